@@ -0,0 +1,125 @@
+"""Micro-benchmark: a MongoDB client per operation versus the shared client.
+
+Measures the latency of :func:`waft.database.get_yt_url` when (1) a new
+``MongoClient`` is created for every call, as the database functions used to
+do, and (2) every call reuses the process-wide client from
+:func:`waft.database.get_database_client`.
+
+With ``--uri`` the benchmark runs against a real deployment, e.g. a local
+``mongod``; the first configuration then pays for connection set-up (and,
+for ``mongodb+srv://`` U.R.I.s, D.N.S. resolution and T.L.S.) on every call.
+Without it, ``mongomock`` stands in for the server, which isolates the
+client-side construction and pool set-up overhead.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_database_client.py --calls 200
+    $ python benchmarks/bench_database_client.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import contextlib
+import statistics
+import time
+from typing import Callable, Iterator, List, Optional
+from unittest.mock import patch
+
+from waft import database
+from waft.database import (DatabaseSettings, close_database, configure_database,
+                           get_yt_url, upload_relation)
+from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
+
+METADATA = FullMetadata(
+    Album("Bags' Groove", "https://i.scdn.co/image/bags"),
+    [Artist("Miles Davis")],
+    Track(290000, False, "Doxy", "1957", 1),
+)
+TRACK = DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 290000, "id1")
+
+
+@contextlib.contextmanager
+def deployment(uri: Optional[str]) -> Iterator[None]:
+    """Configure the shared client for ``uri``, or for ``mongomock``."""
+
+    if uri is not None:
+        configure_database(DatabaseSettings(uri=uri, database="waft-benchmark"))
+        yield
+        database.get_database_client().drop_database("waft-benchmark")
+        close_database()
+        return
+
+    # pylint: disable-next=import-outside-toplevel
+    from mockmongo import mongomock  # type: ignore
+
+    # A shared in-memory store, so separate clients see the same data.
+    store = mongomock.store.ServerStore()
+    with patch.object(
+        database,
+        "MongoClient",
+        lambda *args, **kwargs: mongomock.MongoClient(*args, _store=store, **kwargs),
+    ):
+        configure_database(DatabaseSettings(uri="mongodb://localhost"))
+        yield
+        close_database()
+
+
+def measure(call: Callable[[], object], calls: int) -> List[float]:
+    """Time ``calls`` invocations of ``call`` in milliseconds."""
+
+    timings: List[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    """Print latency summary statistics for one configuration."""
+
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<24} mean {statistics.mean(timings):8.3f} ms   "
+        f"p50 {statistics.median(timings):8.3f} ms   p99 {p99:8.3f} ms"
+    )
+
+
+def per_call_client() -> None:
+    """Look up a link on a freshly created client, then discard the client."""
+
+    get_yt_url(TRACK)
+    close_database()
+
+
+def main() -> None:
+    """Run the benchmark and print a before/after comparison."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--uri", help="MongoDB deployment to run against")
+    arguments = parser.parse_args()
+
+    with deployment(arguments.uri):
+        upload_relation(METADATA, "https://www.youtube.com/watch?v=doxy", "bench")
+
+        before = measure(per_call_client, arguments.calls)
+        get_yt_url(TRACK)  # Create the shared client outside the timings.
+        after = measure(lambda: get_yt_url(TRACK), arguments.calls)
+
+    print(
+        f"{arguments.calls} lookups per configuration against "
+        f"{arguments.uri or 'mongomock'}"
+    )
+    report("client per operation", before)
+    report("shared client", after)
+    print(
+        "speed-up (mean): "
+        f"{statistics.mean(before) / statistics.mean(after):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Micro-benchmark: decoding and parsing 50-item Spotify search pages.
+
+Compares the former ``response.json()`` path (standard library decoder over
+the whole body) with :func:`waft.payloads.decode_response`, which trims the
+unused ``available_markets`` arrays and decodes with ``orjson`` when it is
+installed. For each configuration the mean time to decode and parse one page
+into ``DisplayedTrack`` objects, and the peak memory allocated while doing
+so, are reported.
+
+Without ``--payload`` a page shaped like a recorded ``/v1/search`` response
+(full album objects, artists, images, and ``available_markets`` arrays on
+both track and album) is synthesised.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_payload_parsing.py --repeat 500
+    $ python benchmarks/bench_payload_parsing.py --payload search_page.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from waft import payloads
+from waft.spotify import parse_tracks_from_json
+
+# The ISO 3166-1 codes Spotify lists as markets for a widely available track.
+MARKETS: List[str] = [
+    f"{chr(65 + first)}{chr(65 + second)}"
+    for first in range(26)
+    for second in range(26)
+][:185]
+
+
+def make_artist(index: int) -> Dict[str, Any]:
+    """Build a simplified artist object."""
+
+    artist_id = f"{index:022d}"
+    return {
+        "external_urls": {"spotify": f"https://open.spotify.com/artist/{artist_id}"},
+        "href": f"https://api.spotify.com/v1/artists/{artist_id}",
+        "id": artist_id,
+        "name": f"Artist {index}",
+        "type": "artist",
+        "uri": f"spotify:artist:{artist_id}",
+    }
+
+
+def make_track(index: int) -> Dict[str, Any]:
+    """Build a full track object as returned by ``/v1/search``."""
+
+    track_id = f"{index:022d}"
+    album_id = f"{index + 1000:022d}"
+    return {
+        "album": {
+            "album_type": "album",
+            "artists": [make_artist(index)],
+            "available_markets": MARKETS,
+            "external_urls": {"spotify": f"https://open.spotify.com/album/{album_id}"},
+            "href": f"https://api.spotify.com/v1/albums/{album_id}",
+            "id": album_id,
+            "images": [
+                {
+                    "height": size,
+                    "url": f"https://i.scdn.co/image/{album_id}{size}",
+                    "width": size,
+                }
+                for size in (640, 300, 64)
+            ],
+            "name": f"Album {index}",
+            "release_date": "1954-12-01",
+            "release_date_precision": "day",
+            "total_tracks": 12,
+            "type": "album",
+            "uri": f"spotify:album:{album_id}",
+        },
+        "artists": [make_artist(index), make_artist(index + 1)],
+        "available_markets": MARKETS,
+        "disc_number": 1,
+        "duration_ms": 290000 + index,
+        "explicit": False,
+        "external_ids": {"isrc": f"USPR{index:08d}"},
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+        "href": f"https://api.spotify.com/v1/tracks/{track_id}",
+        "id": track_id,
+        "is_local": False,
+        "name": f"Track {index}",
+        "popularity": 50,
+        "preview_url": None,
+        "track_number": index % 12 + 1,
+        "type": "track",
+        "uri": f"spotify:track:{track_id}",
+    }
+
+
+def make_search_page(items: int = 50) -> bytes:
+    """Build an encoded ``/v1/search`` response with ``items`` tracks."""
+
+    page = {
+        "tracks": {
+            "href": "https://api.spotify.com/v1/search?query=track%3ADoxy",
+            "items": [make_track(index) for index in range(items)],
+            "limit": items,
+            "next": None,
+            "offset": 0,
+            "previous": None,
+            "total": items,
+        }
+    }
+    return json.dumps(page).encode()
+
+
+def stdlib_full(content: bytes) -> int:
+    """Decode the whole body with ``json`` (what ``response.json()`` does)."""
+
+    return len(parse_tracks_from_json(json.loads(content)))
+
+
+def stdlib_trimmed(content: bytes) -> int:
+    """Trim unused fields, then decode with ``json``."""
+
+    return len(
+        parse_tracks_from_json(json.loads(payloads.strip_unused_fields(content)))
+    )
+
+
+def fast_full(content: bytes) -> int:
+    """Decode the whole body with the fast decoder."""
+
+    return len(parse_tracks_from_json(payloads.loads(content)))
+
+
+def fast_trimmed(content: bytes) -> int:
+    """Trim unused fields, then decode with the fast decoder."""
+
+    return len(
+        parse_tracks_from_json(payloads.loads(payloads.strip_unused_fields(content)))
+    )
+
+
+def measure(parse: Callable[[bytes], int], content: bytes, repeat: int) -> List[float]:
+    """Time ``repeat`` parses of ``content`` in milliseconds."""
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def peak_allocation(parse: Callable[[bytes], int], content: bytes) -> int:
+    """Return the peak number of bytes allocated while parsing ``content``."""
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Run the benchmark and print one line per configuration."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--payload", type=Path, help="recorded /v1/search body")
+    arguments = parser.parse_args()
+
+    content: bytes = (
+        arguments.payload.read_bytes() if arguments.payload else make_search_page()
+    )
+    items: int = stdlib_full(content)
+
+    configurations: Dict[str, Callable[[bytes], int]] = {
+        "json, full body": stdlib_full,
+        "json, trimmed": stdlib_trimmed,
+        f"{payloads.BACKEND}, full body": fast_full,
+        f"{payloads.BACKEND}, trimmed": fast_trimmed,
+    }
+
+    print(
+        f"{items}-item page, {len(content) / 1024:.0f} KiB "
+        f"({len(payloads.strip_unused_fields(content)) / 1024:.0f} KiB trimmed), "
+        f"{arguments.repeat} repeats"
+    )
+    for label, parse in configurations.items():
+        timings = measure(parse, content, arguments.repeat)
+        print(
+            f"{label:<20} mean {statistics.mean(timings):7.3f} ms   "
+            f"p50 {statistics.median(timings):7.3f} ms   "
+            f"peak {peak_allocation(parse, content) / 1024:8.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
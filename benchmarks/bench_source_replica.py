@@ -0,0 +1,118 @@
+"""Micro-benchmark: MongoDB source lookups versus the local SQLite replica.
+
+Seeds relations carrying Spotify IDs, syncs them into a
+:class:`waft.replica.SourceReplica`, then looks up random tracks (1) with
+:func:`waft.database.get_yt_url_by_id` and (2) through the replica. Reports
+the p50/p99 latency of each.
+
+Without ``--uri`` the data lives in ``mongomock``, which has no network
+round trips, so the first configuration is a lower bound; against a real
+deployment every remote lookup is also a round trip.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_source_replica.py --relations 2000 --lookups 500
+    $ python benchmarks/bench_source_replica.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+from unittest.mock import patch
+
+from pymongo import MongoClient
+
+from waft import database
+from waft.database import upload_relations
+from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
+from waft.replica import SourceReplica
+
+
+def measure(
+    lookup: Callable[[DisplayedTrack], Optional[str]], tracks: List[DisplayedTrack]
+) -> None:
+    """Run ``lookup`` for every track and print its latency."""
+
+    timings: List[float] = []
+    for track in tracks:
+        start = time.perf_counter()
+        lookup(track)
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{lookup.__name__:<10} p50 {statistics.median(timings):10.1f} us"
+        f"   p99 {p99:10.1f} us"
+    )
+
+
+def main() -> None:
+    """Seed the database, sync the replica, then compare both lookups."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--relations", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--uri", help="MongoDB deployment to run against")
+    arguments = parser.parse_args()
+
+    if arguments.uri:
+        client: Any = MongoClient(arguments.uri)
+    else:
+        # pylint: disable-next=import-outside-toplevel
+        from mockmongo import mongomock  # type: ignore
+
+        client = mongomock.MongoClient()
+    client.drop_database("waft-benchmark")
+
+    tracks: List[DisplayedTrack] = [
+        DisplayedTrack(f"Track {index}", "Artist", "Album", 1, f"id{index}")
+        for index in range(arguments.relations)
+    ]
+    sample = random.Random(0).sample(tracks, arguments.lookups)
+
+    with patch.object(database, "get_database", lambda: client["waft-benchmark"]):
+        upload_relations(
+            (
+                FullMetadata(
+                    Album("Album", "http://img"),
+                    [Artist("Artist")],
+                    Track(1, False, track.title, "2024", 1, track.track_id),
+                ),
+                f"https://youtu.be/{index}",
+                f"hash{index}",
+            )
+            for index, track in enumerate(tracks)
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            replica = SourceReplica(Path(directory) / "sources.db")
+            start = time.perf_counter()
+            copied = replica.sync(client["waft-benchmark"])
+            print(
+                f"{arguments.relations} relations, {arguments.lookups} lookups, "
+                f"against {arguments.uri or 'mongomock'}; synced {copied} links "
+                f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+            )
+
+            def remote(track: DisplayedTrack) -> Optional[str]:
+                return database.get_yt_url_by_id(track)
+
+            def replicated(track: DisplayedTrack) -> Optional[str]:
+                return replica.lookup(track)
+
+            measure(remote, sample)
+            measure(replicated, sample)
+            replica.close()
+
+    client.drop_database("waft-benchmark")
+
+
+if __name__ == "__main__":
+    main()
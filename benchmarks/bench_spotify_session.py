@@ -0,0 +1,85 @@
+"""Micro-benchmark: bare ``requests`` calls versus the pooled Spotify client.
+
+Runs a local stand-in H.T.T.P.S. server and measures per-call latency of
+(1) ``requests.get``, which opens a fresh connection and T.L.S. session for
+every call, and (2) :class:`waft.client.SpotifyClient`, which reuses
+keep-alive connections from its pool.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_spotify_session.py --calls 200
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import requests
+
+from standin import StandInServer  # type: ignore
+from waft.client import SpotifyClient
+
+SEARCH_PAYLOAD = {"tracks": {"items": []}}
+
+
+def measure(call: Callable[[], requests.Response], calls: int) -> List[float]:
+    """Time ``calls`` invocations of ``call`` in milliseconds."""
+
+    timings: List[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call().raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    """Print latency summary statistics for one configuration."""
+
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<24} mean {statistics.mean(timings):7.3f} ms   "
+        f"p50 {statistics.median(timings):7.3f} ms   p99 {p99:7.3f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print a before/after comparison."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100)
+    arguments = parser.parse_args()
+
+    with StandInServer(lambda path: SEARCH_PAYLOAD) as server:
+        url = f"{server.base_url}/v1/search"
+        params = {"q": "track:Doxy", "type": "track", "limit": "50"}
+
+        before = measure(
+            lambda: requests.get(
+                url, params=params, timeout=60, verify=str(server.cert_path)
+            ),
+            arguments.calls,
+        )
+
+        client = SpotifyClient()
+        after = measure(
+            lambda: client.get(url, params=params, verify=str(server.cert_path)),
+            arguments.calls,
+        )
+        client.close()
+
+    print(f"{arguments.calls} calls per configuration")
+    report("bare requests.get", before)
+    report("pooled SpotifyClient", after)
+    print(
+        "speed-up (mean): "
+        f"{statistics.mean(before) / statistics.mean(after):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
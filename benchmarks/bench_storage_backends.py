@@ -0,0 +1,147 @@
+"""Micro-benchmark: throughput of the MongoDB and SQLite storage backends.
+
+Uploads relations carrying Spotify IDs in batches, then looks up random
+tracks one at a time and a page at a time, through every backend of
+:mod:`waft.backends`. Reports operations per second for each.
+
+Without ``--uri`` the MongoDB backend runs against ``mongomock``, which has
+no network round trips, so its figures are an upper bound; against a real
+deployment every operation also pays a round trip.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_storage_backends.py --relations 2000 --batch 50
+    $ python benchmarks/bench_storage_backends.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+from unittest.mock import patch
+
+from waft.backends import MongoBackend, SQLiteBackend, StorageBackend
+from waft.database import (DatabaseSettings, Relation, close_database,
+                           configure_database, get_database_client)
+from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
+
+# Tracks per search page, as looked up by ``lookup_many``.
+PAGE_SIZE: int = 20
+
+
+def measure(label: str, operation: Callable[[], int]) -> None:
+    """Run ``operation``, which returns the items it handled, and print them."""
+
+    start = time.perf_counter()
+    items = operation()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {items:8d} items {items / elapsed:12.0f} /s")
+
+
+def run(
+    backend: StorageBackend,
+    relations: List[Relation],
+    tracks: List[DisplayedTrack],
+    batch: int,
+) -> None:
+    """Time uploads, single lookups, and page lookups against ``backend``."""
+
+    def upload() -> int:
+        for start in range(0, len(relations), batch):
+            backend.upload(relations[start : start + batch])
+        return len(relations)
+
+    def lookup() -> int:
+        for track in tracks:
+            backend.lookup(track)
+        return len(tracks)
+
+    def lookup_many() -> int:
+        for start in range(0, len(tracks), PAGE_SIZE):
+            backend.lookup_many(tracks[start : start + PAGE_SIZE])
+        return len(tracks)
+
+    measure(f"{backend.name} upload", upload)
+    measure(f"{backend.name} lookup", lookup)
+    measure(f"{backend.name} lookup_many", lookup_many)
+    print(backend.stats())
+
+
+def run_mongo(
+    relations: List[Relation], tracks: List[DisplayedTrack], batch: int
+) -> None:
+    """Run the workload against an emptied benchmark database."""
+
+    get_database_client().drop_database("waft-benchmark")
+    run(MongoBackend(), relations, tracks, batch)
+    get_database_client().drop_database("waft-benchmark")
+
+
+def main() -> None:
+    """Run the same workload against every backend."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--relations", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=50, help="relations per upload")
+    parser.add_argument("--uri", help="MongoDB deployment to run against")
+    arguments = parser.parse_args()
+
+    relations: List[Relation] = [
+        (
+            FullMetadata(
+                Album(f"Album {index // 10}", "http://img"),
+                [Artist(f"Artist {index % 50}")],
+                Track(1, False, f"Track {index}", "2024", 1, f"id{index}"),
+            ),
+            f"https://youtu.be/{index}",
+            f"hash{index}",
+        )
+        for index in range(arguments.relations)
+    ]
+    generator = random.Random(0)
+    tracks: List[DisplayedTrack] = [
+        DisplayedTrack(
+            f"Track {index}",
+            f"Artist {index % 50}",
+            f"Album {index // 10}",
+            1,
+            f"id{index}",
+        )
+        for index in (
+            generator.randrange(2 * arguments.relations)
+            for _ in range(arguments.lookups)
+        )
+    ]
+    print(
+        f"{arguments.relations} relations in batches of {arguments.batch}, "
+        f"{arguments.lookups} lookups, half of them misses"
+    )
+
+    configure_database(
+        DatabaseSettings(
+            uri=arguments.uri or "mongodb://localhost", database="waft-benchmark"
+        )
+    )
+    if arguments.uri:
+        run_mongo(relations, tracks, arguments.batch)
+    else:
+        # pylint: disable-next=import-outside-toplevel
+        from mockmongo import mongomock  # type: ignore
+
+        with patch("waft.database.MongoClient", mongomock.MongoClient):
+            run_mongo(relations, tracks, arguments.batch)
+    close_database()
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteBackend(Path(directory) / "waft.db")
+        run(backend, relations, tracks, arguments.batch)
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
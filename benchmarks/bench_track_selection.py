@@ -0,0 +1,158 @@
+"""Micro-benchmark: time-to-first-suggestion after a track is selected.
+
+A selection looks up the YouTube suggestions and the source stored in the
+database for the track. This benchmark times how long the first of them
+takes to reach the screen when (1) both are fetched one after the other on
+the event loop, as before, so nothing is displayed until both are done, and
+(2) both are fetched concurrently off the event loop and each is displayed
+as soon as it arrives, as :meth:`waft.application.Application.load_sources`
+does. Selections are repeated once the suggestions are cached.
+
+YouTube is replaced by a local stand-in H.T.T.P.S. server and the database
+by a lookup that sleeps for a round trip, with latencies set on the command
+line.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_track_selection.py --youtube-ms 150 --database-ms 40
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+from unittest.mock import patch
+
+import googleapiclient.discovery  # type: ignore
+import httplib2  # type: ignore
+
+from standin import StandInServer  # type: ignore
+from waft.cache import SuggestionCache
+from waft.datatypes import DisplayedTrack
+from waft.quota import QuotaLedger
+from waft.youtube import close_youtube_services, suggest_sources
+
+SEARCH_PAYLOAD = {
+    "items": [
+        {
+            "id": {"kind": "youtube#video", "videoId": f"video{index}"},
+            "snippet": {"title": f"Doxy {index}", "channelTitle": "Miles Davis"},
+        }
+        for index in range(25)
+    ]
+}
+
+
+def before(
+    track: DisplayedTrack,
+    suggest: Callable[[DisplayedTrack], Any],
+    lookup: Callable[[DisplayedTrack], Optional[str]],
+) -> float:
+    """Return the milliseconds until sources are shown, fetched in sequence."""
+
+    start = time.perf_counter()
+    suggest(track)
+    lookup(track)
+    return (time.perf_counter() - start) * 1000
+
+
+async def after(
+    track: DisplayedTrack,
+    suggest: Callable[[DisplayedTrack], Any],
+    lookup: Callable[[DisplayedTrack], Optional[str]],
+) -> float:
+    """Return the milliseconds until a source is shown, fetched concurrently."""
+
+    start = time.perf_counter()
+    first: List[float] = []
+
+    async def show(fetch: Callable[[DisplayedTrack], Any]) -> None:
+        if await asyncio.to_thread(fetch, track) and not first:
+            first.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(show(suggest), show(lookup))
+    return first[0] if first else (time.perf_counter() - start) * 1000
+
+
+def report(label: str, timings: List[float]) -> None:
+    """Print latency summary statistics for one configuration."""
+
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<28} mean {statistics.mean(timings):8.3f} ms   "
+        f"p50 {statistics.median(timings):8.3f} ms   p99 {p99:8.3f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print a before/after comparison."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--selections", type=int, default=20)
+    parser.add_argument("--youtube-ms", type=float, default=150.0)
+    parser.add_argument("--database-ms", type=float, default=40.0)
+    arguments = parser.parse_args()
+
+    def respond(_: str) -> Any:
+        time.sleep(arguments.youtube_ms / 1000)
+        return SEARCH_PAYLOAD
+
+    def lookup(track: DisplayedTrack) -> Optional[str]:
+        time.sleep(arguments.database_ms / 1000)
+        return f"https://youtu.be/{track.track_id}"
+
+    tracks: List[DisplayedTrack] = [
+        DisplayedTrack(f"Track {index}", "Artist", "Album", 1, f"id{index}")
+        for index in range(arguments.selections)
+    ]
+    build = googleapiclient.discovery.build
+    with StandInServer(respond) as server, tempfile.TemporaryDirectory() as directory:
+        endpoint = {"api_endpoint": f"{server.base_url}/"}
+        ledger = QuotaLedger(Path(directory) / "quota.db", daily_quota=10**9)
+        with patch(
+            "waft.youtube.httplib2.Http",
+            partial(httplib2.Http, ca_certs=str(server.cert_path)),
+        ), patch(
+            "waft.youtube.googleapiclient.discovery.build",
+            partial(build, client_options=endpoint),
+        ):
+            timings: List[List[float]] = []
+            for run in ("sequential", "concurrent"):
+                cache = SuggestionCache(Path(directory) / f"{run}.db")
+                suggest = partial(
+                    suggest_sources, api_key="benchmark", cache=cache, ledger=ledger
+                )
+                for _ in ("cold", "cached"):
+                    timings.append(
+                        [
+                            (
+                                before(track, suggest, lookup)
+                                if run == "sequential"
+                                else asyncio.run(after(track, suggest, lookup))
+                            )
+                            for track in tracks
+                        ]
+                    )
+                cache.close()
+            close_youtube_services()
+        ledger.close()
+
+    print(
+        f"{arguments.selections} selections, YouTube {arguments.youtube_ms:.0f} ms, "
+        f"database {arguments.database_ms:.0f} ms"
+    )
+    report("sequential, cold cache", timings[0])
+    report("sequential, cached", timings[1])
+    report("concurrent, cold cache", timings[2])
+    report("concurrent, cached", timings[3])
+
+
+if __name__ == "__main__":
+    main()
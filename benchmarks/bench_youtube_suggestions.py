@@ -0,0 +1,108 @@
+"""Micro-benchmark: time-to-suggestions for repeated track selections.
+
+Runs a local stand-in H.T.T.P.S. server in place of the YouTube Data A.P.I.
+and measures how long :func:`waft.youtube.search_youtube` takes to return
+suggestions when (1) a service object and a connection are built for every
+selection, as before, and (2) the cached service and pooled keep-alive
+connections of :mod:`waft.youtube` are reused.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_youtube_suggestions.py --selections 200
+"""
+
+import argparse
+import statistics
+import time
+from functools import partial
+from typing import Any, Callable, List
+from unittest.mock import patch
+
+import googleapiclient.discovery  # type: ignore
+import httplib2  # type: ignore
+
+from standin import StandInServer  # type: ignore
+from waft.datatypes import DisplayedTrack
+from waft.youtube import close_youtube_services, search_youtube
+
+SEARCH_PAYLOAD = {
+    "items": [
+        {
+            "id": {"kind": "youtube#video", "videoId": f"video{index}"},
+            "snippet": {"title": f"Doxy {index}", "channelTitle": "Miles Davis"},
+        }
+        for index in range(25)
+    ]
+}
+
+TRACK = DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", "4:50", "id1")
+
+
+def measure(call: Callable[[], Any], selections: int) -> List[float]:
+    """Time ``selections`` invocations of ``call`` in milliseconds."""
+
+    timings: List[float] = []
+    for _ in range(selections):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    """Print latency summary statistics for one configuration."""
+
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<24} mean {statistics.mean(timings):7.3f} ms   "
+        f"p50 {statistics.median(timings):7.3f} ms   p99 {p99:7.3f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print a before/after comparison."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--selections", type=int, default=100)
+    arguments = parser.parse_args()
+
+    build = googleapiclient.discovery.build
+    with StandInServer(lambda path: SEARCH_PAYLOAD) as server:
+        connect = partial(httplib2.Http, ca_certs=str(server.cert_path))
+        endpoint = {"api_endpoint": f"{server.base_url}/"}
+
+        def build_per_selection() -> Any:
+            service = build(
+                "youtube",
+                "v3",
+                developerKey="benchmark",
+                http=connect(),
+                client_options=endpoint,
+            )
+            return service.search().list(part="snippet", q="Doxy").execute()
+
+        before = measure(build_per_selection, arguments.selections)
+
+        with patch("waft.youtube.httplib2.Http", connect), patch(
+            "waft.youtube.googleapiclient.discovery.build",
+            partial(build, client_options=endpoint),
+        ):
+            after = measure(
+                lambda: search_youtube(TRACK, "benchmark"), arguments.selections
+            )
+            close_youtube_services()
+
+    print(f"{arguments.selections} selections per configuration")
+    report("service per selection", before)
+    report("cached service", after)
+    print(
+        "speed-up (mean): "
+        f"{statistics.mean(before) / statistics.mean(after):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
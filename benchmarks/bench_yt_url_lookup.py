@@ -0,0 +1,196 @@
+"""Micro-benchmark: the former N+1 ``get_yt_url`` loop versus one aggregation.
+
+Seeds thousands of relations (several tracks share each name, as covers and
+re-releases do), then looks up random tracks with (1) the query loop
+:func:`waft.database.get_yt_url` used to run, reproduced below, and (2) the
+current single ``$lookup`` aggregation. Reports the number of queries sent
+per lookup and the p50/p99 latency of each.
+
+Without ``--uri`` the data lives in ``mongomock``, which has no network
+round trips, so its latencies only reflect the work done per query; against
+a real deployment every query is also a round trip.
+
+Examples
+--------
+::
+
+    $ python benchmarks/bench_yt_url_lookup.py --relations 5000 --lookups 200
+    $ python benchmarks/bench_yt_url_lookup.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Callable, List, Optional
+from unittest.mock import patch
+
+from pymongo import MongoClient
+from pymongo.database import Database
+
+from waft import database
+from waft.datatypes import DisplayedTrack
+
+# Tracks sharing one name, e.g. a standard recorded by several artists.
+NAME_SHARE: int = 5
+
+
+class CountingCollection:
+    """Collection proxy counting the queries sent through it."""
+
+    def __init__(self, collection: Any, counter: List[int]) -> None:
+        self.collection = collection
+        self.counter = counter
+
+    def find(self, *args: Any, **kwargs: Any) -> Any:
+        """Count and forward a ``find``."""
+
+        self.counter[0] += 1
+        return self.collection.find(*args, **kwargs)
+
+    def find_one(self, *args: Any, **kwargs: Any) -> Any:
+        """Count and forward a ``find_one``."""
+
+        self.counter[0] += 1
+        return self.collection.find_one(*args, **kwargs)
+
+    def aggregate(self, *args: Any, **kwargs: Any) -> Any:
+        """Count and forward an ``aggregate``."""
+
+        self.counter[0] += 1
+        return self.collection.aggregate(*args, **kwargs)
+
+
+class CountingDatabase:  # pylint: disable=too-few-public-methods
+    """Database proxy whose collections count the queries sent through them."""
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+        self.counter: List[int] = [0]
+
+    def __getitem__(self, name: str) -> CountingCollection:
+        return CountingCollection(self.db[name], self.counter)
+
+
+def legacy_get_yt_url(db: Any, track: DisplayedTrack) -> Optional[str]:
+    """The lookup ``get_yt_url`` performed before the aggregation."""
+
+    candidate_tracks = db["Track"].find({"Name": track.title})
+    candidate_albums = db["Album"].find({"Name": track.album})
+    candidate_artists = db["Artist"].find({"Name": {"$in": [track.artist]}})
+    candidate_artists_names = [artist["Name"] for artist in candidate_artists]
+
+    for track_doc in candidate_tracks:
+        on_doc = db["On"].find_one({"TrackID": track_doc["_id"]})
+        match_exists = False
+        for album_doc in candidate_albums:
+            if on_doc["AlbumID"] == album_doc["_id"]:
+                match_exists = True
+                break
+        if not match_exists:
+            return None
+        for records_doc in db["Records"].find({"TrackID": track_doc["_id"]}):
+            matched_artist = db["Artist"].find_one({"_id": records_doc["ArtistID"]})
+            if matched_artist["Name"] in candidate_artists_names:
+                file_doc = db["File"].find_one({"TrackID": track_doc["_id"]})
+                return file_doc["SourceLink"]
+    return None
+
+
+def seed(db: Database, relations: int) -> List[DisplayedTrack]:
+    """Insert ``relations`` relations and return the tracks they describe."""
+
+    tracks: List[DisplayedTrack] = []
+    for index in range(relations):
+        track = DisplayedTrack(
+            f"Track {index // NAME_SHARE}",
+            f"Artist {index}",
+            f"Album {index}",
+            290000,
+            str(index),
+        )
+        tracks.append(track)
+        db["Album"].insert_one({"_id": index, "Name": track.album})
+        db["Artist"].insert_one({"_id": index, "Name": track.artist})
+        db["Track"].insert_one({"_id": index, "Name": track.title})
+        db["Records"].insert_one({"ArtistID": index, "TrackID": index})
+        db["On"].insert_one({"TrackID": index, "AlbumID": index, "TrackNumber": 1})
+        db["File"].insert_one(
+            {"_id": f"hash{index}", "TrackID": index, "SourceLink": f"yt/{index}"}
+        )
+    for name, key in (("Track", "Name"), ("Album", "Name"), ("Artist", "Name")):
+        db[name].create_index(key)
+    for name in ("On", "Records", "File"):
+        db[name].create_index("TrackID")
+    return tracks
+
+
+def measure(
+    lookup: Callable[[DisplayedTrack], Optional[str]],
+    counting: CountingDatabase,
+    tracks: List[DisplayedTrack],
+) -> None:
+    """Run ``lookup`` for every track and print queries and latency."""
+
+    timings: List[float] = []
+    found: int = 0
+    counting.counter[0] = 0
+    for track in tracks:
+        start = time.perf_counter()
+        found += lookup(track) is not None
+        timings.append((time.perf_counter() - start) * 1000)
+
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{lookup.__name__:<18} queries/lookup {counting.counter[0] / len(tracks):6.1f}"
+        f"   p50 {statistics.median(timings):8.3f} ms   p99 {p99:8.3f} ms"
+        f"   found {found}/{len(tracks)}"
+    )
+
+
+def main() -> None:
+    """Seed the database, then compare both lookups."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--relations", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--uri", help="MongoDB deployment to run against")
+    arguments = parser.parse_args()
+
+    if arguments.uri:
+        client: Any = MongoClient(arguments.uri)
+    else:
+        # pylint: disable-next=import-outside-toplevel
+        from mockmongo import mongomock  # type: ignore
+
+        client = mongomock.MongoClient()
+    db: Database = client["waft-benchmark"]
+    client.drop_database("waft-benchmark")
+
+    tracks = seed(db, arguments.relations)
+    sample = random.Random(0).sample(tracks, arguments.lookups)
+    counting = CountingDatabase(db)
+
+    def legacy(track: DisplayedTrack) -> Optional[str]:
+        return legacy_get_yt_url(counting, track)
+
+    def aggregation(track: DisplayedTrack) -> Optional[str]:
+        return database.get_yt_url(track)
+
+    legacy.__name__ = "query loop"
+    aggregation.__name__ = "aggregation"
+
+    print(
+        f"{arguments.relations} relations, {arguments.lookups} lookups, "
+        f"{NAME_SHARE} tracks per name, against {arguments.uri or 'mongomock'}"
+    )
+    measure(legacy, counting, sample)
+    with patch.object(database, "get_database", lambda: counting):
+        measure(aggregation, counting, sample)
+
+    client.drop_database("waft-benchmark")
+
+
+if __name__ == "__main__":
+    main()
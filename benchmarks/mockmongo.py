@@ -0,0 +1,24 @@
+"""``mongomock``, adapted to the installed pymongo for the benchmarks.
+
+pymongo 4.11 passes the ``sort`` of an ``UpdateOne`` to the bulk builder,
+which mongomock predates, so :func:`waft.database.upload_relations` fails
+against it. Importing ``mongomock`` from here accepts updates without a
+sort, as ``tests/conftest.py`` does for the test suite.
+"""
+
+import inspect
+
+import mongomock  # type: ignore
+from mongomock.collection import BulkOperationBuilder  # type: ignore
+
+__all__ = ["mongomock"]
+
+if "sort" not in inspect.signature(BulkOperationBuilder.add_update).parameters:
+    _add_update = BulkOperationBuilder.add_update
+
+    def _add_update_without_sort(self, *args, sort=None, **kwargs):
+        if sort is not None:
+            raise NotImplementedError("mongomock cannot sort updates")
+        return _add_update(self, *args, **kwargs)
+
+    BulkOperationBuilder.add_update = _add_update_without_sort
@@ -0,0 +1,142 @@
+"""Local stand-in H.T.T.P.S. server for benchmarking the Spotify client.
+
+The server generates a throw-away self-signed certificate for ``localhost``,
+speaks keep-alive H.T.T.P./1.1, and answers every request with a canned JSON
+payload, so client-side connection costs can be measured without touching
+the real Spotify A.P.I.
+"""
+
+import datetime
+import ipaddress
+import json
+import ssl
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+
+def write_self_signed_certificate(directory: Path) -> Tuple[Path, Path]:
+    """Create a self-signed certificate and key for ``localhost``.
+
+    Parameters
+    ----------
+    directory : Path
+        Folder in which ``cert.pem`` and ``key.pem`` are written.
+
+    Returns
+    -------
+    tuple[Path, Path]
+        Paths to the certificate and private key files.
+    """
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName("localhost"),
+                    x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+                ]
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = directory / "cert.pem"
+    key_path = directory / "key.pem"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return cert_path, key_path
+
+
+class StandInServer:
+    """Threaded H.T.T.P.S. server answering every request with JSON.
+
+    Parameters
+    ----------
+    responder : Callable[[str], Dict[str, Any]]
+        Maps a request path (including the query string) to the JSON body
+        that should be returned.
+
+    Attributes
+    ----------
+    base_url : str
+        ``https://localhost:<port>`` once the server has started.
+    cert_path : Path
+        Self-signed certificate clients should trust via ``verify=``.
+    request_count : int
+        Number of requests served so far.
+    """
+
+    def __init__(self, responder: Callable[[str], Dict[str, Any]]) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.cert_path, key_path = write_self_signed_certificate(
+            Path(self._directory.name)
+        )
+        self.request_count = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Keep-alive request handler returning canned JSON."""
+
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _respond(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                if length:
+                    self.rfile.read(length)
+                body = json.dumps(responder(self.path)).encode("utf-8")
+                server.request_count += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond  # noqa: N815
+            do_POST = _respond  # noqa: N815
+
+            def log_message(self, *args: Any) -> None:  # pylint: disable=W0221
+                return
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cert_path, key_path)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.socket = context.wrap_socket(self._httpd.socket, server_side=True)
+        self.base_url = f"https://localhost:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._directory.cleanup()
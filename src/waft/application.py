@@ -5,29 +5,75 @@ The Elm Architecture model and coordinates user interface updates in
 response to Textual events.
 """
 
+import sqlite3
+import time
+from asyncio import Semaphore, gather, sleep, to_thread
 from dataclasses import replace
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
+from pymongo.errors import PyMongoError
+from requests import RequestException
 from textual.app import App
 from textual.css.query import NoMatches
-
-from waft.authentication import get_spotify_access_token
-from waft.database import get_yt_url, upload_relation
-from waft.datatypes import DisplayedTrack
+from textual.widgets.option_list import Option
+from textual.worker import Worker
+
+from waft.backends import (MongoBackend, StorageBackend, close_backend,
+                           get_backend)
+from waft.cache import SearchCache, SearchResult, SuggestionCache
+from waft.client import close_client, get_client
+from waft.config import cache_directory
+from waft.database import Relation, get_database
+from waft.datatypes import (DisplayedAlbum, DisplayedTrack, FullMetadata,
+                            QueuedDownload, UploadQueueStats, YoutubeResult)
+from waft.journal import UploadJournal, UploadQueue, journal_path
 from waft.keyring import retrieve_credentials
-from waft.messages import (Authenticating, SearchRequest, StartDownload,
-                           TrackSelected, UpdateStatus, UrlSelected)
+from waft.library import LibraryEntry, LibraryIndex, copy_track, library_path
+from waft.messages import (Authenticating, LoadMoreResults,
+                           ResultHighlighted, SearchRequest, StartDownload,
+                           TrackSelected, UpdateStatus, UploadQueueChanged,
+                           UrlSelected)
 from waft.model import ApplicationModel, update
-from waft.screens import (AudioSource, IntitialAuthenticationScreen,
-                          SpotifySearchScreen)
-from waft.spotify import get_metadata, spotify_search
+from waft.monitoring import LatencyHistogram, get_monitor
+from waft.prefetch import MetadataPrefetcher
+from waft.quota import QuotaLedger, quota_path
+from waft.ratelimit import Priority
+from waft.replica import SourceReplica, replica_path
+from waft.screens import (AudioSource, DiagnosticsScreen, DuplicateDownload,
+                          IntitialAuthenticationScreen, SpotifySearchScreen)
+from waft.spotify import (MAX_SEARCH_RESULTS, get_album_tracks_async,
+                          get_metadata_async, get_metadata_batch_async,
+                          next_search_offset, spotify_album_search_async,
+                          spotify_search_async)
+from waft.tokens import TokenManager
 from waft.utils import (create_options_from_results,
                         create_options_from_suggestions, hash_file)
 from waft.widgets import DownloadOption, StatusBar
-from waft.youtube import search_youtube
+from waft.youtube import close_youtube_services, suggest_sources
 from waft.ytdlp import download_track
 
+# Number of results loaded for a new search, and per page thereafter.
+SEARCH_LIMIT: int = 50
+
+# Size of the small first page that gets the first rows on screen quickly.
+FIRST_PAGE_SIZE: int = 10
+
+# Number of top results prefetched when a search returns.
+PREFETCH_TOP: int = 5
+
+# Number of results, from the cursor down, prefetched when the cursor rests.
+PREFETCH_AHEAD: int = 2
+
+# Seconds the cursor must rest on a result before it is prefetched.
+PREFETCH_DELAY: float = 0.3
+
+# Tracks of an album whose sources are resolved and downloaded at once.
+ALBUM_CONCURRENCY: int = 4
+
+# Seconds between background syncs of the local source replica.
+REPLICA_SYNC_INTERVAL: float = 300.0
+
 
 class Application(App):
     """Manages/Updates the application state based on Textual events.
@@ -48,16 +94,37 @@ class Application(App):
             active_token="",
             api_key="",
             authenticating=False,
+            download_queue=[],
             downloads_folder=Path.home() / "Music/waft/",
             developer_key="",
             url_found=False,
+            known_sources={},
+            search_next_offset=None,
             search_query=("", ""),
             search_results=[],
             selection=DisplayedTrack("", "", "", "", ""),
             suggestion_results=[],
             status_message="...",
+            upload_queue=UploadQueueStats(),
             valid_credentials=False,
         )
+        self.download_worker: Optional[Worker] = None
+        self.search_worker: Optional[Worker] = None
+        self.tokens: Optional[TokenManager] = None
+        self.search_cache: SearchCache = SearchCache(cache_directory() / "cache.db")
+        self.suggestion_cache: SuggestionCache = SuggestionCache(
+            cache_directory() / "cache.db"
+        )
+        self.quota: QuotaLedger = QuotaLedger(quota_path())
+        self.prefetcher: MetadataPrefetcher = MetadataPrefetcher()
+        # Milliseconds from a track selection to its first source on screen.
+        self.first_suggestion: LatencyHistogram = LatencyHistogram()
+        self.storage: StorageBackend = get_backend()
+        self.replica: SourceReplica = SourceReplica(replica_path())
+        self.library: LibraryIndex = LibraryIndex(library_path())
+        self.upload_queue: UploadQueue = UploadQueue(
+            UploadJournal(journal_path()), upload=self.storage.upload
+        )
 
     async def on_mount(self) -> None:
         """Initialize application state and load the initial screen.
@@ -68,16 +135,12 @@ class Application(App):
 
         credential_result: Optional[Tuple[str, str, str]] = retrieve_credentials()
 
-        authentication_result: Optional[str] = None
-        token: str = ""
+        token: Optional[str] = None
 
         if credential_result is not None:
-            authentication_result = self.run_worker(
-                get_spotify_access_token(credential_result[0], credential_result[1]),
-                exclusive=True,
-            ).result
-
-            token = authentication_result if authentication_result else token
+            # A persisted, unexpired token lets a warm start skip the request.
+            self.tokens = TokenManager(credential_result[0], credential_result[1])
+            token = await self.tokens.get_token()
 
             self.model = replace(
                 self.model,
@@ -86,8 +149,27 @@ class Application(App):
 
         self.model = replace(
             self.model,
-            active_token=token,
-            valid_credentials=(authentication_result is not None),
+            active_token=token or "",
+            valid_credentials=(token is not None),
+        )
+
+        # A token revoked before it expires is renewed on its first 401.
+        get_client().reauthenticate = self.reauthenticate
+        # Resolve and connect to the database before the first lookup needs it.
+        self.run_worker(to_thread(self.storage.warm_up), group="database")
+        # Relations left in the journal by a previous run are flushed first.
+        self.model = replace(self.model, upload_queue=self.upload_queue.stats)
+        self.run_worker(
+            self.upload_queue.run(
+                lambda stats: self.app.post_message(UploadQueueChanged(stats))
+            ),
+            group="uploads",
+        )
+        self.start_replica_sync()
+        self.set_interval(REPLICA_SYNC_INTERVAL, self.start_replica_sync)
+        # Index files downloaded before, or by hand, for duplicate detection.
+        self.run_worker(
+            to_thread(self.library.scan, self.model.downloads_folder), group="library"
         )
 
         if self.model.valid_credentials:
@@ -97,6 +179,22 @@ class Application(App):
 
         self.app.post_message(UpdateStatus("Welcome."))
 
+    async def on_unmount(self) -> None:
+        """Release shared network resources when the application exits."""
+
+        if self.tokens is not None:
+            self.tokens.close()
+        self.search_cache.close()
+        self.suggestion_cache.close()
+        self.quota.close()
+        self.replica.close()
+        self.library.close()
+        self.upload_queue.close()
+        close_client()
+        close_youtube_services()
+        close_backend()
+        get_monitor().close()
+
     async def on_update_status(self, message: UpdateStatus) -> None:
         """Handle a status-message update event.
 
@@ -121,6 +219,23 @@ class Application(App):
         except NoMatches:
             pass
 
+    async def on_upload_queue_changed(self, message: UploadQueueChanged) -> None:
+        """Show the depth and flush latency of the upload queue.
+
+        Parameters
+        ----------
+        message : UploadQueueChanged
+            The TEA message containing the queue statistics.
+        """
+
+        self.model = update(self.model, message)
+
+        try:
+            status_widget: StatusBar = self.screen.query_one(StatusBar)
+            status_widget.render_from_model(self.model)
+        except NoMatches:
+            pass
+
     async def on_authenticating(self, message: Authenticating) -> None:
         """Handle authentication-state updates.
 
@@ -137,9 +252,65 @@ class Application(App):
     async def on_valid_credentials(self) -> None:
         """Transition to Spotify A.P.I. search screen after successful validation."""
 
+        credential_result: Optional[Tuple[str, str, str]] = retrieve_credentials()
+        if credential_result is not None:
+            self.tokens = TokenManager(credential_result[0], credential_result[1])
+            self.model = replace(self.model, api_key=credential_result[2])
+            await self.bearer()
+
         self.pop_screen()
         self.push_screen(SpotifySearchScreen())
 
+    async def bearer(self) -> str:
+        """Return a valid Spotify access token, refreshing it if necessary.
+
+        The token held by the :class:`TokenManager` is mirrored into
+        ``self.model.active_token`` whenever it changes.
+
+        Returns
+        -------
+        str
+            The bearer token to send with Spotify A.P.I. requests.
+        """
+
+        token: Optional[str] = (
+            await self.tokens.get_token() if self.tokens is not None else None
+        )
+        if token and token != self.model.active_token:
+            self.model = replace(self.model, active_token=token)
+        return self.model.active_token
+
+    def reauthenticate(self, rejected: str) -> Optional[str]:
+        """Renew a bearer token Spotify rejected, from a request thread.
+
+        Parameters
+        ----------
+        rejected : str
+            The bearer token Spotify answered with a 401.
+
+        Returns
+        -------
+        str | None
+            The renewed token, or ``None`` without credentials, when Spotify
+            rejects them, or when called on the event loop, which cannot
+            wait for the renewal.
+        """
+
+        try:
+            return self.call_from_thread(self.renew_token, rejected)
+        except RuntimeError:
+            return None
+
+    async def renew_token(self, rejected: str) -> Optional[str]:
+        """Renew a rejected bearer token and mirror it into the model."""
+
+        token: Optional[str] = (
+            await self.tokens.renew(rejected) if self.tokens is not None else None
+        )
+        if token:
+            self.model = replace(self.model, active_token=token)
+        return token
+
     async def on_search_request(self, message: SearchRequest) -> None:
         """Handle a request to perform a Spotify search.
 
@@ -153,6 +324,8 @@ class Application(App):
         -----
         - If the new query is identical to the one cached in
           ``self.model.search_query``, no search is issued.
+        - The search runs in an exclusive worker, so the interface keeps
+          repainting and a newer query cancels one still in flight.
         """
 
         if self.model.search_query == (message.query, message.mode):
@@ -160,16 +333,205 @@ class Application(App):
 
         self.model = update(self.model, message)
 
-        self.app.post_message(UpdateStatus("Searching..."))
-        search_results: List[DisplayedTrack] = spotify_search(
-            message.query, self.model.active_token, 50
+        self.search_worker = self.run_worker(
+            self.search(message.query, message.mode), group="search", exclusive=True
         )
+
+    async def on_load_more_results(self, _message: LoadMoreResults) -> None:
+        """Load the next page of results for the current search.
+
+        Notes
+        -----
+        - Ignored while a search or another page is still loading, and once
+          every available result has been loaded.
+        """
+
+        if self.model.search_next_offset is None:
+            return
+        if self.search_worker is not None and not self.search_worker.is_finished:
+            return
+
+        query, mode = self.model.search_query
+        self.search_worker = self.run_worker(
+            self.load_search_page(query, mode, SEARCH_LIMIT), group="search"
+        )
+
+    async def search(self, query: str, mode: str) -> None:
+        """Stream the first results of a new search into the results list.
+
+        A small first page is loaded and rendered before the remainder of the
+        first ``SEARCH_LIMIT`` results, so the first rows appear as quickly as
+        possible.
+
+        Parameters
+        ----------
+        query : str
+            The user query string.
+        mode : str
+            The search mode (search by track, album, etc.)
+        """
+
+        self.model = replace(
+            self.model,
+            url_found=False,
+            known_sources={},
+            search_results=[],
+            search_next_offset=0,
+        )
+        # The rows of the previous search no longer match the model.
+        search_screen: Optional[SpotifySearchScreen] = self.search_screen()
+        if search_screen is not None:
+            search_screen.display_results([])
+        await self.load_search_page(query, mode, FIRST_PAGE_SIZE)
+        await self.load_search_page(query, mode, SEARCH_LIMIT - FIRST_PAGE_SIZE)
+
+    async def load_search_page(self, query: str, mode: str, limit: int) -> None:
+        """Fetch the next page of search results and append it to the list.
+
+        Pages are served from ``self.search_cache`` when possible, and fetched
+        from Spotify (then cached) otherwise. Album mode searches for albums
+        rather than tracks.
+
+        Parameters
+        ----------
+        query : str
+            The user query string.
+        mode : str
+            The search mode (search by track, album, etc.)
+        limit : int
+            Maximum number of results in the page.
+        """
+
+        offset: Optional[int] = self.model.search_next_offset
+        if offset is None:
+            return
+        limit = min(limit, MAX_SEARCH_RESULTS - offset)
+
+        page: Optional[List[SearchResult]] = self.search_cache.get(
+            query, mode, limit, offset
+        )
+        if page is None:
+            self.app.post_message(UpdateStatus("Searching..."))
+            search = (
+                spotify_album_search_async if mode == "album" else spotify_search_async
+            )
+            try:
+                page = await search(query, await self.bearer(), limit, offset)
+            except RequestException:
+                self.app.post_message(UpdateStatus("Search failed."))
+                return
+            self.search_cache.put(query, mode, limit, page, offset)
+
         self.app.post_message(UpdateStatus("Done."))
 
-        if isinstance(self.screen, SpotifySearchScreen):
-            self.screen.display_results(create_options_from_results(search_results))
+        if offset == 0:
+            self.run_worker(
+                self.prefetch(page[:PREFETCH_TOP]), group="prefetch", exclusive=True
+            )
+
+        search_screen: Optional[SpotifySearchScreen] = self.search_screen()
+        if search_screen is not None:
+            options: List[Option] = create_options_from_results(page)
+            if offset == 0:
+                search_screen.display_results(options)
+            else:
+                search_screen.append_results(options)
+
+        self.model = replace(
+            self.model,
+            search_results=[*self.model.search_results, *page],
+            search_next_offset=next_search_offset(offset, limit, len(page)),
+        )
+        self.run_worker(self.mark_known_sources(page, offset), group="known-sources")
+
+    async def mark_known_sources(self, page: List[SearchResult], offset: int) -> None:
+        """Mark the rows of a rendered page whose YouTube source is stored.
 
-        self.model = replace(self.model, url_found=False, search_results=search_results)
+        The lookup may wait on an unreachable deployment, so it runs after
+        the page is displayed, and its result is dropped if the rows were
+        replaced by another search in the meantime.
+
+        Parameters
+        ----------
+        page : List[DisplayedTrack | DisplayedAlbum]
+            The results of the page, as displayed.
+        offset : int
+            Index of the first result of the page in the results list.
+        """
+
+        # One lookup marks every track of the page whose source is stored.
+        known_sources: Dict[str, str] = await to_thread(
+            self.replica.lookup_many,
+            [result for result in page if isinstance(result, DisplayedTrack)],
+            self.storage.lookup_many,
+        )
+        if not known_sources or (
+            self.model.search_results[offset : offset + len(page)] != page
+        ):
+            return
+        self.model = replace(
+            self.model, known_sources={**self.model.known_sources, **known_sources}
+        )
+
+        search_screen: Optional[SpotifySearchScreen] = self.search_screen()
+        if search_screen is not None:
+            search_screen.replace_results(
+                offset, create_options_from_results(page, known_sources)
+            )
+
+    async def on_result_highlighted(self, message: ResultHighlighted) -> None:
+        """Prefetch the highlighted search result once the cursor rests on it.
+
+        Parameters
+        ----------
+        message : ResultHighlighted
+            Contains the index of the highlighted search result.
+
+        Notes
+        -----
+        - The prefetch runs in an exclusive worker after ``PREFETCH_DELAY``,
+          so scrolling past results cancels their prefetch before any
+          request is made.
+        """
+
+        results: List[SearchResult] = self.model.search_results[
+            message.index : message.index + PREFETCH_AHEAD
+        ]
+        self.run_worker(
+            self.prefetch(results, PREFETCH_DELAY),
+            group="prefetch-cursor",
+            exclusive=True,
+        )
+
+    async def prefetch(self, results: List[SearchResult], delay: float = 0.0) -> None:
+        """Speculatively fetch the metadata and cover art of search results.
+
+        Parameters
+        ----------
+        results : List[DisplayedTrack | DisplayedAlbum]
+            The results to prefetch, most likely pick first. Albums are
+            skipped.
+        delay : float
+            Seconds to wait before the first request.
+        """
+
+        tracks: List[DisplayedTrack] = [
+            result for result in results if isinstance(result, DisplayedTrack)
+        ]
+        if not tracks:
+            return
+        await sleep(delay)
+        await self.prefetcher.prefetch(
+            [track.track_id for track in tracks], await self.bearer()
+        )
+
+    def search_screen(self) -> Optional[SpotifySearchScreen]:
+        """Return the search screen, even when a modal is displayed above it."""
+
+        for screen in reversed(self.screen_stack):
+            if isinstance(screen, SpotifySearchScreen):
+                return screen
+        return None
 
     async def on_track_selected(self, message: TrackSelected) -> None:
         """Handle track selection and fetch YouTube audio source suggestions.
@@ -183,29 +545,106 @@ class Application(App):
         -----
         - Updates the model with the selected track.
         - Pushes the AudioSource screen onto the stack.
-        - Fetches YouTube suggestions for the selected track and populates the screen.
+        - Fetches the sources of the selected track in the background and
+          populates the screen as they arrive, see :meth:`load_sources`.
+        - Selecting an album downloads every track on it instead, see
+          :meth:`download_album`.
+        - Selections of rows no longer in the model, e.g. while a new search
+          loads, are ignored.
         """
 
+        if not 0 <= message.index < len(self.model.search_results):
+            return
+        result: Union[DisplayedTrack, DisplayedAlbum] = self.model.search_results[
+            message.index
+        ]
+        if isinstance(result, DisplayedAlbum):
+            self.run_worker(self.download_album(result), group="albums")
+            return
+
+        selected_at: float = time.perf_counter()
         self.model = replace(
-            self.model, selection=self.model.search_results[message.index]
+            self.model, selection=result, suggestion_results=[], url_found=False
         )
         self.push_screen(AudioSource())
 
         if isinstance(self.screen, AudioSource):
-
-            suggestion_results = search_youtube(
-                self.model.selection, self.model.api_key
-            )
-            self.model = replace(self.model, suggestion_results=suggestion_results)
-            self.screen.populate_suggestions(
-                create_options_from_suggestions(suggestion_results)
+            self.run_worker(
+                self.load_sources(result, self.screen, selected_at),
+                group="sources",
+                exclusive=True,
             )
 
-            suggested_url = get_yt_url(self.model.selection)
+    async def load_sources(
+        self, track: DisplayedTrack, screen: AudioSource, selected_at: float
+    ) -> None:
+        """Fill the source screen as the sources of a track arrive.
+
+        The YouTube suggestions, the database lookup, and the metadata
+        prefetch for the download run concurrently off the event loop, and
+        each result is displayed as soon as it arrives. The time from the
+        selection to the first source on screen is recorded in
+        ``self.first_suggestion``.
+
+        Parameters
+        ----------
+        track : DisplayedTrack
+            The selected track.
+        screen : AudioSource
+            The screen displaying its sources; results arriving after it was
+            closed are dropped.
+        selected_at : float
+            ``time.perf_counter()`` when the track was selected.
+        """
+
+        first_shown: bool = False
+
+        def record_first() -> None:
+            nonlocal first_shown
+            if not first_shown:
+                first_shown = True
+                self.first_suggestion.record((time.perf_counter() - selected_at) * 1000)
 
-            if suggested_url:
+        def show_url(url: str) -> None:
+            # The stored URL must not replace one the user started typing.
+            if screen.set_default_url(url):
                 self.model = replace(self.model, url_found=True)
-                self.screen.set_default_url(suggested_url)
+                record_first()
+
+        async def show_stored_url() -> None:
+            url: Optional[str] = await to_thread(
+                self.replica.lookup, track, self.storage.lookup
+            )
+            if url and self.screen is screen:
+                show_url(url)
+
+        async def show_suggestions() -> None:
+            suggestions: Optional[List[YoutubeResult]] = await to_thread(
+                suggest_sources,
+                track,
+                self.model.api_key,
+                self.suggestion_cache,
+                self.quota,
+            )
+            if self.screen is not screen:
+                return
+            if suggestions is None:
+                suggestions = []
+                self.app.post_message(
+                    UpdateStatus("YouTube quota spent: offering known sources only.")
+                )
+            self.model = replace(self.model, suggestion_results=suggestions)
+            screen.populate_suggestions(create_options_from_suggestions(suggestions))
+            if suggestions:
+                record_first()
+
+        # A known source is offered first, so <enter> downloads it at once.
+        known_url: Optional[str] = self.model.known_sources.get(track.track_id)
+        if known_url:
+            show_url(known_url)
+            await gather(show_suggestions(), self.prefetch([track]))
+        else:
+            await gather(show_suggestions(), show_stored_url(), self.prefetch([track]))
 
     async def on_url_selected(self, message: UrlSelected) -> None:
         """Handle YouTube U.R.L. selection and initiate download.
@@ -225,54 +664,395 @@ class Application(App):
         )
 
     async def on_start_download(self, message: StartDownload) -> None:
-        """Begin downloading the selected track with metadata and album art.
+        """Queue the selected track for download, unless it was downloaded.
+
+        If the track, or its source, is already in the downloads folder, the
+        user is asked whether to skip it, re-link the existing file, or
+        download it again (see :meth:`find_duplicate`).
 
         Parameters
         ----------
         message : StartDownload
             Contains the YouTube U.R.L. to download from.
+        """
 
-        Notes
-        -----
-        - Fetches album artwork from Spotify metadata.
-        - Displays download progress in the U.I. via DownloadOption widget.
-        - Runs the download in a worker thread to avoid blocking the U.I.
+        track: DisplayedTrack = self.model.selection
+        existing: Optional[LibraryEntry] = await self.find_duplicate(track, message.url)
+        if existing is None:
+            self.queue_download(message)
+            return
+
+        queued: QueuedDownload = QueuedDownload(
+            track, message.url, self.model.url_found
+        )
+
+        def on_choice(choice: Optional[str]) -> None:
+            if choice == "download":
+                self.queue_download(message)
+            elif choice == "relink":
+                self.run_worker(self.relink(queued, existing), group="downloads")
+            else:
+                self.app.post_message(
+                    UpdateStatus(f"Skipped {track.title}: already downloaded.")
+                )
+
+        self.push_screen(
+            DuplicateDownload(
+                track,
+                existing,
+                existing.track_id == track.track_id
+                or existing.path == Path(f"{self.download_path(track)}.mp3"),
+            ),
+            on_choice,
+        )
+
+    async def find_duplicate(
+        self, track: DisplayedTrack, url: str
+    ) -> Optional[LibraryEntry]:
+        """Return a file in the downloads folder for a track or its source.
+
+        The library index is searched by track ID and source link first. If
+        neither was downloaded by the application, the hashes of the files
+        the storage backend knows for the track or source are looked up in
+        the index, which also covers files downloaded on another machine or
+        before the index existed. The index is searched off the event loop,
+        as it reads the database and checks that the files still exist.
+
+        Parameters
+        ----------
+        track : DisplayedTrack
+            The requested track.
+        url : str
+            The YouTube U.R.L. it would be downloaded from.
+
+        Returns
+        -------
+        LibraryEntry | None
+            The existing file, or ``None`` if there is none or the backend
+            could not be reached.
         """
 
-        track_metadata = get_metadata(
-            self.model.selection.track_id, self.model.active_token
+        existing: Optional[LibraryEntry] = await to_thread(
+            self.library.find, track.track_id, url
         )
+        if existing is not None:
+            return existing
+        try:
+            hashes: List[str] = await to_thread(
+                self.storage.file_hashes, track.track_id, url
+            )
+        except (PyMongoError, sqlite3.Error):
+            return None
+        return await to_thread(self.library.find, hashes=hashes) if hashes else None
 
-        # Get image.
-        image_url = track_metadata.album.image_url
+    def queue_download(self, message: StartDownload) -> None:
+        """Queue the selected track for download with metadata and album art.
 
-        # Add option to view.
-        title = self.model.selection.title
-        option = DownloadOption(self.model.selection)
+        Parameters
+        ----------
+        message : StartDownload
+            Contains the YouTube U.R.L. to download from.
+
+        Notes
+        -----
+        - Displays the queued download in the U.I. via DownloadOption widget.
+        - Starts the download queue worker unless it is already running; a
+          running worker picks up the new entry once its current batch ends.
+        """
+
+        self.model = update(self.model, message)
 
         if isinstance(self.screen, SpotifySearchScreen):
-            self.screen.display_download(
-                # create_option_from_download(self.model.selection)
-                option
+            self.screen.display_download(DownloadOption(self.model.selection))
+
+        if self.download_worker is None or self.download_worker.is_finished:
+            self.download_worker = self.run_worker(
+                self.process_download_queue(), group="downloads"
+            )
+
+    async def process_download_queue(self) -> None:
+        """Drain the download queue, fetching metadata for each batch at once.
+
+        Every pass takes all downloads queued so far. Metadata prefetched by
+        ``self.prefetcher`` is used as is; when several tracks are still
+        missing their Spotify metadata is fetched with a single
+        :func:`get_metadata_batch` call rather than one request per track.
+        """
+
+        while self.model.download_queue:
+            batch: List[QueuedDownload] = self.model.download_queue
+            self.model = replace(self.model, download_queue=[])
+
+            metadata: Dict[str, FullMetadata] = {}
+            for queued in batch:
+                prefetched: Optional[FullMetadata] = self.prefetcher.get(
+                    queued.track.track_id
+                )
+                if prefetched is not None:
+                    metadata[queued.track.track_id] = prefetched
+
+            missing: List[str] = [
+                queued.track.track_id
+                for queued in batch
+                if queued.track.track_id not in metadata
+            ]
+            if len(missing) > 1:
+                metadata.update(
+                    await get_metadata_batch_async(missing, await self.bearer())
+                )
+
+            for queued in batch:
+                track_id: str = queued.track.track_id
+                if track_id not in metadata:
+                    metadata[track_id] = await get_metadata_async(
+                        track_id, await self.bearer()
+                    )
+                await self.download(queued, metadata[track_id])
+
+    async def download(self, queued: QueuedDownload, metadata: FullMetadata) -> None:
+        """Download a single queued track and record its source relation.
+
+        Parameters
+        ----------
+        queued : QueuedDownload
+            The queued track and the YouTube U.R.L. to download it from.
+        metadata : FullMetadata
+            Spotify metadata for the track, used for album art and the
+            database relation.
+        """
+
+        file_path: Path = await self.download_file(queued, metadata)
+        await self.register_file(queued, metadata, file_path)
+
+    async def relink(self, queued: QueuedDownload, existing: LibraryEntry) -> None:
+        """Copy an already downloaded source for a track, instead of downloading.
+
+        The existing file is copied and tagged for the queued track, which
+        costs neither the download nor the transcoding. A file already at
+        the track's path is registered as it is: re-tagging it would change
+        its hash, and upload a second File relation for the same audio.
+
+        Parameters
+        ----------
+        queued : QueuedDownload
+            The queued track and the YouTube U.R.L. it was requested from.
+        existing : LibraryEntry
+            The file already downloaded from that source.
+        """
+
+        metadata: Optional[FullMetadata] = self.prefetcher.get(queued.track.track_id)
+        if metadata is None:
+            metadata = await get_metadata_async(
+                queued.track.track_id, await self.bearer()
             )
+        file_path: Path = Path(f"{self.download_path(queued.track)}.mp3")
+        if existing.path != file_path:
+            file_path = await copy_track(
+                existing.path,
+                self.download_path(queued.track),
+                queued.track,
+                metadata.album.image_url,
+                self.prefetcher.cover(metadata.album.image_url),
+            )
+        await self.register_file(queued, metadata, file_path)
+        self.app.post_message(UpdateStatus(f"Re-linked {queued.track.title}."))
+
+    async def register_file(
+        self, queued: QueuedDownload, metadata: FullMetadata, file_path: Path
+    ) -> None:
+        """Index a downloaded file and record its relation if it is new.
+
+        Parameters
+        ----------
+        queued : QueuedDownload
+            The track the file is for and the YouTube U.R.L. of its source.
+        metadata : FullMetadata
+            Spotify metadata for the track.
+        file_path : Path
+            Path of the MP3 file.
+        """
+
+        file_hash: str = await to_thread(hash_file, file_path)
+        self.library.add(file_path, file_hash, queued.track.track_id, queued.url)
+        if not queued.url_found:
+            self.record_relation((metadata, queued.url, file_hash))
+
+    def record_relation(self, relation: Relation) -> None:
+        """Queue a relation for upload and make its source known locally.
+
+        The relation is written to the upload journal and uploaded in the
+        background by ``self.upload_queue``, so database latency or failures
+        never hold up the interface.
+
+        Parameters
+        ----------
+        relation : Relation
+            The track metadata, its YouTube link, and the file hash.
+        """
+
+        self.upload_queue.enqueue(relation)
+        self.app.post_message(UploadQueueChanged(self.upload_queue.stats))
+        metadata, url, _ = relation
+        if metadata.track.track_id is not None:
+            self.replica.put(metadata.track.track_id, url)
+
+    async def download_file(
+        self, queued: QueuedDownload, metadata: FullMetadata
+    ) -> Path:
+        """Download a single queued track into the downloads folder.
+
+        Parameters
+        ----------
+        queued : QueuedDownload
+            The queued track and the YouTube U.R.L. to download it from.
+        metadata : FullMetadata
+            Spotify metadata for the track, used for album art.
+
+        Returns
+        -------
+        Path
+            Path of the downloaded MP3 file.
+        """
 
-        file_path: Path = Path(self.model.downloads_folder, f"{title}")
+        file_path: Path = self.download_path(queued.track)
 
         # Download song.
-        # _ = self.run_worker(
         await download_track(
-            message.url,
+            queued.url,
             file_path,
-            self.model.selection,
-            image_url,
+            queued.track,
+            metadata.album.image_url,
+            self.prefetcher.cover(metadata.album.image_url),
         )
-        # thread=True,
-        # )
+        return Path(f"{file_path}.mp3")
+
+    def download_path(self, track: DisplayedTrack) -> Path:
+        """Return where a track is downloaded to, without the extension."""
+
+        return Path(self.model.downloads_folder, f"{track.title}")
+
+    async def download_album(self, album: DisplayedAlbum) -> None:
+        """Download every track of an album without prompting for sources.
+
+        The track listing and the metadata of every track are fetched in as
+        few requests as possible. Each track's source is then taken from the
+        database, or else from the top YouTube suggestion, and up to
+        ``ALBUM_CONCURRENCY`` tracks are resolved and downloaded at once.
+
+        Parameters
+        ----------
+        album : DisplayedAlbum
+            The album selected from the search results.
+        """
+
+        self.app.post_message(UpdateStatus(f"Queueing {album.title}..."))
+        try:
+            bearer: str = await self.bearer()
+            tracks: List[DisplayedTrack] = await get_album_tracks_async(
+                album.album_id, album.title, bearer
+            )
+            metadata: Dict[str, FullMetadata] = await get_metadata_batch_async(
+                [track.track_id for track in tracks], bearer
+            )
+        except (RequestException, ValueError):
+            self.app.post_message(UpdateStatus(f"Could not load {album.title}."))
+            return
+
+        tracks = [track for track in tracks if track.track_id in metadata]
+        search_screen: Optional[SpotifySearchScreen] = self.search_screen()
+        if search_screen is not None:
+            for track in tracks:
+                search_screen.display_download(DownloadOption(track))
+
+        slots: Semaphore = Semaphore(ALBUM_CONCURRENCY)
+
+        async def download_album_track(track: DisplayedTrack) -> bool:
+            # Tracks already in the downloads folder are skipped.
+            if await to_thread(self.library.find, track.track_id) is not None:
+                return False
+            async with slots:
+                source: Optional[Tuple[str, bool]] = await self.resolve_source(track)
+                if source is None:
+                    raise LookupError(f"No source found for {track.title}.")
+                queued: QueuedDownload = QueuedDownload(track, *source)
+                track_metadata: FullMetadata = metadata[track.track_id]
+                file_path: Path = await self.download_file(queued, track_metadata)
+                await self.register_file(queued, track_metadata, file_path)
+            return True
+
+        outcomes: List[Union[bool, BaseException]] = await gather(
+            *(download_album_track(track) for track in tracks), return_exceptions=True
+        )
+        downloaded: int = sum(1 for outcome in outcomes if outcome is True)
+        skipped: int = sum(1 for outcome in outcomes if outcome is False)
+        status: str = f"Downloaded {downloaded}/{len(tracks)} of {album.title}"
+        if skipped:
+            status += f", {skipped} already in the library"
+        self.app.post_message(UpdateStatus(f"{status}."))
+
+    def start_replica_sync(self) -> None:
+        """Start a background sync of the local replica, replacing any other."""
+
+        self.run_worker(self.sync_replica(), group="replica", exclusive=True)
+
+    async def sync_replica(self) -> None:
+        """Copy new source links into the local replica in the background.
+
+        A failed sync is left for the next interval; the replica keeps
+        answering lookups from what it already holds. Only the MongoDB
+        backends are replicated; the SQLite backend is already local.
+        """
+
+        if not isinstance(self.storage, MongoBackend):
+            return
+        try:
+            await to_thread(
+                self.replica.sync, get_database(), collection=self.storage.collection
+            )
+        except PyMongoError:
+            pass
+
+    async def resolve_source(self, track: DisplayedTrack) -> Optional[Tuple[str, bool]]:
+        """Pick a YouTube source for a track without asking the user.
+
+        Parameters
+        ----------
+        track : DisplayedTrack
+            The track to find a source for.
+
+        Returns
+        -------
+        (str, bool) | None
+            The source U.R.L. and whether it came from the database, or
+            ``None`` if YouTube returned no suggestions or the quota left is
+            kept for interactive searches.
+        """
+
+        known_url: Optional[str] = await to_thread(
+            self.replica.lookup, track, self.storage.lookup
+        )
+        if known_url:
+            return known_url, True
+
+        suggestions: Optional[List[YoutubeResult]] = await to_thread(
+            suggest_sources,
+            track,
+            self.model.api_key,
+            self.suggestion_cache,
+            self.quota,
+            Priority.BACKGROUND,
+        )
+        return (suggestions[0].url, False) if suggestions else None
+
+    async def action_show_diagnostics(self) -> None:
+        """Open the database diagnostics over the current screen.
+
+        Invoked by the key binding mapped to the ``show_diagnostics`` action.
+        """
 
-        # Call to Database
-        if not self.model.url_found:
-            upload_relation(
-                track_metadata, message.url, hash_file(Path(f"{file_path}.mp3"))
+        if not isinstance(self.screen, DiagnosticsScreen):
+            self.push_screen(
+                DiagnosticsScreen(self.first_suggestion, self.prefetcher.stats)
             )
 
     async def action_submit_authentication(self) -> None:
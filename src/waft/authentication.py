@@ -8,6 +8,8 @@ with Spotify's A.P.I.
 
 Functions
 ---------
+request_spotify_access_token
+    Request a Spotify access token and its expiry using client credentials.
 get_spotify_access_token
     Request and return a Spotify access token using client credentials.
 authenticate_spotify_access_token
@@ -22,19 +24,27 @@ Notes
 """
 
 import base64
+import time
+from asyncio import to_thread
 from typing import Any, Dict, Optional
 
 import requests
 from requests.models import Response
 
+from waft.client import get_client
+from waft.datatypes import AccessToken
 
-async def get_spotify_access_token(client_id: str, client_secret: str) -> Optional[str]:
-    """Obtain an access token for the Spotify Web API using client credentials.
+
+def request_spotify_access_token(
+    client_id: str, client_secret: str
+) -> Optional[AccessToken]:
+    """Obtain an access token and its expiry using client credentials.
 
     This function sends a request to Spotify's token endpoint with the provided
-    "client_id" and "client_secret", and returns a valid bearer token that can
-    be used for subsequent API calls. The caller is responsible for handling
-    any HTTP errors or exceptions that occur during token retrieval.
+    "client_id" and "client_secret", and returns the bearer token together with
+    the wall-clock time at which it expires, computed from the "expires_in"
+    field of the response. The caller is responsible for handling any HTTP
+    errors or exceptions that occur during token retrieval.
 
     Parameters
     ----------
@@ -45,7 +55,7 @@ async def get_spotify_access_token(client_id: str, client_secret: str) -> Option
 
     Returns
     -------
-    str | None
+    AccessToken | None
         A valid Spotify access token if retrieval succeeds, otherwise
         ``None`` when the token request fails or returns a non-success status.
     """
@@ -67,7 +77,9 @@ async def get_spotify_access_token(client_id: str, client_secret: str) -> Option
     data: Dict[str, str] = {"grant_type": "client_credentials"}
 
     # Post HTTP request
-    resp: Response = requests.post(token_url, headers=headers, data=data, timeout=20)
+    resp: Response = get_client().post(
+        token_url, headers=headers, data=data, timeout=20
+    )
     try:
         resp.raise_for_status()  # Caller is responsible for error handling
     except requests.HTTPError:  # There are other potential unhandled errors.
@@ -76,8 +88,35 @@ async def get_spotify_access_token(client_id: str, client_secret: str) -> Option
     # Parse HTTP response
     token_response: Dict[str, Any] = resp.json()
     access_token: str = token_response["access_token"]
+    expires_in: int = token_response.get("expires_in", 3600)
+
+    return AccessToken(access_token, time.time() + expires_in)
+
+
+async def get_spotify_access_token(client_id: str, client_secret: str) -> Optional[str]:
+    """Obtain an access token for the Spotify Web API using client credentials.
+
+    Runs :func:`request_spotify_access_token` in a worker thread, so awaiting
+    this coroutine does not block the event loop, and discards the expiry.
+
+    Parameters
+    ----------
+    client_id : str
+        The Spotify Client ID associated with your application.
+    client_secret : str
+        The Spotify Client Secret associated with your application.
 
-    return access_token
+    Returns
+    -------
+    str | None
+        A valid Spotify access token if retrieval succeeds, otherwise
+        ``None`` when the token request fails or returns a non-success status.
+    """
+
+    token: Optional[AccessToken] = await to_thread(
+        request_spotify_access_token, client_id, client_secret
+    )
+    return token.value if token is not None else None
 
 
 def authenticate_spotify_access_token(access_token: str) -> bool:
@@ -114,7 +153,7 @@ def authenticate_spotify_access_token(access_token: str) -> bool:
     }
 
     # Submit HTTP request
-    search_resp: Response = requests.get(
+    search_resp: Response = get_client().get(
         search_url, headers=search_headers, params=search_params, timeout=20
     )
     search_resp.raise_for_status()
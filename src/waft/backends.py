@@ -0,0 +1,607 @@
+"""Storage backends for the track metadata relations.
+
+The application stores relations, and looks up the YouTube source of a
+track, through the :class:`StorageBackend` protocol. Three implementations
+are provided:
+
+- :class:`MongoBackend` (``mongodb``) stores relations in the normalized
+  collections of the MongoDB deployment configured in :mod:`waft.config`,
+  through :mod:`waft.database`;
+- :class:`EmbeddedMongoBackend` (``mongodb-embedded``) stores them in the
+  same deployment with one document per file, through :mod:`waft.embedded`,
+  and reads the normalized collections until they have been migrated;
+- :class:`SQLiteBackend` (``sqlite``) stores the same entities and relations
+  in an embedded SQLite file and needs no network.
+
+The backend is chosen with ``WAFT_STORAGE_BACKEND`` (see
+:func:`waft.config.storage_backend`); :func:`get_backend` returns the
+process-wide instance.
+
+Classes
+-------
+BackendStats
+    Number of entities a backend holds.
+StorageBackend
+    The operations every backend provides.
+MongoBackend
+    Backend storing relations in MongoDB.
+EmbeddedMongoBackend
+    Backend storing relations in MongoDB, one document per file.
+SQLiteBackend
+    Backend storing relations in an embedded SQLite database.
+
+Functions
+---------
+open_backend
+    Create the backend with the given name.
+get_backend
+    Return the process-wide backend, creating it on first use.
+configure_backend
+    Replace the process-wide backend.
+close_backend
+    Close the process-wide backend.
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (Any, Dict, Iterable, List, Optional, Protocol, Tuple,
+                    runtime_checkable)
+
+from waft.config import sqlite_database_path, storage_backend
+from waft.database import (Relation, close_database, get_database,
+                           get_file_hashes, get_yt_url_by_id, get_yt_urls,
+                           upload_relations, warm_up_database)
+from waft.datatypes import DisplayedTrack
+from waft.embedded import (SOURCE_COLLECTION, find_file_hashes, find_source,
+                           find_sources, migration_complete, upload_sources)
+
+# Largest number of parameters bound in one SQLite statement; older SQLite
+# builds reject more than 999.
+SQLITE_MAX_VARIABLES: int = 900
+
+
+@dataclass(frozen=True)
+class BackendStats:
+    """Number of entities a backend holds.
+
+    Attributes
+    ----------
+    backend : str
+        Name of the backend.
+    tracks : int
+        Stored tracks.
+    albums : int
+        Stored albums.
+    artists : int
+        Stored artists.
+    files : int
+        Stored files, each with a source link.
+    """
+
+    backend: str
+    tracks: int
+    albums: int
+    artists: int
+    files: int
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """The operations every storage backend provides.
+
+    Implementations are safe to call from several threads, and every
+    operation may block on I/O; call them from worker threads rather than
+    the event loop.
+    """
+
+    name: str
+
+    def warm_up(self) -> bool:
+        """Prepare the backend for the first operation.
+
+        Returns
+        -------
+        bool
+            Whether the backend is reachable.
+        """
+
+    def upload(self, relations: Iterable[Relation]) -> None:
+        """Store relations, reusing the albums, artists and tracks stored.
+
+        Uploading a relation that is already stored changes nothing.
+
+        Parameters
+        ----------
+        relations : Iterable[Relation]
+            ``(metadata, yt_link, file_hash)`` triples.
+        """
+
+    def lookup(self, track: DisplayedTrack) -> Optional[str]:
+        """Return the source link of a track, by Spotify ID or else by name.
+
+        Parameters
+        ----------
+        track : DisplayedTrack
+            The track to look up. The names are only matched against tracks
+            stored without a Spotify ID.
+
+        Returns
+        -------
+        str | None
+            The source link, or ``None`` if there is none.
+        """
+
+    def lookup_many(self, tracks: List[DisplayedTrack]) -> Dict[str, str]:
+        """Return the source links of many tracks by their Spotify IDs.
+
+        Parameters
+        ----------
+        tracks : List[DisplayedTrack]
+            The tracks to look up.
+
+        Returns
+        -------
+        Dict[str, str]
+            The source link of every track that has one, keyed by Spotify ID.
+        """
+
+    def file_hashes(self, track_id: str, source_link: str) -> List[str]:
+        """Return the hashes of the files stored for a track or a source.
+
+        Parameters
+        ----------
+        track_id : str
+            Spotify ID of the track.
+        source_link : str
+            YouTube U.R.L. of the source.
+
+        Returns
+        -------
+        List[str]
+            The hash of every file stored with that Spotify ID, or
+            downloaded from that source.
+        """
+
+    def stats(self) -> BackendStats:
+        """Return the number of entities the backend holds."""
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+
+
+class MongoBackend:
+    """Backend storing relations in the configured MongoDB deployment.
+
+    Every operation goes through the process-wide client of
+    :mod:`waft.database`.
+
+    Attributes
+    ----------
+    collection : str
+        The collection holding one document per file, with its ``SpotifyID``,
+        ``SourceLink`` and ``SyncID``; the local replica syncs from it.
+    """
+
+    name: str = "mongodb"
+    collection: str = "File"
+
+    def warm_up(self) -> bool:
+        """Connect to the deployment and provision its indexes."""
+
+        return warm_up_database()
+
+    def upload(self, relations: Iterable[Relation]) -> None:
+        """Store relations with :func:`waft.database.upload_relations`."""
+
+        upload_relations(relations)
+
+    def lookup(self, track: DisplayedTrack) -> Optional[str]:
+        """Look up a source with :func:`waft.database.get_yt_url_by_id`."""
+
+        return get_yt_url_by_id(track)
+
+    def lookup_many(self, tracks: List[DisplayedTrack]) -> Dict[str, str]:
+        """Look up sources with :func:`waft.database.get_yt_urls`."""
+
+        return get_yt_urls(tracks)
+
+    def file_hashes(self, track_id: str, source_link: str) -> List[str]:
+        """Find files with :func:`waft.database.get_file_hashes`."""
+
+        return get_file_hashes(track_id, source_link)
+
+    def stats(self) -> BackendStats:
+        """Return the estimated number of documents per collection."""
+
+        db = get_database()
+        return BackendStats(
+            self.name,
+            db["Track"].estimated_document_count(),
+            db["Album"].estimated_document_count(),
+            db["Artist"].estimated_document_count(),
+            db["File"].estimated_document_count(),
+        )
+
+    def close(self) -> None:
+        """Close the process-wide client."""
+
+        close_database()
+
+
+class EmbeddedMongoBackend(MongoBackend):
+    """Backend storing relations in MongoDB, one document per file.
+
+    Uploads and lookups are single round trips on the ``Source`` collection
+    (see :mod:`waft.embedded`). Until the migration has completed, a lookup
+    that misses falls back to the normalized collections, so relations not
+    copied yet are still found. Whether it has completed is read once per
+    backend, on the first fallback.
+    """
+
+    name: str = "mongodb-embedded"
+    collection: str = SOURCE_COLLECTION
+
+    def __init__(self) -> None:
+        self._migrated: Optional[bool] = None
+
+    def _fallback(self) -> bool:
+        """Return whether lookups must also read the normalized collections."""
+
+        if self._migrated is None:
+            self._migrated = migration_complete(get_database())
+        return not self._migrated
+
+    def upload(self, relations: Iterable[Relation]) -> None:
+        """Store relations with :func:`waft.embedded.upload_sources`."""
+
+        upload_sources(relations)
+
+    def lookup(self, track: DisplayedTrack) -> Optional[str]:
+        """Look up a source, then in the normalized schema if not migrated."""
+
+        link: Optional[str] = find_source(track)
+        if link is None and self._fallback():
+            link = get_yt_url_by_id(track)
+        return link
+
+    def lookup_many(self, tracks: List[DisplayedTrack]) -> Dict[str, str]:
+        """Look up sources, then in the normalized schema if not migrated."""
+
+        links: Dict[str, str] = find_sources(tracks)
+        missing: List[DisplayedTrack] = [
+            track for track in tracks if track.track_id not in links
+        ]
+        if missing and self._fallback():
+            links.update(get_yt_urls(missing))
+        return links
+
+    def file_hashes(self, track_id: str, source_link: str) -> List[str]:
+        """Find files, then in the normalized schema if not migrated."""
+
+        hashes: List[str] = find_file_hashes(track_id, source_link)
+        if not hashes and self._fallback():
+            hashes = get_file_hashes(track_id, source_link)
+        return hashes
+
+    def stats(self) -> BackendStats:
+        """Return the number of sources and of distinct names they embed."""
+
+        sources = get_database()[SOURCE_COLLECTION]
+        return BackendStats(
+            self.name,
+            len(sources.distinct("SearchKey.Track")),
+            len(sources.distinct("Album.Name")),
+            len(sources.distinct("Artists")),
+            sources.estimated_document_count(),
+        )
+
+
+_SQLITE_SCHEMA: Tuple[str, ...] = (
+    "CREATE TABLE IF NOT EXISTS album ("
+    " id INTEGER PRIMARY KEY,"
+    " name TEXT NOT NULL,"
+    " cover_image_link TEXT NOT NULL,"
+    " UNIQUE (name, cover_image_link))",
+    "CREATE TABLE IF NOT EXISTS artist ("
+    " id INTEGER PRIMARY KEY,"
+    " name TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS track ("
+    " id INTEGER PRIMARY KEY,"
+    " name TEXT NOT NULL,"
+    " release_date TEXT NOT NULL,"
+    " duration INTEGER NOT NULL,"
+    " explicit INTEGER NOT NULL,"
+    " spotify_id TEXT,"
+    " isrc TEXT,"
+    " UNIQUE (name, release_date, duration))",
+    "CREATE TABLE IF NOT EXISTS records ("
+    " track_id INTEGER NOT NULL REFERENCES track (id),"
+    " artist_id INTEGER NOT NULL REFERENCES artist (id),"
+    " PRIMARY KEY (track_id, artist_id))",
+    "CREATE TABLE IF NOT EXISTS on_album ("
+    " track_id INTEGER NOT NULL REFERENCES track (id),"
+    " album_id INTEGER NOT NULL REFERENCES album (id),"
+    " track_number INTEGER NOT NULL,"
+    " PRIMARY KEY (track_id, album_id))",
+    "CREATE TABLE IF NOT EXISTS file ("
+    " hash TEXT PRIMARY KEY,"
+    " track_id INTEGER NOT NULL REFERENCES track (id),"
+    " source_link TEXT NOT NULL,"
+    " spotify_id TEXT)",
+    "CREATE INDEX IF NOT EXISTS file_spotify_id ON file (spotify_id)",
+    "CREATE INDEX IF NOT EXISTS file_track_id ON file (track_id)",
+    "CREATE INDEX IF NOT EXISTS file_source_link ON file (source_link)",
+    "CREATE INDEX IF NOT EXISTS track_name ON track (name)",
+)
+
+# Finds the source of a track stored without a Spotify ID by its names.
+_SQLITE_LEGACY_LOOKUP: str = (
+    "SELECT file.source_link FROM track"
+    " JOIN on_album ON on_album.track_id = track.id"
+    " JOIN album ON album.id = on_album.album_id"
+    " JOIN records ON records.track_id = track.id"
+    " JOIN artist ON artist.id = records.artist_id"
+    " JOIN file ON file.track_id = track.id"
+    " WHERE track.name = ? AND album.name = ? AND artist.name = ?"
+    " AND track.spotify_id IS NULL"
+    " LIMIT 1"
+)
+
+
+class SQLiteBackend:
+    """Backend storing relations in an embedded SQLite database.
+
+    The tables mirror the MongoDB collections. The database is opened lazily
+    on first use.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite database file.
+    """
+
+    name: str = "sqlite"
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            for statement in _SQLITE_SCHEMA:
+                connection.execute(statement)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def warm_up(self) -> bool:
+        """Open the database and create its tables."""
+
+        with self._lock:
+            self._connect()
+        return True
+
+    @staticmethod
+    def _get_or_create(
+        connection: sqlite3.Connection,
+        table: str,
+        key: Dict[str, Any],
+        values: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Return the id of the row matching ``key``, inserting it if missing."""
+
+        row: Dict[str, Any] = {**key, **(values or {})}
+        connection.execute(
+            f"INSERT OR IGNORE INTO {table} ({', '.join(row)})"
+            f" VALUES ({', '.join('?' * len(row))})",
+            tuple(row.values()),
+        )
+        return connection.execute(
+            f"SELECT id FROM {table} WHERE"
+            f" {' AND '.join(f'{column} = ?' for column in key)}",
+            tuple(key.values()),
+        ).fetchone()[0]
+
+    def upload(self, relations: Iterable[Relation]) -> None:
+        """Store relations in a single transaction."""
+
+        batch: List[Relation] = list(relations)
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            with connection:
+                for metadata, yt_link, file_hash in batch:
+                    track = metadata.track
+                    track_id: int = self._get_or_create(
+                        connection,
+                        "track",
+                        {
+                            "name": track.name,
+                            "release_date": track.release_date,
+                            "duration": track.duration_ms,
+                        },
+                        {
+                            "explicit": int(track.explicit),
+                            "spotify_id": track.track_id,
+                            "isrc": track.isrc,
+                        },
+                    )
+                    album_id: int = self._get_or_create(
+                        connection,
+                        "album",
+                        {
+                            "name": metadata.album.album_name,
+                            "cover_image_link": metadata.album.image_url,
+                        },
+                    )
+                    connection.execute(
+                        "INSERT OR IGNORE INTO on_album VALUES (?, ?, ?)",
+                        (track_id, album_id, track.track_number),
+                    )
+                    for artist in metadata.artists:
+                        artist_id: int = self._get_or_create(
+                            connection, "artist", {"name": artist.artist_name}
+                        )
+                        connection.execute(
+                            "INSERT OR IGNORE INTO records VALUES (?, ?)",
+                            (track_id, artist_id),
+                        )
+                    connection.execute(
+                        "INSERT OR IGNORE INTO file VALUES (?, ?, ?, ?)",
+                        (file_hash, track_id, yt_link, track.track_id),
+                    )
+
+    def lookup(self, track: DisplayedTrack) -> Optional[str]:
+        """Look up a source by Spotify ID, then among tracks without one."""
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            row = connection.execute(
+                "SELECT source_link FROM file WHERE spotify_id = ? LIMIT 1",
+                (track.track_id,),
+            ).fetchone()
+            if row is None:
+                row = connection.execute(
+                    _SQLITE_LEGACY_LOOKUP, (track.title, track.album, track.artist)
+                ).fetchone()
+        return None if row is None else row[0]
+
+    def lookup_many(self, tracks: List[DisplayedTrack]) -> Dict[str, str]:
+        """Look up sources by Spotify ID, in as few statements as possible."""
+
+        track_ids: List[str] = list(dict.fromkeys(track.track_id for track in tracks))
+        links: Dict[str, str] = {}
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            for start in range(0, len(track_ids), SQLITE_MAX_VARIABLES):
+                chunk: List[str] = track_ids[start : start + SQLITE_MAX_VARIABLES]
+                links.update(
+                    connection.execute(
+                        "SELECT spotify_id, source_link FROM file"
+                        f" WHERE spotify_id IN ({', '.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                )
+        return links
+
+    def file_hashes(self, track_id: str, source_link: str) -> List[str]:
+        """Find files by Spotify ID or source link."""
+
+        with self._lock:
+            rows: List[Tuple[str]] = (
+                self._connect()
+                .execute(
+                    "SELECT hash FROM file WHERE spotify_id = ? OR source_link = ?",
+                    (track_id, source_link),
+                )
+                .fetchall()
+            )
+        return [file_hash for (file_hash,) in rows]
+
+    def stats(self) -> BackendStats:
+        """Return the number of rows per entity table."""
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            counts: List[int] = [
+                connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("track", "album", "artist", "file")
+            ]
+        return BackendStats(self.name, *counts)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_BACKEND: Optional[StorageBackend] = None
+_LOCK: threading.Lock = threading.Lock()
+
+
+def open_backend(name: Optional[str] = None) -> StorageBackend:
+    """Create the backend with the given name.
+
+    Parameters
+    ----------
+    name : str | None
+        ``"mongodb"``, ``"mongodb-embedded"`` or ``"sqlite"``; defaults to
+        the configured backend.
+
+    Returns
+    -------
+    StorageBackend
+        A new backend instance.
+
+    Raises
+    ------
+    ValueError
+        If ``name`` is not a known backend.
+    """
+
+    name = name or storage_backend()
+    if name == MongoBackend.name:
+        return MongoBackend()
+    if name == EmbeddedMongoBackend.name:
+        return EmbeddedMongoBackend()
+    if name == SQLiteBackend.name:
+        return SQLiteBackend(sqlite_database_path())
+    raise ValueError(f"Unknown storage backend {name!r}.")
+
+
+def get_backend() -> StorageBackend:
+    """Return the process-wide backend, creating it on first use.
+
+    Returns
+    -------
+    StorageBackend
+        The configured backend.
+
+    Raises
+    ------
+    ValueError
+        If the configured backend is not known.
+    """
+
+    global _BACKEND  # pylint: disable=global-statement
+    with _LOCK:
+        if _BACKEND is None:
+            _BACKEND = open_backend()
+        return _BACKEND
+
+
+def configure_backend(backend: StorageBackend) -> None:
+    """Use ``backend`` as the process-wide backend from now on.
+
+    Any previously created backend is closed.
+
+    Parameters
+    ----------
+    backend : StorageBackend
+        The backend to use.
+    """
+
+    global _BACKEND  # pylint: disable=global-statement
+    close_backend()
+    with _LOCK:
+        _BACKEND = backend
+
+
+def close_backend() -> None:
+    """Close the process-wide backend, if one has been created."""
+
+    global _BACKEND  # pylint: disable=global-statement
+    with _LOCK:
+        backend: Optional[StorageBackend] = _BACKEND
+        _BACKEND = None
+    if backend is not None:
+        backend.close()
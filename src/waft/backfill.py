@@ -0,0 +1,313 @@
+"""Backfill Spotify IDs and I.S.R.C.s onto tracks stored without them.
+
+Relations uploaded before Spotify track IDs were recorded can only be found
+by :func:`waft.database.get_yt_url_by_id` through the slower name join. This
+migration searches Spotify for each such track, and stores the ID and
+I.S.R.C. of an exact match on the Track document and on its File documents,
+after which the track is found with a single indexed point lookup.
+
+Tracks are processed in batches in ``_id`` order. A track is only marked
+once it has been matched, so the migration can be interrupted and re-run at
+any time; tracks that found no match are retried on the next run.
+
+Functions
+---------
+load_legacy_tracks
+    Load a batch of tracks stored without a Spotify ID.
+match_spotify_id
+    Return the Spotify ID of the search result matching a legacy track.
+backfill_spotify_ids
+    Search, match and store the identifiers of every legacy track.
+
+Examples
+--------
+::
+
+    $ python -m waft.backfill
+    $ python -m waft.backfill --batch-size 20
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+from requests import RequestException
+
+from waft.authentication import request_spotify_access_token
+from waft.database import get_database
+from waft.datatypes import AccessToken, DisplayedTrack, FullMetadata
+from waft.keyring import retrieve_credentials
+from waft.spotify import get_metadata_batch, spotify_search
+
+# Tracks searched and written per batch; also the size of a metadata request.
+BATCH_SIZE: int = 50
+
+# Spotify search results compared against each legacy track.
+SEARCH_LIMIT: int = 10
+
+# Largest difference in duration, in milliseconds, still considered a match.
+DURATION_TOLERANCE: int = 2000
+
+# Appended by `waft.spotify` to the primary artist of multi-artist results.
+OTHERS_SUFFIX: str = " and Others"
+
+
+@dataclass(frozen=True)
+class LegacyTrack:
+    """A track stored without a Spotify ID, with the names needed to find it.
+
+    Attributes
+    ----------
+    document_id : Any
+        ``_id`` of the Track document.
+    name : str
+        Track title.
+    duration_ms : int
+        Duration of the track in milliseconds.
+    album : str | None
+        Name of the album the track is on, if it is linked to one.
+    artists : Tuple[str, ...]
+        Names of the credited artists.
+    """
+
+    document_id: Any
+    name: str
+    duration_ms: int
+    album: Optional[str]
+    artists: Tuple[str, ...]
+
+
+@dataclass
+class BackfillReport:
+    """Progress of a backfill run.
+
+    Attributes
+    ----------
+    scanned : int
+        Legacy tracks looked up on Spotify.
+    matched : int
+        Tracks whose Spotify ID was found and stored.
+    """
+
+    scanned: int = 0
+    matched: int = 0
+
+
+def load_legacy_tracks(
+    db: Database, after: Any = None, limit: int = BATCH_SIZE
+) -> List[LegacyTrack]:
+    """Load a batch of tracks stored without a Spotify ID.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+    after : Any
+        Only load tracks whose ``_id`` is greater than this, if given.
+    limit : int
+        Maximum number of tracks to load.
+
+    Returns
+    -------
+    List[LegacyTrack]
+        The tracks in ``_id`` order.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If a query fails.
+    """
+
+    query: Dict[str, Any] = {"SpotifyID": {"$exists": False}}
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    tracks: List[Dict[str, Any]] = list(
+        db["Track"].find(query).sort("_id", 1).limit(limit)
+    )
+    track_ids: List[Any] = [track["_id"] for track in tracks]
+
+    album_of: Dict[Any, Any] = {
+        on["TrackID"]: on["AlbumID"]
+        for on in db["On"].find({"TrackID": {"$in": track_ids}})
+    }
+    artists_of: Dict[Any, List[Any]] = {}
+    for records in db["Records"].find({"TrackID": {"$in": track_ids}}):
+        artists_of.setdefault(records["TrackID"], []).append(records["ArtistID"])
+
+    album_names: Dict[Any, str] = {
+        album["_id"]: album["Name"]
+        for album in db["Album"].find({"_id": {"$in": list(album_of.values())}})
+    }
+    artist_ids: List[Any] = [
+        artist_id for ids in artists_of.values() for artist_id in ids
+    ]
+    artist_names: Dict[Any, str] = {
+        artist["_id"]: artist["Name"]
+        for artist in db["Artist"].find({"_id": {"$in": artist_ids}})
+    }
+
+    return [
+        LegacyTrack(
+            track["_id"],
+            track["Name"],
+            track["Duration"],
+            album_names.get(album_of.get(track["_id"])),
+            tuple(
+                artist_names[artist_id]
+                for artist_id in artists_of.get(track["_id"], [])
+                if artist_id in artist_names
+            ),
+        )
+        for track in tracks
+    ]
+
+
+def match_spotify_id(
+    track: LegacyTrack, candidates: List[DisplayedTrack]
+) -> Optional[str]:
+    """Return the Spotify ID of the search result matching a legacy track.
+
+    A result matches if its title and album are the same, ignoring case, its
+    primary artist is credited on the track, and its duration is within
+    ``DURATION_TOLERANCE``. A track without an album or artists matches
+    nothing.
+
+    Parameters
+    ----------
+    track : LegacyTrack
+        The track stored without a Spotify ID.
+    candidates : List[DisplayedTrack]
+        Spotify search results for the track.
+
+    Returns
+    -------
+    str | None
+        The Spotify ID of the first matching result, or ``None``.
+    """
+
+    if track.album is None:
+        return None
+    artists: List[str] = [artist.casefold() for artist in track.artists]
+    for candidate in candidates:
+        artist: str = candidate.artist
+        if artist.endswith(OTHERS_SUFFIX):
+            artist = artist[: -len(OTHERS_SUFFIX)]
+        if (
+            candidate.title.casefold() == track.name.casefold()
+            and candidate.album.casefold() == track.album.casefold()
+            and artist.casefold() in artists
+            and abs(int(candidate.duration) - track.duration_ms) <= DURATION_TOLERANCE
+        ):
+            return candidate.track_id
+    return None
+
+
+def backfill_spotify_ids(
+    db: Database, bearer: Callable[[], str], batch_size: int = BATCH_SIZE
+) -> BackfillReport:
+    """Search, match and store the identifiers of every legacy track.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+    bearer : Callable[[], str]
+        Returns a valid Spotify access token; called once per batch, so that
+        long runs can refresh it.
+    batch_size : int
+        Number of tracks processed per batch.
+
+    Returns
+    -------
+    BackfillReport
+        The number of tracks scanned and matched.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If a database operation fails.
+    requests.RequestException
+        If a Spotify request fails. Tracks matched so far are kept.
+    """
+
+    report: BackfillReport = BackfillReport()
+    after: Any = None
+    while True:
+        batch: List[LegacyTrack] = load_legacy_tracks(db, after, batch_size)
+        if not batch:
+            return report
+        after = batch[-1].document_id
+        token: str = bearer()
+
+        # Legacy data may hold several Track documents for the same song.
+        matched: Dict[str, List[LegacyTrack]] = {}
+        for track in batch:
+            if track.album is None or not track.artists:
+                continue
+            query: str = (
+                f'track:"{track.name}" album:"{track.album}" '
+                f'artist:"{track.artists[0]}"'
+            )
+            spotify_id: Optional[str] = match_spotify_id(
+                track, spotify_search(query, token, SEARCH_LIMIT, fielded=True)
+            )
+            if spotify_id is not None:
+                matched.setdefault(spotify_id, []).append(track)
+        report.scanned += len(batch)
+        if not matched:
+            continue
+
+        metadata: Dict[str, FullMetadata] = get_metadata_batch(list(matched), token)
+        for spotify_id, tracks in matched.items():
+            identifiers: Dict[str, str] = {"SpotifyID": spotify_id}
+            if spotify_id in metadata and metadata[spotify_id].track.isrc:
+                identifiers["ISRC"] = metadata[spotify_id].track.isrc
+            for track in tracks:
+                db["File"].update_many(
+                    {"TrackID": track.document_id, "SpotifyID": {"$exists": False}},
+                    {"$set": {**identifiers, "SyncID": ObjectId()}},
+                )
+                # The Track is marked last, so an interrupted write is retried.
+                db["Track"].update_one(
+                    {"_id": track.document_id}, {"$set": identifiers}
+                )
+            report.matched += len(tracks)
+
+
+def main() -> None:
+    """Backfill the configured database with the stored Spotify credentials."""
+
+    parser = argparse.ArgumentParser(description="Backfill Spotify IDs and ISRCs.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    arguments = parser.parse_args()
+
+    credentials: Optional[Tuple[str, str, str]] = retrieve_credentials()
+    if credentials is None:
+        parser.exit(1, "No Spotify credentials are stored; run waft first.\n")
+    client_id, client_secret, _ = credentials
+    token: List[Optional[AccessToken]] = [None]
+
+    def bearer() -> str:
+        current: Optional[AccessToken] = token[0]
+        if current is None or current.expires_within(60, time.time()):
+            current = request_spotify_access_token(client_id, client_secret)
+            if current is None:
+                raise RequestException("Could not obtain a Spotify access token.")
+            token[0] = current
+        return current.value
+
+    try:
+        report: BackfillReport = backfill_spotify_ids(
+            get_database(), bearer, arguments.batch_size
+        )
+    except (PyMongoError, RequestException) as error:
+        parser.exit(1, f"Stopped: {error}. Re-run to resume.\n")
+    print(f"matched {report.matched} of {report.scanned} legacy tracks")
+
+
+if __name__ == "__main__":
+    main()
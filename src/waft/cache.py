@@ -0,0 +1,595 @@
+"""Two-tier (memory + SQLite) caching of A.P.I. results.
+
+A small in-memory L.R.U. layer answers repeated lookups without any I/O,
+while a persistent SQLite layer keeps results across application restarts.
+Both layers expire entries after a time-to-live and evict the least recently
+used entries once they hold more than a fixed number of them.
+
+Classes
+-------
+CacheStats
+    Hit, miss, and eviction counters reported by a cache.
+MemoryCache
+    Thread-safe L.R.U. cache with per-entry expiry.
+DiskCache
+    SQLite-backed cache with per-entry expiry and size-bounded eviction.
+TieredCache
+    A `MemoryCache` in front of a `DiskCache`.
+SearchCache
+    Spotify search result pages keyed by ``(query, mode, limit, offset)``.
+SuggestionCache
+    YouTube suggestions keyed by track.
+
+Notes
+-----
+- Values written to a `DiskCache` must be J.S.O.N. serialisable.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from waft.datatypes import DisplayedAlbum, DisplayedTrack, YoutubeResult
+
+# A row of search results: a track, or an album when searching by album.
+SearchResult = Union[DisplayedTrack, DisplayedAlbum]
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the effectiveness of a cache.
+
+    Attributes
+    ----------
+    memory_hits : int
+        Lookups answered by the in-memory layer.
+    disk_hits : int
+        Lookups answered by the on-disk layer.
+    misses : int
+        Lookups answered by neither layer.
+    evictions : int
+        Entries removed to respect a size bound.
+    expirations : int
+        Entries removed because their time-to-live elapsed.
+    """
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Return the number of lookups answered by either layer."""
+
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups that were hits."""
+
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MemoryCache:
+    """Thread-safe least-recently-used cache with per-entry expiry.
+
+    Parameters
+    ----------
+    max_entries : int
+        Number of entries kept before the least recently used is evicted.
+    ttl : float
+        Seconds an entry stays valid after it was written.
+    clock : Callable[[], float]
+        Source of monotonic time in seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries: int = max_entries
+        self.ttl: float = ttl
+        self.clock: Callable[[], float] = clock
+        self.stats: CacheStats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.peek(key) is not None
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key`` without counting a lookup.
+
+        Unlike :meth:`get`, neither the statistics nor the entry's recency
+        are updated.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Any | None
+            The cached value, or ``None`` if absent or expired.
+        """
+
+        with self._lock:
+            entry: Optional[Tuple[float, Any]] = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                return None
+            return entry[1]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or ``None`` if absent.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Any | None
+            The cached value, or ``None`` on a miss or an expired entry.
+        """
+
+        with self._lock:
+            entry: Optional[Tuple[float, Any]] = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            if entry[0] <= self.clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.memory_hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting old entries if necessary.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        value : Any
+            The value to cache.
+        """
+
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Remove ``key`` from the cache if it is present."""
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """SQLite-backed cache with per-entry expiry and size-bounded eviction.
+
+    Several caches may share one database file by using distinct
+    ``namespace`` values; size bounds apply per namespace. The database is
+    opened lazily on first use.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite database file.
+    namespace : str
+        Name distinguishing this cache's rows from other caches in the file.
+    max_entries : int
+        Number of entries kept before the least recently used are evicted.
+    ttl : float
+        Seconds an entry stays valid after it was written.
+    clock : Callable[[], float]
+        Source of wall-clock time in seconds since the epoch.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: Path,
+        namespace: str,
+        max_entries: int = 2000,
+        ttl: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path: Path = path
+        self.namespace: str = namespace
+        self.max_entries: int = max_entries
+        self.ttl: float = ttl
+        self.clock: Callable[[], float] = clock
+        self.stats: CacheStats = CacheStats()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, accessed_at)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or ``None`` if absent.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        Any | None
+            The decoded cached value, or ``None`` on a miss or an expired
+            entry.
+        """
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            now: float = self.clock()
+            row = connection.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            if row[1] <= now:
+                connection.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                connection.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            connection.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            connection.commit()
+            self.stats.disk_hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting old entries if necessary.
+
+        Expired entries are purged and, if the namespace still holds more than
+        ``max_entries`` rows, the least recently used rows are deleted.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        value : Any
+            A J.S.O.N. serialisable value to cache.
+        """
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            now: float = self.clock()
+            connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now + self.ttl, now),
+            )
+            expired: int = connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?",
+                (self.namespace, now),
+            ).rowcount
+            evicted: int = connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache WHERE namespace = ?"
+                " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            ).rowcount
+            connection.commit()
+            self.stats.expirations += expired
+            self.stats.evictions += evicted
+
+    def discard(self, key: str) -> None:
+        """Remove ``key`` from the cache if it is present."""
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            connection.commit()
+
+    def clear(self) -> None:
+        """Remove every entry in this cache's namespace."""
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            connection.execute(
+                "DELETE FROM cache WHERE namespace = ?", (self.namespace,)
+            )
+            connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection, if open."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class TieredCache:
+    """A `MemoryCache` in front of a `DiskCache`.
+
+    Lookups try memory first and fall back to disk, promoting disk hits into
+    memory. Writes go to both layers. ``decode`` converts values read from
+    disk (plain J.S.O.N. data) into the objects kept in memory, and
+    ``encode`` performs the reverse conversion before writing to disk.
+
+    Parameters
+    ----------
+    memory : MemoryCache
+        The fast, volatile layer.
+    disk : DiskCache
+        The persistent layer.
+    encode : Callable[[Any], Any]
+        Converts an in-memory value into J.S.O.N. serialisable data.
+    decode : Callable[[Any], Any]
+        Converts J.S.O.N. data read from disk into an in-memory value.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryCache,
+        disk: DiskCache,
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ) -> None:
+        self.memory: MemoryCache = memory
+        self.disk: DiskCache = disk
+        self.encode: Callable[[Any], Any] = encode
+        self.decode: Callable[[Any], Any] = decode
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key`` in either layer, or ``None``."""
+
+        value: Optional[Any] = self.memory.get(key)
+        if value is not None:
+            return value
+
+        stored: Optional[Any] = self.disk.get(key)
+        if stored is None:
+            return None
+
+        value = self.decode(stored)
+        self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` in both layers."""
+
+        self.memory.put(key, value)
+        self.disk.put(key, self.encode(value))
+
+    def discard(self, key: str) -> None:
+        """Remove ``key`` from both layers."""
+
+        self.memory.discard(key)
+        self.disk.discard(key)
+
+    def stats(self) -> CacheStats:
+        """Return combined statistics for both layers.
+
+        A lookup that misses memory but hits disk counts as a disk hit only.
+
+        Returns
+        -------
+        CacheStats
+            A snapshot of the counters.
+        """
+
+        memory: CacheStats = self.memory.stats
+        disk: CacheStats = self.disk.stats
+        return CacheStats(
+            memory_hits=memory.memory_hits,
+            disk_hits=disk.disk_hits,
+            misses=disk.misses,
+            evictions=memory.evictions + disk.evictions,
+            expirations=memory.expirations + disk.expirations,
+        )
+
+    def close(self) -> None:
+        """Close the persistent layer."""
+
+        self.disk.close()
+
+
+def _decode_result(row: Dict[str, Any]) -> SearchResult:
+    if "album_id" in row:
+        return DisplayedAlbum(**row)
+    return DisplayedTrack(**row)
+
+
+class SearchCache:
+    """Cache of parsed Spotify search result pages.
+
+    Pages are keyed by ``(query, mode, limit, offset)``. Queries are compared
+    case-insensitively and ignoring surrounding whitespace, as the Spotify
+    search endpoint does.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite database backing the persistent layer.
+    memory_entries : int
+        Number of result pages kept in memory.
+    memory_ttl : float
+        Seconds a result page stays valid in memory.
+    disk_entries : int
+        Number of result pages kept on disk.
+    disk_ttl : float
+        Seconds a result page stays valid on disk.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: Path,
+        memory_entries: int = 128,
+        memory_ttl: float = 600.0,
+        disk_entries: int = 2000,
+        disk_ttl: float = 86400.0,
+    ) -> None:
+        self.cache: TieredCache = TieredCache(
+            MemoryCache(memory_entries, memory_ttl),
+            DiskCache(path, "search", disk_entries, disk_ttl),
+            encode=lambda tracks: [asdict(track) for track in tracks],
+            decode=lambda rows: [_decode_result(row) for row in rows],
+        )
+
+    @staticmethod
+    def key(query: str, mode: str, limit: int, offset: int = 0) -> str:
+        """Return the cache key for a search request."""
+
+        return json.dumps([query.strip().casefold(), mode, limit, offset])
+
+    def get(
+        self, query: str, mode: str, limit: int, offset: int = 0
+    ) -> Optional[List[SearchResult]]:
+        """Return cached results for a search request, or ``None`` on a miss."""
+
+        return self.cache.get(self.key(query, mode, limit, offset))
+
+    def put(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        results: List[SearchResult],
+        offset: int = 0,
+    ) -> None:
+        """Cache the results of a search request."""
+
+        self.cache.put(self.key(query, mode, limit, offset), results)
+
+    def stats(self) -> CacheStats:
+        """Return hit, miss, and eviction counts for both layers."""
+
+        return self.cache.stats()
+
+    def close(self) -> None:
+        """Close the persistent layer."""
+
+        self.cache.close()
+
+
+class SuggestionCache:
+    """Cache of the YouTube suggestions offered for a track.
+
+    Every YouTube search costs A.P.I. quota (see :mod:`waft.quota`), so the
+    suggestions for a track are kept long enough to cover it being reopened
+    or downloaded again. Suggestions are keyed by the Spotify track ID, or,
+    for tracks without one, by their title, artist, and album compared
+    case-insensitively and ignoring repeated whitespace, which is all the
+    search query is built from.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite database backing the persistent layer.
+    memory_entries : int
+        Number of tracks whose suggestions are kept in memory.
+    memory_ttl : float
+        Seconds suggestions stay valid in memory.
+    disk_entries : int
+        Number of tracks whose suggestions are kept on disk.
+    disk_ttl : float
+        Seconds suggestions stay valid on disk.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: Path,
+        memory_entries: int = 256,
+        memory_ttl: float = 3600.0,
+        disk_entries: int = 5000,
+        disk_ttl: float = 7 * 86400.0,
+    ) -> None:
+        self.cache: TieredCache = TieredCache(
+            MemoryCache(memory_entries, memory_ttl),
+            DiskCache(path, "suggestions", disk_entries, disk_ttl),
+            encode=lambda suggestions: [asdict(result) for result in suggestions],
+            decode=lambda rows: [YoutubeResult(**row) for row in rows],
+        )
+
+    @staticmethod
+    def key(track: DisplayedTrack) -> str:
+        """Return the cache key for the suggestions of a track."""
+
+        if track.track_id:
+            return json.dumps(["id", track.track_id])
+        return json.dumps(
+            [
+                " ".join(field.split()).casefold()
+                for field in (track.title, track.artist, track.album)
+            ]
+        )
+
+    def get(self, track: DisplayedTrack) -> Optional[List[YoutubeResult]]:
+        """Return cached suggestions for a track, or ``None`` on a miss."""
+
+        return self.cache.get(self.key(track))
+
+    def put(self, track: DisplayedTrack, suggestions: List[YoutubeResult]) -> None:
+        """Cache the suggestions found for a track."""
+
+        self.cache.put(self.key(track), suggestions)
+
+    def stats(self) -> CacheStats:
+        """Return hit, miss, and eviction counts for both layers."""
+
+        return self.cache.stats()
+
+    def close(self) -> None:
+        """Close the persistent layer."""
+
+        self.cache.close()
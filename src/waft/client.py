@@ -0,0 +1,400 @@
+"""Shared, connection-pooled H.T.T.P. client for the Spotify Web A.P.I.
+
+Every request issued through bare ``requests.get``/``requests.post`` opens a
+brand new connection, paying a D.N.S. lookup and a T.L.S. handshake each time.
+This module provides a single long-lived :class:`SpotifyClient` that keeps
+connections to ``api.spotify.com`` and ``accounts.spotify.com`` alive in a
+bounded pool and transparently retries transient failures. Every request
+passes through the client's :class:`~waft.ratelimit.RateLimiter`, and
+``429`` responses are retried after the ``Retry-After`` delay (or a jittered
+exponential backoff when the header is absent), and a ``401`` answering a
+bearer token is retried once with a renewed token, see
+:attr:`SpotifyClient.reauthenticate`.
+
+Blocking requests can be awaited from the Textual event loop through
+:meth:`SpotifyClient.run` (or :func:`run_in_executor`), which hands them to a
+thread pool owned by the client. Interactive and background calls use
+separate pools so that queued bulk work can never occupy every thread.
+
+Functions
+---------
+get_client
+    Return the process-wide client, creating it on first use.
+run_in_executor
+    Await a blocking call on the process-wide client's thread pool.
+configure_client
+    Replace the process-wide client with one built from new settings.
+close_client
+    Close the process-wide client and release its pooled connections.
+
+Notes
+-----
+- ``requests.Session`` objects are safe to share between threads for the
+  simple request patterns used in this application, since the underlying
+  ``urllib3`` connection pools are thread-safe.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from urllib3.util.retry import Retry
+
+from waft.ratelimit import Priority, RateLimiter, backoff_delay
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """Tunable parameters for the pooled Spotify client.
+
+    Attributes
+    ----------
+    pool_connections : int
+        Number of distinct hosts to keep connection pools for.
+    pool_maxsize : int
+        Maximum number of keep-alive connections kept per host.
+    connect_timeout : float
+        Seconds to wait for a connection to be established.
+    read_timeout : float
+        Seconds to wait for the server to send a response.
+    total_retries : int
+        Maximum number of retries for connection errors and transient
+        server-side (5xx) responses.
+    backoff_factor : float
+        Exponential backoff factor, in seconds, applied between retries.
+    max_workers : int
+        Number of threads per priority available for running requests off the
+        event loop.
+    requests_per_second : float
+        Sustained request rate allowed by the client-side rate limiter.
+    burst : float
+        Number of requests that may be sent back-to-back before the sustained
+        rate applies.
+    rate_limit_retries : int
+        How many times a request answered with ``429`` is retried.
+    """
+
+    pool_connections: int = 4
+    pool_maxsize: int = 10
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    total_retries: int = 3
+    backoff_factor: float = 0.5
+    max_workers: int = 4
+    requests_per_second: float = 5.0
+    burst: float = 10.0
+    rate_limit_retries: int = 5
+
+
+class SpotifyClient:
+    """Keep-alive H.T.T.P. session shared by all Spotify A.P.I. calls.
+
+    Wraps a ``requests.Session`` whose adapters are configured with a bounded
+    connection pool and a ``urllib3`` retry policy, and applies the configured
+    timeouts to every request that does not specify its own. Requests are
+    metered by ``limiter``.
+
+    Parameters
+    ----------
+    settings : ClientSettings
+        Pool, timeout, and retry configuration for the session.
+
+    Attributes
+    ----------
+    reauthenticate : Callable[[str], str | None] | None
+        Called, from the thread sending the request, with a bearer token
+        Spotify rejected with ``401``; returns a renewed token to retry the
+        request with once, or ``None`` to return the ``401``.
+    """
+
+    def __init__(self, settings: ClientSettings = ClientSettings()) -> None:
+        self.settings: ClientSettings = settings
+        self.session: requests.Session = requests.Session()
+        self.reauthenticate: Optional[Callable[[str], Optional[str]]] = None
+
+        retry: Retry = Retry(
+            total=settings.total_retries,
+            backoff_factor=settings.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,  # Let `raise_for_status` surface the error.
+        )
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=settings.pool_connections,
+            pool_maxsize=settings.pool_maxsize,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.limiter: RateLimiter = RateLimiter(
+            settings.requests_per_second, settings.burst
+        )
+        self._executors: Dict[Priority, ThreadPoolExecutor] = {}
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """Return the default ``(connect, read)`` timeout pair."""
+
+        return (self.settings.connect_timeout, self.settings.read_timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs: Any,
+    ) -> Response:
+        """Send a rate-limited request over the pooled session.
+
+        Parameters
+        ----------
+        method : str
+            The H.T.T.P. method, e.g. ``"GET"``.
+        url : str
+            The U.R.L. to request.
+        priority : Priority
+            Scheduling class used when waiting for the rate limiter.
+        **kwargs : Any
+            Extra keyword arguments forwarded to ``requests.Session.request``.
+
+        Returns
+        -------
+        Response
+            The H.T.T.P. response; status validation is left to the caller.
+            A ``429`` response is only returned once retries are exhausted,
+            and a ``401`` once a renewed token was rejected too.
+        """
+
+        kwargs.setdefault("timeout", self.timeout)
+        response: Response = self._send(method, url, priority, kwargs)
+        if response.status_code != 401 or self.reauthenticate is None:
+            return response
+
+        headers: Dict[str, str] = kwargs.get("headers") or {}
+        authorization: str = headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return response
+        bearer: Optional[str] = self.reauthenticate(authorization[len("Bearer ") :])
+        if bearer is None:
+            return response
+        kwargs["headers"] = {**headers, "Authorization": f"Bearer {bearer}"}
+        return self._send(method, url, priority, kwargs)
+
+    def _send(
+        self, method: str, url: str, priority: Priority, kwargs: Dict[str, Any]
+    ) -> Response:
+        """Send a request, retrying ``429`` responses after their delay."""
+
+        attempt: int = 0
+        while True:
+            self.limiter.acquire(priority)
+            response: Response = self.session.request(method, url, **kwargs)
+            if (
+                response.status_code != 429
+                or attempt >= self.settings.rate_limit_retries
+            ):
+                return response
+
+            delay: Optional[float] = retry_after(response)
+            if delay is None:
+                delay = backoff_delay(attempt, self.settings.backoff_factor)
+            self.limiter.penalize(delay)
+            attempt += 1
+
+    def get(
+        self, url: str, priority: Priority = Priority.INTERACTIVE, **kwargs: Any
+    ) -> Response:
+        """Send a rate-limited GET request over the pooled session.
+
+        Parameters
+        ----------
+        url : str
+            The U.R.L. to request.
+        priority : Priority
+            Scheduling class used when waiting for the rate limiter.
+        **kwargs : Any
+            Extra keyword arguments forwarded to ``requests.Session.request``.
+
+        Returns
+        -------
+        Response
+            The H.T.T.P. response; status validation is left to the caller.
+        """
+
+        return self.request("GET", url, priority, **kwargs)
+
+    def post(
+        self, url: str, priority: Priority = Priority.INTERACTIVE, **kwargs: Any
+    ) -> Response:
+        """Send a rate-limited POST request over the pooled session.
+
+        Parameters
+        ----------
+        url : str
+            The U.R.L. to request.
+        priority : Priority
+            Scheduling class used when waiting for the rate limiter.
+        **kwargs : Any
+            Extra keyword arguments forwarded to ``requests.Session.request``.
+
+        Returns
+        -------
+        Response
+            The H.T.T.P. response; status validation is left to the caller.
+        """
+
+        return self.request("POST", url, priority, **kwargs)
+
+    async def run(
+        self,
+        function: Callable[..., T],
+        *args: Any,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs: Any,
+    ) -> T:
+        """Run a blocking call on the client's thread pool and await its result.
+
+        Cancelling the awaiting task abandons the call: the event loop moves
+        on immediately, and the worker thread discards the response once the
+        request completes or times out.
+
+        Parameters
+        ----------
+        function : Callable[..., T]
+            The blocking function to call, typically a Spotify request helper.
+        *args : Any
+            Positional arguments for ``function``.
+        priority : Priority
+            Selects the thread pool, so background calls cannot delay
+            interactive ones by occupying every thread.
+        **kwargs : Any
+            Keyword arguments for ``function``.
+
+        Returns
+        -------
+        T
+            Whatever ``function`` returns; exceptions it raises propagate.
+        """
+
+        if priority not in self._executors:
+            self._executors[priority] = ThreadPoolExecutor(
+                max_workers=self.settings.max_workers,
+                thread_name_prefix=f"spotify-{priority.name.lower()}",
+            )
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executors[priority], partial(function, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Close the session, its pooled connections, and its thread pools."""
+
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+        self.session.close()
+
+
+def retry_after(response: Response) -> Optional[float]:
+    """Return the delay requested by a ``Retry-After`` header, if any.
+
+    Parameters
+    ----------
+    response : Response
+        A response, typically with status ``429``.
+
+    Returns
+    -------
+    float | None
+        The delay in seconds, or ``None`` if the header is missing or is not
+        a number of seconds.
+    """
+
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+_CLIENT: Optional[SpotifyClient] = None
+
+
+def get_client() -> SpotifyClient:
+    """Return the process-wide Spotify client, creating it lazily.
+
+    Returns
+    -------
+    SpotifyClient
+        The shared client instance.
+    """
+
+    global _CLIENT  # pylint: disable=global-statement
+    if _CLIENT is None:
+        _CLIENT = SpotifyClient()
+    return _CLIENT
+
+
+async def run_in_executor(
+    function: Callable[..., T],
+    *args: Any,
+    priority: Priority = Priority.INTERACTIVE,
+    **kwargs: Any,
+) -> T:
+    """Await a blocking call on the process-wide client's thread pool.
+
+    Parameters
+    ----------
+    function : Callable[..., T]
+        The blocking function to call.
+    *args : Any
+        Positional arguments for ``function``.
+    priority : Priority
+        Selects the thread pool the call runs on.
+    **kwargs : Any
+        Keyword arguments for ``function``.
+
+    Returns
+    -------
+    T
+        Whatever ``function`` returns.
+    """
+
+    return await get_client().run(function, *args, priority=priority, **kwargs)
+
+
+def configure_client(settings: ClientSettings) -> SpotifyClient:
+    """Replace the process-wide client with one using ``settings``.
+
+    Any previously created client is closed first.
+
+    Parameters
+    ----------
+    settings : ClientSettings
+        Pool, timeout, and retry configuration for the new client.
+
+    Returns
+    -------
+    SpotifyClient
+        The newly created shared client.
+    """
+
+    global _CLIENT  # pylint: disable=global-statement
+    close_client()
+    _CLIENT = SpotifyClient(settings)
+    return _CLIENT
+
+
+def close_client() -> None:
+    """Close the process-wide client, if one has been created."""
+
+    global _CLIENT  # pylint: disable=global-statement
+    if _CLIENT is not None:
+        _CLIENT.close()
+        _CLIENT = None
@@ -0,0 +1,112 @@
+"""Filesystem locations and service endpoints used by the `waft` application.
+
+Cached data follows the X.D.G. base directory convention on every platform:
+``$XDG_CACHE_HOME/waft`` (``~/.cache/waft`` by default) holds data that can
+be rebuilt at any time, and ``$XDG_STATE_HOME/waft``
+(``~/.local/state/waft`` by default) holds data that cannot, such as uploads
+that have not reached the database yet.
+
+The MongoDB deployment can be overridden with the ``WAFT_MONGODB_URI`` and
+``WAFT_MONGODB_DATABASE`` environment variables, e.g. to point the
+application at a local ``mongod``.
+
+Relations are stored in MongoDB unless ``WAFT_STORAGE_BACKEND`` is set to
+``sqlite``, which keeps them in an embedded database at ``WAFT_SQLITE_PATH``
+(``$XDG_STATE_HOME/waft/waft.db`` by default) and needs no network, or to
+``mongodb-embedded``, which stores them in MongoDB with one document per
+file (see :mod:`waft.embedded`).
+"""
+
+import os
+from pathlib import Path
+
+
+def cache_directory() -> Path:
+    """Return the directory used for rebuildable on-disk caches.
+
+    The directory is not created; callers create it when first writing.
+
+    Returns
+    -------
+    Path
+        ``$XDG_CACHE_HOME/waft`` or ``~/.cache/waft``.
+    """
+
+    base: str = os.environ.get("XDG_CACHE_HOME", "") or str(Path.home() / ".cache")
+    return Path(base) / "waft"
+
+
+def state_directory() -> Path:
+    """Return the directory used for state that must survive restarts.
+
+    The directory is not created; callers create it when first writing.
+
+    Returns
+    -------
+    Path
+        ``$XDG_STATE_HOME/waft`` or ``~/.local/state/waft``.
+    """
+
+    base: str = os.environ.get("XDG_STATE_HOME", "") or str(
+        Path.home() / ".local" / "state"
+    )
+    return Path(base) / "waft"
+
+
+# The shared deployment used when ``WAFT_MONGODB_URI`` is not set.
+DEFAULT_DATABASE_URI: str = (
+    "mongodb+srv://lpdh3m_db_user:wiki_app_for_tunes_pass"
+    "@wiki-app-for-tunes.5juoymq.mongodb.net/"
+)
+
+# The database used when ``WAFT_MONGODB_DATABASE`` is not set.
+DEFAULT_DATABASE_NAME: str = "Wiki-App-DB"
+
+
+def database_uri() -> str:
+    """Return the connection string of the MongoDB deployment.
+
+    Returns
+    -------
+    str
+        ``$WAFT_MONGODB_URI`` or the shared deployment.
+    """
+
+    return os.environ.get("WAFT_MONGODB_URI", "") or DEFAULT_DATABASE_URI
+
+
+def database_name() -> str:
+    """Return the name of the MongoDB database holding the relations.
+
+    Returns
+    -------
+    str
+        ``$WAFT_MONGODB_DATABASE`` or ``Wiki-App-DB``.
+    """
+
+    return os.environ.get("WAFT_MONGODB_DATABASE", "") or DEFAULT_DATABASE_NAME
+
+
+def storage_backend() -> str:
+    """Return the name of the configured storage backend.
+
+    Returns
+    -------
+    str
+        ``$WAFT_STORAGE_BACKEND`` in lower case, or ``"mongodb"``.
+    """
+
+    return (os.environ.get("WAFT_STORAGE_BACKEND", "") or "mongodb").lower()
+
+
+def sqlite_database_path() -> Path:
+    """Return the location of the embedded SQLite database.
+
+    Returns
+    -------
+    Path
+        ``$WAFT_SQLITE_PATH``, or ``waft.db`` in :func:`state_directory`.
+    """
+
+    path: str = os.environ.get("WAFT_SQLITE_PATH", "")
+    return Path(path) if path else state_directory() / "waft.db"
@@ -2,26 +2,414 @@
 
 This module creates functions to upload FullMetadata objects
 to the database and search for relations by their key attributes.
+
+Every operation goes through a single process-wide ``MongoClient``, created
+on first use. Creating a client for a ``mongodb+srv://`` U.R.I. costs S.R.V.
+and T.X.T. D.N.S. lookups, topology discovery and a T.L.S. handshake per
+server, so the shared client keeps a pool of authenticated connections open
+instead. :func:`warm_up_database` pays that cost ahead of the first query.
+
+Functions
+---------
+get_database_client
+    Return the process-wide client, creating it on first use.
+get_database
+    Return the application database on the process-wide client.
+warm_up_database
+    Create the client, open a pooled connection, and provision indexes ahead
+    of time.
+configure_database
+    Replace the process-wide client with one built from new settings.
+close_database
+    Close the process-wide client and its pooled connections.
+
+Notes
+-----
+- ``MongoClient`` is thread-safe, and creating one for a ``mongodb+srv://``
+  U.R.I. blocks on D.N.S.; call these functions from worker threads rather
+  than the event loop.
 """
 
-from typing import List
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from pymongo import MongoClient
-from pymongo.cursor import Cursor
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+from pymongo.client_session import ClientSession
+from pymongo.collection import Collection
 from pymongo.database import Database
-from pymongo.results import InsertOneResult
+from pymongo.errors import BulkWriteError, PyMongoError
+from pymongo.results import BulkWriteResult
+
+from waft.config import database_name, database_uri
+from waft.datatypes import Album, DisplayedTrack, FullMetadata, Track
+from waft.indexes import ensure_indexes
+from waft.monitoring import get_monitor
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """Tunable parameters for the shared MongoDB client.
+
+    Attributes
+    ----------
+    uri : str
+        Connection string of the deployment.
+    database : str
+        Name of the database holding the relations.
+    max_pool_size : int
+        Maximum number of connections kept open per server.
+    min_pool_size : int
+        Number of connections kept open per server even when idle.
+    max_idle_time : float
+        Seconds an idle pooled connection is kept before being closed.
+    connect_timeout : float
+        Seconds to wait for a connection to be established.
+    socket_timeout : float
+        Seconds to wait for a server to answer an operation.
+    server_selection_timeout : float
+        Seconds to wait for a suitable server before an operation fails.
+    """
+
+    uri: str = field(default_factory=database_uri)
+    database: str = field(default_factory=database_name)
+    max_pool_size: int = 10
+    min_pool_size: int = 1
+    max_idle_time: float = 300.0
+    connect_timeout: float = 10.0
+    socket_timeout: float = 30.0
+    server_selection_timeout: float = 10.0
+
+    def client_options(self) -> Dict[str, Any]:
+        """Return the keyword arguments for ``MongoClient``.
+
+        The client reports its commands and pool checkouts to the process-wide
+        :class:`waft.monitoring.DatabaseMonitor`.
+        """
+
+        return {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxIdleTimeMS": int(self.max_idle_time * 1000),
+            "connectTimeoutMS": int(self.connect_timeout * 1000),
+            "socketTimeoutMS": int(self.socket_timeout * 1000),
+            "serverSelectionTimeoutMS": int(self.server_selection_timeout * 1000),
+            "appname": "waft",
+            "event_listeners": [get_monitor()],
+        }
+
+
+_SETTINGS: Optional[DatabaseSettings] = None
+_CLIENT: Optional[MongoClient] = None
+_LOCK: threading.Lock = threading.Lock()
+
+
+def get_database_client() -> MongoClient:
+    """Return the process-wide MongoDB client, creating it lazily.
+
+    Returns
+    -------
+    MongoClient
+        The shared client instance.
+    """
+
+    global _CLIENT, _SETTINGS  # pylint: disable=global-statement
+    with _LOCK:
+        if _CLIENT is None:
+            if _SETTINGS is None:
+                _SETTINGS = DatabaseSettings()
+            _CLIENT = MongoClient(_SETTINGS.uri, **_SETTINGS.client_options())
+        return _CLIENT
+
+
+def get_database() -> Database:
+    """Return the application database on the process-wide client.
+
+    Returns
+    -------
+    Database
+        The database holding the Album, Artist, File, On, Records, and Track
+        collections.
+    """
+
+    client: MongoClient = get_database_client()
+    return client[_SETTINGS.database if _SETTINGS else database_name()]
+
+
+def warm_up_database() -> bool:
+    """Create the shared client and open a pooled connection ahead of time.
+
+    Once the deployment answers, any index declared in :mod:`waft.indexes`
+    that it lacks is created.
+
+    Returns
+    -------
+    bool
+        Whether the deployment answered; failures are not raised, since the
+        next real operation will report them.
+    """
+
+    try:
+        get_database_client().admin.command("ping")
+    except PyMongoError:
+        return False
+
+    try:
+        ensure_indexes(get_database())
+    except PyMongoError:
+        pass  # Lookups still work without indexes, only slower.
+    return True
+
+
+def configure_database(settings: DatabaseSettings) -> None:
+    """Use ``settings`` for the process-wide client from now on.
+
+    Any previously created client is closed; the next operation creates a
+    new one.
+
+    Parameters
+    ----------
+    settings : DatabaseSettings
+        Connection, pool, and timeout configuration.
+    """
 
-from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
+    global _SETTINGS  # pylint: disable=global-statement
+    close_database()
+    with _LOCK:
+        _SETTINGS = settings
+
+
+def close_database() -> None:
+    """Close the process-wide client, if one has been created."""
+
+    global _CLIENT  # pylint: disable=global-statement
+    with _LOCK:
+        client: Optional[MongoClient] = _CLIENT
+        _CLIENT = None
+    if client is not None:
+        client.close()
+
+
+# A relation to upload: track metadata, its YouTube link, and the file hash.
+Relation = Tuple[FullMetadata, str, str]
+
+# Error code of a write rejected by a unique index.
+DUPLICATE_KEY: int = 11000
+
+
+def _track_identifiers(track: Track) -> Dict[str, str]:
+    """Return the Spotify ID and I.S.R.C. fields to store for ``track``.
+
+    Fields are left out, rather than stored as null, when unknown, so that
+    documents written before the identifiers were recorded can be told apart
+    with ``$exists``.
+    """
+
+    identifiers: Dict[str, str] = {}
+    if track.track_id is not None:
+        identifiers["SpotifyID"] = track.track_id
+    if track.isrc is not None:
+        identifiers["ISRC"] = track.isrc
+    return identifiers
+
+
+def _get_or_create(
+    collection: Collection,
+    documents: List[Dict[str, Any]],
+    key_fields: Tuple[str, ...],
+    session: Optional[ClientSession] = None,
+) -> Dict[Tuple[Any, ...], Any]:
+    """Find or insert documents by their natural key, in at most two round trips.
+
+    Documents are upserted on their natural key, which a unique index backs
+    (see :mod:`waft.indexes`), so writers running at once cannot insert the
+    same document twice: the loser of a race matches, or is rejected with a
+    duplicate key error and reads, the winner's document.
+
+    Parameters
+    ----------
+    collection : Collection
+        The collection to write to.
+    documents : List[Dict[str, Any]]
+        The documents that must exist; duplicates are collapsed.
+    key_fields : Tuple[str, ...]
+        Fields identifying a document.
+    session : ClientSession | None
+        Session the operations belong to, e.g. inside a transaction.
+
+    Returns
+    -------
+    Dict[Tuple[Any, ...], Any]
+        The ``_id`` of every document, keyed by its natural key.
+    """
+
+    unique: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for document in documents:
+        unique.setdefault(tuple(document[field] for field in key_fields), document)
+    if not unique:
+        return {}
+
+    keys: List[Tuple[Any, ...]] = list(unique)
+    upserted: Dict[int, Any] = {}
+    try:
+        result: BulkWriteResult = collection.bulk_write(
+            [
+                UpdateOne(
+                    dict(zip(key_fields, key)),
+                    {"$setOnInsert": unique[key]},
+                    upsert=True,
+                )
+                for key in keys
+            ],
+            ordered=False,
+            session=session,
+        )
+        upserted = result.upserted_ids
+    except BulkWriteError as error:
+        failures: List[Dict[str, Any]] = error.details.get("writeErrors", [])
+        if any(failure["code"] != DUPLICATE_KEY for failure in failures):
+            raise
+        upserted = {
+            upsert["index"]: upsert["_id"]
+            for upsert in error.details.get("upserted", [])
+        }
+
+    ids: Dict[Tuple[Any, ...], Any] = {
+        keys[index]: document_id for index, document_id in upserted.items()
+    }
+    existing: List[Dict[str, Any]] = [
+        dict(zip(key_fields, key)) for key in keys if key not in ids
+    ]
+    if existing:
+        for found in collection.find({"$or": existing}, session=session):
+            ids.setdefault(tuple(found[field] for field in key_fields), found["_id"])
+    return ids
+
+
+def _write_relations(
+    db: Database, relations: List[Relation], session: Optional[ClientSession]
+) -> None:
+    """Write ``relations``, collection by collection."""
+
+    album_ids = _get_or_create(
+        db["Album"],
+        [
+            {
+                "Name": metadata.album.album_name,
+                "CoverImageLink": metadata.album.image_url,
+            }
+            for metadata, _, _ in relations
+        ],
+        ("Name", "CoverImageLink"),
+        session,
+    )
+    artist_ids = _get_or_create(
+        db["Artist"],
+        [
+            {"Name": artist.artist_name}
+            for metadata, _, _ in relations
+            for artist in metadata.artists
+        ],
+        ("Name",),
+        session,
+    )
+    track_ids = _get_or_create(
+        db["Track"],
+        [
+            {
+                "Name": metadata.track.name,
+                "ReleaseDate": metadata.track.release_date,
+                "Duration": metadata.track.duration_ms,
+                "Explicit": metadata.track.explicit,
+                **_track_identifiers(metadata.track),
+            }
+            for metadata, _, _ in relations
+        ],
+        ("Name", "ReleaseDate", "Duration"),
+        session,
+    )
+
+    records: List[Dict[str, Any]] = []
+    on: List[Dict[str, Any]] = []
+    files: List[Dict[str, Any]] = []
+    for metadata, yt_link, file_hash in relations:
+        track: Track = metadata.track
+        track_id: Any = track_ids[(track.name, track.release_date, track.duration_ms)]
+        album: Album = metadata.album
+        for artist in metadata.artists:
+            records.append(
+                {"ArtistID": artist_ids[(artist.artist_name,)], "TrackID": track_id}
+            )
+        on.append(
+            {
+                "TrackID": track_id,
+                "AlbumID": album_ids[(album.album_name, album.image_url)],
+                "TrackNumber": track.track_number,
+            }
+        )
+        # NOTE: _id is the same as Hash in the ER Diagram. MongoDB enforced _id as PK
+        # SyncID orders writes for replicas (see waft.replica), as _id cannot.
+        files.append(
+            {
+                "_id": file_hash,
+                "TrackID": track_id,
+                "SourceLink": yt_link,
+                "SyncID": ObjectId(),
+                **_track_identifiers(track),
+            }
+        )
+
+    _get_or_create(db["Records"], records, ("ArtistID", "TrackID"), session)
+    _get_or_create(db["On"], on, ("TrackID", "AlbumID"), session)
+    _get_or_create(db["File"], files, ("_id",), session)
+
+
+def upload_relations(relations: Iterable[Relation], transaction: bool = False) -> None:
+    """Upload many music metadata relations in a handful of round trips.
+
+    Albums, artists and tracks are matched on their natural keys (album name
+    and cover, artist name, and track name, release date and duration) and
+    only created when missing, as are the linking records and files. Each
+    collection is read once and written at most once for the whole batch,
+    so a whole album costs the same dozen round trips as a single track.
+
+    Parameters
+    ----------
+    relations : Iterable[Relation]
+        ``(metadata, yt_link, file_hash)`` triples, as taken by
+        :func:`upload_relation`.
+    transaction : bool
+        Whether to write the batch in a multi-document transaction, so that
+        it is stored entirely or not at all. Requires a replica set.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If any database operation fails.
+    """
+
+    batch: List[Relation] = list(relations)
+    if not batch:
+        return
+
+    db: Database = get_database()
+    if not transaction:
+        _write_relations(db, batch, None)
+        return
+
+    with get_database_client().start_session() as session:
+        session.with_transaction(lambda session: _write_relations(db, batch, session))
 
 
 def upload_relation(metadata: FullMetadata, yt_link: str, file_hash: str) -> None:
     """Upload a complete music metadata relation into the MongoDB database.
 
     This function decomposes a `FullMetadata` object into its component entities
-    (Album, Track, Artist) and inserts them into their respective collections.
-    It also creates linking records to represent relationships between tracks,
-    albums, artists, and associated files, including a YouTube source link and
-    a unique file hash.
+    (Album, Track, Artist) and stores them in their respective collections,
+    reusing any that already exist. It also creates linking records to
+    represent relationships between tracks, albums, artists, and associated
+    files, including a YouTube source link and a unique file hash.
 
     Parameters
     ----------
@@ -43,54 +431,89 @@ def upload_relation(metadata: FullMetadata, yt_link: str, file_hash: str) -> Non
     pymongo.errors.PyMongoError
         If any database insertion or connection operation fails.
     """
-    con_str: str = (
-        "mongodb+srv://lpdh3m_db_user:wiki_app_for_tunes_pass"
-        "@wiki-app-for-tunes.5juoymq.mongodb.net/"
-    )
-    client: MongoClient = MongoClient(con_str)
 
-    db: Database = client["Wiki-App-DB"]
+    upload_relations([(metadata, yt_link, file_hash)])
 
-    album_collection = db["Album"]
-    artist_collection = db["Artist"]
-    file_collection = db["File"]
-    on_collection = db["On"]
-    records_collection = db["Records"]
-    track_collection = db["Track"]
 
-    album: Album = metadata.album
-    inserted_album: InsertOneResult = album_collection.insert_one(
-        {"Name": album.album_name, "CoverImageLink": album.image_url}
-    )
-    album_id: str = inserted_album.inserted_id
+def source_link_pipeline(
+    track_name: str, album_name: str, artist_names: List[str], legacy_only: bool = False
+) -> List[Dict[str, Any]]:
+    """Build the aggregation that finds the source link of a known track.
 
-    track: Track = metadata.track
-    inserted_track: InsertOneResult = track_collection.insert_one(
-        {
-            "Name": track.name,
-            "ReleaseDate": track.release_date,
-            "Duration": track.duration_ms,
-            "Explicit": track.explicit,
-        }
-    )
-    track_id: str = inserted_track.inserted_id
+    The pipeline runs on the Track collection and joins On, Album, Records,
+    Artist and File server-side, so the whole lookup is a single round trip.
 
-    artists: List[Artist] = metadata.artists
-    for artist in artists:
-        inserted_artist: InsertOneResult = artist_collection.insert_one(
-            {"Name": artist.artist_name}
-        )
-        artist_id: str = inserted_artist.inserted_id
-        records_collection.insert_one({"ArtistID": artist_id, "TrackID": track_id})
+    Parameters
+    ----------
+    track_name : str
+        Name of the track.
+    album_name : str
+        Name of the album the track must appear on.
+    artist_names : List[str]
+        Names of which at least one must be credited on the track.
+    legacy_only : bool
+        Whether to only consider tracks stored without a Spotify ID.
 
-    # NOTE: _id is the same as Hash in the ER Diagram. MongoDB enforced _id as PK
-    file_collection.insert_one(
-        {"_id": file_hash, "TrackID": track_id, "SourceLink": yt_link}
-    )
+    Returns
+    -------
+    List[Dict[str, Any]]
+        The pipeline stages, yielding at most one ``{"SourceLink": ...}``
+        document.
+    """
 
-    on_collection.insert_one(
-        {"TrackID": track_id, "AlbumID": album_id, "TrackNumber": track.track_number}
-    )
+    match: Dict[str, Any] = {"Name": track_name}
+    if legacy_only:
+        match["SpotifyID"] = {"$exists": False}
+    return [
+        {"$match": match},
+        {
+            "$lookup": {
+                "from": "On",
+                "localField": "_id",
+                "foreignField": "TrackID",
+                "as": "on",
+            }
+        },
+        {"$unwind": "$on"},
+        {
+            "$lookup": {
+                "from": "Album",
+                "localField": "on.AlbumID",
+                "foreignField": "_id",
+                "as": "album",
+            }
+        },
+        {"$match": {"album.Name": album_name}},
+        {
+            "$lookup": {
+                "from": "Records",
+                "localField": "_id",
+                "foreignField": "TrackID",
+                "as": "records",
+            }
+        },
+        {"$unwind": "$records"},
+        {
+            "$lookup": {
+                "from": "Artist",
+                "localField": "records.ArtistID",
+                "foreignField": "_id",
+                "as": "artist",
+            }
+        },
+        {"$match": {"artist.Name": {"$in": artist_names}}},
+        {
+            "$lookup": {
+                "from": "File",
+                "localField": "_id",
+                "foreignField": "TrackID",
+                "as": "file",
+            }
+        },
+        {"$unwind": "$file"},
+        {"$limit": 1},
+        {"$project": {"_id": 0, "SourceLink": "$file.SourceLink"}},
+    ]
 
 
 def get_yt_url(partial_metadata: DisplayedTrack) -> str | None:
@@ -98,15 +521,51 @@ def get_yt_url(partial_metadata: DisplayedTrack) -> str | None:
     Retrieve a YouTube URL by matching metadata attributes in the database.
 
     This function searches the database for an existing relation that matches
-    the provided metadata using track name, release date, album name, and at
-    least one artist name. If a matching relation is found, the associated
-    YouTube source link is returned.
+    the provided metadata using track name, album name, and at least one
+    artist name. If a matching relation is found, the associated YouTube
+    source link is returned.
 
     Parameters
     ----------
-    metadata : FullMetadata
-        Metadata object containing track, album, and artist information used
-        to search for a matching database entry.
+    partial_metadata : DisplayedTrack
+        Track, album, and artist names used to search for a matching
+        database entry.
+
+    Returns
+    -------
+    str | None
+        The associated YouTube URL if a matching relation is found;
+        otherwise, None.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If a database query or connection fails.
+    """
+
+    track_collection: Collection = get_database()["Track"]
+    pipeline: List[Dict[str, Any]] = source_link_pipeline(
+        partial_metadata.title, partial_metadata.album, [partial_metadata.artist]
+    )
+
+    for match in track_collection.aggregate(pipeline):
+        return match["SourceLink"]
+    return None  # Nothing was matched
+
+
+def get_yt_url_by_id(partial_metadata: DisplayedTrack) -> str | None:
+    """
+    Retrieve a YouTube URL by the Spotify ID of a track.
+
+    Files uploaded with their track's Spotify ID are found with a single
+    indexed point lookup. Only if none is, the name join of
+    :func:`get_yt_url` is run, restricted to tracks stored before Spotify IDs
+    were recorded and not yet backfilled (see :mod:`waft.backfill`).
+
+    Parameters
+    ----------
+    partial_metadata : DisplayedTrack
+        The track to look up. Its names are only used for the fallback.
 
     Returns
     -------
@@ -119,72 +578,88 @@ def get_yt_url(partial_metadata: DisplayedTrack) -> str | None:
     pymongo.errors.PyMongoError
         If a database query or connection fails.
     """
-    metadata: FullMetadata = FullMetadata(
-        Album(partial_metadata.album, ""),
-        [Artist(partial_metadata.artist)],
-        Track(
-            "",
-            False,
-            partial_metadata.title,
-            "33",
-            0,
-        ),
+
+    db: Database = get_database()
+    found: Optional[Dict[str, Any]] = db["File"].find_one(
+        {"SpotifyID": partial_metadata.track_id}, {"_id": 0, "SourceLink": 1}
     )
-    track_name: str = metadata.track.name
-    # release_date: str = metadata.track.release_date
-    album_name: str = metadata.album.album_name
-    artist_names: List[str] = []
-    for artist in metadata.artists:
-        artist_names.append(artist.artist_name)
-
-    con_str: str = (
-        "mongodb+srv://lpdh3m_db_user:wiki_app_for_tunes_pass"
-        "@wiki-app-for-tunes.5juoymq.mongodb.net/"
+    if found is not None:
+        return found["SourceLink"]
+
+    pipeline: List[Dict[str, Any]] = source_link_pipeline(
+        partial_metadata.title,
+        partial_metadata.album,
+        [partial_metadata.artist],
+        legacy_only=True,
     )
-    client: MongoClient = MongoClient(con_str)
-    db: Database = client["Wiki-App-DB"]
-
-    album_collection = db["Album"]
-    artist_collection = db["Artist"]
-    file_collection = db["File"]
-    on_collection = db["On"]
-    records_collection = db["Records"]
-    track_collection = db["Track"]
-
-    # groupings of entities that match the given metadata
-    candidate_tracks: Cursor = track_collection.find({"Name": track_name})
-    candidate_albums: Cursor = album_collection.find({"Name": album_name})
-    candidate_artists: Cursor = artist_collection.find({"Name": {"$in": artist_names}})
-    candidate_artists_names: List[str] = []
-    for artist in candidate_artists:
-        candidate_artists_names.append(artist["Name"])
-
-    # list of track ids that are associated with a candidate album_name
-    for track_doc in candidate_tracks:
-        track_id: str = track_doc["_id"]
-        on_doc = on_collection.find_one({"TrackID": track_id})  # type: ignore
-        album_id: str = on_doc["AlbumID"]  # type: ignore
-        match_exists: bool = False
-        for album_doc in candidate_albums:
-            album_doc_id: str = album_doc["_id"]
-            if album_id == album_doc_id:
-                match_exists = True
-                break
-        if not match_exists:
-            # There is no metadata in the DB that matches the provided
-            return None
-        records_docs = records_collection.find({"TrackID": track_id})
-        for records_doc in records_docs:
-            artist_id: str = records_doc["ArtistID"]
-            matched_artist = artist_collection.find_one(  # type: ignore
-                {"_id": artist_id}
-            )
-            if matched_artist["Name"] in candidate_artists_names:  # type: ignore
-                # We matched Track Name, release date, Album name, and 1+ Artist names
-                # Find File with track_id
-                file_doc = file_collection.find_one(  # type: ignore
-                    {"TrackID": track_id}
-                )
-                link = file_doc["SourceLink"]  # type: ignore
-                return link
+    for match in db["Track"].aggregate(pipeline):
+        return match["SourceLink"]
     return None  # Nothing was matched
+
+
+def get_yt_urls(tracks: List[DisplayedTrack]) -> Dict[str, str]:
+    """
+    Retrieve the YouTube URLs of many tracks by their Spotify IDs at once.
+
+    A whole page of search results is resolved with a single ``$in`` query
+    on the indexed ``File.SpotifyID``. Tracks only stored without a Spotify
+    ID are not found; :func:`get_yt_url_by_id` still finds those one at a
+    time.
+
+    Parameters
+    ----------
+    tracks : List[DisplayedTrack]
+        The tracks to look up.
+
+    Returns
+    -------
+    Dict[str, str]
+        The YouTube URL of every track that has one, keyed by Spotify ID.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If a database query or connection fails.
+    """
+
+    track_ids: List[str] = list(dict.fromkeys(track.track_id for track in tracks))
+    if not track_ids:
+        return {}
+    return {
+        found["SpotifyID"]: found["SourceLink"]
+        for found in get_database()["File"].find(
+            {"SpotifyID": {"$in": track_ids}},
+            {"_id": 0, "SpotifyID": 1, "SourceLink": 1},
+        )
+    }
+
+
+def get_file_hashes(track_id: str, source_link: str) -> List[str]:
+    """
+    Retrieve the hashes of the files stored for a track or a source.
+
+    Parameters
+    ----------
+    track_id : str
+        Spotify ID of the track.
+    source_link : str
+        YouTube URL of the source.
+
+    Returns
+    -------
+    List[str]
+        The hash of every file stored with that Spotify ID or source link.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If a database query or connection fails.
+    """
+
+    return [
+        found["_id"]
+        for found in get_database()["File"].find(
+            {"$or": [{"SpotifyID": track_id}, {"SourceLink": source_link}]},
+            {"_id": 1},
+        )
+    ]
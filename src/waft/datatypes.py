@@ -15,13 +15,22 @@ Artist
     Represents a single contributing artist with a display name.
 Track
     Detailed track-level metadata such as duration, explicit flag,
-    release date, and track ordering.
+    release date, track ordering, and the Spotify ID and I.S.R.C.
 FullMetadata
     Bundled container holding the complete metadata set: album, artists,
     and track details.
 DisplayedTrack
     Simplified, user-facing version of track metadata intended for
     UI display and search result presentation.
+DisplayedAlbum
+    Simplified, user-facing version of album metadata shown by album
+    searches.
+QueuedDownload
+    A track waiting in the download queue together with its chosen source.
+AccessToken
+    A Spotify access token together with the time at which it expires.
+UploadQueueStats
+    Depth and flush latency of the queue of relations awaiting upload.
 
 Notes
 -----
@@ -32,7 +41,7 @@ immutable once created and used purely as data containers.
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -97,6 +106,10 @@ class Track:
         The track's release date (ISO string).
     track_number : int
         Track's position within the album.
+    track_id : str | None
+        The Spotify track ID, if known.
+    isrc : str | None
+        The International Standard Recording Code, if Spotify lists one.
     """
 
     duration_ms: int
@@ -104,13 +117,26 @@ class Track:
     name: str
     release_date: str
     track_number: int
-
-    def __init__(self, duration_ms, explicit, name, release_date, track_number):
+    track_id: Optional[str]
+    isrc: Optional[str]
+
+    def __init__(
+        self,
+        duration_ms,
+        explicit,
+        name,
+        release_date,
+        track_number,
+        track_id=None,
+        isrc=None,
+    ):
         self.duration_ms = duration_ms
         self.explicit = explicit
         self.name = name
         self.release_date = release_date
         self.track_number = track_number
+        self.track_id = track_id
+        self.isrc = isrc
 
 
 @dataclass
@@ -181,6 +207,40 @@ class DisplayedTrack:
         self.track_id = track_id
 
 
+@dataclass
+class DisplayedAlbum:
+    """
+    Container for displaying simplified Spotify album metadata.
+
+    Attributes
+    ----------
+    title : str
+        The album name as shown on Spotify.
+    artist : str
+        The primary artist's name. May include "and Others" if
+        multiple artists are credited on the album.
+    release_date : str
+        The album's release date, at the precision Spotify provides.
+    total_tracks : int
+        The number of tracks on the album.
+    album_id : str
+        The unique Spotify album identifier.
+    """
+
+    title: str
+    artist: str
+    release_date: str
+    total_tracks: int
+    album_id: str
+
+    def __init__(self, title, artist, release_date, total_tracks, album_id):
+        self.title = title
+        self.artist = artist
+        self.release_date = release_date
+        self.total_tracks = total_tracks
+        self.album_id = album_id
+
+
 @dataclass
 class YoutubeResult:
     """Represents a single YouTube video search result.
@@ -206,3 +266,103 @@ class YoutubeResult:
         self.video_title = video_title
         self.channel = channel
         self.url = url
+
+
+@dataclass
+class QueuedDownload:
+    """A pending download waiting for the application to process it.
+
+    Attributes
+    ----------
+    track : DisplayedTrack
+        The track that was selected when the download was requested.
+    url : str
+        The YouTube URL chosen as the audio source.
+    url_found : bool
+        Whether ``url`` was already stored in the database, in which case the
+        relation does not need to be uploaded again.
+    """
+
+    track: DisplayedTrack
+    url: str
+    url_found: bool
+
+    def __init__(self, track: DisplayedTrack, url: str, url_found: bool):
+        self.track = track
+        self.url = url
+        self.url_found = url_found
+
+
+@dataclass
+class AccessToken:
+    """A Spotify access token and its expiry time.
+
+    Attributes
+    ----------
+    value : str
+        The bearer token string sent in the ``Authorization`` header.
+    expires_at : float
+        Wall-clock time (seconds since the epoch) after which Spotify will
+        reject the token.
+    """
+
+    value: str
+    expires_at: float
+
+    def __init__(self, value: str, expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+
+    def expires_within(self, seconds: float, now: float) -> bool:
+        """Return whether the token expires less than ``seconds`` after ``now``.
+
+        Parameters
+        ----------
+        seconds : float
+            Safety margin in seconds.
+        now : float
+            The current wall-clock time in seconds since the epoch.
+
+        Returns
+        -------
+        bool
+            ``True`` if the token should be considered stale.
+        """
+
+        return self.expires_at - now < seconds
+
+
+@dataclass(frozen=True)
+class UploadQueueStats:
+    """Depth and flush latency of the upload queue.
+
+    Attributes
+    ----------
+    depth : int
+        Relations waiting to be uploaded.
+    flush_latency : float | None
+        Seconds the last successful flush took, or ``None`` before the first.
+    failures : int
+        Consecutive failed flushes; non-zero while the queue is retrying.
+    failed : int
+        Relations set aside this session because they could not be uploaded.
+    """
+
+    depth: int = 0
+    flush_latency: Optional[float] = None
+    failures: int = 0
+    failed: int = 0
+
+    def summary(self) -> str:
+        """Describe the queue in a few words, or return ``""`` if idle."""
+
+        parts: List[str] = []
+        if self.depth:
+            parts.append(f"{self.depth} upload{'s' if self.depth > 1 else ''} queued")
+        if self.failures:
+            parts.append("retrying")
+        if self.failed:
+            parts.append(f"{self.failed} failed")
+        if self.flush_latency is not None:
+            parts.append(f"last flush {self.flush_latency * 1000:.0f} ms")
+        return ", ".join(parts)
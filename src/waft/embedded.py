@@ -0,0 +1,500 @@
+"""Embedded single-document schema for relations, and its migration.
+
+The normalized schema spreads a relation over six collections (``Album``,
+``Artist``, ``File``, ``On``, ``Records`` and ``Track``), so a lookup by
+names is a five-way join and an upload writes every collection. The
+embedded schema stores one ``Source`` document per file instead::
+
+    {
+        "_id": <file hash>,
+        "SourceLink": "https://youtu.be/...",
+        "SyncID": ObjectId(...),
+        "SpotifyID": "...", "ISRC": "...",     # when known
+        "Track": {"Name", "ReleaseDate", "Duration", "Explicit", "TrackNumber"},
+        "Album": {"Name", "CoverImageLink"},
+        "Artists": ["...", ...],
+        "SearchKey": {"Track": "...", "Album": "...", "Artists": ["...", ...]},
+    }
+
+``SearchKey`` holds the names normalized by :func:`search_key`, so a lookup
+by names is a single indexed query, and an upload is a single insert.
+
+Existing relations are copied with :func:`migrate`, in batches of files in
+``_id`` order; progress is checkpointed in the ``Migrations`` collection
+after every batch, so an interrupted migration resumes where it stopped.
+Until it has completed, lookups that miss fall back to the normalized
+schema (see :class:`waft.backends.EmbeddedMongoBackend`).
+
+Functions
+---------
+search_key
+    Normalize a name for matching.
+source_document
+    Build the ``Source`` document of a relation.
+upload_sources
+    Store relations as ``Source`` documents in one round trip.
+find_source
+    Return the source link of a track in one round trip.
+find_sources
+    Return the source links of many tracks in one round trip.
+find_file_hashes
+    Return the hashes of the files stored for a track or a source.
+migration_complete
+    Return whether every normalized relation has been copied.
+migrate
+    Copy the normalized relations into the ``Source`` collection.
+
+Examples
+--------
+::
+
+    $ python -m waft.embedded              # migrate, resuming if interrupted
+    $ python -m waft.embedded --restart    # copy every relation again
+"""
+
+import argparse
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from waft.database import DUPLICATE_KEY, Relation, get_database
+from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
+
+# Collection holding one document per file.
+SOURCE_COLLECTION: str = "Source"
+
+# Collection holding migration checkpoints, and the checkpoint of this one.
+MIGRATION_COLLECTION: str = "Migrations"
+MIGRATION_ID: str = "embedded-sources"
+
+# Files copied per migration batch.
+MIGRATION_BATCH: int = 500
+
+
+def search_key(name: str) -> str:
+    """Normalize a name for matching.
+
+    Accents are removed, case is folded, and runs of whitespace are
+    collapsed, so e.g. ``"Beyoncé  Knowles"`` and ``"beyonce knowles"`` match.
+
+    Parameters
+    ----------
+    name : str
+        A track, album or artist name.
+
+    Returns
+    -------
+    str
+        The normalized name.
+    """
+
+    decomposed: str = unicodedata.normalize("NFKD", name)
+    stripped: str = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def source_document(
+    relation: Relation, sync_id: Optional[ObjectId] = None
+) -> Dict[str, Any]:
+    """Build the ``Source`` document of a relation.
+
+    Parameters
+    ----------
+    relation : Relation
+        The ``(metadata, yt_link, file_hash)`` triple to store.
+    sync_id : ObjectId | None
+        The ``SyncID`` to keep, e.g. when migrating a File document; a new
+        one is generated if not given.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The document, keyed by the file hash.
+    """
+
+    metadata, yt_link, file_hash = relation
+    track: Track = metadata.track
+    artists: List[str] = [artist.artist_name for artist in metadata.artists]
+    document: Dict[str, Any] = {
+        "_id": file_hash,
+        "SourceLink": yt_link,
+        "SyncID": sync_id or ObjectId(),
+        "Track": {
+            "Name": track.name,
+            "ReleaseDate": track.release_date,
+            "Duration": track.duration_ms,
+            "Explicit": track.explicit,
+            "TrackNumber": track.track_number,
+        },
+        "Album": {
+            "Name": metadata.album.album_name,
+            "CoverImageLink": metadata.album.image_url,
+        },
+        "Artists": artists,
+        "SearchKey": {
+            "Track": search_key(track.name),
+            "Album": search_key(metadata.album.album_name),
+            "Artists": [search_key(artist) for artist in artists],
+        },
+    }
+    # Left out rather than stored as null, as in the normalized schema.
+    if track.track_id is not None:
+        document["SpotifyID"] = track.track_id
+    if track.isrc is not None:
+        document["ISRC"] = track.isrc
+    return document
+
+
+def _insert_new(collection: Collection, documents: List[Dict[str, Any]]) -> int:
+    """Insert documents, skipping those whose ``_id`` already exists.
+
+    Returns
+    -------
+    int
+        The number of documents inserted.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If a write fails for any other reason.
+    """
+
+    if not documents:
+        return 0
+    try:
+        return len(collection.insert_many(documents, ordered=False).inserted_ids)
+    except BulkWriteError as error:
+        failures: List[Dict[str, Any]] = error.details.get("writeErrors", [])
+        if any(failure["code"] != DUPLICATE_KEY for failure in failures):
+            raise
+        return error.details.get("nInserted", 0)
+
+
+def upload_sources(relations: Iterable[Relation]) -> None:
+    """Store relations as ``Source`` documents in a single round trip.
+
+    Files that are already stored are left as they are, so uploading a
+    relation twice changes nothing.
+
+    Parameters
+    ----------
+    relations : Iterable[Relation]
+        ``(metadata, yt_link, file_hash)`` triples.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If the write fails.
+    """
+
+    _insert_new(
+        get_database()[SOURCE_COLLECTION],
+        [source_document(relation) for relation in relations],
+    )
+
+
+def find_source(track: DisplayedTrack) -> Optional[str]:
+    """Return the source link of a track in a single round trip.
+
+    The track is matched by Spotify ID, or by its normalized names among
+    files stored without a Spotify ID.
+
+    Parameters
+    ----------
+    track : DisplayedTrack
+        The track to look up.
+
+    Returns
+    -------
+    str | None
+        The source link, or ``None`` if there is none.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If the query fails.
+    """
+
+    found: Optional[Dict[str, Any]] = get_database()[SOURCE_COLLECTION].find_one(
+        {
+            "$or": [
+                {"SpotifyID": track.track_id},
+                {
+                    "SearchKey.Track": search_key(track.title),
+                    "SearchKey.Album": search_key(track.album),
+                    "SearchKey.Artists": search_key(track.artist),
+                    "SpotifyID": {"$exists": False},
+                },
+            ]
+        },
+        {"_id": 0, "SourceLink": 1},
+    )
+    return None if found is None else found["SourceLink"]
+
+
+def find_sources(tracks: List[DisplayedTrack]) -> Dict[str, str]:
+    """Return the source links of many tracks in a single round trip.
+
+    Parameters
+    ----------
+    tracks : List[DisplayedTrack]
+        The tracks to look up, by Spotify ID.
+
+    Returns
+    -------
+    Dict[str, str]
+        The source link of every track that has one, keyed by Spotify ID.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If the query fails.
+    """
+
+    if not tracks:
+        return {}
+    return {
+        found["SpotifyID"]: found["SourceLink"]
+        for found in get_database()[SOURCE_COLLECTION].find(
+            {"SpotifyID": {"$in": list({track.track_id for track in tracks})}},
+            {"_id": 0, "SpotifyID": 1, "SourceLink": 1},
+        )
+    }
+
+
+def find_file_hashes(track_id: str, source_link: str) -> List[str]:
+    """Return the hashes of the files stored for a track or a source.
+
+    Parameters
+    ----------
+    track_id : str
+        Spotify ID of the track.
+    source_link : str
+        YouTube U.R.L. of the source.
+
+    Returns
+    -------
+    List[str]
+        The hash of every file stored with that Spotify ID or source link.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If the query fails.
+    """
+
+    return [
+        found["_id"]
+        for found in get_database()[SOURCE_COLLECTION].find(
+            {"$or": [{"SpotifyID": track_id}, {"SourceLink": source_link}]},
+            {"_id": 1},
+        )
+    ]
+
+
+@dataclass(frozen=True)
+class MigrationReport:
+    """Progress of a migration run.
+
+    Attributes
+    ----------
+    files : int
+        File documents read.
+    inserted : int
+        Source documents created; files already migrated are not counted.
+    skipped : int
+        Files whose track or album could not be found.
+    done : bool
+        Whether every File document has been read.
+    """
+
+    files: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    done: bool = False
+
+
+def migration_complete(db: Database) -> bool:
+    """Return whether the migration has copied every normalized relation.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+
+    Returns
+    -------
+    bool
+        Whether the last migration run read every File document.
+    """
+
+    checkpoint: Optional[Dict[str, Any]] = db[MIGRATION_COLLECTION].find_one(
+        {"_id": MIGRATION_ID}
+    )
+    return bool(checkpoint and checkpoint.get("Done"))
+
+
+# A relation to migrate and the SyncID of its file, or None if incomplete.
+_Loaded = Optional[Tuple[Relation, Optional[ObjectId]]]
+
+
+def _load_relations(db: Database, files: List[Dict[str, Any]]) -> List[_Loaded]:
+    """Join a batch of File documents with their tracks, albums and artists.
+
+    Each collection is read once per batch. A track on several albums is
+    stored with the first one linked.
+
+    Returns
+    -------
+    List[(Relation, ObjectId | None) | None]
+        For every file, its relation and ``SyncID``, or ``None`` if its track
+        or album is missing.
+    """
+
+    track_ids: List[Any] = list({file["TrackID"] for file in files})
+    tracks: Dict[Any, Dict[str, Any]] = {
+        track["_id"]: track for track in db["Track"].find({"_id": {"$in": track_ids}})
+    }
+    albums_of: Dict[Any, Dict[str, Any]] = {}
+    for link in db["On"].find({"TrackID": {"$in": track_ids}}).sort("_id", 1):
+        albums_of.setdefault(link["TrackID"], link)
+    albums: Dict[Any, Dict[str, Any]] = {
+        album["_id"]: album
+        for album in db["Album"].find(
+            {"_id": {"$in": [link["AlbumID"] for link in albums_of.values()]}}
+        )
+    }
+    artists_of: Dict[Any, List[Any]] = {}
+    for record in db["Records"].find({"TrackID": {"$in": track_ids}}).sort("_id", 1):
+        artists_of.setdefault(record["TrackID"], []).append(record["ArtistID"])
+    artist_names: Dict[Any, str] = {
+        artist["_id"]: artist["Name"]
+        for artist in db["Artist"].find(
+            {"_id": {"$in": [i for ids in artists_of.values() for i in ids]}}
+        )
+    }
+
+    relations: List[_Loaded] = []
+    for file in files:
+        track: Optional[Dict[str, Any]] = tracks.get(file["TrackID"])
+        link: Optional[Dict[str, Any]] = albums_of.get(file["TrackID"])
+        album: Optional[Dict[str, Any]] = link and albums.get(link["AlbumID"])
+        if track is None or album is None:
+            relations.append(None)
+            continue
+        metadata: FullMetadata = FullMetadata(
+            Album(album["Name"], album["CoverImageLink"]),
+            [
+                Artist(artist_names[artist_id])
+                for artist_id in artists_of.get(file["TrackID"], [])
+                if artist_id in artist_names
+            ],
+            Track(
+                track["Duration"],
+                track["Explicit"],
+                track["Name"],
+                track["ReleaseDate"],
+                link["TrackNumber"],
+                file.get("SpotifyID", track.get("SpotifyID")),
+                file.get("ISRC", track.get("ISRC")),
+            ),
+        )
+        relations.append(
+            ((metadata, file["SourceLink"], file["_id"]), file.get("SyncID"))
+        )
+    return relations
+
+
+def migrate(
+    db: Database, batch_size: int = MIGRATION_BATCH, restart: bool = False
+) -> MigrationReport:
+    """Copy the normalized relations into the ``Source`` collection.
+
+    Files are read in ``_id`` order, and the last one copied is checkpointed
+    after every batch, so the migration can be interrupted and re-run at any
+    time. Files already copied are left as they are.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+    batch_size : int
+        Files read and written per batch.
+    restart : bool
+        Whether to read every File document again rather than resume, e.g.
+        to copy files written with the normalized schema since the last run.
+
+    Returns
+    -------
+    MigrationReport
+        What this run read and wrote.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If the deployment cannot be read or written; progress up to the
+        last completed batch is kept.
+    """
+
+    checkpoints: Collection = db[MIGRATION_COLLECTION]
+    checkpoint: Optional[Dict[str, Any]] = checkpoints.find_one({"_id": MIGRATION_ID})
+    after: Any = None if restart or checkpoint is None else checkpoint.get("After")
+    report: MigrationReport = MigrationReport()
+    while True:
+        files: List[Dict[str, Any]] = list(
+            db["File"]
+            .find({} if after is None else {"_id": {"$gt": after}})
+            .sort("_id", 1)
+            .limit(batch_size)
+        )
+        if not files:
+            checkpoints.update_one(
+                {"_id": MIGRATION_ID}, {"$set": {"Done": True}}, upsert=True
+            )
+            return MigrationReport(report.files, report.inserted, report.skipped, True)
+
+        loaded: List[_Loaded] = _load_relations(db, files)
+        inserted: int = _insert_new(
+            db[SOURCE_COLLECTION],
+            [source_document(*entry) for entry in loaded if entry is not None],
+        )
+        after = files[-1]["_id"]
+        checkpoints.update_one(
+            {"_id": MIGRATION_ID},
+            {"$set": {"After": after, "Done": False}},
+            upsert=True,
+        )
+        report = MigrationReport(
+            report.files + len(files),
+            report.inserted + inserted,
+            report.skipped + loaded.count(None),
+        )
+
+
+def main() -> None:
+    """Migrate the configured database to the embedded schema."""
+
+    parser = argparse.ArgumentParser(description="Migrate to the embedded schema.")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH)
+    parser.add_argument("--restart", action="store_true", help="read every file again")
+    arguments = parser.parse_args()
+
+    try:
+        report: MigrationReport = migrate(
+            get_database(), arguments.batch_size, arguments.restart
+        )
+    except PyMongoError as error:
+        parser.exit(1, f"Stopped: {error}. Re-run to resume.\n")
+    print(
+        f"read {report.files} files, created {report.inserted} sources, "
+        f"skipped {report.skipped} incomplete relations"
+    )
+
+
+if __name__ == "__main__":
+    main()
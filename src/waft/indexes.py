@@ -0,0 +1,451 @@
+"""Index management for the Wiki-App-DB collections.
+
+Every query in :mod:`waft.database` filters or joins on a field other than
+``_id``. Without an index each of them is a collection scan whose cost grows
+with the catalogue. This module declares the indexes those queries need,
+creates them idempotently, reports any that are missing from a deployment,
+and summarises ``explain()`` output of the hot queries so that index use can
+be verified.
+
+Functions
+---------
+ensure_indexes
+    Create every declared index that does not exist yet.
+merge_duplicates
+    Merge the documents that share a natural key.
+missing_indexes
+    Return the declared indexes a database does not have.
+explain_hot_queries
+    Summarise the query plans of the lookups ``waft`` performs.
+
+Examples
+--------
+::
+
+    $ python -m waft.indexes            # report missing indexes
+    $ python -m waft.indexes --create   # create them
+    $ python -m waft.indexes --explain  # show the plans of the hot queries
+"""
+
+import argparse
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.errors import OperationFailure, PyMongoError
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """A declared index.
+
+    Attributes
+    ----------
+    collection : str
+        Name of the indexed collection.
+    keys : Tuple[Tuple[str, int], ...]
+        Indexed fields and their directions, in index order.
+    unique : bool
+        Whether the fields are a natural key, which no two documents share.
+    """
+
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+
+    @property
+    def name(self) -> str:
+        """Return the name MongoDB gives the index by default.
+
+        Unique indexes are suffixed with ``_unique``, so that they can be
+        built next to the non-unique index on the same keys they replace.
+        """
+
+        name: str = "_".join(f"{field}_{direction}" for field, direction in self.keys)
+        return f"{name}_unique" if self.unique else name
+
+
+# Indexes backing the lookups in `waft.database`. The compound indexes on the
+# join collections also cover the field read after the join. The natural keys
+# of tracks, albums and artists are unique, so that concurrent uploads cannot
+# insert the same document twice; their leading ``Name`` serves name lookups.
+INDEXES: Tuple[IndexSpec, ...] = (
+    IndexSpec(
+        "Track",
+        (("Name", ASCENDING), ("ReleaseDate", ASCENDING), ("Duration", ASCENDING)),
+        unique=True,
+    ),
+    IndexSpec(
+        "Album", (("Name", ASCENDING), ("CoverImageLink", ASCENDING)), unique=True
+    ),
+    IndexSpec("Artist", (("Name", ASCENDING),), unique=True),
+    IndexSpec("On", (("TrackID", ASCENDING), ("AlbumID", ASCENDING))),
+    IndexSpec("Records", (("TrackID", ASCENDING), ("ArtistID", ASCENDING))),
+    IndexSpec("File", (("TrackID", ASCENDING),)),
+    IndexSpec("File", (("SpotifyID", ASCENDING),)),
+    IndexSpec("File", (("SyncID", ASCENDING),)),
+    IndexSpec("Track", (("SpotifyID", ASCENDING),)),
+    IndexSpec("File", (("SourceLink", ASCENDING),)),
+    # The embedded schema, see `waft.embedded`.
+    IndexSpec("Source", (("SpotifyID", ASCENDING),)),
+    IndexSpec("Source", (("SyncID", ASCENDING),)),
+    IndexSpec("Source", (("SourceLink", ASCENDING),)),
+    IndexSpec(
+        "Source", (("SearchKey.Track", ASCENDING), ("SearchKey.Album", ASCENDING))
+    ),
+)
+
+# The fields referring to the documents of each collection with a natural key,
+# which merging duplicates must repoint.
+REFERENCES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "Track": (("On", "TrackID"), ("Records", "TrackID"), ("File", "TrackID")),
+    "Album": (("On", "AlbumID"),),
+    "Artist": (("Records", "ArtistID"),),
+}
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    """The parts of an ``explain()`` result that show how a query ran.
+
+    Attributes
+    ----------
+    query : str
+        Description of the explained query.
+    stages : Tuple[str, ...]
+        Plan stages, e.g. ``"IXSCAN"`` or ``"COLLSCAN"``, outermost first.
+    indexes : Tuple[str, ...]
+        Names of the indexes used.
+    """
+
+    query: str
+    stages: Tuple[str, ...]
+    indexes: Tuple[str, ...]
+
+    @property
+    def collection_scan(self) -> bool:
+        """Return whether any part of the query scans a whole collection."""
+
+        return "COLLSCAN" in self.stages
+
+    def __str__(self) -> str:
+        indexes: str = ", ".join(self.indexes) or "no index"
+        return f"{self.query}: {' > '.join(self.stages) or '?'} ({indexes})"
+
+
+def ensure_indexes(db: Database) -> List[str]:
+    """Create every declared index that does not exist yet.
+
+    Creating an index that already exists is a no-op, so this is safe to call
+    on every connect. An index declared unique replaces a non-unique index on
+    the same keys, once the documents sharing a key have been merged (see
+    :func:`merge_duplicates`); the non-unique index is only dropped after its
+    replacement is built. An index that cannot be created does not prevent
+    the others from being created.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+
+    Returns
+    -------
+    List[str]
+        Names of the indexes that were missing and have been created.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If the indexes cannot be listed, or once every other index has been
+        created, the error of the first index that could not be, e.g. for
+        lack of privileges.
+    """
+
+    created: List[str] = []
+    errors: List[PyMongoError] = []
+    for spec in missing_indexes(db):
+        try:
+            _create_index(db, spec)
+        except PyMongoError as error:
+            errors.append(error)
+        else:
+            created.append(spec.name)
+    if errors:
+        raise errors[0]
+    return created
+
+
+def _create_index(db: Database, spec: IndexSpec) -> None:
+    """Create a declared index, replacing a non-unique one on its keys."""
+
+    collection: Collection = db[spec.collection]
+    model: IndexModel = IndexModel(list(spec.keys), name=spec.name, unique=spec.unique)
+    if spec.unique:
+        merge_duplicates(db, spec)
+    replaced: Optional[Tuple[str, bool]] = _existing_indexes(db, spec.collection).get(
+        spec.keys
+    )
+    if replaced is None:
+        collection.create_indexes([model])
+        return
+    try:
+        collection.create_indexes([model])
+    except OperationFailure:
+        # Deployments that refuse two indexes on the same keys: swap them,
+        # restoring the old index if the new one cannot be built.
+        collection.drop_index(replaced[0])
+        try:
+            collection.create_indexes([model])
+        except PyMongoError:
+            collection.create_indexes([IndexModel(list(spec.keys), name=replaced[0])])
+            raise
+        return
+    collection.drop_index(replaced[0])
+
+
+def merge_duplicates(db: Database, spec: IndexSpec) -> int:
+    """Merge the documents that share the keys of a unique index.
+
+    Databases written before the natural keys were unique may hold several
+    documents for the same track, album or artist. The oldest of them is
+    kept, completed with the fields only the others have, and every
+    reference to the others (see :data:`REFERENCES`) is repointed to it.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+    spec : IndexSpec
+        The unique index about to be created.
+
+    Returns
+    -------
+    int
+        Number of documents merged into another and deleted.
+    """
+
+    collection: Collection = db[spec.collection]
+    groups: List[Dict[str, Any]] = list(
+        collection.aggregate(
+            [
+                {
+                    "$group": {
+                        "_id": {field: f"${field}" for field, _ in spec.keys},
+                        "ids": {"$push": "$_id"},
+                        "count": {"$sum": 1},
+                    }
+                },
+                {"$match": {"count": {"$gt": 1}}},
+            ]
+        )
+    )
+    merged: int = 0
+    for group in groups:
+        documents: List[Dict[str, Any]] = list(
+            collection.find({"_id": {"$in": group["ids"]}}).sort("_id", ASCENDING)
+        )
+        keeper: Dict[str, Any] = documents[0]
+        duplicates: List[Any] = [document["_id"] for document in documents[1:]]
+        fields: Dict[str, Any] = {
+            key: value
+            for document in reversed(documents[1:])
+            for key, value in document.items()
+            if key not in keeper
+        }
+        if fields:
+            collection.update_one({"_id": keeper["_id"]}, {"$set": fields})
+        for referring, field in REFERENCES.get(spec.collection, ()):
+            db[referring].update_many(
+                {field: {"$in": duplicates}}, {"$set": {field: keeper["_id"]}}
+            )
+        collection.delete_many({"_id": {"$in": duplicates}})
+        merged += len(duplicates)
+    return merged
+
+
+def _existing_indexes(
+    db: Database, collection: str
+) -> Dict[Tuple[Tuple[str, int], ...], Tuple[str, bool]]:
+    """Return the name and uniqueness of a collection's indexes by keys."""
+
+    return {
+        tuple((field, int(direction)) for field, direction in info["key"]): (
+            name,
+            bool(info.get("unique", False)),
+        )
+        for name, info in db[collection].index_information().items()
+    }
+
+
+def missing_indexes(db: Database) -> List[IndexSpec]:
+    """Return the declared indexes ``db`` does not have.
+
+    An existing index on the same keys counts as present, whatever its name,
+    unless the declared index is unique and the existing one is not.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+
+    Returns
+    -------
+    List[IndexSpec]
+        The missing indexes, in declaration order.
+    """
+
+    existing: Dict[str, Dict[Tuple[Tuple[str, int], ...], Tuple[str, bool]]] = {}
+    missing: List[IndexSpec] = []
+    for spec in INDEXES:
+        if spec.collection not in existing:
+            existing[spec.collection] = _existing_indexes(db, spec.collection)
+        found: Optional[Tuple[str, bool]] = existing[spec.collection].get(spec.keys)
+        if found is None or (spec.unique and not found[1]):
+            missing.append(spec)
+    return missing
+
+
+def _walk(document: Any) -> Iterator[Tuple[str, Any]]:
+    """Yield every key/value pair nested in an explain document.
+
+    Rejected plans are skipped, as they do not describe how the query ran.
+    """
+
+    if isinstance(document, dict):
+        for key, value in document.items():
+            if key == "rejectedPlans":
+                continue
+            yield key, value
+            yield from _walk(value)
+    elif isinstance(document, list):
+        for item in document:
+            yield from _walk(item)
+
+
+def summarize_plan(query: str, explained: Dict[str, Any]) -> PlanSummary:
+    """Extract the plan stages and indexes from an ``explain()`` result.
+
+    Only the winning plan is considered; rejected plans are ignored.
+
+    Parameters
+    ----------
+    query : str
+        Description of the explained query.
+    explained : Dict[str, Any]
+        The ``explain()`` result of a ``find`` or an aggregation.
+
+    Returns
+    -------
+    PlanSummary
+        The stages and indexes of the winning plan.
+    """
+
+    stages: List[str] = []
+    indexes: List[str] = []
+    for key, value in _walk(explained):
+        if key == "stage" and isinstance(value, str):
+            stages.append(value)
+        elif key == "indexName" and isinstance(value, str):
+            indexes.append(value)
+        elif key == "indexesUsed" and isinstance(value, list):
+            indexes.extend(str(name) for name in value)
+    return PlanSummary(query, tuple(stages), tuple(dict.fromkeys(indexes)))
+
+
+def explain_hot_queries(
+    db: Database, track: str = "", album: str = "", artist: str = ""
+) -> List[PlanSummary]:
+    """Summarise the query plans of the lookups ``waft`` performs.
+
+    Parameters
+    ----------
+    db : Database
+        The application database.
+    track : str
+        Track name to explain the queries with.
+    album : str
+        Album name to explain the queries with.
+    artist : str
+        Artist name to explain the queries with.
+
+    Returns
+    -------
+    List[PlanSummary]
+        One summary per query, including the ``get_yt_url`` aggregation.
+
+    Raises
+    ------
+    pymongo.errors.PyMongoError
+        If a query cannot be explained.
+    """
+
+    # Imported here as `waft.database` provisions indexes through this module.
+    # pylint: disable-next=import-outside-toplevel
+    from waft.database import source_link_pipeline
+
+    # pylint: disable-next=import-outside-toplevel
+    from waft.embedded import search_key
+
+    finds: List[Tuple[str, str, Dict[str, Any]]] = [
+        ("Track by name", "Track", {"Name": track}),
+        ("Album by name", "Album", {"Name": album}),
+        ("Artist by name", "Artist", {"Name": artist}),
+        ("On by track", "On", {"TrackID": None}),
+        ("Records by track", "Records", {"TrackID": None}),
+        ("File by track", "File", {"TrackID": None}),
+        ("File by Spotify ID", "File", {"SpotifyID": None}),
+        ("Source by Spotify ID", "Source", {"SpotifyID": None}),
+        (
+            "Source by names",
+            "Source",
+            {
+                "SearchKey.Track": search_key(track),
+                "SearchKey.Album": search_key(album),
+            },
+        ),
+    ]
+    summaries: List[PlanSummary] = [
+        summarize_plan(query, db[collection].find(filter_).explain())
+        for query, collection, filter_ in finds
+    ]
+    summaries.append(
+        summarize_plan(
+            "get_yt_url aggregation",
+            db.command(
+                "aggregate",
+                "Track",
+                pipeline=source_link_pipeline(track, album, [artist]),
+                explain=True,
+            ),
+        )
+    )
+    return summaries
+
+
+def main() -> None:
+    """Report, create, or explain the indexes of the configured database."""
+
+    # Imported here as `waft.database` provisions indexes through this module.
+    # pylint: disable-next=import-outside-toplevel
+    from waft.database import get_database
+
+    parser = argparse.ArgumentParser(description="Manage Wiki-App-DB indexes.")
+    parser.add_argument("--create", action="store_true", help="create missing")
+    parser.add_argument("--explain", action="store_true", help="explain queries")
+    arguments = parser.parse_args()
+
+    db: Database = get_database()
+    if arguments.create:
+        for name in ensure_indexes(db):
+            print(f"created {name}")
+    for spec in missing_indexes(db):
+        print(f"missing {spec.collection}.{spec.name}")
+    if arguments.explain:
+        for summary in explain_hot_queries(db):
+            print(summary)
+
+
+if __name__ == "__main__":
+    main()
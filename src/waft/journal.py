@@ -0,0 +1,389 @@
+"""Durable write-behind queue for database uploads.
+
+Uploading a relation after a download costs several MongoDB round trips and
+fails outright while the deployment is unreachable. Instead, relations are
+appended to a journal on disk, which returns once the entry is on stable
+storage, and a background flusher uploads them in batches, retrying with
+exponential backoff until the deployment accepts them.
+
+The journal is a J.S.O.N. Lines file of two kinds of entries:
+``{"seq": n, "relation": {...}}`` records a relation to upload, and
+``{"ack": n}`` records that relation ``n`` has been uploaded. Relations
+without an acknowledgement are replayed at start-up. Uploads are idempotent
+(see :func:`waft.database.upload_relations`), so a relation uploaded just
+before a crash, but not acknowledged, is harmlessly uploaded again. The file
+is truncated whenever every relation in it has been acknowledged.
+
+A batch that fails for a reason retrying cannot fix, such as a document the
+deployment rejects, is uploaded again one relation at a time. Relations that
+still fail are set aside in a second journal, ``uploads.failed.jsonl``, with
+the error, and acknowledged, so that they do not block the relations queued
+behind them.
+
+Classes
+-------
+UploadJournal
+    Append-only on-disk journal of relations waiting to be uploaded.
+UploadQueue
+    The write-behind queue and its background flusher.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pymongo.errors import (ConnectionFailure, ExecutionTimeout, PyMongoError,
+                            WTimeoutError)
+
+from waft.config import state_directory
+from waft.database import Relation, upload_relations
+from waft.datatypes import (Album, Artist, FullMetadata, Track,
+                            UploadQueueStats)
+
+# Relations uploaded per flush.
+FLUSH_BATCH: int = 50
+
+# Seconds waited after the first failed flush; doubled after each failure.
+INITIAL_BACKOFF: float = 1.0
+
+# Longest wait, in seconds, between two flush attempts.
+MAX_BACKOFF: float = 60.0
+
+# Labels the server attaches to errors that a retry may not repeat.
+TRANSIENT_LABELS: Tuple[str, ...] = ("RetryableWriteError", "TransientTransactionError")
+
+LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+def journal_path() -> Path:
+    """Return the default location of the upload journal."""
+
+    return state_directory() / "uploads.jsonl"
+
+
+def encode_relation(relation: Relation) -> Dict[str, Any]:
+    """Convert a relation into a J.S.O.N. serialisable dictionary."""
+
+    metadata, yt_link, file_hash = relation
+    return {"metadata": asdict(metadata), "link": yt_link, "hash": file_hash}
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return whether a failed upload may succeed if retried unchanged.
+
+    Network errors, timeouts, errors the server labels as retryable, and
+    SQLite operational errors, such as a locked database, are transient;
+    any other error, such as a validation or duplicate key error, or a
+    relation that cannot be encoded, is not.
+    """
+
+    if isinstance(error, (ConnectionFailure, ExecutionTimeout, WTimeoutError)):
+        return True
+    if isinstance(error, PyMongoError):
+        return any(error.has_error_label(label) for label in TRANSIENT_LABELS)
+    return isinstance(error, sqlite3.OperationalError)
+
+
+def decode_relation(data: Dict[str, Any]) -> Relation:
+    """Rebuild a relation from the output of :func:`encode_relation`."""
+
+    metadata: Dict[str, Any] = data["metadata"]
+    return (
+        FullMetadata(
+            Album(**metadata["album"]),
+            [Artist(**artist) for artist in metadata["artists"]],
+            Track(**metadata["track"]),
+        ),
+        data["link"],
+        data["hash"],
+    )
+
+
+class UploadJournal:
+    """Append-only on-disk journal of relations waiting to be uploaded.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the journal file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self.failed_path: Path = path.with_name(f"{path.stem}.failed{path.suffix}")
+        self.next_seq: int = 0
+        self.unacknowledged: int = 0
+        self._file: Optional[IO[str]] = None
+
+    def replay(self) -> List[Tuple[int, Relation]]:
+        """Return the relations that have not been acknowledged.
+
+        A torn final line, left by a crash during an append, is ignored.
+
+        Returns
+        -------
+        List[Tuple[int, Relation]]
+            Sequence numbers and relations, in the order they were appended.
+        """
+
+        pending: Dict[int, Relation] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        entry: Dict[str, Any] = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "ack" in entry:
+                        pending.pop(entry["ack"], None)
+                    else:
+                        pending[entry["seq"]] = decode_relation(entry["relation"])
+                        self.next_seq = max(self.next_seq, entry["seq"] + 1)
+        self.unacknowledged = len(pending)
+        return sorted(pending.items(), key=lambda item: item[0])
+
+    def _write(self, entries: List[Dict[str, Any]]) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, relation: Relation) -> int:
+        """Durably record a relation to upload.
+
+        Parameters
+        ----------
+        relation : Relation
+            The relation to upload.
+
+        Returns
+        -------
+        int
+            The sequence number identifying the entry.
+        """
+
+        seq: int = self.next_seq
+        self._write([{"seq": seq, "relation": encode_relation(relation)}])
+        self.next_seq += 1
+        self.unacknowledged += 1
+        return seq
+
+    def set_aside(self, failures: List[Tuple[int, Relation, str]]) -> None:
+        """Record relations that cannot be uploaded, and acknowledge them.
+
+        The relations are appended to :attr:`failed_path` with their error,
+        where they can be inspected and re-queued by hand.
+
+        Parameters
+        ----------
+        failures : List[Tuple[int, Relation, str]]
+            Sequence numbers, relations, and the errors they failed with.
+        """
+
+        if not failures:
+            return
+        self.failed_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.failed_path.open("a", encoding="utf-8") as failed:
+            failed.write(
+                "".join(
+                    json.dumps(
+                        {
+                            "seq": seq,
+                            "relation": encode_relation(relation),
+                            "error": error,
+                        }
+                    )
+                    + "\n"
+                    for seq, relation, error in failures
+                )
+            )
+            failed.flush()
+            os.fsync(failed.fileno())
+        self.acknowledge([seq for seq, _, _ in failures])
+
+    def acknowledge(self, seqs: List[int]) -> None:
+        """Record that relations have been uploaded.
+
+        The journal is truncated once no relation in it is unacknowledged.
+
+        Parameters
+        ----------
+        seqs : List[int]
+            Sequence numbers of the uploaded relations.
+        """
+
+        self.unacknowledged -= len(seqs)
+        if self.unacknowledged > 0:
+            self._write([{"ack": seq} for seq in seqs])
+            return
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Close the journal file."""
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class UploadQueue:
+    """Write-behind queue of relations, flushed in the background.
+
+    Entries still in the journal from a previous run are queued on
+    construction.
+
+    Parameters
+    ----------
+    journal : UploadJournal
+        The journal entries are recorded in.
+    upload : Callable[[List[Relation]], None]
+        Uploads a batch of relations, such as
+        :meth:`waft.backends.StorageBackend.upload`.
+    batch_size : int
+        Relations uploaded per flush.
+    clock : Callable[[], float]
+        Monotonic source of time in seconds, for flush latencies.
+    """
+
+    def __init__(
+        self,
+        journal: UploadJournal,
+        upload: Callable[[List[Relation]], None] = upload_relations,
+        batch_size: int = FLUSH_BATCH,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.journal: UploadJournal = journal
+        self.upload: Callable[[List[Relation]], None] = upload
+        self.batch_size: int = batch_size
+        self.clock: Callable[[], float] = clock
+        self.pending: List[Tuple[int, Relation]] = journal.replay()
+        self.stats: UploadQueueStats = UploadQueueStats(depth=len(self.pending))
+        self._wake: asyncio.Event = asyncio.Event()
+
+    def enqueue(self, relation: Relation) -> None:
+        """Record a relation in the journal and queue it for upload.
+
+        Parameters
+        ----------
+        relation : Relation
+            The relation to upload.
+        """
+
+        self.pending.append((self.journal.append(relation), relation))
+        self.stats = replace(self.stats, depth=len(self.pending))
+        self._wake.set()
+
+    def _failed_attempt(self) -> bool:
+        self.stats = replace(
+            self.stats, depth=len(self.pending), failures=self.stats.failures + 1
+        )
+        return False
+
+    async def flush(self) -> bool:
+        """Upload the next batch of queued relations.
+
+        A batch rejected for a reason other than a transient error (see
+        :func:`is_transient`) is retried one relation at a time, and the
+        relations that fail again are set aside.
+
+        Returns
+        -------
+        bool
+            Whether the batch was uploaded or set aside, or there was nothing
+            to upload; ``False`` after a transient error.
+        """
+
+        batch: List[Tuple[int, Relation]] = self.pending[: self.batch_size]
+        if not batch:
+            return True
+        start: float = self.clock()
+        try:
+            await asyncio.to_thread(self.upload, [relation for _, relation in batch])
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            if is_transient(error):
+                return self._failed_attempt()
+            LOGGER.warning("Upload batch rejected, retrying one by one: %r", error)
+            return await self._isolate(batch)
+        latency: float = self.clock() - start
+        self.journal.acknowledge([seq for seq, _ in batch])
+        del self.pending[: len(batch)]
+        self.stats = replace(
+            self.stats, depth=len(self.pending), flush_latency=latency, failures=0
+        )
+        return True
+
+    async def _isolate(self, batch: List[Tuple[int, Relation]]) -> bool:
+        """Upload a rejected batch one relation at a time.
+
+        Relations that fail with a non-transient error are set aside; a
+        transient error stops the attempt, keeping the rest of the batch
+        queued.
+        """
+
+        uploaded: List[int] = []
+        failures: List[Tuple[int, Relation, str]] = []
+        transient: bool = False
+        for seq, relation in batch:
+            try:
+                await asyncio.to_thread(self.upload, [relation])
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if is_transient(error):
+                    transient = True
+                    break
+                LOGGER.error("Setting aside upload %d: %r", seq, error)
+                failures.append((seq, relation, repr(error)))
+            else:
+                uploaded.append(seq)
+
+        self.journal.set_aside(failures)
+        if uploaded:
+            self.journal.acknowledge(uploaded)
+        done: Set[int] = set(uploaded) | {seq for seq, _, _ in failures}
+        self.pending = [entry for entry in self.pending if entry[0] not in done]
+        self.stats = replace(self.stats, failed=self.stats.failed + len(failures))
+        if transient:
+            return self._failed_attempt()
+        self.stats = replace(self.stats, depth=len(self.pending), failures=0)
+        return True
+
+    async def run(self, notify: Callable[[UploadQueueStats], None]) -> None:
+        """Flush queued relations forever, backing off after failures.
+
+        An unexpected error, e.g. while writing the journal, is logged and
+        counts as a failed flush; it never ends the flusher.
+
+        Parameters
+        ----------
+        notify : Callable[[UploadQueueStats], None]
+            Called with the new statistics after every flush attempt.
+        """
+
+        while True:
+            if not self.pending:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            try:
+                flushed: bool = await self.flush()
+            except Exception:  # pylint: disable=broad-exception-caught
+                LOGGER.exception("Flushing the upload queue failed")
+                flushed = self._failed_attempt()
+            notify(self.stats)
+            if not flushed:
+                await asyncio.sleep(
+                    min(MAX_BACKOFF, INITIAL_BACKOFF * 2 ** (self.stats.failures - 1))
+                )
+
+    def close(self) -> None:
+        """Close the journal; unflushed relations are replayed next run."""
+
+        self.journal.close()
@@ -3,7 +3,8 @@
 This module wraps the `securecredentials` library to provide a portable,
 encrypted credential store for the application. It is used to load
 previously saved credentials at startup and to persist new ones supplied
-by the user.
+by the user. The most recent Spotify access token is stored alongside them
+so that a warm start can skip the token request entirely.
 
 Notes
 -----
@@ -11,11 +12,15 @@ Notes
   marked with ``type: ignore``.
 """
 
+import json
 from typing import Optional, Tuple
 
 from securecredentials import SecureCredentials  # type: ignore[import-untyped]
 from securecredentials.exceptions import (  # type: ignore[import-untyped]
-    MasterDatabaseNotFoundError, UserDatabaseNotFoundError)
+    FieldDecryptionError, MasterDatabaseNotFoundError,
+    SecureFieldNotFoundError, UserDatabaseNotFoundError)
+
+from waft.datatypes import AccessToken
 
 
 def retrieve_credentials() -> Optional[Tuple[str, str, str]]:
@@ -68,3 +73,62 @@ def store_credentials(client_id: str, client_secret: str, youtube_api_key: str)
     SecureCredentials.set_secure(field="SPOTIFY ID", plaintext=client_id)
     SecureCredentials.set_secure(field="SPOTIFY SECRET", plaintext=client_secret)
     SecureCredentials.set_secure(field="YOUTUBE KEY", plaintext=youtube_api_key)
+
+
+def retrieve_token(client_id: str) -> Optional[AccessToken]:
+    """Retrieve the persisted Spotify access token for ``client_id``.
+
+    Parameters
+    ----------
+    client_id : str
+        The Spotify Client ID the token must have been issued to. Tokens
+        stored for a different client are ignored.
+
+    Returns
+    -------
+    AccessToken | None
+        The stored token and its expiry, or ``None`` if no usable token
+        has been stored.
+    """
+
+    try:
+        stored: str = SecureCredentials.get_secure("SPOTIFY TOKEN")
+    except (
+        FieldDecryptionError,
+        MasterDatabaseNotFoundError,
+        SecureFieldNotFoundError,
+        UserDatabaseNotFoundError,
+    ):
+        return None
+
+    try:
+        record = json.loads(stored)
+        if record["client_id"] != client_id:
+            return None
+        return AccessToken(record["access_token"], float(record["expires_at"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def store_token(client_id: str, token: AccessToken) -> None:
+    """Persist a Spotify access token issued to ``client_id``.
+
+    Parameters
+    ----------
+    client_id : str
+        The Spotify Client ID the token was issued to.
+    token : AccessToken
+        The token and expiry to store. Any previously stored token is
+        overwritten without confirmation.
+    """
+
+    record: str = json.dumps(
+        {
+            "client_id": client_id,
+            "access_token": token.value,
+            "expires_at": token.expires_at,
+        }
+    )
+    SecureCredentials.set_secure(
+        field="SPOTIFY TOKEN", plaintext=record, user_confirmation=False
+    )
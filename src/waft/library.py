@@ -0,0 +1,320 @@
+"""Local index of the tracks in the downloads folder.
+
+Before a track is downloaded, the application checks whether it, or the
+same source, was already downloaded, so that a repeated request completes
+without fetching and transcoding the audio again. The index keeps, for
+every MP3 file in the downloads folder, its hash and, when the application
+downloaded it, the Spotify track ID and source link it was downloaded for.
+
+Files are found by track ID or source link directly, and by hash for the
+files the database knows for a track (see
+:meth:`waft.backends.StorageBackend.file_hashes`), which also covers files
+downloaded before the index existed once :meth:`LibraryIndex.scan` has
+hashed them.
+
+An entry is only returned while its file is unchanged on disk; entries
+whose file was moved, deleted or modified are dropped when looked up.
+
+Classes
+-------
+LibraryEntry
+    A file in the downloads folder.
+LibraryIndex
+    SQLite index of the files in the downloads folder.
+
+Functions
+---------
+library_path
+    Return the default location of the index.
+copy_track
+    Copy a downloaded file for another track, and tag it for that track.
+"""
+
+import shutil
+import sqlite3
+import threading
+from asyncio import to_thread
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Collection, List, Optional, Set, Tuple
+
+from waft.config import cache_directory
+from waft.datatypes import DisplayedTrack
+from waft.metadata import write_metadata
+from waft.utils import hash_file
+
+
+def library_path() -> Path:
+    """Return the default location of the library index."""
+
+    return cache_directory() / "library.db"
+
+
+@dataclass(frozen=True)
+class LibraryEntry:
+    """A file in the downloads folder.
+
+    Attributes
+    ----------
+    path : Path
+        Location of the MP3 file.
+    file_hash : str
+        S.H.A.-256 hash of the file, as stored in the database.
+    track_id : str | None
+        Spotify ID of the track the file was downloaded for, if known.
+    source_link : str | None
+        YouTube U.R.L. the file was downloaded from, if known.
+    """
+
+    path: Path
+    file_hash: str
+    track_id: Optional[str]
+    source_link: Optional[str]
+
+
+class LibraryIndex:
+    """SQLite index of the files in the downloads folder.
+
+    The database is opened lazily on first use and may be shared between
+    threads.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite database file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Size and modification time tell whether the hash is still valid.
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY,"
+                " hash TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime REAL NOT NULL,"
+                " track_id TEXT,"
+                " source_link TEXT)"
+            )
+            for column in ("hash", "track_id", "source_link"):
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS files_{column} ON files ({column})"
+                )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, float]]:
+        """Return the size and modification time of a file, if it exists."""
+
+        try:
+            status = path.stat()
+        except OSError:
+            return None
+        return status.st_size, status.st_mtime
+
+    def add(
+        self,
+        path: Path,
+        file_hash: str,
+        track_id: Optional[str] = None,
+        source_link: Optional[str] = None,
+    ) -> None:
+        """Record a file, updating any entry for the same path.
+
+        An entry updated without a track ID or source link keeps the ones it
+        had, e.g. when a scan finds that a downloaded file was re-tagged.
+
+        Parameters
+        ----------
+        path : Path
+            Location of the MP3 file, which must exist.
+        file_hash : str
+            Hash of the file, from :func:`waft.utils.hash_file`.
+        track_id : str | None
+            Spotify ID of the track the file is for.
+        source_link : str | None
+            YouTube U.R.L. the file was downloaded from.
+        """
+
+        signature: Optional[Tuple[int, float]] = self._signature(path)
+        if signature is None:
+            return
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (path) DO UPDATE SET"
+                    " hash = excluded.hash,"
+                    " size = excluded.size,"
+                    " mtime = excluded.mtime,"
+                    " track_id = coalesce(excluded.track_id, track_id),"
+                    " source_link = coalesce(excluded.source_link, source_link)",
+                    (str(path), file_hash, *signature, track_id, source_link),
+                )
+
+    def find(
+        self,
+        track_id: Optional[str] = None,
+        source_link: Optional[str] = None,
+        hashes: Collection[str] = (),
+    ) -> Optional[LibraryEntry]:
+        """Return a file for a track, a source link, or any of some hashes.
+
+        Files recorded for ``track_id`` are preferred, then those downloaded
+        from ``source_link``, then those with one of ``hashes``.
+
+        Parameters
+        ----------
+        track_id : str | None
+            Spotify ID of the track.
+        source_link : str | None
+            YouTube U.R.L. of the source.
+        hashes : Collection[str]
+            Hashes of files stored for the track.
+
+        Returns
+        -------
+        LibraryEntry | None
+            An unchanged file on disk, or ``None`` if there is none.
+        """
+
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        if track_id is not None:
+            conditions.append("track_id = ?")
+            parameters.append(track_id)
+        if source_link is not None:
+            conditions.append("source_link = ?")
+            parameters.append(source_link)
+        if hashes:
+            conditions.append(f"hash IN ({', '.join('?' * len(hashes))})")
+            parameters.extend(hashes)
+        if not conditions:
+            return None
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            rows: List[Tuple[Any, ...]] = connection.execute(
+                "SELECT path, hash, size, mtime, track_id, source_link FROM files"
+                f" WHERE {' OR '.join(conditions)}"
+                " ORDER BY track_id IS NOT ?, source_link IS NOT ?",
+                (*parameters, track_id, source_link),
+            ).fetchall()
+            for path, file_hash, size, mtime, found_id, found_link in rows:
+                if self._signature(Path(path)) == (size, mtime):
+                    return LibraryEntry(Path(path), file_hash, found_id, found_link)
+                with connection:
+                    connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        return None
+
+    def scan(self, folder: Path) -> int:
+        """Index the MP3 files in a folder that are new or have changed.
+
+        Files already indexed and unchanged keep their entry, including the
+        track ID and source link recorded when they were downloaded; entries
+        of files that no longer exist are dropped.
+
+        Parameters
+        ----------
+        folder : Path
+            The downloads folder, searched recursively.
+
+        Returns
+        -------
+        int
+            The number of files hashed.
+        """
+
+        with self._lock:
+            indexed = {
+                path: (size, mtime)
+                for path, size, mtime in self._connect().execute(
+                    "SELECT path, size, mtime FROM files"
+                )
+            }
+
+        hashed: int = 0
+        present: Set[str] = set()
+        for path in folder.rglob("*.mp3") if folder.is_dir() else []:
+            present.add(str(path))
+            if indexed.get(str(path)) == self._signature(path):
+                continue
+            try:
+                file_hash: str = hash_file(path)
+            except OSError:
+                continue
+            self.add(path, file_hash)
+            hashed += 1
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "DELETE FROM files WHERE path = ?",
+                    [(path,) for path in indexed if path not in present],
+                )
+        return hashed
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+async def copy_track(
+    source: Path,
+    destination: Path,
+    data: DisplayedTrack,
+    image_url: str,
+    image_data: Optional[bytes] = None,
+) -> Path:
+    """Copy a downloaded file for another track, and tag it for that track.
+
+    This replaces a download when the same source was already downloaded
+    for another track, e.g. the same recording on another release, and
+    costs neither the download nor the transcoding.
+
+    Parameters
+    ----------
+    source : Path
+        The MP3 file already downloaded.
+    destination : Path
+        The file path of the copy (without extension), as for
+        :func:`waft.ytdlp.download_track`.
+    data : DisplayedTrack
+        Track metadata to embed in the copy.
+    image_url : str
+        U.R.L. of the album artwork to embed in the copy.
+    image_data : bytes | None
+        The artwork at ``image_url`` if it was already downloaded.
+
+    Returns
+    -------
+    Path
+        Path of the copy.
+    """
+
+    target: Path = Path(f"{destination}.mp3")
+
+    def copy_and_tag() -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if source != target:
+            shutil.copyfile(source, target)
+        write_metadata(destination, data, image_url, image_data)
+
+    await to_thread(copy_and_tag)
+    return target
@@ -9,10 +9,14 @@ Authenticating
     Indicates that an authentication workflow has started or ended.
 UpdateStatus
     Carries text for updating the application's status display.
+UploadQueueChanged
+    Carries the depth and flush latency of the upload queue.
 """
 
 from textual.message import Message
 
+from waft.datatypes import UploadQueueStats
+
 
 class Authenticating(Message):
     """Message indicating a change to the authentication workflow state.
@@ -105,6 +109,46 @@ class SearchRequest(Message):
         self.mode = mode
 
 
+class ResultHighlighted(Message):
+    """Message indicating that the cursor moved to a search result.
+
+    This message is dispatched when a row of the search results list is
+    highlighted, so that the application can prefetch what downloading the
+    result would need.
+    """
+
+    def __init__(self, index: int) -> None:
+        """Construct a result-highlighted message.
+
+        Parameters
+        ----------
+        index : int
+            Index of the highlighted result.
+        """
+
+        super().__init__()
+        self.index = index
+
+
+class LoadMoreResults(Message):
+    """Message requesting the next page of the current Spotify search.
+
+    This message is dispatched when the cursor approaches the end of the search
+    results list, so that further results can be appended before the user
+    reaches the bottom.
+    """
+
+    def __init__(self) -> None:  # pylint: disable=useless-parent-delegation
+        """Construct a load-more request message.
+
+        Notes
+        -----
+        Calling ``super().__init__()`` is required so that Textual correctly
+        handles this as a message.
+        """
+        super().__init__()
+
+
 class TrackSelected(Message):
     """Message indicating a track has been selected from search results.
 
@@ -166,3 +210,23 @@ class StartDownload(Message):
 
         super().__init__()
         self.url = url
+
+
+class UploadQueueChanged(Message):
+    """Message reporting the state of the database upload queue.
+
+    This message is dispatched by the background flusher after every flush
+    attempt, so that the status display can show the queue.
+    """
+
+    def __init__(self, stats: UploadQueueStats) -> None:
+        """Construct an upload-queue message.
+
+        Parameters
+        ----------
+        stats : UploadQueueStats
+            Depth and flush latency of the queue.
+        """
+
+        super().__init__()
+        self.stats = stats
@@ -6,6 +6,7 @@ to MP3 files after they have been downloaded.
 
 # from io import BytesIO
 from pathlib import Path
+from typing import Optional
 from urllib.request import urlopen
 
 import eyed3  # type: ignore
@@ -16,8 +17,38 @@ from waft.datatypes import DisplayedTrack
 
 # from PIL import Image
 
+# Seconds a cover art request may block on the network before failing.
+COVER_TIMEOUT: float = 10.0
 
-def write_metadata(path: Path, data: DisplayedTrack, image_url: str) -> None:
+
+def read_cover_art(image_url: str, timeout: float = COVER_TIMEOUT) -> bytes:
+    """Download album artwork.
+
+    Parameters
+    ----------
+    image_url : str
+        URL to the album artwork image.
+    timeout : float
+        Seconds to wait for the connection and for each read, so that a
+        stalled server cannot hold the calling thread indefinitely.
+
+    Returns
+    -------
+    bytes
+        The raw image data.
+
+    Raises
+    ------
+    OSError
+        If the image cannot be downloaded, including on timeout.
+    """
+
+    return urlopen(image_url, timeout=timeout).read()
+
+
+def write_metadata(
+    path: Path, data: DisplayedTrack, image_url: str, image_data: Optional[bytes] = None
+) -> None:
     """Write ID3 metadata tags and album artwork to an MP3 file.
 
     Embeds track title, artist, album name, and cover art into the MP3 file
@@ -33,6 +64,9 @@ def write_metadata(path: Path, data: DisplayedTrack, image_url: str) -> None:
         Track metadata containing title, artist, and album information.
     image_url : str
         URL to the album artwork image to embed in the MP3 file.
+    image_data : bytes | None
+        The artwork at ``image_url`` if it was already downloaded, in which
+        case it is not fetched again.
 
     Notes
     -----
@@ -51,7 +85,8 @@ def write_metadata(path: Path, data: DisplayedTrack, image_url: str) -> None:
     mp3_tags.save()
 
     # Read image data and rescale if nessessary.
-    image_data: bytes = urlopen(image_url).read()
+    if image_data is None:
+        image_data = read_cover_art(image_url)
     # image = Image.open(BytesIO(image_data), "r")  # type: ignore
     # image.thumbnail((480, 480))
     # image.save((buffer := BytesIO()), format=image.format)
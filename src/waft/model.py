@@ -8,12 +8,14 @@ Notes
 
 from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 from textual.message import Message
 
-from waft.datatypes import DisplayedTrack, YoutubeResult
-from waft.messages import Authenticating, SearchRequest, UpdateStatus
+from waft.datatypes import (DisplayedAlbum, DisplayedTrack, QueuedDownload,
+                            UploadQueueStats, YoutubeResult)
+from waft.messages import (Authenticating, SearchRequest, StartDownload,
+                           UpdateStatus, UploadQueueChanged)
 
 
 @dataclass(frozen=True)
@@ -30,10 +32,25 @@ class ApplicationModel:  # pylint: disable=too-many-instance-attributes
         Whether the application is currently performing an authentication
         workflow. Used to disable inputs, show spinners, and block
         additional submissions.
+    download_queue : List[QueuedDownload]
+        Downloads that have been requested but not yet started, in request
+        order.
+    known_sources : Dict[str, str]
+        Stored YouTube sources of the loaded search results, keyed by
+        Spotify track ID.
+    search_next_offset : int | None
+        Offset of the next page of results for ``search_query``, or ``None``
+        when every available result has been loaded.
     search_query : (str, str)
         TODO
+    search_results : List[DisplayedTrack | DisplayedAlbum]
+        Results loaded so far for ``search_query``; albums when searching
+        in album mode.
     status_message : str
         Text to display in the global status bar.
+    upload_queue : UploadQueueStats
+        Depth and flush latency of the database upload queue, shown in the
+        status bar.
     valid_credentials: bool
         Whether the application has confirmed that stored or newly provided
         credentials are valid for making Spotify API requests.
@@ -43,13 +60,17 @@ class ApplicationModel:  # pylint: disable=too-many-instance-attributes
     api_key: str
     authenticating: bool
     developer_key: str
+    download_queue: List[QueuedDownload]
     downloads_folder: Path
     url_found: bool
+    known_sources: Dict[str, str]
+    search_next_offset: Optional[int]
     search_query: Tuple[str, str]
-    search_results: List[DisplayedTrack]
+    search_results: List[Union[DisplayedTrack, DisplayedAlbum]]
     selection: DisplayedTrack
     suggestion_results: List[YoutubeResult]
     status_message: str
+    upload_queue: UploadQueueStats
     valid_credentials: bool
 
 
@@ -80,5 +101,12 @@ def update(model: ApplicationModel, message: Message) -> ApplicationModel:
             return replace(model, authenticating=state)
         case SearchRequest(query=query, mode=mode):
             return replace(model, search_query=(query, mode))
+        case UploadQueueChanged(stats=stats):
+            return replace(model, upload_queue=stats)
+        case StartDownload(url=url):
+            queued: QueuedDownload = QueuedDownload(
+                model.selection, url, model.url_found
+            )
+            return replace(model, download_queue=[*model.download_queue, queued])
         case _:
             return model
@@ -0,0 +1,457 @@
+"""Instrumentation of the MongoDB commands the application sends.
+
+A :class:`DatabaseMonitor` is registered on the process-wide client (see
+:func:`waft.database.get_database_client`) as a command and connection pool
+listener. It records a latency histogram and an error count per collection
+and command, and how long each pool checkout waited for a connection.
+
+Commands slower than the threshold are written to a rotating slow-query log
+in the state directory, with the shape of their filter: every value is
+replaced with ``"?"`` so the log shows which queries are slow without
+recording what was searched for.
+
+Classes
+-------
+LatencyHistogram
+    Counts of latencies in fixed buckets.
+CommandStats
+    Aggregate statistics of one command on one collection.
+MonitorSnapshot
+    Everything recorded by a monitor at one point in time.
+DatabaseMonitor
+    Command and connection pool listener recording the statistics.
+
+Functions
+---------
+slow_query_log_path
+    Return the default location of the slow-query log.
+filter_shape
+    Replace every value in a filter with a placeholder.
+command_shape
+    Return the shape of the filter a command runs.
+get_monitor
+    Return the process-wide monitor.
+"""
+
+import json
+import logging
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from pymongo import monitoring
+
+from waft.config import state_directory
+
+# Commands taking at least this many seconds are written to the slow-query log.
+SLOW_QUERY_THRESHOLD: float = 0.1
+
+# Upper bounds, in milliseconds, of the histogram buckets; the last is open.
+HISTOGRAM_BOUNDS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+# Size in bytes at which the slow-query log is rotated, and rotations kept.
+SLOW_LOG_MAX_BYTES: int = 1_000_000
+SLOW_LOG_BACKUPS: int = 3
+
+# Fields holding the filter of each command, as sent by pymongo.
+_FILTER_FIELDS: Dict[str, str] = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+
+def slow_query_log_path() -> Path:
+    """Return the default location of the slow-query log."""
+
+    return state_directory() / "slow-queries.log"
+
+
+def filter_shape(value: Any) -> Any:
+    """Replace every value in a filter with ``"?"``, keeping its structure.
+
+    Parameters
+    ----------
+    value : Any
+        A filter, an aggregation stage, or a value within one.
+
+    Returns
+    -------
+    Any
+        The same structure with field names and operators kept, and values
+        replaced; a list of values becomes a single ``"?"``.
+    """
+
+    if isinstance(value, Mapping):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, list) and any(isinstance(item, Mapping) for item in value):
+        return [filter_shape(item) for item in value]
+    return "?"
+
+
+def command_shape(command_name: str, command: Mapping[str, Any]) -> Any:
+    """Return the shape of the filter a command runs.
+
+    Parameters
+    ----------
+    command_name : str
+        Name of the command, e.g. ``"find"``.
+    command : Mapping[str, Any]
+        The command document, as sent to the server.
+
+    Returns
+    -------
+    Any
+        The shape of the filter, of the pipeline of an aggregation, or of the
+        filters of an update or delete; ``None`` for other commands.
+    """
+
+    if command_name in _FILTER_FIELDS:
+        return filter_shape(command.get(_FILTER_FIELDS[command_name], {}))
+    if command_name == "aggregate":
+        return filter_shape(command.get("pipeline", []))
+    if command_name in ("update", "delete"):
+        statements: List[Mapping[str, Any]] = command.get(f"{command_name}s", [])
+        return [filter_shape(statement.get("q", {})) for statement in statements]
+    return None
+
+
+@dataclass
+class LatencyHistogram:
+    """Counts of latencies in the buckets of :data:`HISTOGRAM_BOUNDS`.
+
+    Attributes
+    ----------
+    counts : List[int]
+        Latencies per bucket; the last bucket holds everything slower than
+        the last bound.
+    total : float
+        Sum of all latencies, in milliseconds.
+    maximum : float
+        Largest latency, in milliseconds.
+    """
+
+    counts: List[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS) + 1))
+    total: float = 0.0
+    maximum: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """Number of recorded latencies."""
+
+        return sum(self.counts)
+
+    def record(self, milliseconds: float) -> None:
+        """Add a latency to the histogram."""
+
+        self.counts[bisect_left(HISTOGRAM_BOUNDS, milliseconds)] += 1
+        self.total += milliseconds
+        self.maximum = max(self.maximum, milliseconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Return an upper bound of the given percentile, in milliseconds.
+
+        Parameters
+        ----------
+        fraction : float
+            The percentile, between 0 and 1.
+
+        Returns
+        -------
+        float
+            The bound of the bucket holding the percentile, or the largest
+            latency if that is lower; 0 if nothing was recorded.
+        """
+
+        rank: float = fraction * self.count
+        seen: int = 0
+        for bound, count in zip(HISTOGRAM_BOUNDS, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+    def clear(self) -> None:
+        """Forget every recorded latency."""
+
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.total = 0.0
+        self.maximum = 0.0
+
+
+@dataclass(frozen=True)
+class CommandStats:
+    """Aggregate statistics of one command on one collection.
+
+    Attributes
+    ----------
+    collection : str
+        Name of the collection, or ``""`` for database commands.
+    command : str
+        Name of the command.
+    count : int
+        Commands that completed, successfully or not.
+    errors : int
+        Commands that failed.
+    p50 : float
+        Median latency, in milliseconds (bucket bound).
+    p95 : float
+        95th percentile latency, in milliseconds (bucket bound).
+    maximum : float
+        Largest latency, in milliseconds.
+    """
+
+    collection: str
+    command: str
+    count: int
+    errors: int
+    p50: float
+    p95: float
+    maximum: float
+
+
+@dataclass(frozen=True)
+class MonitorSnapshot:
+    """Everything recorded by a :class:`DatabaseMonitor` at one point in time.
+
+    Attributes
+    ----------
+    commands : List[CommandStats]
+        Statistics per collection and command, sorted by total time spent.
+    checkouts : int
+        Connections checked out of the pool.
+    checkout_p95 : float
+        95th percentile wait for a pooled connection, in milliseconds.
+    checkout_maximum : float
+        Longest wait for a pooled connection, in milliseconds.
+    checkout_failures : int
+        Checkouts that failed, e.g. because the pool timed out.
+    slow_queries : int
+        Commands that took at least the slow-query threshold.
+    """
+
+    commands: List[CommandStats]
+    checkouts: int
+    checkout_p95: float
+    checkout_maximum: float
+    checkout_failures: int
+    slow_queries: int
+
+
+class DatabaseMonitor(  # pylint: disable=too-many-instance-attributes
+    monitoring.CommandListener, monitoring.ConnectionPoolListener
+):
+    """Record latencies, errors, and pool waits of MongoDB commands.
+
+    Listeners are called on the threads running the commands, so every
+    method takes the monitor's lock.
+
+    Parameters
+    ----------
+    threshold : float
+        Seconds from which a command is written to the slow-query log.
+    slow_log_path : Path | None
+        Location of the slow-query log, or ``None`` to keep no log. The file
+        is created on the first slow command.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SLOW_QUERY_THRESHOLD,
+        slow_log_path: Optional[Path] = None,
+    ) -> None:
+        self.threshold: float = threshold
+        self.slow_log_path: Optional[Path] = slow_log_path
+        self._slow_log: Optional[logging.Logger] = None
+        self._lock: threading.Lock = threading.Lock()
+        self._started: Dict[Tuple[Any, int], Tuple[str, str, Any]] = {}
+        self._latencies: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._checkouts: LatencyHistogram = LatencyHistogram()
+        self._checkout_failures: int = 0
+        self._slow_queries: int = 0
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Remember the collection and filter shape of a starting command."""
+
+        collection: Any = event.command.get(event.command_name, "")
+        if event.command_name == "getMore":
+            collection = event.command.get("collection", "")
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (
+                collection if isinstance(collection, str) else "",
+                event.command_name,
+                command_shape(event.command_name, event.command),
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Record the latency of a command that succeeded."""
+
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Record the latency of a command that failed, and count the error."""
+
+        self._finish(event, failed=True)
+
+    def _finish(self, event: Any, failed: bool) -> None:
+        milliseconds: float = event.duration_micros / 1000
+        with self._lock:
+            collection, command, shape = self._started.pop(
+                (event.connection_id, event.request_id),
+                ("", event.command_name, None),
+            )
+            key: Tuple[str, str] = (collection, command)
+            self._latencies.setdefault(key, LatencyHistogram()).record(milliseconds)
+            if failed:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            if milliseconds < self.threshold * 1000:
+                return
+            self._slow_queries += 1
+            if self.slow_log_path is not None:
+                self._log_slow_query(collection, command, shape, milliseconds, failed)
+
+    def _log_slow_query(
+        self,
+        collection: str,
+        command: str,
+        shape: Any,
+        milliseconds: float,
+        failed: bool,
+    ) -> None:
+        if self._slow_log is None:
+            self.slow_log_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.slow_log_path,
+                maxBytes=SLOW_LOG_MAX_BYTES,
+                backupCount=SLOW_LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            # A logger outside the logging hierarchy, so nothing else sees it.
+            self._slow_log = logging.Logger("waft.slow_queries")
+            self._slow_log.addHandler(handler)
+        self._slow_log.warning(
+            "%.1f ms %s.%s%s %s",
+            milliseconds,
+            collection,
+            command,
+            " failed" if failed else "",
+            json.dumps(shape, default=str),
+        )
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        """Record how long a checkout waited for a pooled connection."""
+
+        with self._lock:
+            self._checkouts.record(event.duration * 1000)
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        """Count a checkout that failed."""
+
+        with self._lock:
+            self._checkout_failures += 1
+
+    # The remaining pool events are not recorded.
+    def pool_created(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def pool_ready(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def pool_cleared(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def pool_closed(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def connection_created(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def connection_ready(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def connection_closed(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def connection_check_out_started(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def connection_checked_in(self, event: Any) -> None:
+        """Ignore the event."""
+
+    def snapshot(self) -> MonitorSnapshot:
+        """Return the statistics recorded so far."""
+
+        with self._lock:
+            commands: List[CommandStats] = [
+                CommandStats(
+                    collection,
+                    command,
+                    histogram.count,
+                    self._errors.get((collection, command), 0),
+                    histogram.percentile(0.5),
+                    histogram.percentile(0.95),
+                    histogram.maximum,
+                )
+                for (collection, command), histogram in sorted(
+                    self._latencies.items(), key=lambda item: -item[1].total
+                )
+            ]
+            return MonitorSnapshot(
+                commands,
+                self._checkouts.count,
+                self._checkouts.percentile(0.95),
+                self._checkouts.maximum,
+                self._checkout_failures,
+                self._slow_queries,
+            )
+
+    def reset(self) -> None:
+        """Forget every statistic recorded so far."""
+
+        with self._lock:
+            self._latencies.clear()
+            self._errors.clear()
+            self._checkouts = LatencyHistogram()
+            self._checkout_failures = 0
+            self._slow_queries = 0
+
+    def close(self) -> None:
+        """Close the slow-query log."""
+
+        with self._lock:
+            if self._slow_log is not None:
+                for handler in list(self._slow_log.handlers):
+                    handler.close()
+                    self._slow_log.removeHandler(handler)
+                self._slow_log = None
+
+
+_MONITOR: Optional[DatabaseMonitor] = None
+_LOCK: threading.Lock = threading.Lock()
+
+
+def get_monitor() -> DatabaseMonitor:
+    """Return the process-wide monitor, creating it on first use.
+
+    Returns
+    -------
+    DatabaseMonitor
+        The monitor registered on the process-wide client, logging slow
+        commands to :func:`slow_query_log_path`.
+    """
+
+    global _MONITOR  # pylint: disable=global-statement
+    with _LOCK:
+        if _MONITOR is None:
+            _MONITOR = DatabaseMonitor(slow_log_path=slow_query_log_path())
+        return _MONITOR
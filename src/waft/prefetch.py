@@ -0,0 +1,165 @@
+"""Speculative prefetching of Spotify metadata and album artwork.
+
+Starting a download needs the track's full metadata (for the album cover
+U.R.L. and the database relation) and the cover art itself. The
+:class:`MetadataPrefetcher` fetches both for the search results the user is
+likely to pick, at background priority, and keeps them in bounded in-memory
+caches so that a download can start without waiting on Spotify.
+
+Notes
+-----
+- Prefetching is best-effort: request failures are ignored, and a cancelled
+  prefetch simply leaves the remaining tracks uncached.
+- All coroutines must be awaited from the thread running the asyncio event
+  loop; the blocking requests run on the background thread pool.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from requests import RequestException
+
+from waft.cache import MemoryCache
+from waft.client import run_in_executor
+from waft.datatypes import FullMetadata
+from waft.metadata import read_cover_art
+from waft.ratelimit import Priority
+from waft.spotify import get_metadata_batch_async
+
+
+@dataclass
+class PrefetchStats:
+    """Counters describing the effectiveness of prefetching.
+
+    Attributes
+    ----------
+    prefetched : int
+        Tracks whose metadata was fetched speculatively.
+    hits : int
+        Downloads whose metadata had already been prefetched.
+    misses : int
+        Downloads that had to fetch their metadata themselves.
+    """
+
+    prefetched: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of downloads served by a prefetch."""
+
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Reset every counter to zero."""
+
+        self.prefetched = self.hits = self.misses = 0
+
+
+class MetadataPrefetcher:
+    """Fetch and hold metadata and cover art for likely downloads.
+
+    Parameters
+    ----------
+    max_entries : int
+        Number of tracks whose metadata is kept.
+    max_covers : int
+        Number of cover images kept.
+    ttl : float
+        Seconds a prefetched entry stays valid.
+
+    Attributes
+    ----------
+    stats : PrefetchStats
+        Prefetch and hit/miss counters.
+    """
+
+    def __init__(
+        self, max_entries: int = 64, max_covers: int = 32, ttl: float = 600.0
+    ) -> None:
+        self.metadata: MemoryCache = MemoryCache(max_entries, ttl)
+        self.covers: MemoryCache = MemoryCache(max_covers, ttl)
+        self.stats: PrefetchStats = PrefetchStats()
+
+    async def prefetch(self, track_ids: List[str], bearer: str) -> None:
+        """Fetch metadata and cover art for tracks that are not yet cached.
+
+        Metadata for every missing track is requested in a single batch,
+        then cover art is downloaded in the order of ``track_ids``.
+
+        Parameters
+        ----------
+        track_ids : List[str]
+            The Spotify track IDs to prefetch, most likely pick first.
+        bearer : str
+            A valid OAuth Bearer token for the Spotify Web API.
+        """
+
+        unique_ids: List[str] = [
+            track_id for track_id in dict.fromkeys(track_ids) if track_id
+        ]
+        missing: List[str] = [
+            track_id for track_id in unique_ids if track_id not in self.metadata
+        ]
+
+        if missing:
+            try:
+                fetched: Dict[str, FullMetadata] = await get_metadata_batch_async(
+                    missing, bearer
+                )
+            except (RequestException, ValueError):
+                return
+            for track_id, metadata in fetched.items():
+                self.metadata.put(track_id, metadata)
+            self.stats.prefetched += len(fetched)
+
+        for track_id in unique_ids:
+            cached: Optional[FullMetadata] = self.metadata.peek(track_id)
+            if cached is None or cached.album.image_url in self.covers:
+                continue
+            try:
+                image_data: bytes = await run_in_executor(
+                    read_cover_art, cached.album.image_url, priority=Priority.BACKGROUND
+                )
+            except (OSError, ValueError):
+                continue
+            self.covers.put(cached.album.image_url, image_data)
+
+    def get(self, track_id: str) -> Optional[FullMetadata]:
+        """Return prefetched metadata for a track about to be downloaded.
+
+        Parameters
+        ----------
+        track_id : str
+            The Spotify track ID.
+
+        Returns
+        -------
+        FullMetadata | None
+            The prefetched metadata, or ``None`` if it was not prefetched.
+        """
+
+        metadata: Optional[FullMetadata] = self.metadata.get(track_id)
+        if metadata is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return metadata
+
+    def cover(self, image_url: str) -> Optional[bytes]:
+        """Return prefetched cover art, if available.
+
+        Parameters
+        ----------
+        image_url : str
+            U.R.L. of the album artwork.
+
+        Returns
+        -------
+        bytes | None
+            The image data, or ``None`` if it was not prefetched.
+        """
+
+        return self.covers.get(image_url)
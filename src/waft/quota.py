@@ -0,0 +1,229 @@
+"""Daily ledger of the YouTube Data A.P.I. quota spent by the application.
+
+YouTube grants every project a fixed number of quota units a day, reset at
+midnight Pacific time, and a search costs 100 of them, so the default
+budget allows 100 searches a day. Once it is spent every request fails with
+``quotaExceeded`` until the next reset. The ledger counts the units spent
+each day, persistently so that restarts do not forget them, and refuses
+requests that would overdraw the budget, so that the application can fall
+back to the suggestions it already knows instead.
+
+Background work, such as resolving the tracks of an album, may only spend
+a share of the budget; the rest is kept for searches the user is waiting
+on.
+
+Classes
+-------
+QuotaStats
+    The units spent and left on a day.
+QuotaLedger
+    SQLite ledger of the quota units spent per day.
+
+Functions
+---------
+quota_path
+    Return the default location of the ledger.
+pacific_day
+    Return the quota day a point in time falls on.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from waft.config import state_directory
+from waft.ratelimit import Priority
+
+try:
+    from zoneinfo import ZoneInfo
+
+    PACIFIC: tzinfo = ZoneInfo("America/Los_Angeles")
+except (ImportError, KeyError):  # no cov
+    # Without time zone data the reset is an hour early during daylight time.
+    PACIFIC = timezone(timedelta(hours=-8), "PST")
+
+# Units granted to a project each day by default.
+DAILY_QUOTA: int = 10000
+
+# Units charged for one ``search().list`` request, whatever its page size.
+SEARCH_COST: int = 100
+
+# Fraction of the daily quota that background work may spend.
+BACKGROUND_SHARE: float = 0.8
+
+
+def quota_path() -> Path:
+    """Return the default location of the quota ledger."""
+
+    return state_directory() / "quota.db"
+
+
+def pacific_day(now: float) -> str:
+    """Return the quota day a point in time falls on.
+
+    Parameters
+    ----------
+    now : float
+        Seconds since the epoch.
+
+    Returns
+    -------
+    str
+        The date in Pacific time, in I.S.O. format.
+    """
+
+    return datetime.fromtimestamp(now, PACIFIC).date().isoformat()
+
+
+@dataclass(frozen=True)
+class QuotaStats:
+    """The units spent and left on a day.
+
+    Attributes
+    ----------
+    day : str
+        The Pacific date, in I.S.O. format.
+    spent : int
+        Units spent so far.
+    remaining : int
+        Units left before the daily quota is exhausted.
+    exhausted : bool
+        Whether YouTube reported the quota as exhausted.
+    """
+
+    day: str
+    spent: int
+    remaining: int
+    exhausted: bool
+
+
+class QuotaLedger:
+    """SQLite ledger of the quota units spent per day.
+
+    The database is opened lazily on first use and may be shared between
+    threads. Only the current day is kept.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite database file.
+    daily_quota : int
+        Units available each day.
+    background_share : float
+        Fraction of ``daily_quota`` that background requests may spend.
+    clock : Callable[[], float]
+        Source of wall-clock time in seconds since the epoch.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        daily_quota: int = DAILY_QUOTA,
+        background_share: float = BACKGROUND_SHARE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path: Path = path
+        self.daily_quota: int = daily_quota
+        self.background_share: float = background_share
+        self.clock: Callable[[], float] = clock
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS quota ("
+                " day TEXT PRIMARY KEY,"
+                " spent INTEGER NOT NULL,"
+                " exhausted INTEGER NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _today(self, connection: sqlite3.Connection) -> Tuple[str, int, bool]:
+        day: str = pacific_day(self.clock())
+        row: Optional[Tuple[int, int]] = connection.execute(
+            "SELECT spent, exhausted FROM quota WHERE day = ?", (day,)
+        ).fetchone()
+        return (day, row[0], bool(row[1])) if row else (day, 0, False)
+
+    def _write(
+        self, connection: sqlite3.Connection, day: str, spent: int, exhausted: bool
+    ) -> None:
+        with connection:
+            connection.execute("DELETE FROM quota WHERE day != ?", (day,))
+            connection.execute(
+                "INSERT OR REPLACE INTO quota VALUES (?, ?, ?)",
+                (day, spent, int(exhausted)),
+            )
+
+    def limit(self, priority: Priority = Priority.INTERACTIVE) -> int:
+        """Return the units requests of a priority may spend in a day."""
+
+        if priority == Priority.BACKGROUND:
+            return int(self.daily_quota * self.background_share)
+        return self.daily_quota
+
+    def reserve(self, units: int, priority: Priority = Priority.INTERACTIVE) -> bool:
+        """Record units about to be spent, if the budget allows it.
+
+        Units are counted before the request is sent, since YouTube charges
+        for failed requests too.
+
+        Parameters
+        ----------
+        units : int
+            Cost of the request, e.g. :data:`SEARCH_COST`.
+        priority : Priority
+            Whether a user is waiting on the request.
+
+        Returns
+        -------
+        bool
+            ``True`` if the units were recorded and the request may be sent,
+            ``False`` if it would overdraw the budget for ``priority``.
+        """
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            day, spent, exhausted = self._today(connection)
+            if exhausted or spent + units > self.limit(priority):
+                return False
+            self._write(connection, day, spent + units, exhausted)
+            return True
+
+    def exhaust(self) -> None:
+        """Refuse every request until the next reset.
+
+        Called when YouTube answers ``quotaExceeded`` although the ledger
+        had units left, e.g. because the A.P.I. key is shared.
+        """
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            day, spent, _ = self._today(connection)
+            self._write(connection, day, spent, True)
+
+    def stats(self) -> QuotaStats:
+        """Return the units spent and left today."""
+
+        with self._lock:
+            day, spent, exhausted = self._today(self._connect())
+        remaining: int = 0 if exhausted else max(0, self.daily_quota - spent)
+        return QuotaStats(day, spent, remaining, exhausted)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
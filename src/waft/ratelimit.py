@@ -0,0 +1,205 @@
+"""Token-bucket rate limiting shared by every Spotify A.P.I. call.
+
+Spotify enforces a rolling, application-wide request budget and answers with
+``429 Too Many Requests`` (and a ``Retry-After`` header) once it is spent.
+The :class:`RateLimiter` meters requests client-side so bulk jobs stay below
+that budget, pauses every caller when Spotify asks us to back off, and lets
+interactive requests overtake queued background work.
+
+Notes
+-----
+- :meth:`RateLimiter.acquire` blocks the calling thread, so it must only be
+  called from worker threads, never from the event loop.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, List, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """Scheduling class of a request; lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    """A snapshot of the limiter's state.
+
+    Attributes
+    ----------
+    budget : float
+        Requests that could be sent immediately.
+    interactive_waiting : int
+        Interactive callers currently waiting for a token.
+    background_waiting : int
+        Background callers currently waiting for a token.
+    blocked_for : float
+        Seconds left before a ``Retry-After`` pause ends (``0`` if none).
+    throttled : int
+        Total number of ``429`` responses reported to the limiter.
+    """
+
+    budget: float
+    interactive_waiting: int
+    background_waiting: int
+    blocked_for: float
+    throttled: int
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the total number of waiting callers."""
+
+        return self.interactive_waiting + self.background_waiting
+
+
+class RateLimiter:
+    """Thread-safe token bucket with priorities and server-imposed pauses.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added to the bucket per second (sustained requests/second).
+    capacity : float
+        Maximum number of tokens the bucket holds (burst size).
+    clock : Callable[[], float]
+        Source of monotonic time in seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        capacity: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.clock: Callable[[], float] = clock
+        self._tokens: float = capacity
+        self._updated: float = clock()
+        self._blocked_until: float = 0.0
+        self._throttled: int = 0
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition: threading.Condition = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        elapsed: float = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(
+        self, priority: Priority = Priority.INTERACTIVE, timeout: Optional[float] = None
+    ) -> bool:
+        """Block until a request may be sent.
+
+        Waiting callers are served in priority order, then in arrival order.
+
+        Parameters
+        ----------
+        priority : Priority
+            Scheduling class of the request.
+        timeout : float | None
+            Maximum number of seconds to wait, or ``None`` to wait forever.
+
+        Returns
+        -------
+        bool
+            ``True`` once a token was taken, ``False`` if ``timeout`` elapsed.
+        """
+
+        entry: Tuple[int, int] = (int(priority), next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            deadline: Optional[float] = (
+                None if timeout is None else self.clock() + timeout
+            )
+            try:
+                while True:
+                    now: float = self.clock()
+                    self._refill(now)
+                    if self._waiters[0] == entry and now >= self._blocked_until:
+                        if self._tokens >= 1.0:
+                            self._tokens -= 1.0
+                            return True
+                        wait: float = (1.0 - self._tokens) / self.rate
+                    elif now < self._blocked_until:
+                        wait = self._blocked_until - now
+                    else:
+                        wait = 1.0  # Woken by `notify_all` when the head leaves.
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        wait = min(wait, deadline - now)
+                    self._condition.wait(wait)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+    def penalize(self, retry_after: float) -> None:
+        """Pause every caller after Spotify answered ``429``.
+
+        Parameters
+        ----------
+        retry_after : float
+            Seconds to pause, usually taken from the ``Retry-After`` header.
+        """
+
+        with self._condition:
+            self._throttled += 1
+            self._blocked_until = max(self._blocked_until, self.clock() + retry_after)
+            self._tokens = 0.0
+            self._condition.notify_all()
+
+    def stats(self) -> RateLimitStats:
+        """Return the current budget and queue depth.
+
+        Returns
+        -------
+        RateLimitStats
+            A snapshot of the limiter's state.
+        """
+
+        with self._condition:
+            now: float = self.clock()
+            self._refill(now)
+            return RateLimitStats(
+                budget=self._tokens if now >= self._blocked_until else 0.0,
+                interactive_waiting=sum(
+                    1 for waiter in self._waiters if waiter[0] == Priority.INTERACTIVE
+                ),
+                background_waiting=sum(
+                    1 for waiter in self._waiters if waiter[0] == Priority.BACKGROUND
+                ),
+                blocked_for=max(0.0, self._blocked_until - now),
+                throttled=self._throttled,
+            )
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 30.0) -> float:
+    """Return a "full jitter" exponential backoff delay.
+
+    Parameters
+    ----------
+    attempt : int
+        Zero-based number of the retry being scheduled.
+    base : float
+        Delay scale in seconds.
+    cap : float
+        Upper bound on the un-jittered delay in seconds.
+
+    Returns
+    -------
+    float
+        A random delay between ``0`` and ``min(cap, base * 2 ** attempt)``.
+    """
+
+    return random.uniform(0.0, min(cap, base * 2**attempt))
@@ -0,0 +1,451 @@
+"""Local SQLite replica of the track to source link mapping.
+
+Looking up the source of a track in MongoDB costs a network round trip, or
+a server selection timeout when the deployment is unreachable. The replica
+keeps the Spotify track ID to YouTube link mapping in a local SQLite file,
+so that most lookups are answered in microseconds, and keeps answering them
+read-only while the deployment is down.
+
+The replica is filled in three ways:
+
+- on a miss, the link is read from MongoDB and stored, including the fact
+  that a track has no link;
+- after a relation is uploaded, its link is written through;
+- in the background, :meth:`SourceReplica.sync` copies every File document
+  written since the last sync, using the ``SyncID`` ObjectId stamped on each
+  write as a high-water mark. With the embedded schema (see
+  :mod:`waft.embedded`) the Source documents are copied instead.
+
+Invalidation
+------------
+- Links are never expired individually; a relation's link does not change
+  once uploaded.
+- A stored miss expires after ``negative_ttl`` seconds, so that tracks
+  uploaded from another machine are picked up before the next sync.
+- The replica is cleared and rebuilt from scratch once it is older than
+  ``rebuild_after`` seconds, which drops links whose File documents were
+  deleted, and whenever its schema version changes.
+
+Examples
+--------
+::
+
+    $ python -m waft.replica            # sync the replica incrementally
+    $ python -m waft.replica --rebuild  # rebuild it from scratch
+    $ python -m waft.replica --collection Source  # copy the embedded schema
+"""
+
+import argparse
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from waft.backends import EmbeddedMongoBackend, MongoBackend
+from waft.config import cache_directory, storage_backend
+from waft.database import get_database, get_yt_url_by_id, get_yt_urls
+from waft.datatypes import DisplayedTrack
+
+# Bumped whenever the table layout changes; a mismatch clears the replica.
+SCHEMA_VERSION: int = 1
+
+# Seconds a stored miss is trusted before MongoDB is asked again.
+NEGATIVE_TTL: float = 300.0
+
+# Seconds after which the replica is rebuilt from scratch.
+REBUILD_AFTER: float = 7 * 86400.0
+
+# Seconds MongoDB is not asked after it failed to answer.
+OFFLINE_BACKOFF: float = 60.0
+
+# File documents copied per batch during a sync.
+SYNC_BATCH: int = 1000
+
+# `SyncID`s are generated on the clients, whose clocks may disagree; each
+# sync re-reads this much history before the high-water mark.
+SYNC_OVERLAP: timedelta = timedelta(minutes=1)
+
+
+def replica_path() -> Path:
+    """Return the default location of the replica."""
+
+    return cache_directory() / "sources.db"
+
+
+class SourceReplica:
+    """SQLite replica of the Spotify track ID to source link mapping.
+
+    The database is opened lazily on first use and may be shared between
+    threads.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the SQLite database file.
+    negative_ttl : float
+        Seconds a stored miss is trusted.
+    rebuild_after : float
+        Seconds after which the replica is rebuilt from scratch.
+    clock : Callable[[], float]
+        Source of wall-clock time in seconds since the epoch.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        negative_ttl: float = NEGATIVE_TTL,
+        rebuild_after: float = REBUILD_AFTER,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path: Path = path
+        self.negative_ttl: float = negative_ttl
+        self.rebuild_after: float = rebuild_after
+        self.clock: Callable[[], float] = clock
+        self.offline_until: float = 0.0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL)"
+            )
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'schema'"
+            ).fetchone()
+            if row is None or int(row[0]) != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS sources")
+                connection.execute("DELETE FROM meta")
+                connection.execute(
+                    "INSERT INTO meta VALUES ('schema', ?), ('built_at', ?)",
+                    (str(SCHEMA_VERSION), str(self.clock())),
+                )
+            # A NULL source link records that the track has no source.
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sources ("
+                " track_id TEXT PRIMARY KEY,"
+                " source_link TEXT,"
+                " checked_at REAL NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = (
+            self._connect()
+            .execute("SELECT value FROM meta WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def get(self, track_id: str) -> Tuple[bool, Optional[str]]:
+        """Return what the replica knows about the source of a track.
+
+        Parameters
+        ----------
+        track_id : str
+            The Spotify track ID.
+
+        Returns
+        -------
+        (bool, str | None)
+            Whether the replica knows the answer, and the source link if the
+            track has one. An expired miss is reported as unknown.
+        """
+
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT source_link, checked_at FROM sources WHERE track_id = ?",
+                    (track_id,),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return False, None
+        if row[0] is None and row[1] + self.negative_ttl <= self.clock():
+            return False, None
+        return True, row[0]
+
+    def put(self, track_id: str, source_link: Optional[str]) -> None:
+        """Record the source link of a track, or that it has none.
+
+        Parameters
+        ----------
+        track_id : str
+            The Spotify track ID.
+        source_link : str | None
+            The YouTube link, or ``None`` if the track has no source.
+        """
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                (track_id, source_link, self.clock()),
+            )
+            connection.commit()
+
+    def lookup(
+        self,
+        track: DisplayedTrack,
+        fetch: Callable[[DisplayedTrack], Optional[str]] = get_yt_url_by_id,
+    ) -> Optional[str]:
+        """Return the source link of a track, reading through to MongoDB.
+
+        If the replica does not know the answer, it is fetched and stored.
+        Should MongoDB fail to answer, the replica is used read-only, without
+        asking MongoDB again, for ``OFFLINE_BACKOFF`` seconds.
+
+        Parameters
+        ----------
+        track : DisplayedTrack
+            The track to look up.
+        fetch : Callable[[DisplayedTrack], str | None]
+            Remote lookup used on a miss.
+
+        Returns
+        -------
+        str | None
+            The source link, or ``None`` if there is none or it is unknown.
+        """
+
+        known, source_link = self.get(track.track_id)
+        if known or self.clock() < self.offline_until:
+            return source_link
+        try:
+            source_link = fetch(track)
+        except PyMongoError:
+            self.offline_until = self.clock() + OFFLINE_BACKOFF
+            return None
+        self.put(track.track_id, source_link)
+        return source_link
+
+    def lookup_many(
+        self,
+        tracks: List[DisplayedTrack],
+        fetch: Callable[[List[DisplayedTrack]], Dict[str, str]] = get_yt_urls,
+    ) -> Dict[str, str]:
+        """Return the source links of many tracks, in at most one remote call.
+
+        Tracks the replica does not know are fetched together and the links
+        found are stored. Tracks without a link are not recorded as misses,
+        as the batch query cannot find tracks stored without a Spotify ID
+        that :meth:`lookup` would still find.
+
+        Parameters
+        ----------
+        tracks : List[DisplayedTrack]
+            The tracks to look up.
+        fetch : Callable[[List[DisplayedTrack]], Dict[str, str]]
+            Remote batch lookup used for the tracks the replica misses.
+
+        Returns
+        -------
+        Dict[str, str]
+            The source link of every track known to have one, keyed by
+            Spotify ID.
+        """
+
+        links: Dict[str, str] = {}
+        missing: List[DisplayedTrack] = []
+        for track in tracks:
+            known, source_link = self.get(track.track_id)
+            if not known:
+                missing.append(track)
+            elif source_link is not None:
+                links[track.track_id] = source_link
+        if not missing or self.clock() < self.offline_until:
+            return links
+        try:
+            fetched: Dict[str, str] = fetch(missing)
+        except PyMongoError:
+            self.offline_until = self.clock() + OFFLINE_BACKOFF
+            return links
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            now: float = self.clock()
+            connection.executemany(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                [(track_id, link, now) for track_id, link in fetched.items()],
+            )
+            connection.commit()
+        links.update(fetched)
+        return links
+
+    def clear(self) -> None:
+        """Remove every entry and the sync high-water mark."""
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            connection.execute("DELETE FROM sources")
+            connection.execute("DELETE FROM meta WHERE key = 'sync_id'")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('built_at', ?)",
+                (str(self.clock()),),
+            )
+            connection.commit()
+
+    def sync(
+        self, db: Database, batch_size: int = SYNC_BATCH, collection: str = "File"
+    ) -> int:
+        """Copy the File documents written since the last sync.
+
+        The replica is rebuilt from scratch first if it is older than
+        ``rebuild_after``. Progress is committed after every batch, so an
+        interrupted sync resumes where it stopped.
+
+        Parameters
+        ----------
+        db : Database
+            The application database.
+        batch_size : int
+            Number of documents copied per batch.
+        collection : str
+            The collection to copy from: ``"File"``, or ``"Source"`` for the
+            embedded schema (see :mod:`waft.embedded`), whose documents carry
+            the same fields.
+
+        Returns
+        -------
+        int
+            The number of documents copied, including those re-read from the
+            ``SYNC_OVERLAP`` before the previous high-water mark.
+
+        Raises
+        ------
+        pymongo.errors.PyMongoError
+            If the deployment cannot be read.
+        """
+
+        with self._lock:
+            built_at: Optional[str] = self._meta("built_at")
+            sync_id: Optional[str] = self._meta("sync_id")
+        if built_at is None or float(built_at) + self.rebuild_after <= self.clock():
+            self.clear()
+            sync_id = None
+
+        mark: Optional[ObjectId] = None if sync_id is None else ObjectId(sync_id)
+        since: Optional[ObjectId] = (
+            None
+            if mark is None
+            else ObjectId.from_datetime(mark.generation_time - SYNC_OVERLAP)
+        )
+        copied: int = 0
+        while True:
+            query: Dict[str, Any] = {"SpotifyID": {"$exists": True}}
+            if since is not None:
+                query["SyncID"] = {"$gt": since}
+            else:
+                query["SyncID"] = {"$exists": True}
+            documents: List[Dict[str, Any]] = list(
+                db[collection]
+                .find(query, {"_id": 0, "SpotifyID": 1, "SourceLink": 1, "SyncID": 1})
+                .sort("SyncID", 1)
+                .limit(batch_size)
+            )
+            if not documents:
+                return copied
+
+            since = documents[-1]["SyncID"]
+            if mark is None or since > mark:
+                mark = since
+            now: float = self.clock()
+            with self._lock:
+                connection: sqlite3.Connection = self._connect()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                    [
+                        (document["SpotifyID"], document["SourceLink"], now)
+                        for document in documents
+                    ],
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('sync_id', ?)", (str(mark),)
+                )
+                connection.commit()
+            copied += len(documents)
+
+    def rebuild(self, db: Database, collection: str = "File") -> int:
+        """Clear the replica and copy every document of a collection again.
+
+        Parameters
+        ----------
+        db : Database
+            The application database.
+        collection : str
+            The collection to copy from, as for :meth:`sync`.
+
+        Returns
+        -------
+        int
+            The number of documents copied.
+
+        Raises
+        ------
+        pymongo.errors.PyMongoError
+            If the deployment cannot be read.
+        """
+
+        self.clear()
+        return self.sync(db, collection=collection)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def main() -> None:
+    """Sync or rebuild the replica of the configured database.
+
+    The collection copied is the one the configured storage backend writes
+    to, unless ``--collection`` names another.
+    """
+
+    default: str = (
+        EmbeddedMongoBackend.collection
+        if storage_backend() == EmbeddedMongoBackend.name
+        else MongoBackend.collection
+    )
+    parser = argparse.ArgumentParser(description="Sync the local source replica.")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild from scratch")
+    parser.add_argument(
+        "--collection",
+        choices=[MongoBackend.collection, EmbeddedMongoBackend.collection],
+        default=default,
+        help=f"collection to copy from (default: {default})",
+    )
+    arguments = parser.parse_args()
+
+    replica: SourceReplica = SourceReplica(replica_path())
+    try:
+        if arguments.rebuild:
+            copied: int = replica.rebuild(get_database(), arguments.collection)
+        else:
+            copied = replica.sync(get_database(), collection=arguments.collection)
+    except PyMongoError as error:
+        parser.exit(1, f"Stopped: {error}. Re-run to resume.\n")
+    finally:
+        replica.close()
+    print(f"copied {copied} source links to {replica.path}")
+
+
+if __name__ == "__main__":
+    main()
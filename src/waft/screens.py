@@ -21,12 +21,18 @@ from textual.widgets import Button, Footer, Input, OptionList, Select, Static
 from textual.widgets.option_list import Option
 
 from waft.authentication import get_spotify_access_token
+from waft.datatypes import DisplayedTrack
 from waft.keyring import store_credentials
-from waft.messages import (Authenticating, SearchRequest, StartDownload,
+from waft.library import LibraryEntry
+from waft.messages import (Authenticating, LoadMoreResults,
+                           ResultHighlighted, SearchRequest, StartDownload,
                            TrackSelected, UpdateStatus, UrlSelected,
                            ValidCredentials)
 from waft.model import ApplicationModel
-from waft.widgets import Logo, StatusBar
+from waft.monitoring import (LatencyHistogram, get_monitor,
+                             slow_query_log_path)
+from waft.prefetch import PrefetchStats
+from waft.widgets import DiagnosticsView, Logo, StatusBar
 
 
 class IntitialAuthenticationScreen(Screen):
@@ -169,9 +175,17 @@ class SpotifySearchScreen(Screen):
 
     BINDING_GROUP_TITLE: str | None = "Spotify A.P.I. Search Screen"
     BINDINGS = [
-        Binding(key="<c-q>", action="app.quit", description="Quit the application")
+        Binding(key="<c-q>", action="app.quit", description="Quit the application"),
+        Binding(
+            key="f2",
+            action="app.show_diagnostics",
+            description="Database diagnostics",
+        ),
     ]
 
+    # Request the next page once the cursor is this close to the last result.
+    LOAD_MORE_THRESHOLD: int = 5
+
     def compose(self) -> ComposeResult:
         """Construct and yield the widgets that make up the screen layout.
 
@@ -189,7 +203,7 @@ class SpotifySearchScreen(Screen):
             id="search_bar",
         )
         search_mode: Select = Select(
-            [("Track", "track")],  # NOTE: Add Album search in future.
+            [("Track", "track"), ("Album", "album")],
             allow_blank=False,
             compact=True,
             id="search_mode",
@@ -306,6 +320,55 @@ class SpotifySearchScreen(Screen):
         search_results_view.clear_options()
         search_results_view.add_options(results)
 
+    def append_results(self, results: List[Option]) -> None:
+        """Append a further page of options to the search results list.
+
+        Parameters
+        ----------
+        results : List[Option]
+            List of Textual Option objects representing search results to add.
+        """
+
+        search_results_view: OptionList = self.query_one("#search_results", OptionList)
+        search_results_view.add_options(results)
+
+    def replace_results(self, start: int, results: List[Option]) -> None:
+        """Redraw a run of rows of the search results list in place.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first row to redraw.
+        results : List[Option]
+            The new options, one per row from ``start``.
+        """
+
+        search_results_view: OptionList = self.query_one("#search_results", OptionList)
+        for index, option in enumerate(results, start):
+            search_results_view.replace_option_prompt_at_index(index, option.prompt)
+
+    async def on_option_list_option_highlighted(
+        self, event: OptionList.OptionHighlighted
+    ) -> None:
+        """Report the highlighted search result and load more near the end.
+
+        Parameters
+        ----------
+        event : OptionList.OptionHighlighted
+            The highlight event containing the highlighted index.
+
+        Notes
+        -----
+        - Only processes events from the search_results widget.
+        """
+
+        if event.option_list.id != "search_results":
+            return
+        self.app.post_message(ResultHighlighted(event.option_index))
+        remaining: int = event.option_list.option_count - event.option_index - 1
+        if remaining < self.LOAD_MORE_THRESHOLD:
+            self.app.post_message(LoadMoreResults())
+
     def display_download(self, download: Option) -> None:
         """Add a new download to the progress view.
 
@@ -392,19 +455,28 @@ class AudioSource(ModalScreen):
         suggestions_view.clear_options()
         suggestions_view.add_options(suggestions)
 
-    def set_default_url(self, url: str) -> None:
+    def set_default_url(self, url: str) -> bool:
         """Set a default URL value in the input field.
 
         Populates the URL input field with a default value, typically used
-        to pre-fill the field with a suggested or previously used URL.
+        to pre-fill the field with a suggested or previously used URL. A
+        field the user has already typed into is left as it is.
 
         Parameters
         ----------
         url : str
             The default URL string to display in the input field.
+
+        Returns
+        -------
+        bool
+            Whether the field was empty and now holds ``url``.
         """
         url_field: Input = self.query_one("#url_field", Input)
+        if url_field.value:
+            return False
         url_field.value = url
+        return True
 
     def on_key(self, event: events.Key) -> None:
         """Handle keyboard events for modal navigation and URL submission.
@@ -448,3 +520,149 @@ class AudioSource(ModalScreen):
         if event.option_list.id == "suggestions_view":
             self.app.post_message(UrlSelected(event.option_index))
             self.app.pop_screen()
+
+
+class DiagnosticsScreen(ModalScreen):
+    """Modal view of the database statistics recorded this session.
+
+    The statistics come from the process-wide
+    :class:`waft.monitoring.DatabaseMonitor` and are refreshed every second.
+    Slow commands are listed in the slow-query log.
+
+    Parameters
+    ----------
+    first_suggestion : LatencyHistogram | None
+        Times from track selections to their first source on screen, shown
+        below the database statistics.
+    prefetch : PrefetchStats | None
+        Counters of the metadata prefetcher, shown with its hit rate.
+    """
+
+    BINDING_GROUP_TITLE: str | None = "Database Diagnostics Screen"
+    BINDINGS = [
+        Binding(key="escape", action="app.pop_screen", description="Close"),
+        Binding(key="r", action="reset", description="Reset statistics"),
+    ]
+
+    # Seconds between two refreshes of the statistics.
+    REFRESH_INTERVAL: float = 1.0
+
+    def __init__(
+        self,
+        first_suggestion: Optional[LatencyHistogram] = None,
+        prefetch: Optional[PrefetchStats] = None,
+    ) -> None:
+        super().__init__()
+        self.first_suggestion: Optional[LatencyHistogram] = first_suggestion
+        self.prefetch: Optional[PrefetchStats] = prefetch
+
+    def compose(self) -> ComposeResult:
+        """Construct and yield the widgets that make up the screen layout.
+
+        Yields
+        ------
+        ComposeResult
+            The statistics view, the location of the slow-query log, and the
+            footer.
+        """
+
+        yield Vertical(
+            DiagnosticsView(id="diagnostics_view"),
+            Static(f"[dim]Slow queries are logged to {slow_query_log_path()}[/dim]"),
+        )
+        yield Footer(show_command_palette=False)
+
+    def on_mount(self) -> None:
+        """Display the statistics and refresh them periodically."""
+
+        self.refresh_statistics()
+        self.set_interval(self.REFRESH_INTERVAL, self.refresh_statistics)
+
+    def refresh_statistics(self) -> None:
+        """Display the latest statistics of the database monitor."""
+
+        self.query_one("#diagnostics_view", DiagnosticsView).render_snapshot(
+            get_monitor().snapshot(), self.first_suggestion, self.prefetch
+        )
+
+    def action_reset(self) -> None:
+        """Forget the statistics recorded so far."""
+
+        get_monitor().reset()
+        if self.first_suggestion is not None:
+            self.first_suggestion.clear()
+        if self.prefetch is not None:
+            self.prefetch.clear()
+        self.refresh_statistics()
+
+
+class DuplicateDownload(ModalScreen[str]):
+    """Modal dialog offered when a requested track was already downloaded.
+
+    The screen is dismissed with the choice of the user: ``"skip"`` to keep
+    the existing file, ``"relink"`` to copy it for the requested track
+    instead of downloading, or ``"download"`` to download the track anyway.
+    Re-linking is only offered when the existing file was downloaded for
+    another track.
+
+    Parameters
+    ----------
+    track : DisplayedTrack
+        The requested track.
+    existing : LibraryEntry
+        The file already in the downloads folder.
+    same_track : bool
+        Whether the existing file is for the requested track.
+    """
+
+    BINDING_GROUP_TITLE: str | None = "Duplicate Download Screen"
+    BINDINGS = [
+        Binding(key="escape", action="choose('skip')", description="Skip"),
+    ]
+
+    def __init__(
+        self, track: DisplayedTrack, existing: LibraryEntry, same_track: bool
+    ) -> None:
+        super().__init__()
+        self.track: DisplayedTrack = track
+        self.existing: LibraryEntry = existing
+        self.same_track: bool = same_track
+
+    def compose(self) -> ComposeResult:
+        """Construct and yield the widgets that make up the screen layout.
+
+        Yields
+        ------
+        ComposeResult
+            A description of the existing file and one button per choice.
+        """
+
+        if self.same_track:
+            description: str = f"[b]{self.track.title}[/b] is already downloaded"
+        else:
+            description = (
+                f"The source of [b]{self.track.title}[/b] is already downloaded"
+            )
+        buttons: List[Button] = [Button("Skip", id="skip", variant="primary")]
+        if not self.same_track:
+            buttons.append(Button("Re-link", id="relink"))
+        buttons.append(Button("Download again", id="download"))
+
+        dialog: Vertical = Vertical(
+            Static(f"{description}:\n[dim]{self.existing.path}[/dim]"),
+            Horizontal(*buttons),
+            id="duplicate_dialog",
+        )
+        dialog.border_title = "Already downloaded"
+        yield dialog
+
+    def action_choose(self, choice: str) -> None:
+        """Close the dialog with ``choice``."""
+
+        self.dismiss(choice)
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Close the dialog with the choice of the pressed button."""
+
+        event.stop()
+        self.dismiss(event.button.id)
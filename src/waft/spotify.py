@@ -16,14 +16,32 @@ Notes
 -----
 All functions require a valid Spotify OAuth Bearer token. The user is
 responsible for managing token expiration and refresh.
+
+Requests are sent through the shared, connection-pooled client returned by
+:func:`waft.client.get_client`, so repeated calls reuse open connections.
+The ``*_async`` variants run the same requests on that client's thread pool
+so they can be awaited from the Textual event loop without blocking it.
+Searches are sent with interactive priority and metadata fetches with
+background priority, so bulk downloads do not slow down the search screen.
+Response bodies are decoded by :func:`waft.payloads.decode_response`, which
+skips the large fields no parser here reads.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-import requests
 from requests.models import Response
 
-from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
+from waft.client import get_client, run_in_executor
+from waft.datatypes import (Album, Artist, DisplayedAlbum, DisplayedTrack,
+                            FullMetadata, Track)
+from waft.payloads import decode_response
+from waft.ratelimit import Priority
+
+# Upper bound on IDs accepted by Spotify's `/v1/tracks?ids=` endpoint.
+MAX_TRACKS_PER_REQUEST: int = 50
+
+# Spotify refuses search requests whose `offset + limit` exceeds this value.
+MAX_SEARCH_RESULTS: int = 1000
 
 
 def parse_tracks_from_json(json_object: Dict[str, Any]) -> List[DisplayedTrack]:
@@ -77,7 +95,98 @@ def parse_tracks_from_json(json_object: Dict[str, Any]) -> List[DisplayedTrack]:
     return ordered_data_list
 
 
-def spotify_search(query: str, bearer: str, limit: int) -> List[DisplayedTrack]:
+def parse_albums_from_json(json_object: Dict[str, Any]) -> List[DisplayedAlbum]:
+    """
+    Parse Spotify album search results into structured album records.
+
+    Parameters
+    ----------
+    json_object : Dict[str, Any]
+        The full JSON response returned by the Spotify Search API, containing
+        `json_object["albums"]["items"]`, where each item is an album object.
+
+    Returns
+    -------
+    List[DisplayedAlbum]
+        A list of parsed `DisplayedAlbum` objects in the order they appear
+        in the search results.
+
+    Raises
+    ------
+    KeyError
+        If the expected fields (`albums`, `items`, or nested metadata fields)
+        are missing from the input JSON.
+    TypeError
+        If the structure of the JSON object is not as expected or `json_object`
+        is not a dictionary.
+    """
+    albums_list: List[Dict[str, Any]] = json_object["albums"]["items"]
+    ordered_data_list: List[DisplayedAlbum] = []
+    for album_object in albums_list:
+        artists_list: List[Dict[str, Any]] = album_object["artists"]
+        artist_name: str = artists_list[0]["name"]
+        if len(artists_list) > 1:
+            artist_name = artist_name + " and Others"
+        ordered_data_list.append(
+            DisplayedAlbum(
+                album_object["name"],
+                artist_name,
+                album_object["release_date"],
+                album_object["total_tracks"],
+                album_object["id"],
+            )
+        )
+    return ordered_data_list
+
+
+def parse_album_tracks_from_json(
+    json_object: Dict[str, Any], album_name: str
+) -> List[DisplayedTrack]:
+    """
+    Parse one page of an album's track listing into track records.
+
+    The simplified track objects returned by `/v1/albums/{id}/tracks` do not
+    include their album, so its name is supplied by the caller.
+
+    Parameters
+    ----------
+    json_object : Dict[str, Any]
+        A paging object returned by `/v1/albums/{id}/tracks`, with the track
+        objects under `json_object["items"]`.
+    album_name : str
+        Name of the album the tracks belong to.
+
+    Returns
+    -------
+    List[DisplayedTrack]
+        The tracks in album order.
+
+    Raises
+    ------
+    KeyError
+        If the expected fields are missing from the input JSON.
+    """
+    ordered_data_list: List[DisplayedTrack] = []
+    for track_object in json_object["items"]:
+        artists_list: List[Dict[str, Any]] = track_object["artists"]
+        artist_name: str = artists_list[0]["name"]
+        if len(artists_list) > 1:
+            artist_name = artist_name + " and Others"
+        ordered_data_list.append(
+            DisplayedTrack(
+                track_object["name"],
+                artist_name,
+                album_name,
+                track_object["duration_ms"],
+                track_object["id"],
+            )
+        )
+    return ordered_data_list
+
+
+def spotify_search(
+    query: str, bearer: str, limit: int, offset: int = 0, fielded: bool = False
+) -> List[DisplayedTrack]:
     """
     Perform a robust Spotify Search API request for tracks using a query.
 
@@ -92,6 +201,14 @@ def spotify_search(query: str, bearer: str, limit: int) -> List[DisplayedTrack]:
         The track name (e.g., "Let it Be").
     bearer : str
         A valid OAuth Bearer token for the Spotify Web API.
+    limit : int
+        Maximum number of results to return (at most 50).
+    offset : int
+        Index of the first result to return, for fetching later pages.
+    fielded : bool
+        Whether `query` already holds field filters (e.g.
+        ``track:"Doxy" artist:"Miles Davis"``) and is sent as is, rather
+        than searched as a track name.
 
     Returns
     -------
@@ -117,21 +234,94 @@ def spotify_search(query: str, bearer: str, limit: int) -> List[DisplayedTrack]:
     """
     base_url: str = "https://api.spotify.com/v1/search"
     params: Dict[str, str] = {
-        "q": f"track:{query}",  # NOTE: For not, this only searches tracks
+        "q": query if fielded else f"track:{query}",  # NOTE: Only searches tracks
         "type": "track",
         "limit": str(limit),
     }
+    if offset:
+        params["offset"] = str(offset)
     headers: Dict[str, str] = {"Authorization": f"Bearer {bearer}"}
 
-    response: Response = requests.get(
-        base_url, headers=headers, params=params, timeout=60
-    )
+    response: Response = get_client().get(base_url, headers=headers, params=params)
     response.raise_for_status()  # raises error for non-200 responses
 
-    tracks_list: List[DisplayedTrack] = parse_tracks_from_json(response.json())
+    tracks_list: List[DisplayedTrack] = parse_tracks_from_json(
+        decode_response(response)
+    )
     return tracks_list
 
 
+def spotify_album_search(
+    query: str, bearer: str, limit: int, offset: int = 0
+) -> List[DisplayedAlbum]:
+    """
+    Perform a Spotify Search API request for albums using a query.
+
+    Parameters
+    ----------
+    query : str
+        The album name (e.g., "Abbey Road").
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+    limit : int
+        Maximum number of results to return (at most 50).
+    offset : int
+        Index of the first result to return, for fetching later pages.
+
+    Returns
+    -------
+    List[DisplayedAlbum]
+        The matching albums, in result order.
+
+    Raises
+    ------
+    requests.HTTPError
+        If the Spotify API returns a non-200 response code.
+    requests.RequestException
+        For network-related exceptions such as timeouts or connection errors.
+    """
+    base_url: str = "https://api.spotify.com/v1/search"
+    params: Dict[str, str] = {
+        "q": f"album:{query}",
+        "type": "album",
+        "limit": str(limit),
+    }
+    if offset:
+        params["offset"] = str(offset)
+    headers: Dict[str, str] = {"Authorization": f"Bearer {bearer}"}
+
+    response: Response = get_client().get(base_url, headers=headers, params=params)
+    response.raise_for_status()
+
+    return parse_albums_from_json(decode_response(response))
+
+
+def next_search_offset(offset: int, limit: int, page_length: int) -> Optional[int]:
+    """
+    Return the offset of the page following a search page, if there is one.
+
+    Parameters
+    ----------
+    offset : int
+        Offset the page was requested with.
+    limit : int
+        Page size the page was requested with.
+    page_length : int
+        Number of results the page actually contained.
+
+    Returns
+    -------
+    int | None
+        The next offset, or ``None`` when the results are exhausted or the
+        next page would lie beyond `MAX_SEARCH_RESULTS`.
+    """
+
+    next_offset: int = offset + page_length
+    if page_length < limit or next_offset >= MAX_SEARCH_RESULTS:
+        return None
+    return next_offset
+
+
 def parse_album_data(response_json: Dict[str, Any]) -> Album:
     """
     Parse album metadata from a Spotify track JSON response.
@@ -201,7 +391,8 @@ def parse_track_data(response_json: Dict[str, Any]) -> Track:
     Parse track-level metadata from a Spotify track JSON response.
 
     Extracts core fields describing the track itself—duration, explicit flag,
-    title, release date, and track number—from the raw Spotify metadata.
+    title, release date, track number, Spotify ID and I.S.R.C.—from the raw
+    Spotify metadata.
     The release date is taken from the album object, as the track-level payload
     consolidates this data there.
 
@@ -227,11 +418,17 @@ def parse_track_data(response_json: Dict[str, Any]) -> Track:
     album: Dict[str, Any] = response_json["album"]
     release_date: str = album["release_date"]  # NOTE: This is from Album.
     track_number: int = response_json["track_number"]
-    track_data: Track = Track(duration_ms, explicit, name, release_date, track_number)
+    track_id: Optional[str] = response_json.get("id")
+    isrc: Optional[str] = response_json.get("external_ids", {}).get("isrc")
+    track_data: Track = Track(
+        duration_ms, explicit, name, release_date, track_number, track_id, isrc
+    )
     return track_data
 
 
-def get_metadata(track_id: str, bearer: str) -> FullMetadata:
+def get_metadata(
+    track_id: str, bearer: str, priority: Priority = Priority.BACKGROUND
+) -> FullMetadata:
     """
     Fetch metadata for a specific Spotify track using its track ID.
 
@@ -246,6 +443,8 @@ def get_metadata(track_id: str, bearer: str) -> FullMetadata:
         The Spotify track ID to query (e.g., "11dFghCHEESElKmJXsNCbNl").
     bearer : str
         A valid OAuth Bearer token for the Spotify Web API.
+    priority : Priority
+        Scheduling class used by the shared rate limiter.
 
     Returns
     -------
@@ -278,9 +477,36 @@ def get_metadata(track_id: str, bearer: str) -> FullMetadata:
     headers: Dict[str, str] = {"Authorization": f"Bearer {bearer}"}
 
     # Send request and validate HTTP status of response
-    response: Response = requests.get(url, headers=headers, timeout=60)
+    response: Response = get_client().get(url, priority, headers=headers)
     response.raise_for_status()
-    response_json: Dict[str, Any] = response.json()
+    response_json: Dict[str, Any] = decode_response(response)
+
+    return parse_full_metadata(response_json)
+
+
+def parse_full_metadata(response_json: Dict[str, Any]) -> FullMetadata:
+    """
+    Parse a complete Spotify track object into a `FullMetadata` bundle.
+
+    Combines the album, artist, and track parsing helpers so that single-track
+    and multi-track responses are handled identically.
+
+    Parameters
+    ----------
+    response_json : Dict[str, Any]
+        A Spotify track object, as returned by `/v1/tracks/{id}` or as an
+        element of the `tracks` array returned by `/v1/tracks?ids=`.
+
+    Returns
+    -------
+    FullMetadata
+        Custom data type containing album, artist(s), and track data
+
+    Raises
+    ------
+    KeyError
+        If any of the fields required by the individual parsers are missing.
+    """
 
     # Parse data to extract relevant entities
     album_data: Album = parse_album_data(response_json)
@@ -291,3 +517,262 @@ def get_metadata(track_id: str, bearer: str) -> FullMetadata:
     full_meta_data: FullMetadata = FullMetadata(album_data, artists_data, track_data)
 
     return full_meta_data
+
+
+def get_metadata_batch(
+    track_ids: List[str], bearer: str, priority: Priority = Priority.BACKGROUND
+) -> Dict[str, FullMetadata]:
+    """
+    Fetch metadata for several Spotify tracks using the multi-ID endpoint.
+
+    The IDs are de-duplicated and sent in chunks of at most
+    `MAX_TRACKS_PER_REQUEST` to `/v1/tracks?ids=`, so fetching `n` tracks costs
+    `ceil(n / 50)` round trips instead of `n`.
+
+    Parameters
+    ----------
+    track_ids : List[str]
+        The Spotify track IDs to query.
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+    priority : Priority
+        Scheduling class used by the shared rate limiter.
+
+    Returns
+    -------
+    Dict[str, FullMetadata]
+        Metadata keyed by track ID. IDs that Spotify does not recognise (for
+        which the A.P.I. returns `null`) are omitted.
+
+    Raises
+    ------
+    ValueError
+        If any track ID or `bearer` is empty.
+    requests.HTTPError
+        If the Spotify API returns a non-200 status code.
+    requests.RequestException
+        For network-related errors.
+    """
+
+    # Verify arguments are not empty
+    if not all(track_ids):
+        raise ValueError("track_ids cannot contain empty IDs.")
+    if not bearer:
+        raise ValueError("bearer token cannot be empty.")
+    url = "https://api.spotify.com/v1/tracks"
+    headers: Dict[str, str] = {"Authorization": f"Bearer {bearer}"}
+
+    unique_ids: List[str] = list(dict.fromkeys(track_ids))
+    metadata: Dict[str, FullMetadata] = {}
+    for start in range(0, len(unique_ids), MAX_TRACKS_PER_REQUEST):
+        chunk: List[str] = unique_ids[start : start + MAX_TRACKS_PER_REQUEST]
+        params: Dict[str, str] = {"ids": ",".join(chunk)}
+
+        response: Response = get_client().get(
+            url, priority, headers=headers, params=params
+        )
+        response.raise_for_status()
+        response_json: Dict[str, Any] = decode_response(response)
+
+        # The endpoint answers in request order, with `null` for unknown IDs.
+        for track_id, track_json in zip(chunk, response_json["tracks"]):
+            if track_json is not None:
+                metadata[track_id] = parse_full_metadata(track_json)
+
+    return metadata
+
+
+def get_album_tracks(
+    album_id: str,
+    album_name: str,
+    bearer: str,
+    priority: Priority = Priority.BACKGROUND,
+) -> List[DisplayedTrack]:
+    """
+    Fetch the complete track listing of an album.
+
+    Pages of up to `MAX_TRACKS_PER_REQUEST` tracks are requested from
+    `/v1/albums/{id}/tracks` until the listing is exhausted.
+
+    Parameters
+    ----------
+    album_id : str
+        The Spotify album ID to query.
+    album_name : str
+        Name of the album, recorded on every returned track.
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+    priority : Priority
+        Scheduling class used by the shared rate limiter.
+
+    Returns
+    -------
+    List[DisplayedTrack]
+        Every track on the album, in album order.
+
+    Raises
+    ------
+    ValueError
+        If `album_id` or `bearer` is empty.
+    requests.HTTPError
+        If the Spotify API returns a non-200 status code.
+    requests.RequestException
+        For network-related errors.
+    """
+
+    if not album_id:
+        raise ValueError("album_id cannot be empty.")
+    if not bearer:
+        raise ValueError("bearer token cannot be empty.")
+    url: str = f"https://api.spotify.com/v1/albums/{album_id}/tracks"
+    headers: Dict[str, str] = {"Authorization": f"Bearer {bearer}"}
+
+    tracks: List[DisplayedTrack] = []
+    offset: Optional[int] = 0
+    while offset is not None:
+        params: Dict[str, str] = {
+            "limit": str(MAX_TRACKS_PER_REQUEST),
+            "offset": str(offset),
+        }
+        response: Response = get_client().get(
+            url, priority, headers=headers, params=params
+        )
+        response.raise_for_status()
+        page: Dict[str, Any] = decode_response(response)
+        tracks.extend(parse_album_tracks_from_json(page, album_name))
+        offset = len(tracks) if page.get("next") and page["items"] else None
+
+    return tracks
+
+
+async def spotify_search_async(
+    query: str, bearer: str, limit: int, offset: int = 0
+) -> List[DisplayedTrack]:
+    """
+    Await :func:`spotify_search` without blocking the event loop.
+
+    Parameters
+    ----------
+    query : str
+        The track name (e.g., "Let it Be").
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+    limit : int
+        Maximum number of results to return.
+    offset : int
+        Index of the first result to return.
+
+    Returns
+    -------
+    List[DisplayedTrack]
+        The parsed search results.
+    """
+
+    return await run_in_executor(
+        spotify_search, query, bearer, limit, offset, priority=Priority.INTERACTIVE
+    )
+
+
+async def get_metadata_async(track_id: str, bearer: str) -> FullMetadata:
+    """
+    Await :func:`get_metadata` without blocking the event loop.
+
+    Parameters
+    ----------
+    track_id : str
+        The Spotify track ID to query.
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+
+    Returns
+    -------
+    FullMetadata
+        Custom data type containing album, artist(s), and track data
+    """
+
+    return await run_in_executor(
+        get_metadata, track_id, bearer, priority=Priority.BACKGROUND
+    )
+
+
+async def get_metadata_batch_async(
+    track_ids: List[str], bearer: str
+) -> Dict[str, FullMetadata]:
+    """
+    Await :func:`get_metadata_batch` without blocking the event loop.
+
+    Parameters
+    ----------
+    track_ids : List[str]
+        The Spotify track IDs to query.
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+
+    Returns
+    -------
+    Dict[str, FullMetadata]
+        Metadata keyed by track ID.
+    """
+
+    return await run_in_executor(
+        get_metadata_batch, track_ids, bearer, priority=Priority.BACKGROUND
+    )
+
+
+async def spotify_album_search_async(
+    query: str, bearer: str, limit: int, offset: int = 0
+) -> List[DisplayedAlbum]:
+    """
+    Await :func:`spotify_album_search` without blocking the event loop.
+
+    Parameters
+    ----------
+    query : str
+        The album name (e.g., "Abbey Road").
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+    limit : int
+        Maximum number of results to return.
+    offset : int
+        Index of the first result to return, for fetching later pages.
+
+    Returns
+    -------
+    List[DisplayedAlbum]
+        The matching albums, in result order.
+    """
+
+    return await run_in_executor(
+        spotify_album_search,
+        query,
+        bearer,
+        limit,
+        offset,
+        priority=Priority.INTERACTIVE,
+    )
+
+
+async def get_album_tracks_async(
+    album_id: str, album_name: str, bearer: str
+) -> List[DisplayedTrack]:
+    """
+    Await :func:`get_album_tracks` without blocking the event loop.
+
+    Parameters
+    ----------
+    album_id : str
+        The Spotify album ID to query.
+    album_name : str
+        Name of the album, recorded on every returned track.
+    bearer : str
+        A valid OAuth Bearer token for the Spotify Web API.
+
+    Returns
+    -------
+    List[DisplayedTrack]
+        Every track on the album, in album order.
+    """
+
+    return await run_in_executor(
+        get_album_tracks, album_id, album_name, bearer, priority=Priority.BACKGROUND
+    )
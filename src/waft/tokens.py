@@ -0,0 +1,170 @@
+"""Lifecycle management for Spotify access tokens.
+
+Spotify client-credential tokens expire (typically after an hour). The
+:class:`TokenManager` keeps the current token in memory together with its
+expiry, persists it through :mod:`waft.keyring` so that a warm start can
+reuse it, and refreshes it in the background shortly before it expires.
+
+Notes
+-----
+- All methods must be called from the thread running the asyncio event loop.
+- Concurrent callers that need a new token share a single in-flight refresh
+  request rather than each contacting Spotify.
+"""
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+from waft.authentication import request_spotify_access_token
+from waft.datatypes import AccessToken
+from waft.keyring import retrieve_token, store_token
+
+
+class TokenManager:
+    """Cache, persist, and proactively refresh a Spotify access token.
+
+    Parameters
+    ----------
+    client_id : str
+        The Spotify Client ID used to request tokens.
+    client_secret : str
+        The Spotify Client Secret used to request tokens.
+    refresh_margin : float
+        How many seconds before expiry a token is considered stale and is
+        refreshed in the background.
+    clock : Callable[[], float]
+        Source of wall-clock time in seconds since the epoch.
+
+    Attributes
+    ----------
+    token : AccessToken | None
+        The most recently obtained token, if any.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_margin: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.client_id: str = client_id
+        self.client_secret: str = client_secret
+        self.refresh_margin: float = refresh_margin
+        self.clock: Callable[[], float] = clock
+        self.token: Optional[AccessToken] = None
+        self._loaded: bool = False
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._timer_task: Optional[asyncio.Task] = None
+
+    async def get_token(self) -> Optional[str]:
+        """Return a usable access token, refreshing it when necessary.
+
+        On first use the persisted token is loaded from the keyring. A token
+        that is still valid is returned immediately; if it is within
+        ``refresh_margin`` of expiring a background refresh is started. An
+        expired or missing token is refreshed before returning.
+
+        Returns
+        -------
+        str | None
+            The bearer token, or ``None`` if Spotify rejected the credentials.
+        """
+
+        if not self._loaded:
+            self._loaded = True
+            self.token = retrieve_token(self.client_id)
+            if self.token is not None:
+                self._schedule_refresh(self.token)
+
+        now: float = self.clock()
+        if self.token is None or self.token.expires_within(0, now):
+            return await self.refresh()
+
+        if self.token.expires_within(self.refresh_margin, now):
+            self._start_refresh()
+
+        return self.token.value
+
+    async def refresh(self) -> Optional[str]:
+        """Request a new token, joining any refresh that is already running.
+
+        Returns
+        -------
+        str | None
+            The new bearer token, or ``None`` if Spotify rejected the
+            credentials.
+        """
+
+        # Shielded so that a cancelled caller does not abort the shared request.
+        return await asyncio.shield(self._start_refresh())
+
+    def invalidate(self) -> None:
+        """Discard the cached token, e.g. after Spotify answered with a 401."""
+
+        self.token = None
+
+    async def renew(self, rejected: str) -> Optional[str]:
+        """Replace a token Spotify rejected, e.g. because it was revoked.
+
+        Requests that were rejected together share one refresh: a token that
+        has already been replaced is not refreshed again.
+
+        Parameters
+        ----------
+        rejected : str
+            The bearer token Spotify answered with a 401.
+
+        Returns
+        -------
+        str | None
+            The new bearer token, or ``None`` if Spotify rejected the
+            credentials.
+        """
+
+        if self.token is not None and self.token.value != rejected:
+            return self.token.value
+        self.invalidate()
+        return await self.refresh()
+
+    def close(self) -> None:
+        """Cancel any pending background refresh."""
+
+        for task in (self._timer_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            # Background refreshes may fail without anyone awaiting them; the
+            # next caller to find the token expired simply tries again.
+            self._refresh_task.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+        return self._refresh_task
+
+    async def _refresh(self) -> Optional[str]:
+        token: Optional[AccessToken] = await asyncio.to_thread(
+            request_spotify_access_token, self.client_id, self.client_secret
+        )
+        if token is None:
+            return None
+
+        self.token = token
+        await asyncio.to_thread(store_token, self.client_id, token)
+        self._schedule_refresh(token)
+        return token.value
+
+    def _schedule_refresh(self, token: AccessToken) -> None:
+        if self._timer_task is not None and not self._timer_task.done():
+            self._timer_task.cancel()
+
+        delay: float = max(0.0, token.expires_at - self.refresh_margin - self.clock())
+        self._timer_task = asyncio.ensure_future(self._refresh_after(delay))
+
+    async def _refresh_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer_task = None
+        self._start_refresh()
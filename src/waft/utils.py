@@ -7,12 +7,12 @@ Textual U.I. components and formatting time values for display.
 import hashlib
 from datetime import timedelta
 from pathlib import Path
-from typing import List
+from typing import Collection, List, Sequence, Union
 
 from rich.table import Table
 from textual.widgets.option_list import Option
 
-from waft.datatypes import YoutubeResult
+from waft.datatypes import DisplayedAlbum, YoutubeResult
 from waft.spotify import DisplayedTrack
 
 
@@ -45,16 +45,23 @@ def format_milliseconds(milliseconds: int) -> str:
     )
 
 
-def create_options_from_results(results_list: List[DisplayedTrack]) -> List[Option]:
+def create_options_from_results(
+    results_list: Sequence[Union[DisplayedTrack, DisplayedAlbum]],
+    known_sources: Collection[str] = (),
+) -> List[Option]:
     """Convert Spotify search results into Textual Option widgets.
 
     Creates formatted table layouts for each track result, displaying title,
-    artist, album, and duration in a structured grid format.
+    artist, album, and duration in a structured grid format. Album results
+    show the release date and number of tracks in place of the album and
+    duration. Tracks whose YouTube source is already stored are marked.
 
     Parameters
     ----------
-    results_list : List[DisplayedTrack]
-        List of track metadata objects from Spotify search results.
+    results_list : Sequence[DisplayedTrack | DisplayedAlbum]
+        List of track or album metadata objects from Spotify search results.
+    known_sources : Collection[str]
+        Spotify IDs of the tracks with a known YouTube source.
 
     Returns
     -------
@@ -64,7 +71,7 @@ def create_options_from_results(results_list: List[DisplayedTrack]) -> List[Opti
 
     options: List[Option] = []
 
-    result: DisplayedTrack
+    result: Union[DisplayedTrack, DisplayedAlbum]
     for result in results_list:
         table: Table = Table.grid(expand=True)
 
@@ -78,12 +85,22 @@ def create_options_from_results(results_list: List[DisplayedTrack]) -> List[Opti
         table.add_column(
             "Duration", justify="right", ratio=50, no_wrap=True, overflow="ellipsis"
         )
-        table.add_row(
-            f"[b]{result.title}[/b]",
-            f"{result.album}",
-            f"{format_milliseconds(int(result.duration))}",
-        )
-        table.add_row(f"{result.artist}")
+        if isinstance(result, DisplayedAlbum):
+            table.add_row(
+                f"[b]{result.title}[/b]",
+                f"{result.release_date}",
+                f"{result.total_tracks} tracks",
+            )
+        else:
+            table.add_row(
+                f"[b]{result.title}[/b]",
+                f"{result.album}",
+                f"{format_milliseconds(int(result.duration))}",
+            )
+        if isinstance(result, DisplayedTrack) and result.track_id in known_sources:
+            table.add_row(f"{result.artist}", "", "[green]✓ known source[/green]")
+        else:
+            table.add_row(f"{result.artist}")
 
         options.append(Option(table))
 
@@ -5,6 +5,7 @@ This module defines user interface components.
 
 # from rich.progress_bar import ProgressBar
 from pathlib import Path
+from typing import Optional
 
 from rich.table import Table
 from textual.widgets import Static
@@ -12,6 +13,8 @@ from textual.widgets.option_list import Option
 
 from waft.datatypes import DisplayedTrack
 from waft.model import ApplicationModel
+from waft.monitoring import LatencyHistogram, MonitorSnapshot
+from waft.prefetch import PrefetchStats
 
 # from rich.padding import Padding
 
@@ -35,8 +38,8 @@ class StatusBar(Static):
     """
     Widget for displaying the global status message.
 
-    The status bar reflects the ``status_message`` field of the
-    application model and is updated via calls to
+    The status bar reflects the ``status_message`` and ``upload_queue``
+    fields of the application model and is updated via calls to
     :meth:`render_from_model`.
     """
 
@@ -60,7 +63,85 @@ class StatusBar(Static):
             The current T.E.A. model providing the status message to display.
         """
 
-        self.update(model.status_message)
+        upload_queue: str = model.upload_queue.summary()
+        if upload_queue:
+            self.update(f"{model.status_message}  [dim]({upload_queue})[/dim]")
+        else:
+            self.update(model.status_message)
+
+
+class DiagnosticsView(Static):
+    """Widget for displaying the database statistics of the session.
+
+    The view reflects a :class:`waft.monitoring.MonitorSnapshot` and is
+    updated via calls to :meth:`render_snapshot`.
+    """
+
+    def on_mount(self) -> None:
+        """Initialize static widget properties."""
+
+        self.border_title = "Database diagnostics"
+        self.can_focus = False
+
+    def render_snapshot(
+        self,
+        snapshot: MonitorSnapshot,
+        first_suggestion: Optional[LatencyHistogram] = None,
+        prefetch: Optional[PrefetchStats] = None,
+    ) -> None:
+        """Display the latency, error and pool statistics of a snapshot.
+
+        Parameters
+        ----------
+        snapshot : MonitorSnapshot
+            The statistics recorded by the database monitor.
+        first_suggestion : LatencyHistogram | None
+            Times from track selections to their first source on screen.
+        prefetch : PrefetchStats | None
+            Counters of the metadata prefetcher.
+        """
+
+        table: Table = Table(expand=True, box=None)
+        for column in ("Collection", "Command", "Count", "Errors"):
+            table.add_column(column)
+        for column in ("p50 ms", "p95 ms", "max ms"):
+            table.add_column(column, justify="right")
+        for stats in snapshot.commands:
+            table.add_row(
+                stats.collection or "-",
+                stats.command,
+                str(stats.count),
+                f"[red]{stats.errors}[/red]" if stats.errors else "0",
+                f"{stats.p50:.1f}",
+                f"{stats.p95:.1f}",
+                f"{stats.maximum:.1f}",
+            )
+        if not snapshot.commands:
+            table.add_row("[dim]No database commands yet.[/dim]")
+
+        summary: Table = Table.grid(expand=True)
+        summary.add_row(table)
+        summary.add_row(
+            f"Pool checkouts: {snapshot.checkouts}, "
+            f"p95 wait {snapshot.checkout_p95:.1f} ms, "
+            f"max wait {snapshot.checkout_maximum:.1f} ms, "
+            f"{snapshot.checkout_failures} failed"
+        )
+        summary.add_row(f"Slow queries: {snapshot.slow_queries}")
+        if first_suggestion is not None and first_suggestion.count:
+            summary.add_row(
+                f"Time to first suggestion: "
+                f"p50 {first_suggestion.percentile(0.5):.1f} ms, "
+                f"p95 {first_suggestion.percentile(0.95):.1f} ms "
+                f"over {first_suggestion.count} selections"
+            )
+        if prefetch is not None and (prefetch.prefetched or prefetch.hits):
+            summary.add_row(
+                f"Prefetch: {prefetch.hit_rate:.0%} hit rate over "
+                f"{prefetch.hits + prefetch.misses} downloads, "
+                f"{prefetch.prefetched} tracks prefetched"
+            )
+        self.update(summary)
 
 
 class DownloadOption(Option):
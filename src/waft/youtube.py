@@ -2,13 +2,148 @@
 
 This module provides functions to search YouTube for videos matching
 Spotify track metadata and parse the results into usable data structures.
+
+Building a YouTube service object walks the whole discovery document to
+create its resource tree, so one service is kept per A.P.I. key for the
+lifetime of the process. It is built from the discovery document bundled
+with ``google-api-python-client``, so building it never touches the
+network. ``httplib2`` connections are not thread-safe, so requests borrow
+a connection from a shared :class:`HttpPool` instead of using the one the
+service was built with, and keep it alive for the next search.
+
+Functions
+---------
+get_youtube_service
+    Return the process-wide YouTube service for an A.P.I. key.
+close_youtube_services
+    Forget the cached services and close their pooled connections.
+suggest_sources
+    Return suggestions for a track from the cache, or search within quota.
 """
 
-from typing import Any, Dict, List
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import googleapiclient.discovery  # type: ignore
+import httplib2  # type: ignore
+from googleapiclient.errors import HttpError  # type: ignore
 
+from waft.cache import SuggestionCache
 from waft.datatypes import DisplayedTrack, YoutubeResult
+from waft.quota import SEARCH_COST, QuotaLedger
+from waft.ratelimit import Priority
+
+# Seconds to wait for the YouTube Data A.P.I. before giving up on a request.
+REQUEST_TIMEOUT: float = 10.0
+
+# Idle keep-alive connections kept for later requests.
+POOL_SIZE: int = 4
+
+
+class HttpPool:
+    """A bounded pool of keep-alive ``httplib2`` connections.
+
+    Each connection is used by one thread at a time; a request borrows one,
+    opening it if the pool is empty, and returns it once the response was
+    read. Connections beyond ``size`` are closed when they are returned.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of idle connections kept.
+    timeout : float
+        Socket timeout of the connections, in seconds.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, timeout: float = REQUEST_TIMEOUT):
+        self.timeout: float = timeout
+        self._idle: "queue.LifoQueue[httplib2.Http]" = queue.LifoQueue(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[httplib2.Http]:
+        """Borrow a connection for the duration of a ``with`` block."""
+
+        try:
+            http: httplib2.Http = self._idle.get_nowait()
+        except queue.Empty:
+            http = httplib2.Http(timeout=self.timeout)
+        try:
+            yield http
+        finally:
+            try:
+                self._idle.put_nowait(http)
+            except queue.Full:
+                http.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# Error reasons YouTube gives when the daily quota is spent.
+QUOTA_REASONS: Tuple[bytes, ...] = (b"quotaExceeded", b"dailyLimitExceeded")
+
+_SERVICES: Dict[str, Any] = {}
+_POOL: Optional[HttpPool] = None
+_LOCK = threading.Lock()
+
+
+def get_youtube_service(api_key: str) -> Any:
+    """Return the process-wide YouTube service for an A.P.I. key.
+
+    The service is built on first use from the bundled discovery document.
+
+    Parameters
+    ----------
+    api_key : str
+        YouTube Data A.P.I. key for authentication.
+
+    Returns
+    -------
+    Any
+        The ``googleapiclient`` resource for YouTube Data A.P.I. v3.
+    """
+
+    with _LOCK:
+        service: Any = _SERVICES.get(api_key)
+        if service is None:
+            service = googleapiclient.discovery.build(
+                "youtube",
+                "v3",
+                developerKey=api_key,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+            _SERVICES[api_key] = service
+        return service
+
+
+def _get_pool() -> HttpPool:
+    global _POOL  # pylint: disable=global-statement
+
+    with _LOCK:
+        if _POOL is None:
+            _POOL = HttpPool()
+        return _POOL
+
+
+def close_youtube_services() -> None:
+    """Forget the cached services and close their pooled connections."""
+
+    global _POOL  # pylint: disable=global-statement
+
+    with _LOCK:
+        _SERVICES.clear()
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
 
 
 def parse_results_from_json(json_object: Dict[str, Any]) -> List[YoutubeResult]:
@@ -61,15 +196,76 @@ def search_youtube(search_info: DisplayedTrack, api_key: str) -> List[YoutubeRes
         List of YouTube video results matching the search criteria.
     """
 
-    developer_key: str = api_key
     title = search_info.title
     artist = search_info.artist
     album = search_info.album
-    youtube = googleapiclient.discovery.build(
-        "youtube", "v3", developerKey=developer_key
-    )
+    youtube = get_youtube_service(api_key)
     request = youtube.search().list(  # pylint: disable=no-member
         part="snippet", maxResults=25, q=f"{title} {artist} {album}"
     )
-    response = request.execute()
+    with _get_pool().connection() as http:
+        response = request.execute(http=http)
     return parse_results_from_json(response)
+
+
+def is_quota_exceeded(error: HttpError) -> bool:
+    """Return whether an A.P.I. error reports the daily quota as spent."""
+
+    return error.resp.status == 403 and any(
+        reason in (error.content or b"") for reason in QUOTA_REASONS
+    )
+
+
+def suggest_sources(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    search_info: DisplayedTrack,
+    api_key: str,
+    cache: SuggestionCache,
+    ledger: QuotaLedger,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Optional[List[YoutubeResult]]:
+    """Return suggestions for a track from the cache, or search within quota.
+
+    Cached suggestions cost no quota. Otherwise YouTube is searched if the
+    ledger allows it for ``priority``, and the results are cached.
+
+    Parameters
+    ----------
+    search_info : DisplayedTrack
+        Track metadata to use for constructing the search query.
+    api_key : str
+        YouTube Data A.P.I. key for authentication.
+    cache : SuggestionCache
+        Suggestions found before.
+    ledger : QuotaLedger
+        The quota spent today.
+    priority : Priority
+        Whether a user is waiting on the suggestions.
+
+    Returns
+    -------
+    List[YoutubeResult] | None
+        The suggestions, or ``None`` if they are not cached and the quota
+        does not allow a search, in which case only sources known to the
+        database can be offered.
+
+    Raises
+    ------
+    HttpError
+        If the search failed for another reason than the quota.
+    """
+
+    cached: Optional[List[YoutubeResult]] = cache.get(search_info)
+    if cached is not None:
+        return cached
+    if not ledger.reserve(SEARCH_COST, priority):
+        return None
+
+    try:
+        suggestions: List[YoutubeResult] = search_youtube(search_info, api_key)
+    except HttpError as error:
+        if not is_quota_exceeded(error):
+            raise
+        ledger.exhaust()
+        return None
+    cache.put(search_info, suggestions)
+    return suggestions
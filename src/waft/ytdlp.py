@@ -4,8 +4,10 @@ This module provides asynchronous track downloading from YouTube URLs,
 including audio extraction and metadata embedding.
 """
 
+from asyncio import to_thread
 from os import makedirs
 from pathlib import Path
+from typing import Optional
 
 from yt_dlp import YoutubeDL
 
@@ -14,12 +16,18 @@ from waft.metadata import write_metadata
 
 
 async def download_track(
-    url: str, destination: Path, data: DisplayedTrack, image_url: str
+    url: str,
+    destination: Path,
+    data: DisplayedTrack,
+    image_url: str,
+    image_data: Optional[bytes] = None,
 ) -> None:
     """Download and process a track from YouTube with metadata embedding.
 
     Downloads audio from the specified YouTube URL, converts it to MP3 format,
-    and embeds track metadata and album artwork.
+    and embeds track metadata and album artwork. The blocking download and
+    transcoding work runs in a worker thread so the event loop stays free to
+    accept further download requests.
 
     Parameters
     ----------
@@ -31,6 +39,8 @@ async def download_track(
         Track metadata to embed in the MP3 file.
     image_url : str
         URL to the album artwork to embed in the MP3 file.
+    image_data : bytes | None
+        The artwork at ``image_url`` if it was already downloaded.
     """
 
     # Set up ouput folder if it does not exist already.
@@ -52,7 +62,10 @@ async def download_track(
         ],
     }
 
-    with YoutubeDL(options) as youtube_downloader:  # type: ignore
-        youtube_downloader.download(url)
+    def download_and_tag() -> None:
+        with YoutubeDL(options) as youtube_downloader:  # type: ignore
+            youtube_downloader.download(url)
 
-    write_metadata(destination, data, image_url)
+        write_metadata(destination, data, image_url, image_data)
+
+    await to_thread(download_and_tag)
@@ -0,0 +1,23 @@
+"""Shared test configuration."""
+
+import inspect
+
+try:
+    from mongomock.collection import BulkOperationBuilder  # type: ignore
+except ImportError:  # no cov
+    BulkOperationBuilder = None
+
+# pymongo 4.11 passes the ``sort`` of an ``UpdateOne`` to the bulk builder,
+# which mongomock predates; updates without a sort are unaffected by it.
+if (
+    BulkOperationBuilder is not None
+    and "sort" not in inspect.signature(BulkOperationBuilder.add_update).parameters
+):
+    _add_update = BulkOperationBuilder.add_update
+
+    def _add_update_without_sort(self, *args, sort=None, **kwargs):
+        if sort is not None:
+            raise NotImplementedError("mongomock cannot sort updates")
+        return _add_update(self, *args, **kwargs)
+
+    BulkOperationBuilder.add_update = _add_update_without_sort
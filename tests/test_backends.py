@@ -0,0 +1,162 @@
+"""Conformance tests for the storage backends in src/waft/backends.py.
+
+Every test runs against each backend, so all of them behave alike.
+"""
+
+from unittest.mock import patch
+
+import pytest  # type: ignore
+
+from waft.backends import (BackendStats, EmbeddedMongoBackend,  # type: ignore
+                           MongoBackend, SQLiteBackend, StorageBackend,
+                           open_backend)
+from waft.database import (DatabaseSettings, close_database,  # type: ignore
+                           configure_database)
+from waft.datatypes import (Album, Artist, DisplayedTrack,  # type: ignore
+                            FullMetadata, Track)
+
+ALBUM = Album("Bags' Groove", "http://img")
+
+
+def relation(name, spotify_id, link, file_hash, artists=("Miles Davis",)):
+    """Return a relation for a track of ``ALBUM``."""
+    return (
+        FullMetadata(
+            ALBUM,
+            [Artist(artist) for artist in artists],
+            Track(290000, False, name, "1957", 1, spotify_id),
+        ),
+        link,
+        file_hash,
+    )
+
+
+def displayed(name, spotify_id):
+    """Return the displayed form of a track of ``ALBUM``."""
+    return DisplayedTrack(name, "Miles Davis", "Bags' Groove", "4:50", spotify_id)
+
+
+@pytest.fixture(name="backend", params=["sqlite", "mongodb", "mongodb-embedded"])
+def fixture_backend(request, tmp_path):
+    """Yield an empty backend of each kind."""
+    if request.param == "sqlite":
+        backend = SQLiteBackend(tmp_path / "waft.db")
+        yield backend
+        backend.close()
+        return
+
+    mongomock = pytest.importorskip("mongomock")
+    configure_database(DatabaseSettings(uri="mongodb://localhost", database="test"))
+    store = mongomock.store.ServerStore()
+    with patch(
+        "waft.database.MongoClient",
+        lambda *args, **kwargs: mongomock.MongoClient(*args, _store=store, **kwargs),
+    ):
+        yield open_backend(request.param)
+    close_database()
+
+
+def test_backends_follow_protocol(backend):
+    """Unit test for StorageBackend.
+
+    when checking each implementation against the protocol.
+    """
+    assert isinstance(backend, StorageBackend)
+    assert backend.warm_up() is True
+
+
+def test_upload_then_lookup(backend):
+    """Unit test for StorageBackend.lookup().
+
+    when the track was uploaded with its Spotify ID.
+    """
+    backend.upload([relation("Doxy", "id1", "https://youtu.be/doxy", "h1")])
+
+    assert backend.lookup(displayed("Doxy", "id1")) == "https://youtu.be/doxy"
+    assert backend.lookup(displayed("Oleo", "id2")) is None
+
+
+def test_upload_reuses_entities(backend):
+    """Unit test for StorageBackend.upload().
+
+    when relations share an album and artists, or are uploaded twice.
+    """
+    doxy = relation("Doxy", "id1", "https://youtu.be/doxy", "h1")
+    oleo = relation(
+        "Oleo", "id2", "https://youtu.be/oleo", "h2", ("Miles Davis", "Sonny Rollins")
+    )
+
+    backend.upload([doxy, oleo])
+    backend.upload([doxy])
+
+    assert backend.stats() == BackendStats(backend.name, 2, 1, 2, 2)
+
+
+def test_lookup_many(backend):
+    """Unit test for StorageBackend.lookup_many().
+
+    when only some of the tracks have a source.
+    """
+    backend.upload(
+        [
+            relation("Doxy", "id1", "https://youtu.be/doxy", "h1"),
+            relation("Oleo", "id2", "https://youtu.be/oleo", "h2"),
+        ]
+    )
+    tracks = [displayed("Doxy", "id1"), displayed("Oleo", "id2")]
+
+    links = backend.lookup_many(tracks + [displayed("Airegin", "id3")])
+
+    assert links == {"id1": "https://youtu.be/doxy", "id2": "https://youtu.be/oleo"}
+    assert backend.lookup_many([]) == {}
+
+
+def test_lookup_legacy_relation(backend):
+    """Unit test for StorageBackend.lookup().
+
+    when the track was uploaded before Spotify IDs were stored.
+    """
+    backend.upload([relation("Doxy", None, "https://youtu.be/doxy", "h1")])
+    backend.upload([relation("Oleo", "id2", "https://youtu.be/oleo", "h2")])
+
+    assert backend.lookup(displayed("Doxy", "id1")) == "https://youtu.be/doxy"
+    # Names only match tracks stored without a Spotify ID.
+    assert backend.lookup(displayed("Oleo", "id9")) is None
+
+
+def test_file_hashes(backend):
+    """Unit test for StorageBackend.file_hashes().
+
+    when files match by Spotify ID or by source link.
+    """
+    backend.upload(
+        [
+            relation("Doxy", "id1", "https://youtu.be/doxy", "h1"),
+            relation("Oleo", "id2", "https://youtu.be/doxy", "h2"),
+            relation("Airegin", "id3", "https://youtu.be/airegin", "h3"),
+        ]
+    )
+
+    hashes = backend.file_hashes("id1", "https://youtu.be/doxy")
+
+    assert sorted(hashes) == ["h1", "h2"]
+    assert backend.file_hashes("id9", "https://youtu.be/none") == []
+
+
+def test_open_backend(tmp_path, monkeypatch):
+    """Unit test for open_backend().
+
+    when the backend is chosen by configuration.
+    """
+    monkeypatch.setenv("WAFT_SQLITE_PATH", str(tmp_path / "waft.db"))
+    monkeypatch.setenv("WAFT_STORAGE_BACKEND", "SQLite")
+
+    backend = open_backend()
+
+    assert isinstance(backend, SQLiteBackend)
+    assert backend.path == tmp_path / "waft.db"
+    assert isinstance(open_backend("mongodb"), MongoBackend)
+    assert isinstance(open_backend("mongodb-embedded"), EmbeddedMongoBackend)
+    with pytest.raises(ValueError):
+        open_backend("redis")
+
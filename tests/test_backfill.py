@@ -0,0 +1,124 @@
+"""Unit tests for the functions in src/waft/backfill.py."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest  # type: ignore
+
+from waft.backfill import (LegacyTrack, backfill_spotify_ids,  # type: ignore
+                           load_legacy_tracks, match_spotify_id)
+from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
+
+mongomock = pytest.importorskip("mongomock")
+
+
+def seed_legacy_track(db, name, album, artist, duration=290000):
+    """Insert a relation the way it was stored before Spotify IDs."""
+    track_id = db["Track"].insert_one({"Name": name, "Duration": duration}).inserted_id
+    album_id = db["Album"].insert_one({"Name": album}).inserted_id
+    artist_id = db["Artist"].insert_one({"Name": artist}).inserted_id
+    db["On"].insert_one({"TrackID": track_id, "AlbumID": album_id})
+    db["Records"].insert_one({"TrackID": track_id, "ArtistID": artist_id})
+    db["File"].insert_one({"_id": f"hash-{name}-{track_id}", "TrackID": track_id})
+    return track_id
+
+
+def test_load_legacy_tracks():
+    """Unit test for load_legacy_tracks().
+
+    when some tracks already have a Spotify ID.
+    """
+    db = mongomock.MongoClient()["test"]
+    first = seed_legacy_track(db, "Doxy", "Bags' Groove", "Miles Davis")
+    db["Track"].insert_one({"Name": "Oleo", "Duration": 1, "SpotifyID": "id2"})
+    seed_legacy_track(db, "Airegin", "Bags' Groove", "Miles Davis")
+
+    tracks = load_legacy_tracks(db, limit=1)
+    rest = load_legacy_tracks(db, after=first)
+
+    assert tracks == [
+        LegacyTrack(first, "Doxy", 290000, "Bags' Groove", ("Miles Davis",))
+    ]
+    assert [track.name for track in rest] == ["Airegin"]
+
+
+def test_match_spotify_id():
+    """Unit test for match_spotify_id().
+
+    when only one result has the same title, album, artist and duration.
+    """
+    track = LegacyTrack(1, "Doxy", 290000, "Bags' Groove", ("Miles Davis",))
+    candidates = [
+        DisplayedTrack("Doxy", "Sonny Rollins", "Bags' Groove", 290000, "other"),
+        DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 400000, "long"),
+        DisplayedTrack("DOXY", "Miles Davis", "bags' groove", 291000, "match"),
+    ]
+
+    assert match_spotify_id(track, candidates) == "match"
+    assert match_spotify_id(track, candidates[:2]) is None
+
+
+def test_match_spotify_id_with_other_artists():
+    """Unit test for match_spotify_id().
+
+    when the result credits several artists.
+    """
+    track = LegacyTrack(1, "Oleo", 290000, "Bags' Groove", ("Miles Davis",))
+    candidates = [
+        DisplayedTrack(
+            "Oleo", "Miles Davis and Others", "Bags' Groove", 290000, "match"
+        )
+    ]
+
+    assert match_spotify_id(track, candidates) == "match"
+
+
+def search_response(items):
+    """Return a Spotify search response holding ``items``."""
+    response = Mock()
+    response.content = json.dumps({"tracks": {"items": items}}).encode()
+    return response
+
+
+@patch("waft.backfill.get_metadata_batch")
+@patch("waft.spotify.get_client")
+def test_backfill_spotify_ids(mock_get_client, mock_metadata):
+    """Unit test for backfill_spotify_ids().
+
+    when one of two legacy songs, stored twice, is found on Spotify.
+    """
+    db = mongomock.MongoClient()["test"]
+    found = seed_legacy_track(db, "Doxy", "Bags' Groove", "Miles Davis")
+    duplicate = seed_legacy_track(db, "Doxy", "Bags' Groove", "Miles Davis")
+    seed_legacy_track(db, "Unreleased", "Bags' Groove", "Miles Davis")
+    doxy = {
+        "name": "Doxy",
+        "id": "id1",
+        "duration_ms": 290000,
+        "album": {"name": "Bags' Groove"},
+        "artists": [{"name": "Miles Davis"}],
+    }
+    mock_get_client.return_value.get.side_effect = lambda url, **kwargs: (
+        search_response([doxy] if "Doxy" in kwargs["params"]["q"] else [])
+    )
+    mock_metadata.return_value = {
+        "id1": FullMetadata(
+            Album("Bags' Groove", "http://img"),
+            [Artist("Miles Davis")],
+            Track(290000, False, "Doxy", "1957", 1, "id1", "USPR35600012"),
+        )
+    }
+
+    report = backfill_spotify_ids(db, lambda: "bearer", batch_size=2)
+
+    queries = [
+        call.kwargs["params"]["q"]
+        for call in mock_get_client.return_value.get.call_args_list
+    ]
+    assert queries[0] == 'track:"Doxy" album:"Bags\' Groove" artist:"Miles Davis"'
+    assert (report.scanned, report.matched) == (3, 2)
+    assert mock_metadata.call_args.args[0] == ["id1"]
+    for track_id in (found, duplicate):
+        assert db["Track"].find_one({"_id": track_id})["SpotifyID"] == "id1"
+        assert db["File"].find_one({"TrackID": track_id})["ISRC"] == "USPR35600012"
+    assert [track.name for track in load_legacy_tracks(db)] == ["Unreleased"]
@@ -0,0 +1,204 @@
+"""Unit tests for the caches in src/waft/cache.py."""
+
+import time
+
+from waft.cache import (DiskCache, MemoryCache, SearchCache,  # type: ignore
+                        SuggestionCache, TieredCache)
+from waft.datatypes import (DisplayedAlbum, DisplayedTrack,  # type: ignore
+                            YoutubeResult)
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """Controllable replacement for ``time.monotonic``/``time.time``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_cache_lru_eviction():
+    """Unit test for MemoryCache.
+
+    when more entries than the bound are inserted.
+    """
+    cache = MemoryCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used.
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+    assert cache.stats.memory_hits == 3
+    assert cache.stats.misses == 1
+
+
+def test_memory_cache_peek():
+    """Unit test for MemoryCache.peek().
+
+    when the entry is present, absent, and expired.
+    """
+    clock = FakeClock()
+    cache = MemoryCache(ttl=10, clock=clock)
+    cache.put("a", 1)
+
+    assert cache.peek("a") == 1
+    assert "a" in cache
+    assert cache.peek("b") is None
+    clock.now = 10
+    assert "a" not in cache
+    assert cache.stats.memory_hits == 0
+    assert cache.stats.misses == 0
+
+
+def test_memory_cache_ttl_expiry():
+    """Unit test for MemoryCache.
+
+    when an entry outlives its time-to-live.
+    """
+    clock = FakeClock()
+    cache = MemoryCache(ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 11
+
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_disk_cache_persists_and_evicts(tmp_path):
+    """Unit test for DiskCache.
+
+    when values are read back from a new instance and the bound is exceeded.
+    """
+    clock = FakeClock(100.0)
+    cache = DiskCache(tmp_path / "cache.db", "test", max_entries=2, clock=clock)
+    cache.put("a", [1])
+    clock.now += 1
+    cache.put("b", [2])
+    clock.now += 1
+    cache.put("c", [3])
+    cache.close()
+
+    reopened = DiskCache(tmp_path / "cache.db", "test", clock=clock)
+    assert reopened.get("a") is None
+    assert reopened.get("c") == [3]
+    assert cache.stats.evictions == 1
+    reopened.close()
+
+
+def test_disk_cache_ttl_and_namespaces(tmp_path):
+    """Unit test for DiskCache.
+
+    when entries expire and namespaces share a file.
+    """
+    clock = FakeClock(100.0)
+    first = DiskCache(tmp_path / "cache.db", "first", ttl=5, clock=clock)
+    second = DiskCache(tmp_path / "cache.db", "second", ttl=50, clock=clock)
+    first.put("key", "one")
+    second.put("key", "two")
+
+    clock.now += 10
+
+    assert first.get("key") is None
+    assert first.stats.expirations == 1
+    assert second.get("key") == "two"
+    first.close()
+    second.close()
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    """Unit test for TieredCache.
+
+    when a value is only present on disk.
+    """
+    disk = DiskCache(tmp_path / "cache.db", "tiered")
+    disk.put("key", {"value": 1})
+    cache = TieredCache(MemoryCache(), disk)
+
+    assert cache.get("key") == {"value": 1}
+    assert cache.get("key") == {"value": 1}
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert (stats.memory_hits, stats.disk_hits, stats.misses) == (1, 1, 1)
+    assert stats.hits == 2
+    cache.close()
+
+
+def test_search_cache_round_trip(tmp_path):
+    """Unit test for SearchCache.
+
+    when results are stored, normalised, and restored from disk.
+    """
+    tracks = [DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 290000, "id1")]
+    cache = SearchCache(tmp_path / "cache.db")
+    cache.put("Doxy", "track", 50, tracks)
+
+    assert cache.get("  doxy ", "track", 50) == tracks
+    assert cache.get("Doxy", "album", 50) is None
+    assert cache.get("Doxy", "track", 10) is None
+    cache.close()
+
+    restored = SearchCache(tmp_path / "cache.db")
+    assert restored.get("Doxy", "track", 50) == tracks
+    assert restored.stats().disk_hits == 1
+    restored.close()
+
+
+def test_search_cache_album_round_trip(tmp_path):
+    """Unit test for SearchCache.
+
+    when album results are restored from disk.
+    """
+    albums = [DisplayedAlbum("Bags' Groove", "Miles Davis", "1957", 7, "album1")]
+    cache = SearchCache(tmp_path / "cache.db")
+    cache.put("Bags", "album", 50, albums)
+    cache.close()
+
+    restored = SearchCache(tmp_path / "cache.db")
+    assert restored.get("Bags", "album", 50) == albums
+    restored.close()
+
+
+def test_search_cache_memory_hit_is_fast(tmp_path):
+    """Unit test for SearchCache.get().
+
+    when the result page is held in memory.
+    """
+    tracks = [DisplayedTrack(f"T{i}", "A", "B", 1000, f"id{i}") for i in range(50)]
+    cache = SearchCache(tmp_path / "cache.db")
+    cache.put("query", "track", 50, tracks)
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        cache.get("query", "track", 50)
+    average = (time.perf_counter() - start) / 1000
+
+    assert average < 0.001
+    cache.close()
+
+
+def test_suggestion_cache_keys(tmp_path):
+    """Unit test for SuggestionCache.
+
+    when tracks with and without IDs are restored from disk.
+    """
+    suggestions = [YoutubeResult("Doxy", "Miles Davis", "https://youtu.be/doxy")]
+    cache = SuggestionCache(tmp_path / "cache.db")
+    cache.put(DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 1, "id1"), [])
+    cache.put(DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 1, ""), suggestions)
+    cache.close()
+
+    restored = SuggestionCache(tmp_path / "cache.db")
+    assert restored.get(DisplayedTrack("Doxy (Live)", "", "", 1, "id1")) == []
+    assert (
+        restored.get(DisplayedTrack(" doxy", "Miles  Davis", "BAGS' GROOVE", 1, ""))
+        == suggestions
+    )
+    assert restored.get(DisplayedTrack("Doxy", "Miles Davis", "", 1, "")) is None
+    restored.close()
@@ -0,0 +1,131 @@
+"""Unit tests for the functions in src/waft/client.py."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest  # type: ignore
+
+from waft import client as client_module  # type: ignore
+from waft.client import (ClientSettings, SpotifyClient,  # type: ignore
+                         close_client, configure_client, get_client)
+
+
+def test_spotify_client_mounts_pooled_adapter():
+    """Unit test for SpotifyClient().
+
+    when custom pool and retry settings are provided.
+    """
+    settings = ClientSettings(pool_connections=2, pool_maxsize=7, total_retries=5)
+    client = SpotifyClient(settings)
+
+    adapter = client.session.get_adapter("https://api.spotify.com/v1/search")
+
+    assert adapter._pool_connections == 2  # pylint: disable=protected-access
+    assert adapter._pool_maxsize == 7  # pylint: disable=protected-access
+    assert adapter.max_retries.total == 5
+    client.close()
+
+
+def test_spotify_client_get_default_timeout():
+    """Unit test for SpotifyClient.get().
+
+    when no timeout is provided.
+    """
+    client = SpotifyClient(ClientSettings(connect_timeout=1.5, read_timeout=9.0))
+
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value.status_code = 200
+        client.get("https://api.spotify.com/v1/search", params={"q": "Doxy"})
+
+    mock_request.assert_called_once_with(
+        "GET",
+        "https://api.spotify.com/v1/search",
+        params={"q": "Doxy"},
+        timeout=(1.5, 9.0),
+    )
+
+
+def test_spotify_client_post_explicit_timeout():
+    """Unit test for SpotifyClient.post().
+
+    when an explicit timeout is provided.
+    """
+    client = SpotifyClient()
+
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value.status_code = 200
+        client.post("https://accounts.spotify.com/api/token", timeout=20)
+
+    mock_request.assert_called_once_with(
+        "POST", "https://accounts.spotify.com/api/token", timeout=20
+    )
+
+
+def test_get_client_is_shared():
+    """Unit test for get_client().
+
+    when called repeatedly.
+    """
+    close_client()
+
+    first = get_client()
+    second = get_client()
+
+    assert first is second
+    close_client()
+    assert client_module._CLIENT is None  # pylint: disable=protected-access
+
+
+def test_configure_client_replaces_shared_client():
+    """Unit test for configure_client().
+
+    when a client already exists.
+    """
+    old_client = get_client()
+
+    with patch.object(old_client, "close") as mock_close:
+        new_client = configure_client(ClientSettings(pool_maxsize=3))
+
+    mock_close.assert_called_once()
+    assert get_client() is new_client
+    assert new_client.settings.pool_maxsize == 3
+    close_client()
+
+
+def test_spotify_client_run_off_event_loop():
+    """Unit test for SpotifyClient.run().
+
+    when a blocking function is awaited.
+    """
+    client = SpotifyClient()
+
+    async def run():
+        return await client.run(lambda value: (value, threading.get_ident()), 7)
+
+    value, thread_id = asyncio.run(run())
+
+    assert value == 7
+    assert thread_id != threading.get_ident()
+    client.close()
+
+
+def test_spotify_client_run_cancellation():
+    """Unit test for SpotifyClient.run().
+
+    when the awaiting task is cancelled while the call is in flight.
+    """
+    client = SpotifyClient()
+
+    async def run():
+        task = asyncio.ensure_future(client.run(time.sleep, 2))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) < 0.5
+    client.close()
@@ -1,6 +1,18 @@
 """Test database uploads and queries."""
 
 # from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest  # type: ignore
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
+
+from waft import database  # type: ignore
+from waft.database import (DatabaseSettings, close_database,  # type: ignore
+                           configure_database, get_database,
+                           get_database_client, get_yt_url, get_yt_url_by_id,
+                           get_yt_urls, upload_relation, upload_relations,
+                           warm_up_database)
+from waft.datatypes import Album, Artist, DisplayedTrack, FullMetadata, Track
 
 # from waft.database import get_yt_url
 # from waft.datatypes import Album, Artist, FullMetadata, Track
@@ -33,3 +45,359 @@ def test_get_yt_url():
     # assert link is None or isinstance(link, str)
     # assert isinstance(link, str)
     assert True
+
+
+@pytest.fixture(name="database_settings")
+def fixture_database_settings():
+    """Point the shared client at a test deployment, and close it afterwards."""
+    settings = DatabaseSettings(uri="mongodb://localhost:27017", database="test")
+    configure_database(settings)
+    yield settings
+    close_database()
+
+
+@patch("waft.database.MongoClient")
+def test_get_database_client_is_shared(mock_client, database_settings):
+    """Unit test for get_database_client().
+
+    when called repeatedly.
+    """
+    first = get_database_client()
+    second = get_database_client()
+
+    assert first is second
+    mock_client.assert_called_once_with(
+        database_settings.uri, **database_settings.client_options()
+    )
+
+
+@patch("waft.database.MongoClient")
+def test_configure_database_closes_client(mock_client, database_settings):
+    """Unit test for configure_database().
+
+    when a client already exists.
+    """
+    client = get_database_client()
+
+    configure_database(database_settings)
+
+    client.close.assert_called_once()
+    get_database_client()
+    assert mock_client.call_count == 2
+
+
+@patch("waft.database.MongoClient")
+def test_warm_up_database_failure(mock_client, database_settings):
+    """Unit test for warm_up_database().
+
+    when the deployment cannot be reached.
+    """
+    del database_settings
+    mock_client.return_value.admin.command.side_effect = ServerSelectionTimeoutError
+
+    assert warm_up_database() is False
+
+
+def test_database_settings_client_options():
+    """Unit test for DatabaseSettings.client_options()."""
+    settings = DatabaseSettings(uri="mongodb://db", max_pool_size=4, connect_timeout=2)
+
+    options = settings.client_options()
+
+    assert options["maxPoolSize"] == 4
+    assert options["connectTimeoutMS"] == 2000
+
+
+def test_upload_relation_round_trip(database_settings):
+    """Unit test for upload_relation() and get_yt_url().
+
+    when the relation is stored in a stand-in deployment.
+    """
+    del database_settings
+    mongomock = pytest.importorskip("mongomock")
+    metadata = FullMetadata(
+        Album("Bags' Groove", "http://img"),
+        [Artist("Miles Davis")],
+        Track(290000, False, "Doxy", "1957", 1),
+    )
+    track = DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 290000, "id1")
+
+    with patch("waft.database.MongoClient", mongomock.MongoClient):
+        upload_relation(metadata, "https://youtu.be/doxy", "HASH")
+        link = get_yt_url(track)
+
+    assert link == "https://youtu.be/doxy"
+
+
+def test_get_yt_url_skips_other_albums(database_settings):
+    """Unit test for get_yt_url().
+
+    when an earlier track with the same name is on a different album.
+    """
+    del database_settings
+    mongomock = pytest.importorskip("mongomock")
+    track = DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 290000, "id1")
+
+    with patch("waft.database.MongoClient", mongomock.MongoClient):
+        upload_relation(
+            FullMetadata(
+                Album("Sonny Rollins Plus 4", "http://img"),
+                [Artist("Sonny Rollins")],
+                Track(300000, False, "Doxy", "1956", 2),
+            ),
+            "https://youtu.be/rollins",
+            "HASH1",
+        )
+        upload_relation(
+            FullMetadata(
+                Album("Bags' Groove", "http://img"),
+                [Artist("Horace Silver"), Artist("Miles Davis")],
+                Track(290000, False, "Doxy", "1957", 1),
+            ),
+            "https://youtu.be/doxy",
+            "HASH2",
+        )
+        link = get_yt_url(track)
+        missing = get_yt_url(
+            DisplayedTrack("Doxy", "Miles Davis", "Walkin'", 290000, "id2")
+        )
+
+    assert link == "https://youtu.be/doxy"
+    assert missing is None
+
+
+def test_upload_relation_reuses_documents(database_settings):
+    """Unit test for upload_relation().
+
+    when two tracks share an album and an artist.
+    """
+    del database_settings
+    mongomock = pytest.importorskip("mongomock")
+    album = Album("Bags' Groove", "http://img")
+
+    with patch("waft.database.MongoClient", mongomock.MongoClient):
+        upload_relation(
+            FullMetadata(
+                album, [Artist("Miles Davis")], Track(1, False, "Doxy", "1957", 1)
+            ),
+            "https://youtu.be/doxy",
+            "HASH1",
+        )
+        upload_relation(
+            FullMetadata(
+                album, [Artist("Miles Davis")], Track(2, False, "Oleo", "1957", 2)
+            ),
+            "https://youtu.be/oleo",
+            "HASH2",
+        )
+        upload_relation(
+            FullMetadata(
+                album, [Artist("Miles Davis")], Track(1, False, "Doxy", "1957", 1)
+            ),
+            "https://youtu.be/doxy",
+            "HASH1",
+        )
+        db = get_database()
+        counts = {
+            name: db[name].count_documents({})
+            for name in ("Album", "Artist", "Track", "Records", "On", "File")
+        }
+
+    assert counts == {
+        "Album": 1,
+        "Artist": 1,
+        "Track": 2,
+        "Records": 2,
+        "On": 2,
+        "File": 2,
+    }
+
+
+def test_upload_relations_batch(database_settings):
+    """Unit test for upload_relations().
+
+    when a whole album is uploaded at once.
+    """
+    del database_settings
+    mongomock = pytest.importorskip("mongomock")
+    album = Album("Bags' Groove", "http://img")
+    artists = [Artist("Miles Davis"), Artist("Sonny Rollins")]
+    relations = [
+        (
+            FullMetadata(album, artists, Track(number, False, name, "1957", number)),
+            f"https://youtu.be/{name}",
+            f"HASH{number}",
+        )
+        for number, name in enumerate(["Airegin", "Oleo", "But Not For Me"], 1)
+    ]
+
+    with patch("waft.database.MongoClient", mongomock.MongoClient):
+        upload_relations(relations)
+        db = get_database()
+        albums = db["Album"].count_documents({})
+        artist_count = db["Artist"].count_documents({})
+        records = db["Records"].count_documents({})
+        link = get_yt_url(
+            DisplayedTrack("Oleo", "Sonny Rollins", "Bags' Groove", 2, "id2")
+        )
+
+    assert (albums, artist_count, records) == (1, 2, 6)
+    assert link == "https://youtu.be/Oleo"
+
+
+@patch("waft.database.get_database")
+@patch("waft.database.get_database_client")
+def test_upload_relations_transaction(mock_client, mock_database):
+    """Unit test for upload_relations().
+
+    when the batch is written in a transaction.
+    """
+    session = MagicMock()
+    mock_client.return_value.start_session.return_value.__enter__.return_value = session
+    metadata = FullMetadata(
+        Album("Bags' Groove", "http://img"),
+        [Artist("Miles Davis")],
+        Track(290000, False, "Doxy", "1957", 1),
+    )
+
+    upload_relations([(metadata, "https://youtu.be/doxy", "HASH")], transaction=True)
+
+    session.with_transaction.assert_called_once()
+    mock_database.assert_called_once_with()
+
+
+@patch("waft.database.get_database")
+def test_upload_relations_empty(mock_database):
+    """Unit test for upload_relations().
+
+    when there is nothing to upload.
+    """
+    upload_relations([])
+
+    mock_database.assert_not_called()
+
+
+def test_get_yt_url_by_id(database_settings):
+    """Unit test for get_yt_url_by_id().
+
+    when the relation was uploaded with its Spotify ID.
+    """
+    del database_settings
+    mongomock = pytest.importorskip("mongomock")
+    metadata = FullMetadata(
+        Album("Bags' Groove", "http://img"),
+        [Artist("Miles Davis")],
+        Track(290000, False, "Doxy", "1957", 1, "id1", "USPR35600012"),
+    )
+
+    with patch("waft.database.MongoClient", mongomock.MongoClient):
+        upload_relation(metadata, "https://youtu.be/doxy", "HASH")
+        # Found by ID, even when Spotify names the album differently.
+        link = get_yt_url_by_id(
+            DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove (RVG)", 1, "id1")
+        )
+        stored = get_database()["Track"].find_one({}, {"_id": 0, "ISRC": 1})
+        missing = get_yt_url_by_id(
+            DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 290000, "id2")
+        )
+
+    assert link == "https://youtu.be/doxy"
+    assert stored == {"ISRC": "USPR35600012"}
+    assert missing is None
+
+
+def test_get_yt_url_by_id_legacy_fallback(database_settings):
+    """Unit test for get_yt_url_by_id().
+
+    when the relation was uploaded without a Spotify ID.
+    """
+    del database_settings
+    mongomock = pytest.importorskip("mongomock")
+    metadata = FullMetadata(
+        Album("Bags' Groove", "http://img"),
+        [Artist("Miles Davis")],
+        Track(290000, False, "Doxy", "1957", 1),
+    )
+
+    with patch("waft.database.MongoClient", mongomock.MongoClient):
+        upload_relation(metadata, "https://youtu.be/doxy", "HASH")
+        link = get_yt_url_by_id(
+            DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 290000, "id1")
+        )
+
+    assert link == "https://youtu.be/doxy"
+
+
+def test_get_yt_urls(database_settings):
+    """Unit test for get_yt_urls().
+
+    when only some tracks of a page have a stored source.
+    """
+    del database_settings
+    mongomock = pytest.importorskip("mongomock")
+    album = Album("Bags' Groove", "http://img")
+    tracks = [
+        DisplayedTrack(name, "Miles Davis", "Bags' Groove", 1, f"id{number}")
+        for number, name in enumerate(["Airegin", "Oleo", "Doxy"], 1)
+    ]
+
+    with patch("waft.database.MongoClient", mongomock.MongoClient):
+        upload_relations(
+            (
+                FullMetadata(
+                    album,
+                    [Artist("Miles Davis")],
+                    Track(1, False, track.title, "1957", 1, track.track_id),
+                ),
+                f"https://youtu.be/{track.title}",
+                f"HASH{track.track_id}",
+            )
+            for track in tracks[:2]
+        )
+        links = get_yt_urls(tracks)
+
+    assert links == {"id1": "https://youtu.be/Airegin", "id2": "https://youtu.be/Oleo"}
+    assert get_yt_urls([]) == {}
+
+
+def test_get_or_create_loses_race():
+    """Unit test for _get_or_create().
+
+    when another writer inserts one of the documents first.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient()["test"]["Artist"]
+    collection.create_index([("Name", 1)], unique=True)
+    winner = collection.insert_one({"Name": "Miles Davis"}).inserted_id
+    race = BulkWriteError(
+        {
+            "writeErrors": [{"index": 0, "code": 11000}],
+            "upserted": [{"index": 1, "_id": "new"}],
+        }
+    )
+    get_or_create = database._get_or_create  # pylint: disable=protected-access
+
+    with patch.object(collection, "bulk_write", side_effect=race):
+        ids = get_or_create(
+            collection, [{"Name": "Miles Davis"}, {"Name": "Sonny Rollins"}], ("Name",)
+        )
+
+    assert ids == {("Miles Davis",): winner, ("Sonny Rollins",): "new"}
+
+
+def test_get_or_create_upserts_once():
+    """Unit test for _get_or_create().
+
+    when the same documents are written twice.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient()["test"]["Track"]
+    documents = [{"Name": "Doxy", "Duration": 1}, {"Name": "Oleo", "Duration": 2}]
+    get_or_create = database._get_or_create  # pylint: disable=protected-access
+
+    first = get_or_create(collection, documents, ("Name",))
+    second = get_or_create(collection, documents + documents, ("Name",))
+
+    assert first == second
+    assert collection.count_documents({}) == 2
+    assert collection.find_one({"Name": "Oleo"})["Duration"] == 2
@@ -0,0 +1,139 @@
+"""Unit tests for the embedded schema in src/waft/embedded.py."""
+
+from unittest.mock import patch
+
+import pytest  # type: ignore
+from pymongo.errors import AutoReconnect
+
+from waft import embedded  # type: ignore
+from waft.backends import EmbeddedMongoBackend  # type: ignore
+from waft.database import (DatabaseSettings, close_database,  # type: ignore
+                           configure_database, get_database, upload_relations)
+from waft.datatypes import (Album, Artist, DisplayedTrack,  # type: ignore
+                            FullMetadata, Track)
+from waft.embedded import (MigrationReport, migrate,  # type: ignore
+                           migration_complete, search_key, source_document,
+                           upload_sources)
+
+mongomock = pytest.importorskip("mongomock")
+
+
+def relation(name, spotify_id, file_hash):
+    """Return a relation for a track of Bags' Groove."""
+    return (
+        FullMetadata(
+            Album("Bags' Groove", "http://img"),
+            [Artist("Miles Davis"), Artist("Sonny Rollins")],
+            Track(290000, False, name, "1957", 3, spotify_id, "ISRC1"),
+        ),
+        f"yt/{name}",
+        file_hash,
+    )
+
+
+@pytest.fixture(name="db")
+def fixture_db():
+    """Yield the database of a stand-in deployment, shared by every client."""
+    configure_database(DatabaseSettings(uri="mongodb://localhost", database="test"))
+    store = mongomock.store.ServerStore()
+    with patch(
+        "waft.database.MongoClient",
+        lambda *args, **kwargs: mongomock.MongoClient(*args, _store=store, **kwargs),
+    ):
+        yield get_database()
+    close_database()
+
+
+def test_search_key():
+    """Unit test for search_key()."""
+    assert search_key("  Beyoncé\tKNOWLES ") == "beyonce knowles"
+
+
+def test_source_document():
+    """Unit test for source_document()."""
+    document = source_document(relation("Doxy", "id1", "h1"))
+
+    assert document["_id"] == "h1"
+    assert (document["SpotifyID"], document["ISRC"]) == ("id1", "ISRC1")
+    assert document["Track"]["TrackNumber"] == 3
+    assert document["SearchKey"] == {
+        "Track": "doxy",
+        "Album": "bags' groove",
+        "Artists": ["miles davis", "sonny rollins"],
+    }
+    assert "SpotifyID" not in source_document(relation("Oleo", None, "h2"))
+
+
+def test_upload_sources_is_idempotent(db):
+    """Unit test for upload_sources().
+
+    when a file is uploaded twice, once in the same batch.
+    """
+    doxy = relation("Doxy", "id1", "h1")
+
+    upload_sources([doxy, doxy])
+    upload_sources([doxy, relation("Oleo", "id2", "h2")])
+
+    assert sorted(db["Source"].distinct("_id")) == ["h1", "h2"]
+
+
+def test_migrate_copies_relations(db):
+    """Unit test for migrate().
+
+    when the normalized collections hold relations with and without IDs.
+    """
+    upload_relations([relation("Doxy", "id1", "h1"), relation("Oleo", None, "h2")])
+    sync_id = db["File"].find_one({"_id": "h1"})["SyncID"]
+
+    report = migrate(db, batch_size=1)
+
+    assert report == MigrationReport(files=2, inserted=2, skipped=0, done=True)
+    doxy = db["Source"].find_one({"_id": "h1"})
+    assert doxy["SyncID"] == sync_id
+    assert doxy["Artists"] == ["Miles Davis", "Sonny Rollins"]
+    assert doxy["Track"]["TrackNumber"] == 3
+    assert "SpotifyID" not in db["Source"].find_one({"_id": "h2"})
+    assert migration_complete(db)
+
+
+def test_migrate_resumes(db):
+    """Unit test for migrate().
+
+    when a run is interrupted after its first batch.
+    """
+    upload_relations([relation("Doxy", "id1", "h1"), relation("Oleo", "id2", "h2")])
+    insert_new = embedded._insert_new  # pylint: disable=protected-access
+    interrupted = [insert_new, AutoReconnect("connection lost")]
+
+    def insert_then_fail(collection, documents):
+        step = interrupted.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        return step(collection, documents)
+
+    with patch("waft.embedded._insert_new", side_effect=insert_then_fail):
+        with pytest.raises(AutoReconnect):
+            migrate(db, batch_size=1)
+    assert not migration_complete(db)
+
+    report = migrate(db, batch_size=1)
+
+    assert report == MigrationReport(files=1, inserted=1, skipped=0, done=True)
+    assert sorted(db["Source"].distinct("_id")) == ["h1", "h2"]
+
+
+def test_backend_reads_normalized_until_migrated(db):
+    """Unit test for EmbeddedMongoBackend.lookup().
+
+    when a relation is only stored in the normalized collections.
+    """
+    upload_relations([relation("Doxy", "id1", "h1")])
+    track = DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", "4:50", "id1")
+
+    assert EmbeddedMongoBackend().lookup(track) == "yt/Doxy"
+    assert EmbeddedMongoBackend().lookup_many([track]) == {"id1": "yt/Doxy"}
+
+    migrate(db)
+    db["Source"].delete_many({})
+
+    assert EmbeddedMongoBackend().lookup(track) is None
@@ -0,0 +1,171 @@
+"""Unit tests for the functions in src/waft/indexes.py."""
+
+from unittest.mock import patch
+
+import pytest  # type: ignore
+from pymongo.errors import OperationFailure
+
+from waft.database import (DatabaseSettings, close_database,  # type: ignore
+                           configure_database, get_database, warm_up_database)
+from waft.indexes import (INDEXES, ensure_indexes,  # type: ignore
+                          missing_indexes, summarize_plan)
+
+mongomock = pytest.importorskip("mongomock")
+
+
+def test_ensure_indexes_is_idempotent():
+    """Unit test for ensure_indexes().
+
+    when called twice on an empty database.
+    """
+    db = mongomock.MongoClient()["test"]
+
+    created = ensure_indexes(db)
+
+    assert created == [spec.name for spec in INDEXES]
+    assert ensure_indexes(db) == []
+    assert "TrackID_1_AlbumID_1" in db["On"].index_information()
+
+
+def test_missing_indexes_ignores_names():
+    """Unit test for missing_indexes().
+
+    when an index exists under a different name.
+    """
+    db = mongomock.MongoClient()["test"]
+    db["On"].create_index([("TrackID", 1), ("AlbumID", 1)], name="custom")
+
+    missing = missing_indexes(db)
+
+    assert [spec.collection for spec in missing] == [
+        "Track",
+        "Album",
+        "Artist",
+        "Records",
+        "File",
+        "File",
+        "File",
+        "Track",
+        "File",
+        "Source",
+        "Source",
+        "Source",
+        "Source",
+    ]
+
+
+def test_summarize_plan_find():
+    """Unit test for summarize_plan().
+
+    when the winning plan uses an index and a rejected plan does not.
+    """
+    explained = {
+        "queryPlanner": {
+            "winningPlan": {
+                "stage": "FETCH",
+                "inputStage": {"stage": "IXSCAN", "indexName": "Name_1"},
+            },
+            "rejectedPlans": [{"stage": "COLLSCAN"}],
+        }
+    }
+
+    summary = summarize_plan("Track by name", explained)
+
+    assert summary.stages == ("FETCH", "IXSCAN")
+    assert summary.indexes == ("Name_1",)
+    assert not summary.collection_scan
+    assert str(summary) == "Track by name: FETCH > IXSCAN (Name_1)"
+
+
+def test_summarize_plan_aggregation():
+    """Unit test for summarize_plan().
+
+    when a $lookup stage scans a collection.
+    """
+    explained = {
+        "stages": [
+            {"$cursor": {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}},
+            {"$lookup": {"from": "On"}, "indexesUsed": ["TrackID_1_AlbumID_1"]},
+        ]
+    }
+
+    summary = summarize_plan("get_yt_url aggregation", explained)
+
+    assert summary.collection_scan
+    assert summary.indexes == ("TrackID_1_AlbumID_1",)
+
+
+def test_warm_up_database_provisions_indexes():
+    """Unit test for warm_up_database().
+
+    when the deployment answers.
+    """
+    configure_database(DatabaseSettings(uri="mongodb://localhost", database="test"))
+    store = mongomock.store.ServerStore()
+
+    with patch(
+        "waft.database.MongoClient",
+        lambda *args, **kwargs: mongomock.MongoClient(*args, _store=store, **kwargs),
+    ):
+        assert warm_up_database() is True
+        assert missing_indexes(get_database()) == []
+    close_database()
+
+
+def test_ensure_indexes_makes_natural_keys_unique():
+    """Unit test for ensure_indexes().
+
+    when a non-unique index exists on a natural key.
+    """
+    db = mongomock.MongoClient()["test"]
+    db["Artist"].create_index([("Name", 1)], name="Name_1")
+
+    assert "Name_1_unique" in [spec.name for spec in missing_indexes(db)]
+    ensure_indexes(db)
+
+    assert "Name_1" not in db["Artist"].index_information()
+    assert db["Artist"].index_information()["Name_1_unique"]["unique"]
+    assert missing_indexes(db) == []
+
+
+def test_ensure_indexes_merges_duplicates():
+    """Unit test for ensure_indexes().
+
+    when a database written before the natural keys were unique holds
+    duplicate tracks.
+    """
+    db = mongomock.MongoClient()["test"]
+    key = {"Name": "Doxy", "ReleaseDate": "1957", "Duration": 290000}
+    db["Track"].create_index([(field, 1) for field in key])
+    first = db["Track"].insert_one(dict(key)).inserted_id
+    second = db["Track"].insert_one({**key, "SpotifyID": "id1"}).inserted_id
+    db["File"].insert_one({"TrackID": second, "SourceLink": "https://youtu.be/a"})
+    db["On"].insert_one({"TrackID": second, "AlbumID": 1})
+
+    ensure_indexes(db)
+
+    assert list(db["Track"].find({}, {"_id": 1, "SpotifyID": 1})) == [
+        {"_id": first, "SpotifyID": "id1"}
+    ]
+    assert db["File"].find_one()["TrackID"] == first
+    assert db["On"].find_one()["TrackID"] == first
+    assert missing_indexes(db) == []
+
+
+def test_ensure_indexes_continues_after_failure():
+    """Unit test for ensure_indexes().
+
+    when one index cannot be created.
+    """
+    db = mongomock.MongoClient()["test"]
+
+    with patch(
+        "waft.indexes.merge_duplicates", side_effect=OperationFailure("denied")
+    ), pytest.raises(OperationFailure):
+        ensure_indexes(db)
+
+    assert [spec.collection for spec in missing_indexes(db)] == [
+        "Track",
+        "Album",
+        "Artist",
+    ]
@@ -0,0 +1,213 @@
+"""Unit tests for the write-behind queue in src/waft/journal.py."""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+from pymongo.errors import AutoReconnect, WriteError
+
+from waft.datatypes import (Album, Artist, FullMetadata,  # type: ignore
+                            Track, UploadQueueStats)
+from waft.journal import (UploadJournal, UploadQueue,  # type: ignore
+                          decode_relation, encode_relation)
+
+
+def make_relation(name):
+    """Return a relation for a track called ``name``."""
+    return (
+        FullMetadata(
+            Album("Bags' Groove", "http://img"),
+            [Artist("Miles Davis")],
+            Track(290000, False, name, "1957", 1, f"id-{name}", "USPR35600012"),
+        ),
+        f"https://youtu.be/{name}",
+        f"hash-{name}",
+    )
+
+
+def test_encode_relation_round_trip():
+    """Unit test for encode_relation() and decode_relation()."""
+    relation = make_relation("Doxy")
+
+    assert decode_relation(encode_relation(relation)) == relation
+
+
+def test_journal_replays_unacknowledged(tmp_path):
+    """Unit test for UploadJournal.replay().
+
+    when one relation was acknowledged and the last line is torn.
+    """
+    journal = UploadJournal(tmp_path / "uploads.jsonl")
+    first = journal.append(make_relation("Doxy"))
+    journal.append(make_relation("Oleo"))
+    journal.acknowledge([first])
+    journal.close()
+    with (tmp_path / "uploads.jsonl").open("a", encoding="utf-8") as torn:
+        torn.write('{"seq": 2, "rel')
+
+    reopened = UploadJournal(tmp_path / "uploads.jsonl")
+    pending = reopened.replay()
+
+    assert pending == [(1, make_relation("Oleo"))]
+    assert reopened.append(make_relation("Airegin")) == 2
+
+
+def test_journal_truncated_when_drained(tmp_path):
+    """Unit test for UploadJournal.acknowledge().
+
+    when every relation has been acknowledged.
+    """
+    journal = UploadJournal(tmp_path / "uploads.jsonl")
+    seqs = [journal.append(make_relation(name)) for name in ("Doxy", "Oleo")]
+
+    journal.acknowledge(seqs)
+
+    assert not (tmp_path / "uploads.jsonl").exists()
+    assert UploadJournal(tmp_path / "uploads.jsonl").replay() == []
+
+
+def test_queue_flushes_in_batches(tmp_path):
+    """Unit test for UploadQueue.flush().
+
+    when more relations are queued than fit in one batch.
+    """
+    upload = Mock()
+    clock = Mock(side_effect=[10.0, 10.25, 11.0, 11.5])
+    queue = UploadQueue(
+        UploadJournal(tmp_path / "uploads.jsonl"), upload, batch_size=2, clock=clock
+    )
+    for name in ("Doxy", "Oleo", "Airegin"):
+        queue.enqueue(make_relation(name))
+
+    async def run():
+        return [await queue.flush(), await queue.flush(), await queue.flush()]
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert [len(call.args[0]) for call in upload.call_args_list] == [2, 1]
+    assert queue.stats == UploadQueueStats(0, 0.5, 0)
+    assert not (tmp_path / "uploads.jsonl").exists()
+
+
+def test_queue_keeps_relations_on_failure(tmp_path):
+    """Unit test for UploadQueue.flush().
+
+    when the deployment is unreachable, and the application restarts.
+    """
+    upload = Mock(side_effect=AutoReconnect("down"))
+    queue = UploadQueue(UploadJournal(tmp_path / "uploads.jsonl"), upload)
+    queue.enqueue(make_relation("Doxy"))
+
+    flushed = [asyncio.run(queue.flush()), asyncio.run(queue.flush())]
+    queue.close()
+    restarted = UploadQueue(UploadJournal(tmp_path / "uploads.jsonl"), Mock())
+
+    assert flushed == [False, False]
+    assert queue.stats == UploadQueueStats(1, None, 2)
+    assert restarted.pending == [(0, make_relation("Doxy"))]
+    assert restarted.stats.depth == 1
+
+
+def test_queue_sets_aside_rejected_relations(tmp_path):
+    """Unit test for UploadQueue.flush().
+
+    when the deployment rejects one relation of a batch.
+    """
+
+    def upload(relations):
+        if any(relation[1].endswith("Oleo") for relation in relations):
+            raise WriteError("Document failed validation", 121)
+
+    upload = Mock(side_effect=upload)
+    journal = UploadJournal(tmp_path / "uploads.jsonl")
+    queue = UploadQueue(journal, upload)
+    for name in ("Doxy", "Oleo", "Airegin"):
+        queue.enqueue(make_relation(name))
+
+    flushed = asyncio.run(queue.flush())
+    queue.close()
+    failed = [json.loads(line) for line in journal.failed_path.read_text().splitlines()]
+
+    assert flushed
+    assert upload.call_count == 4
+    assert queue.pending == []
+    assert queue.stats == UploadQueueStats(0, None, 0, 1)
+    assert [(entry["seq"], entry["error"][:10]) for entry in failed] == [
+        (1, "WriteError")
+    ]
+    assert decode_relation(failed[0]["relation"]) == make_relation("Oleo")
+    assert not (tmp_path / "uploads.jsonl").exists()
+
+
+def test_queue_isolation_stops_on_transient_error(tmp_path):
+    """Unit test for UploadQueue.flush().
+
+    when the deployment becomes unreachable while a batch is isolated.
+    """
+    upload = Mock(
+        side_effect=[WriteError("duplicate", 11000), None, AutoReconnect("down")]
+    )
+    queue = UploadQueue(UploadJournal(tmp_path / "uploads.jsonl"), upload)
+    for name in ("Doxy", "Oleo", "Airegin"):
+        queue.enqueue(make_relation(name))
+
+    flushed = asyncio.run(queue.flush())
+    queue.close()
+
+    assert not flushed
+    assert [seq for seq, _ in queue.pending] == [1, 2]
+    assert queue.stats == UploadQueueStats(2, None, 1)
+
+
+def test_queue_run_survives_unexpected_errors(tmp_path, monkeypatch):
+    """Unit test for UploadQueue.run().
+
+    when a flush raises an error that is not an upload failure.
+    """
+    monkeypatch.setattr("waft.journal.INITIAL_BACKOFF", 0.0)
+    queue = UploadQueue(UploadJournal(tmp_path / "uploads.jsonl"), Mock())
+    queue.flush = Mock(side_effect=[RuntimeError("disk"), asyncio.sleep(0, True)])
+    notify = Mock()
+
+    async def run():
+        flusher = asyncio.create_task(queue.run(notify))
+        queue.enqueue(make_relation("Doxy"))
+        while notify.call_count < 2:
+            await asyncio.sleep(0.01)
+        flusher.cancel()
+
+    asyncio.run(run())
+    queue.close()
+
+    assert [call.args[0].failures for call in notify.call_args_list[:2]] == [1, 1]
+
+
+def test_queue_run_notifies(tmp_path):
+    """Unit test for UploadQueue.run().
+
+    when a relation is queued while the flusher waits.
+    """
+    queue = UploadQueue(UploadJournal(tmp_path / "uploads.jsonl"), Mock())
+    notify = Mock()
+
+    async def run():
+        flusher = asyncio.create_task(queue.run(notify))
+        await asyncio.sleep(0)
+        queue.enqueue(make_relation("Doxy"))
+        while not notify.called:
+            await asyncio.sleep(0.01)
+        flusher.cancel()
+
+    asyncio.run(run())
+
+    assert notify.call_args.args[0].depth == 0
+
+
+def test_upload_queue_stats_summary():
+    """Unit test for UploadQueueStats.summary()."""
+    assert UploadQueueStats().summary() == ""
+    assert UploadQueueStats(1, None, 0).summary() == "1 upload queued"
+    assert (
+        UploadQueueStats(3, 0.1204, 2).summary()
+        == "3 uploads queued, retrying, last flush 120 ms"
+    )
+    assert UploadQueueStats(0, None, 0, 2).summary() == "2 failed"
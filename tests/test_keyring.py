@@ -4,10 +4,12 @@
 from unittest.mock import patch
 
 from securecredentials.exceptions import (  # type: ignore
-    MasterDatabaseNotFoundError, UserDatabaseNotFoundError)
+    MasterDatabaseNotFoundError, SecureFieldNotFoundError,
+    UserDatabaseNotFoundError)
 
+from waft.datatypes import AccessToken  # type: ignore
 from waft.keyring import (retrieve_credentials,  # type: ignore
-                          store_credentials)
+                          retrieve_token, store_credentials, store_token)
 
 
 @patch("waft.keyring.SecureCredentials")
@@ -87,3 +89,35 @@ def test_store_credentials_success(mock_secure):
     mock_secure.set_secure.assert_any_call(field="YOUTUBE KEY", plaintext="youtube_key")
 
     assert mock_secure.set_secure.call_count == 3
+
+
+@patch("waft.keyring.SecureCredentials")
+def test_store_and_retrieve_token(mock_secure):
+    """Unit test for store_token() and retrieve_token().
+
+    when a token is stored and read back for the same client.
+    """
+    store_token("spotify_id", AccessToken("token", 1234.5))
+
+    field, plaintext = (
+        mock_secure.set_secure.call_args.kwargs["field"],
+        mock_secure.set_secure.call_args.kwargs["plaintext"],
+    )
+    assert field == "SPOTIFY TOKEN"
+    mock_secure.get_secure.return_value = plaintext
+
+    token = retrieve_token("spotify_id")
+
+    assert token == AccessToken("token", 1234.5)
+    assert retrieve_token("other_id") is None
+
+
+@patch("waft.keyring.SecureCredentials")
+def test_retrieve_token_missing(mock_secure):
+    """Unit test for retrieve_token().
+
+    when no token has been stored.
+    """
+    mock_secure.get_secure.side_effect = SecureFieldNotFoundError
+
+    assert retrieve_token("spotify_id") is None
@@ -0,0 +1,104 @@
+"""Unit tests for the library index in src/waft/library.py."""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+from waft.datatypes import DisplayedTrack  # type: ignore
+from waft.library import LibraryEntry, LibraryIndex, copy_track  # type: ignore
+from waft.utils import hash_file  # type: ignore
+
+TRACK = DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", "4:50", "id1")
+
+
+def write_file(path, content=b"audio"):
+    """Write an MP3 stand-in and return its path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def test_find_prefers_track(tmp_path):
+    """Unit test for LibraryIndex.find().
+
+    when files match the track, the source and a hash.
+    """
+    library = LibraryIndex(tmp_path / "library.db")
+    by_hash = write_file(tmp_path / "music" / "a.mp3")
+    by_link = write_file(tmp_path / "music" / "b.mp3")
+    by_track = write_file(tmp_path / "music" / "c.mp3")
+    library.add(by_hash, "h1")
+    library.add(by_link, "h2", "id2", "yt/doxy")
+    library.add(by_track, "h3", "id1", "yt/other")
+
+    found = library.find("id1", "yt/doxy", ["h1"])
+
+    assert found == LibraryEntry(by_track, "h3", "id1", "yt/other")
+    assert library.find("id9", "yt/doxy", ["h1"]).path == by_link
+    assert library.find(hashes=["h1"]).path == by_hash
+    assert library.find("id9", "yt/none") is None
+    assert library.find() is None
+
+
+def test_find_drops_changed_files(tmp_path):
+    """Unit test for LibraryIndex.find().
+
+    when the indexed file was deleted or modified.
+    """
+    library = LibraryIndex(tmp_path / "library.db")
+    deleted = write_file(tmp_path / "a.mp3")
+    modified = write_file(tmp_path / "b.mp3")
+    library.add(deleted, "h1", "id1")
+    library.add(modified, "h2", "id2")
+    deleted.unlink()
+    write_file(modified, b"re-encoded audio")
+
+    assert library.find("id1") is None
+    assert library.find("id2") is None
+
+
+def test_scan(tmp_path):
+    """Unit test for LibraryIndex.scan().
+
+    when files were added, changed and removed since they were indexed.
+    """
+    folder = tmp_path / "music"
+    library = LibraryIndex(tmp_path / "library.db")
+    downloaded = write_file(folder / "Doxy.mp3")
+    removed = write_file(folder / "Oleo.mp3", b"other audio")
+    library.add(downloaded, hash_file(downloaded), "id1", "yt/doxy")
+    library.add(removed, hash_file(removed), "id2")
+    unchanged_hashes = library.scan(folder)
+    removed.unlink()
+    copied = write_file(folder / "old" / "Airegin.mp3", b"copied audio")
+    write_file(downloaded, b"re-tagged audio")
+    os.utime(downloaded, (0, 0))
+
+    hashed = library.scan(folder)
+
+    assert (unchanged_hashes, hashed) == (0, 2)
+    assert library.find(hashes=[hash_file(copied)]).path == copied
+    assert library.find("id1") == LibraryEntry(
+        downloaded, hash_file(downloaded), "id1", "yt/doxy"
+    )
+    assert library.find("id2") is None
+    assert library.scan(tmp_path / "missing") == 0
+
+
+def test_copy_track(tmp_path):
+    """Unit test for copy_track().
+
+    when a downloaded file is re-linked for another track.
+    """
+    source = write_file(tmp_path / "Doxy.mp3")
+
+    with patch("waft.library.write_metadata") as write_metadata:
+        copied = asyncio.run(
+            copy_track(source, tmp_path / "other" / "Doxy (Live)", TRACK, "http://img")
+        )
+
+    assert copied == tmp_path / "other" / "Doxy (Live).mp3"
+    assert copied.read_bytes() == b"audio"
+    write_metadata.assert_called_once_with(
+        tmp_path / "other" / "Doxy (Live)", TRACK, "http://img", None
+    )
@@ -49,7 +49,7 @@ def test_write_metadata_success(mock_load_file, mock_eyed3_load, mock_urlopen):
     mock_tags.__setitem__.assert_any_call("album", "Test Album")
     mock_tags.save.assert_called_once()
 
-    mock_urlopen.assert_called_once_with(image_url)
+    mock_urlopen.assert_called_once_with(image_url, timeout=10.0)
     mock_response.read.assert_called_once()
 
     mock_eyed3_load.assert_called_once_with("test_song.mp3")
@@ -61,3 +61,25 @@ def test_write_metadata_success(mock_load_file, mock_eyed3_load, mock_urlopen):
     )
 
     mock_audiofile.tag.save.assert_called_once_with(version=(2, 3, 0))
+
+
+@patch("waft.metadata.urlopen")
+@patch("waft.metadata.eyed3.load")
+@patch("waft.metadata.music_tag.load_file")
+def test_write_metadata_prefetched_image(
+    _mock_load_file, mock_eyed3_load, mock_urlopen
+):
+    """Unit test for write_metadata().
+
+    when the album artwork was already downloaded.
+    """
+    track = DisplayedTrack("Test Title", "Test Artist", "Test Album", 123456, "1234")
+
+    write_metadata(
+        Path("test_song"), track, "http://example.com/cover.jpg", b"cached-bytes"
+    )
+
+    mock_urlopen.assert_not_called()
+    mock_eyed3_load.return_value.tag.images.set.assert_called_once_with(
+        ImageFrame.FRONT_COVER, b"cached-bytes", "image/jpeg"
+    )
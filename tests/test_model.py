@@ -1,10 +1,12 @@
 """Unit tests for the functions in src/waft/model.py."""
 
+from dataclasses import replace
 from pathlib import Path
 
-from waft.datatypes import DisplayedTrack
+from waft.datatypes import DisplayedTrack, UploadQueueStats
 from waft.messages import SearchRequest  # type: ignore
-from waft.messages import Authenticating, UpdateStatus, UrlSelected
+from waft.messages import (Authenticating, StartDownload, UpdateStatus,
+                           UploadQueueChanged, UrlSelected)
 from waft.model import ApplicationModel, update  # type: ignore
 
 
@@ -18,13 +20,17 @@ def make_base_model() -> ApplicationModel:
         api_key="api",
         authenticating=False,
         developer_key="dev",
+        download_queue=[],
         url_found=False,
+        known_sources={},
         downloads_folder=Path("/tmp"),
+        search_next_offset=None,
         search_query=("", ""),
         search_results=[],
         selection=DisplayedTrack("", "", "", "", ""),
         suggestion_results=[],
         status_message="",
+        upload_queue=UploadQueueStats(),
         valid_credentials=False,
     )
 
@@ -45,6 +51,20 @@ def test_update_update_status():
     assert new_model is not model
 
 
+def test_update_upload_queue_changed():
+    """Unit test for update().
+
+    when an UploadQueueChanged message is sent.
+    """
+    model = make_base_model()
+    stats = UploadQueueStats(2, 0.05, 0)
+
+    new_model = update(model, UploadQueueChanged(stats))
+
+    assert new_model.upload_queue == stats
+    assert model.upload_queue == UploadQueueStats()
+
+
 def test_update_authenticating():
     """Unit test for update().
 
@@ -77,6 +97,27 @@ def test_update_search_request():
     assert new_model is not model
 
 
+def test_update_start_download():
+    """Unit test for update().
+
+    when a StartDownload message is sent.
+    """
+    model = make_base_model()
+    track = DisplayedTrack("Song", "Artist", "Album", 1000, "id1")
+    model = replace(model, selection=track)
+    message = StartDownload(url="https://youtube.com/watch?v=1")
+
+    new_model = update(model, message)
+    newer_model = update(new_model, message)
+
+    assert len(new_model.download_queue) == 1
+    assert new_model.download_queue[0].track is track
+    assert new_model.download_queue[0].url == "https://youtube.com/watch?v=1"
+    assert new_model.download_queue[0].url_found is False
+    assert len(newer_model.download_queue) == 2
+    assert not model.download_queue
+
+
 def test_update_other():
     """Unit test for update().
 
@@ -0,0 +1,143 @@
+"""Unit tests for the database monitor in src/waft/monitoring.py."""
+
+from unittest.mock import Mock
+
+from waft.monitoring import (DatabaseMonitor, LatencyHistogram,  # type: ignore
+                             command_shape, filter_shape)
+
+
+def run_command(monitor, command_name, command, milliseconds, failed=False):
+    """Report a command to ``monitor`` as a driver would."""
+    event = Mock(
+        command_name=command_name,
+        command=command,
+        connection_id=("localhost", 27017),
+        request_id=1,
+        duration_micros=int(milliseconds * 1000),
+    )
+    monitor.started(event)
+    if failed:
+        monitor.failed(event)
+    else:
+        monitor.succeeded(event)
+
+
+def test_filter_shape():
+    """Unit test for filter_shape()."""
+    shape = filter_shape(
+        {"$or": [{"Name": "Doxy", "Duration": 290000}], "_id": {"$in": ["a", "b"]}}
+    )
+
+    assert shape == {"$or": [{"Name": "?", "Duration": "?"}], "_id": {"$in": "?"}}
+
+
+def test_command_shape():
+    """Unit test for command_shape()."""
+    update = {"update": "File", "updates": [{"q": {"_id": "h1"}, "u": {}}]}
+
+    assert command_shape("find", {"find": "File", "filter": {"SpotifyID": "id1"}}) == {
+        "SpotifyID": "?"
+    }
+    assert command_shape("aggregate", {"pipeline": [{"$match": {"Name": "Doxy"}}]}) == [
+        {"$match": {"Name": "?"}}
+    ]
+    assert command_shape("update", update) == [{"_id": "?"}]
+    assert command_shape("ping", {"ping": 1}) is None
+
+
+def test_latency_histogram_percentile():
+    """Unit test for LatencyHistogram.percentile()."""
+    histogram = LatencyHistogram()
+    for milliseconds in [0.5] * 90 + [30] * 9 + [4000]:
+        histogram.record(milliseconds)
+
+    assert histogram.count == 100
+    assert histogram.percentile(0.5) == 1
+    assert histogram.percentile(0.95) == 50
+    assert histogram.percentile(1.0) == 4000
+    assert LatencyHistogram().percentile(0.5) == 0
+
+
+def test_monitor_records_commands():
+    """Unit test for DatabaseMonitor.snapshot().
+
+    when commands succeed and fail on several collections.
+    """
+    monitor = DatabaseMonitor()
+    run_command(monitor, "find", {"find": "File", "filter": {}}, 3)
+    run_command(monitor, "find", {"find": "File", "filter": {}}, 4, failed=True)
+    run_command(monitor, "insert", {"insert": "Track"}, 1)
+    run_command(monitor, "ping", {"ping": 1}, 0.5)
+
+    snapshot = monitor.snapshot()
+
+    files = snapshot.commands[0]
+    assert (files.collection, files.command, files.count, files.errors) == (
+        "File",
+        "find",
+        2,
+        1,
+    )
+    assert files.maximum == 4
+    assert [(stats.collection, stats.command) for stats in snapshot.commands[1:]] == [
+        ("Track", "insert"),
+        ("", "ping"),
+    ]
+
+
+def test_monitor_records_pool_checkouts():
+    """Unit test for DatabaseMonitor.snapshot().
+
+    when connections are checked out of the pool.
+    """
+    monitor = DatabaseMonitor()
+    monitor.connection_checked_out(Mock(duration=0.0004))
+    monitor.connection_checked_out(Mock(duration=0.25))
+    monitor.connection_check_out_failed(Mock(duration=10.0, reason="timeout"))
+
+    snapshot = monitor.snapshot()
+
+    assert snapshot.checkouts == 2
+    assert snapshot.checkout_maximum == 250
+    assert snapshot.checkout_failures == 1
+
+
+def test_monitor_logs_slow_queries(tmp_path):
+    """Unit test for DatabaseMonitor.
+
+    when a command is slower than the threshold.
+    """
+    log = tmp_path / "state" / "slow-queries.log"
+    monitor = DatabaseMonitor(threshold=0.1, slow_log_path=log)
+    run_command(monitor, "find", {"find": "File", "filter": {"SpotifyID": "id1"}}, 5)
+    run_command(monitor, "find", {"find": "File", "filter": {"SpotifyID": "id1"}}, 150)
+    monitor.close()
+
+    lines = log.read_text(encoding="utf-8").splitlines()
+
+    assert monitor.snapshot().slow_queries == 1
+    assert len(lines) == 1
+    assert lines[0].endswith('150.0 ms File.find {"SpotifyID": "?"}')
+    assert "id1" not in lines[0]
+
+
+def test_monitor_reset():
+    """Unit test for DatabaseMonitor.reset()."""
+    monitor = DatabaseMonitor()
+    run_command(monitor, "find", {"find": "File"}, 300)
+
+    monitor.reset()
+
+    snapshot = monitor.snapshot()
+    assert (snapshot.commands, snapshot.slow_queries) == ([], 0)
+
+
+def test_latency_histogram_clear():
+    """Unit test for LatencyHistogram.clear()."""
+    histogram = LatencyHistogram()
+    histogram.record(30)
+
+    histogram.clear()
+
+    assert (histogram.count, histogram.total, histogram.maximum) == (0, 0.0, 0.0)
+    assert histogram.percentile(0.5) == 0
@@ -0,0 +1,65 @@
+"""Unit tests for the functions in src/waft/payloads.py."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest  # type: ignore
+
+from waft import payloads  # type: ignore
+from waft.payloads import decode_response, loads, strip_unused_fields
+
+
+def test_strip_unused_fields_track_and_album():
+    """Unit test for strip_unused_fields().
+
+    when both the track and its album list their markets.
+    """
+    track = {
+        "album": {"available_markets": ["AD", "AE"], "name": "Bags' Groove"},
+        "available_markets": ["AD", "AE", "AG"],
+        "name": "Doxy",
+    }
+
+    stripped = json.loads(strip_unused_fields(json.dumps(track).encode()))
+
+    assert stripped == {
+        "album": {"available_markets": [], "name": "Bags' Groove"},
+        "available_markets": [],
+        "name": "Doxy",
+    }
+
+
+def test_strip_unused_fields_without_markets():
+    """Unit test for strip_unused_fields().
+
+    when the body has nothing to strip.
+    """
+    content = b'{"tracks": {"items": []}}'
+
+    assert strip_unused_fields(content) is content
+
+
+def test_loads_stdlib_fallback():
+    """Unit test for loads().
+
+    when orjson is not installed.
+    """
+    with patch.object(payloads, "orjson", None):
+        assert loads(b'{"name": "Doxy"}') == {"name": "Doxy"}
+
+
+def test_loads_invalid_document():
+    """Unit test for loads().
+
+    when the document is not valid JSON.
+    """
+    with pytest.raises(ValueError):
+        loads(b"{")
+
+
+def test_decode_response():
+    """Unit test for decode_response()."""
+    response = Mock()
+    response.content = b'{"available_markets": ["AD"], "name": "Doxy"}'
+
+    assert decode_response(response) == {"available_markets": [], "name": "Doxy"}
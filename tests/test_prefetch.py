@@ -0,0 +1,75 @@
+"""Unit tests for the prefetcher in src/waft/prefetch.py."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import requests  # type: ignore
+
+from waft.datatypes import Album, Artist, FullMetadata, Track  # type: ignore
+from waft.prefetch import MetadataPrefetcher, PrefetchStats  # type: ignore
+
+
+def make_metadata(name):
+    """Build a FullMetadata whose cover U.R.L. is derived from ``name``."""
+    return FullMetadata(
+        Album("Test Album", f"http://img/{name}"),
+        [Artist("Artist A")],
+        Track(100000, False, name, "2022-01-01", 1),
+    )
+
+
+@patch("waft.prefetch.run_in_executor", new_callable=AsyncMock)
+@patch("waft.prefetch.get_metadata_batch_async", new_callable=AsyncMock)
+def test_prefetch_caches_metadata_and_covers(mock_batch, mock_run):
+    """Unit test for MetadataPrefetcher.prefetch().
+
+    when some of the tracks were already prefetched.
+    """
+    prefetcher = MetadataPrefetcher()
+    prefetcher.metadata.put("a", make_metadata("a"))
+    mock_batch.return_value = {"b": make_metadata("b")}
+    mock_run.return_value = b"image"
+
+    asyncio.run(prefetcher.prefetch(["a", "b", "b", ""], "token123"))
+
+    mock_batch.assert_awaited_once_with(["b"], "token123")
+    assert mock_run.await_count == 2
+    assert prefetcher.cover("http://img/a") == b"image"
+    assert prefetcher.cover("http://img/b") == b"image"
+    assert prefetcher.stats.prefetched == 1
+
+
+@patch("waft.prefetch.run_in_executor", new_callable=AsyncMock)
+@patch("waft.prefetch.get_metadata_batch_async", new_callable=AsyncMock)
+def test_prefetch_request_failure(mock_batch, mock_run):
+    """Unit test for MetadataPrefetcher.prefetch().
+
+    when the metadata request fails.
+    """
+    prefetcher = MetadataPrefetcher()
+    mock_batch.side_effect = requests.RequestException("Network down")
+
+    asyncio.run(prefetcher.prefetch(["a"], "token123"))
+
+    mock_run.assert_not_awaited()
+    assert len(prefetcher.metadata) == 0
+
+
+def test_prefetcher_hit_rate():
+    """Unit test for MetadataPrefetcher.get().
+
+    when one download was prefetched and one was not.
+    """
+    prefetcher = MetadataPrefetcher()
+    metadata = make_metadata("a")
+    prefetcher.metadata.put("a", metadata)
+
+    assert prefetcher.get("a") is metadata
+    assert prefetcher.get("b") is None
+    assert prefetcher.stats.hits == 1
+    assert prefetcher.stats.misses == 1
+    assert prefetcher.stats.hit_rate == 0.5
+
+    prefetcher.stats.clear()
+
+    assert prefetcher.stats == PrefetchStats()
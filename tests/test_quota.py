@@ -0,0 +1,63 @@
+"""Unit tests for the quota ledger in src/waft/quota.py."""
+
+from waft.quota import QuotaLedger, QuotaStats, pacific_day  # type: ignore
+from waft.ratelimit import Priority  # type: ignore
+
+# 2024-06-01 06:59:59 UTC, a second before midnight Pacific daylight time.
+BEFORE_RESET: float = 1717225199.0
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """Controllable replacement for ``time.time``."""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_pacific_day():
+    """Unit test for pacific_day()."""
+    assert pacific_day(BEFORE_RESET) == "2024-05-31"
+    assert pacific_day(BEFORE_RESET + 1) == "2024-06-01"
+
+
+def test_reserve_keeps_interactive_share(tmp_path):
+    """Unit test for QuotaLedger.reserve().
+
+    when background and interactive requests spend the budget.
+    """
+    ledger = QuotaLedger(
+        tmp_path / "quota.db", daily_quota=300, clock=FakeClock(BEFORE_RESET)
+    )
+
+    assert ledger.reserve(100, Priority.BACKGROUND)
+    assert ledger.reserve(100, Priority.BACKGROUND)
+    assert not ledger.reserve(100, Priority.BACKGROUND)
+    assert ledger.reserve(100)
+    assert not ledger.reserve(100)
+    assert ledger.stats() == QuotaStats("2024-05-31", 300, 0, False)
+
+
+def test_ledger_persists_until_reset(tmp_path):
+    """Unit test for QuotaLedger.
+
+    when the ledger is reopened, exhausted, and the Pacific day changes.
+    """
+    clock = FakeClock(BEFORE_RESET)
+    ledger = QuotaLedger(tmp_path / "quota.db", clock=clock)
+    ledger.reserve(100)
+    ledger.close()
+
+    reopened = QuotaLedger(tmp_path / "quota.db", clock=clock)
+    assert reopened.stats().spent == 100
+    reopened.exhaust()
+    assert not reopened.reserve(100)
+    assert reopened.stats().remaining == 0
+
+    clock.now += 1
+
+    assert reopened.stats() == QuotaStats("2024-06-01", 0, 10000, False)
+    assert reopened.reserve(100)
+    reopened.close()
@@ -0,0 +1,179 @@
+"""Unit tests for the rate limiter in src/waft/ratelimit.py."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from waft.client import SpotifyClient  # type: ignore
+from waft.ratelimit import Priority, RateLimiter, backoff_delay  # type: ignore
+
+
+def test_rate_limiter_budget():
+    """Unit test for RateLimiter.acquire() and RateLimiter.stats().
+
+    when the burst budget is spent.
+    """
+    limiter = RateLimiter(rate=1.0, capacity=3.0)
+
+    assert all(limiter.acquire(timeout=0) for _ in range(3))
+    assert limiter.acquire(timeout=0.01) is False
+    assert limiter.stats().budget < 1.0
+    assert limiter.stats().queue_depth == 0
+
+
+def test_rate_limiter_penalize_blocks_callers():
+    """Unit test for RateLimiter.penalize().
+
+    when Spotify has asked the client to back off.
+    """
+    limiter = RateLimiter(rate=100.0, capacity=10.0)
+    limiter.penalize(0.2)
+
+    stats = limiter.stats()
+    assert stats.budget == 0.0
+    assert stats.blocked_for > 0.1
+    assert stats.throttled == 1
+
+    start = time.perf_counter()
+    assert limiter.acquire(timeout=1.0)
+    assert time.perf_counter() - start >= 0.15
+
+
+def test_rate_limiter_interactive_overtakes_background():
+    """Unit test for RateLimiter.acquire().
+
+    when an interactive caller arrives after a waiting background caller.
+    """
+    limiter = RateLimiter(rate=20.0, capacity=1.0)
+    limiter.acquire()
+    order = []
+
+    def worker(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+
+    background = threading.Thread(target=worker, args=(Priority.BACKGROUND,))
+    interactive = threading.Thread(target=worker, args=(Priority.INTERACTIVE,))
+    background.start()
+    time.sleep(0.005)
+    assert limiter.stats().background_waiting == 1
+    interactive.start()
+    background.join()
+    interactive.join()
+
+    assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+
+def test_backoff_delay_bounds():
+    """Unit test for backoff_delay().
+
+    when the exponential delay exceeds the cap.
+    """
+    delays = [backoff_delay(10, 0.5, cap=4.0) for _ in range(100)]
+
+    assert all(0.0 <= delay <= 4.0 for delay in delays)
+
+
+def test_spotify_client_honors_retry_after():
+    """Unit test for SpotifyClient.request().
+
+    when Spotify answers 429 with a Retry-After header.
+    """
+    client = SpotifyClient()
+    throttled = Mock(status_code=429, headers={"Retry-After": "3"})
+    success = Mock(status_code=200, headers={})
+
+    with patch.object(client.session, "request", side_effect=[throttled, success]):
+        with patch.object(client.limiter, "acquire") as mock_acquire:
+            with patch.object(client.limiter, "penalize") as mock_penalize:
+                response = client.get("https://api.spotify.com/v1/tracks/1")
+
+    assert response is success
+    mock_penalize.assert_called_once_with(3.0)
+    assert mock_acquire.call_count == 2
+    client.close()
+
+
+def test_spotify_client_honors_zero_retry_after():
+    """Unit test for SpotifyClient.request().
+
+    when Spotify answers 429 with ``Retry-After: 0``.
+    """
+    client = SpotifyClient()
+    throttled = Mock(status_code=429, headers={"Retry-After": "0"})
+    success = Mock(status_code=200, headers={})
+
+    with patch.object(client.session, "request", side_effect=[throttled, success]):
+        with patch.object(client.limiter, "acquire"):
+            with patch.object(client.limiter, "penalize") as mock_penalize:
+                with patch("waft.client.backoff_delay") as mock_backoff:
+                    client.get("https://api.spotify.com/v1/tracks/1")
+
+    mock_penalize.assert_called_once_with(0.0)
+    mock_backoff.assert_not_called()
+    client.close()
+
+
+def test_spotify_client_gives_up_after_retries():
+    """Unit test for SpotifyClient.request().
+
+    when every attempt is answered with 429.
+    """
+    client = SpotifyClient()
+    throttled = Mock(status_code=429, headers={})
+
+    with patch.object(client.session, "request", return_value=throttled):
+        with patch.object(client.limiter, "acquire"):
+            with patch.object(client.limiter, "penalize") as mock_penalize:
+                response = client.get("https://api.spotify.com/v1/tracks/1")
+
+    assert response is throttled
+    assert mock_penalize.call_count == client.settings.rate_limit_retries
+    client.close()
+
+
+def test_spotify_client_renews_rejected_token():
+    """Unit test for SpotifyClient.request().
+
+    when Spotify answers 401 to a revoked bearer token.
+    """
+    client = SpotifyClient()
+    client.reauthenticate = Mock(return_value="fresh")
+    rejected = Mock(status_code=401, headers={})
+    success = Mock(status_code=200, headers={})
+
+    with patch.object(
+        client.session, "request", side_effect=[rejected, success]
+    ) as mock_request:
+        with patch.object(client.limiter, "acquire"):
+            response = client.get(
+                "https://api.spotify.com/v1/tracks/1",
+                headers={"Authorization": "Bearer revoked"},
+            )
+
+    assert response is success
+    client.reauthenticate.assert_called_once_with("revoked")
+    assert mock_request.call_args.kwargs["headers"] == {"Authorization": "Bearer fresh"}
+    client.close()
+
+
+def test_spotify_client_retries_rejected_token_once():
+    """Unit test for SpotifyClient.request().
+
+    when the renewed token is rejected too.
+    """
+    client = SpotifyClient()
+    client.reauthenticate = Mock(return_value="fresh")
+    rejected = Mock(status_code=401, headers={})
+
+    with patch.object(client.session, "request", return_value=rejected) as mock_request:
+        with patch.object(client.limiter, "acquire"):
+            response = client.get(
+                "https://api.spotify.com/v1/tracks/1",
+                headers={"Authorization": "Bearer revoked"},
+            )
+
+    assert response is rejected
+    assert mock_request.call_count == 2
+    client.reauthenticate.assert_called_once_with("revoked")
+    client.close()
@@ -0,0 +1,184 @@
+"""Unit tests for the replica in src/waft/replica.py."""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import pytest  # type: ignore
+from bson import ObjectId
+from pymongo.errors import ServerSelectionTimeoutError
+
+from waft.datatypes import DisplayedTrack  # type: ignore
+from waft.replica import (NEGATIVE_TTL, OFFLINE_BACKOFF,  # type: ignore
+                          SourceReplica, main)
+
+TRACK = DisplayedTrack("Doxy", "Miles Davis", "Bags' Groove", 290000, "id1")
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """Controllable replacement for ``time.time``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def file_document(file_hash, spotify_id, hour):
+    """Return a File document whose ``SyncID`` was generated at ``hour``."""
+    return {
+        "_id": file_hash,
+        "SpotifyID": spotify_id,
+        "SourceLink": f"yt/{spotify_id}",
+        "SyncID": ObjectId.from_datetime(
+            datetime(2024, 1, 1, hour, tzinfo=timezone.utc)
+        ),
+    }
+
+
+def test_lookup_reads_through(tmp_path):
+    """Unit test for SourceReplica.lookup().
+
+    when the first lookup misses and later ones hit.
+    """
+    replica = SourceReplica(tmp_path / "sources.db")
+    fetch = Mock(return_value="https://youtu.be/doxy")
+
+    first = replica.lookup(TRACK, fetch)
+    second = replica.lookup(TRACK, fetch)
+
+    assert first == second == "https://youtu.be/doxy"
+    fetch.assert_called_once_with(TRACK)
+
+
+def test_lookup_stored_miss_expires(tmp_path):
+    """Unit test for SourceReplica.lookup().
+
+    when a track without a source is looked up again after the negative TTL.
+    """
+    clock = FakeClock(100.0)
+    replica = SourceReplica(tmp_path / "sources.db", clock=clock)
+    fetch = Mock(side_effect=[None, "https://youtu.be/doxy"])
+
+    assert replica.lookup(TRACK, fetch) is None
+    assert replica.lookup(TRACK, fetch) is None
+    clock.now += NEGATIVE_TTL
+    assert replica.lookup(TRACK, fetch) == "https://youtu.be/doxy"
+    assert fetch.call_count == 2
+
+
+def test_lookup_offline(tmp_path):
+    """Unit test for SourceReplica.lookup().
+
+    when the deployment is unreachable.
+    """
+    clock = FakeClock(100.0)
+    replica = SourceReplica(tmp_path / "sources.db", clock=clock)
+    replica.put("id2", "https://youtu.be/oleo")
+    fetch = Mock(side_effect=ServerSelectionTimeoutError("down"))
+
+    assert replica.lookup(TRACK, fetch) is None
+    assert replica.lookup(TRACK, fetch) is None
+    oleo = DisplayedTrack("Oleo", "Miles Davis", "Bags' Groove", 1, "id2")
+    assert replica.lookup(oleo, fetch) == "https://youtu.be/oleo"
+    fetch.assert_called_once_with(TRACK)
+
+    clock.now += OFFLINE_BACKOFF
+    replica.lookup(TRACK, fetch)
+    assert fetch.call_count == 2
+
+
+def test_lookup_many(tmp_path):
+    """Unit test for SourceReplica.lookup_many().
+
+    when some tracks are known and the rest are fetched in one call.
+    """
+    replica = SourceReplica(tmp_path / "sources.db")
+    replica.put("id1", "https://youtu.be/doxy")
+    replica.put("id2", None)
+    oleo = DisplayedTrack("Oleo", "Miles Davis", "Bags' Groove", 1, "id3")
+    airegin = DisplayedTrack("Airegin", "Miles Davis", "Bags' Groove", 1, "id4")
+    known = DisplayedTrack("Walkin'", "Miles Davis", "Walkin'", 1, "id2")
+    fetch = Mock(return_value={"id3": "https://youtu.be/oleo"})
+
+    links = replica.lookup_many([TRACK, known, oleo, airegin], fetch)
+
+    assert links == {"id1": "https://youtu.be/doxy", "id3": "https://youtu.be/oleo"}
+    fetch.assert_called_once_with([oleo, airegin])
+    assert replica.get("id3") == (True, "https://youtu.be/oleo")
+    assert replica.get("id4") == (False, None)
+
+
+def test_sync_is_incremental(tmp_path):
+    """Unit test for SourceReplica.sync().
+
+    when documents are written between two syncs.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["test"]
+    db["File"].insert_many(
+        [
+            file_document("b", "id1", 1),
+            file_document("a", "id2", 2),
+            {"_id": "c", "SourceLink": "yt/legacy"},
+        ]
+    )
+    replica = SourceReplica(tmp_path / "sources.db")
+
+    first = replica.sync(db, batch_size=1)
+    db["File"].insert_one(file_document("d", "id3", 5))
+    second = replica.sync(db)
+
+    # The second sync re-reads the last minute before its high-water mark.
+    assert (first, second) == (2, 2)
+    assert [replica.get(key) for key in ("id1", "id2", "id3", "id4")] == [
+        (True, "yt/id1"),
+        (True, "yt/id2"),
+        (True, "yt/id3"),
+        (False, None),
+    ]
+
+
+def test_sync_rebuilds_stale_replica(tmp_path):
+    """Unit test for SourceReplica.sync().
+
+    when the replica is older than the rebuild period.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["test"]
+    db["File"].insert_one(file_document("a", "id1", 1))
+    clock = FakeClock(100.0)
+    replica = SourceReplica(tmp_path / "sources.db", rebuild_after=50, clock=clock)
+    replica.sync(db)
+    db["File"].delete_one({"_id": "a"})
+
+    replica.sync(db)
+    kept = replica.get("id1")
+    clock.now += 50
+    replica.sync(db)
+
+    assert kept == (True, "yt/id1")
+    assert replica.get("id1") == (False, None)
+
+
+def test_main_rebuilds_from_configured_collection(tmp_path, monkeypatch, capsys):
+    """Unit test for main().
+
+    when the embedded storage backend is configured.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["test"]
+    db["File"].insert_one(file_document("a", "id1", 1))
+    db["Source"].insert_one(file_document("b", "id2", 2))
+    monkeypatch.setenv("WAFT_STORAGE_BACKEND", "mongodb-embedded")
+    monkeypatch.setattr("sys.argv", ["waft.replica", "--rebuild"])
+
+    with patch("waft.replica.get_database", return_value=db), patch(
+        "waft.replica.replica_path", return_value=tmp_path / "sources.db"
+    ):
+        main()
+
+    replica = SourceReplica(tmp_path / "sources.db")
+    assert replica.get("id2") == (True, "yt/id2")
+    assert replica.get("id1") == (False, None)
+    assert "copied 1 source links" in capsys.readouterr().out
@@ -1,15 +1,26 @@
 """Unit tests for the functions in src/waft/spotify.py."""
 
+import asyncio
+import json
 from unittest.mock import Mock, patch
 
 import pytest  # type: ignore
 import requests  # type: ignore
 
-from waft.datatypes import DisplayedTrack  # type: ignore
+from waft.datatypes import DisplayedAlbum, DisplayedTrack  # type: ignore
 from waft.datatypes import Album, Artist, FullMetadata, Track
 from waft.spotify import parse_album_data  # type: ignore
-from waft.spotify import (get_metadata, parse_artists_data, parse_track_data,
-                          parse_tracks_from_json, spotify_search)
+from waft.spotify import (get_album_tracks, get_metadata,
+                          get_metadata_async, get_metadata_batch,
+                          next_search_offset, parse_albums_from_json,
+                          parse_artists_data, parse_track_data,
+                          parse_tracks_from_json, spotify_album_search,
+                          spotify_search, spotify_search_async)
+
+
+def encode(payload):
+    """Encode ``payload`` as a Spotify response body."""
+    return json.dumps(payload).encode()
 
 
 def test_parse_tracks_from_json_single_artist():
@@ -88,29 +99,31 @@ def test_parse_tracks_from_json_type_error():
         parse_tracks_from_json([])
 
 
-@patch("waft.spotify.requests.get")
-def test_spotify_search_success(mock_get):
+@patch("waft.spotify.get_client")
+def test_spotify_search_success(mock_get_client):
     """Unit test for spotify_search().
 
     when a value should be returned.
     """
     mock_response = Mock()
     mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "tracks": {
-            "items": [
-                {
-                    "name": "Song",
-                    "id": "id1",
-                    "duration_ms": 123,
-                    "album": {"name": "Album"},
-                    "artists": [{"name": "Artist"}],
-                }
-            ]
+    mock_response.content = encode(
+        {
+            "tracks": {
+                "items": [
+                    {
+                        "name": "Song",
+                        "id": "id1",
+                        "duration_ms": 123,
+                        "album": {"name": "Album"},
+                        "artists": [{"name": "Artist"}],
+                    }
+                ]
+            }
         }
-    }
+    )
 
-    mock_get.return_value = mock_response
+    mock_get_client.return_value.get.return_value = mock_response
 
     results = spotify_search("Song", "token123", limit=1)
 
@@ -118,15 +131,15 @@ def test_spotify_search_success(mock_get):
     assert isinstance(results[0], DisplayedTrack)
 
 
-@patch("waft.spotify.requests.get")
-def test_spotify_search_http_error(mock_get):
+@patch("waft.spotify.get_client")
+def test_spotify_search_http_error(mock_get_client):
     """Unit test for spotify_search().
 
     when an HttpError Exception should be raised.
     """
     mock_response = Mock()
     mock_response.raise_for_status.side_effect = requests.HTTPError
-    mock_get.return_value = mock_response
+    mock_get_client.return_value.get.return_value = mock_response
 
     with pytest.raises(requests.HTTPError):
         spotify_search("Song", "token123", limit=1)
@@ -209,6 +222,29 @@ def test_parse_track_data_success():
     assert track.explicit is False
     assert track.release_date == "2020-01-01"
     assert track.track_number == 5
+    assert track.track_id is None
+    assert track.isrc is None
+
+
+def test_parse_track_data_identifiers():
+    """Unit test for parse_track_data().
+
+    when the payload carries the track ID and an I.S.R.C.
+    """
+    json_data = {
+        "duration_ms": 300000,
+        "explicit": False,
+        "external_ids": {"isrc": "USPR35600012"},
+        "id": "abc",
+        "name": "Track Name",
+        "track_number": 5,
+        "album": {"release_date": "2020-01-01"},
+    }
+
+    track = parse_track_data(json_data)
+
+    assert track.track_id == "abc"
+    assert track.isrc == "USPR35600012"
 
 
 def test_parse_track_data_key_error():
@@ -220,28 +256,30 @@ def test_parse_track_data_key_error():
         parse_track_data({})
 
 
-@patch("waft.spotify.requests.get")
-def test_get_metadata_success(mock_get):
+@patch("waft.spotify.get_client")
+def test_get_metadata_success(mock_get_client):
     """Unit test for get_metadata().
 
     when a value should be returned correctly.
     """
     mock_response = Mock()
     mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {
-        "duration_ms": 100000,
-        "explicit": True,
-        "name": "Test Song",
-        "track_number": 1,
-        "album": {
-            "name": "Test Album",
-            "release_date": "2022-01-01",
-            "images": [{"url": "http://img"}],
-        },
-        "artists": [{"name": "Artist A"}],
-    }
+    mock_response.content = encode(
+        {
+            "duration_ms": 100000,
+            "explicit": True,
+            "name": "Test Song",
+            "track_number": 1,
+            "album": {
+                "name": "Test Album",
+                "release_date": "2022-01-01",
+                "images": [{"url": "http://img"}],
+            },
+            "artists": [{"name": "Artist A"}],
+        }
+    )
 
-    mock_get.return_value = mock_response
+    mock_get_client.return_value.get.return_value = mock_response
 
     metadata = get_metadata("track123", "token123")
 
@@ -269,27 +307,255 @@ def test_get_metadata_value_error_token():
         get_metadata("track123", "")
 
 
-@patch("waft.spotify.requests.get")
-def test_get_metadata_http_error(mock_get):
+@patch("waft.spotify.get_client")
+def test_get_metadata_http_error(mock_get_client):
     """Unit test for get_metadata().
 
     when a HttpError Exception should be raised.
     """
     mock_response = Mock()
     mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
-    mock_get.return_value = mock_response
+    mock_get_client.return_value.get.return_value = mock_response
 
     with pytest.raises(requests.HTTPError):
         get_metadata("track123", "token123")
 
 
-@patch("waft.spotify.requests.get")
-def test_get_metadata_request_request_exception(mock_get):
+@patch("waft.spotify.get_client")
+def test_get_metadata_request_request_exception(mock_get_client):
     """Unit test for get_metadata().
 
     when a RequestException should be raised.
     """
-    mock_get.side_effect = requests.RequestException("Connection error")
+    mock_get_client.return_value.get.side_effect = requests.RequestException(
+        "Connection error"
+    )
 
     with pytest.raises(requests.RequestException):
         get_metadata("track123", "token123")
+
+
+def make_track_json(name):
+    """Build a minimal Spotify track object for metadata tests."""
+    return {
+        "duration_ms": 100000,
+        "explicit": False,
+        "name": name,
+        "track_number": 1,
+        "album": {
+            "name": "Test Album",
+            "release_date": "2022-01-01",
+            "images": [{"url": "http://img"}],
+        },
+        "artists": [{"name": "Artist A"}],
+    }
+
+
+@patch("waft.spotify.get_client")
+def test_get_metadata_batch_chunks_ids(mock_get_client):
+    """Unit test for get_metadata_batch().
+
+    when more IDs than fit in a single request are inputted.
+    """
+    track_ids = [f"id{index}" for index in range(120)]
+
+    def respond(_url, _priority, headers, params):  # pylint: disable=W0613
+        response = Mock()
+        response.raise_for_status.return_value = None
+        chunk = params["ids"].split(",")
+        response.content = encode({"tracks": [make_track_json(i) for i in chunk]})
+        return response
+
+    mock_get_client.return_value.get.side_effect = respond
+
+    metadata = get_metadata_batch(track_ids, "token123")
+
+    calls = mock_get_client.return_value.get.call_args_list
+    assert [len(c.kwargs["params"]["ids"].split(",")) for c in calls] == [50, 50, 20]
+    assert list(metadata) == track_ids
+    assert all(isinstance(m, FullMetadata) for m in metadata.values())
+    assert metadata["id7"].track.name == "id7"
+
+
+@patch("waft.spotify.get_client")
+def test_get_metadata_batch_skips_unknown_ids(mock_get_client):
+    """Unit test for get_metadata_batch().
+
+    when Spotify returns null for an unknown ID and IDs are repeated.
+    """
+    mock_response = Mock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.content = encode({"tracks": [make_track_json("A"), None]})
+    mock_get_client.return_value.get.return_value = mock_response
+
+    metadata = get_metadata_batch(["a", "missing", "a"], "token123")
+
+    mock_get_client.return_value.get.assert_called_once()
+    params = mock_get_client.return_value.get.call_args.kwargs["params"]
+    assert params == {"ids": "a,missing"}
+    assert list(metadata) == ["a"]
+
+
+def test_get_metadata_batch_value_error():
+    """Unit test for get_metadata_batch().
+
+    when a ValueError Exception should be raised.
+    """
+    with pytest.raises(ValueError):
+        get_metadata_batch(["id1", ""], "token")
+    with pytest.raises(ValueError):
+        get_metadata_batch(["id1"], "")
+
+
+@patch("waft.spotify.get_client")
+def test_get_metadata_batch_http_error(mock_get_client):
+    """Unit test for get_metadata_batch().
+
+    when a HttpError Exception should be raised.
+    """
+    mock_response = Mock()
+    mock_response.raise_for_status.side_effect = requests.HTTPError("429")
+    mock_get_client.return_value.get.return_value = mock_response
+
+    with pytest.raises(requests.HTTPError):
+        get_metadata_batch(["id1"], "token123")
+
+
+@patch("waft.spotify.get_client")
+def test_spotify_search_async_success(mock_get_client):
+    """Unit test for spotify_search_async().
+
+    when a value should be returned.
+    """
+    mock_response = Mock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.content = encode(
+        {
+            "tracks": {
+                "items": [
+                    {
+                        "name": "Song",
+                        "id": "id1",
+                        "duration_ms": 123,
+                        "album": {"name": "Album"},
+                        "artists": [{"name": "Artist"}],
+                    }
+                ]
+            }
+        }
+    )
+    mock_get_client.return_value.get.return_value = mock_response
+
+    results = asyncio.run(spotify_search_async("Song", "token123", 1))
+
+    assert [track.track_id for track in results] == ["id1"]
+
+
+@patch("waft.spotify.get_client")
+def test_get_metadata_async_http_error(mock_get_client):
+    """Unit test for get_metadata_async().
+
+    when a HttpError Exception should be raised.
+    """
+    mock_response = Mock()
+    mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+    mock_get_client.return_value.get.return_value = mock_response
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(get_metadata_async("track123", "token123"))
+
+
+def test_next_search_offset():
+    """Unit test for next_search_offset()."""
+    assert next_search_offset(0, 10, 10) == 10
+    assert next_search_offset(10, 40, 25) is None
+    assert next_search_offset(950, 50, 50) is None
+
+
+def make_album_json(name, artists=1):
+    """Build a minimal Spotify album object for album search tests."""
+    return {
+        "id": f"id-{name}",
+        "name": name,
+        "release_date": "1957",
+        "total_tracks": 7,
+        "artists": [{"name": f"Artist {i}"} for i in range(artists)],
+    }
+
+
+def test_parse_albums_from_json():
+    """Unit test for parse_albums_from_json()."""
+    json_object = {
+        "albums": {"items": [make_album_json("A"), make_album_json("B", artists=2)]}
+    }
+
+    albums = parse_albums_from_json(json_object)
+
+    assert albums == [
+        DisplayedAlbum("A", "Artist 0", "1957", 7, "id-A"),
+        DisplayedAlbum("B", "Artist 0 and Others", "1957", 7, "id-B"),
+    ]
+
+
+@patch("waft.spotify.get_client")
+def test_spotify_album_search_success(mock_get_client):
+    """Unit test for spotify_album_search().
+
+    when a value should be returned.
+    """
+    mock_response = Mock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.content = encode({"albums": {"items": [make_album_json("A")]}})
+    mock_get_client.return_value.get.return_value = mock_response
+
+    albums = spotify_album_search("Bags", "token123", limit=20, offset=20)
+
+    assert albums[0].album_id == "id-A"
+    params = mock_get_client.return_value.get.call_args.kwargs["params"]
+    assert params == {"q": "album:Bags", "type": "album", "limit": "20", "offset": "20"}
+
+
+@patch("waft.spotify.get_client")
+def test_get_album_tracks_pages(mock_get_client):
+    """Unit test for get_album_tracks().
+
+    when the listing spans two pages.
+    """
+
+    def track_json(number):
+        return {
+            "id": f"t{number}",
+            "name": f"Track {number}",
+            "duration_ms": 1000,
+            "artists": [{"name": "Artist A"}],
+        }
+
+    def respond(_url, _priority, headers, params):  # pylint: disable=W0613
+        offset = int(params["offset"])
+        count = 50 if offset == 0 else 10
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.content = encode(
+            {
+                "items": [track_json(offset + i) for i in range(count)],
+                "next": "https://api.spotify.com/next" if offset == 0 else None,
+            }
+        )
+        return response
+
+    mock_get_client.return_value.get.side_effect = respond
+
+    tracks = get_album_tracks("album1", "Bags' Groove", "token123")
+
+    assert [track.track_id for track in tracks] == [f"t{i}" for i in range(60)]
+    assert all(track.album == "Bags' Groove" for track in tracks)
+    assert mock_get_client.return_value.get.call_count == 2
+
+
+def test_get_album_tracks_value_error():
+    """Unit test for get_album_tracks().
+
+    when the album ID is empty.
+    """
+    with pytest.raises(ValueError):
+        get_album_tracks("", "Bags' Groove", "token123")
@@ -0,0 +1,151 @@
+"""Unit tests for the TokenManager in src/waft/tokens.py."""
+
+import asyncio
+from unittest.mock import patch
+
+from waft.datatypes import AccessToken  # type: ignore
+from waft.tokens import TokenManager  # type: ignore
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """Controllable replacement for ``time.time``."""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@patch("waft.tokens.store_token")
+@patch("waft.tokens.request_spotify_access_token")
+@patch("waft.tokens.retrieve_token")
+def test_get_token_warm_start(mock_retrieve, mock_request, mock_store):
+    """Unit test for TokenManager.get_token().
+
+    when a persisted, unexpired token exists.
+    """
+    mock_retrieve.return_value = AccessToken("stored", 5000.0)
+
+    async def run():
+        manager = TokenManager("id", "secret", clock=FakeClock(1000.0))
+        token = await manager.get_token()
+        manager.close()
+        return token
+
+    assert asyncio.run(run()) == "stored"
+    mock_retrieve.assert_called_once_with("id")
+    mock_request.assert_not_called()
+    mock_store.assert_not_called()
+
+
+@patch("waft.tokens.store_token")
+@patch("waft.tokens.request_spotify_access_token")
+@patch("waft.tokens.retrieve_token")
+def test_get_token_expired_refreshes(mock_retrieve, mock_request, mock_store):
+    """Unit test for TokenManager.get_token().
+
+    when the persisted token has expired.
+    """
+    mock_retrieve.return_value = AccessToken("stale", 900.0)
+    fresh = AccessToken("fresh", 4600.0)
+    mock_request.return_value = fresh
+
+    async def run():
+        manager = TokenManager("id", "secret", clock=FakeClock(1000.0))
+        token = await manager.get_token()
+        manager.close()
+        return token
+
+    assert asyncio.run(run()) == "fresh"
+    mock_request.assert_called_once_with("id", "secret")
+    mock_store.assert_called_once_with("id", fresh)
+
+
+@patch("waft.tokens.store_token")
+@patch("waft.tokens.request_spotify_access_token")
+@patch("waft.tokens.retrieve_token")
+def test_get_token_shares_inflight_refresh(mock_retrieve, mock_request, _mock_store):
+    """Unit test for TokenManager.get_token().
+
+    when several callers race for a token that must be refreshed.
+    """
+    mock_retrieve.return_value = None
+    mock_request.return_value = AccessToken("fresh", 4600.0)
+
+    async def run():
+        manager = TokenManager("id", "secret", clock=FakeClock(1000.0))
+        tokens = await asyncio.gather(*(manager.get_token() for _ in range(5)))
+        manager.close()
+        return tokens
+
+    assert asyncio.run(run()) == ["fresh"] * 5
+    mock_request.assert_called_once()
+
+
+@patch("waft.tokens.store_token")
+@patch("waft.tokens.request_spotify_access_token")
+@patch("waft.tokens.retrieve_token")
+def test_get_token_near_expiry_refreshes_in_background(
+    mock_retrieve, mock_request, _mock_store
+):
+    """Unit test for TokenManager.get_token().
+
+    when the token is still valid but within the refresh margin.
+    """
+    mock_retrieve.return_value = AccessToken("current", 1100.0)
+    mock_request.return_value = AccessToken("next", 4700.0)
+
+    async def run():
+        manager = TokenManager("id", "secret", refresh_margin=300, clock=FakeClock(1e3))
+        first = await manager.get_token()
+        await asyncio.sleep(0.05)  # Let the background refresh complete.
+        second = await manager.get_token()
+        manager.close()
+        return first, second
+
+    assert asyncio.run(run()) == ("current", "next")
+    mock_request.assert_called_once()
+
+
+@patch("waft.tokens.store_token")
+@patch("waft.tokens.request_spotify_access_token")
+@patch("waft.tokens.retrieve_token")
+def test_get_token_invalid_credentials(mock_retrieve, mock_request, mock_store):
+    """Unit test for TokenManager.get_token().
+
+    when Spotify rejects the credentials.
+    """
+    mock_retrieve.return_value = None
+    mock_request.return_value = None
+
+    async def run():
+        manager = TokenManager("id", "secret", clock=FakeClock(1000.0))
+        return await manager.get_token()
+
+    assert asyncio.run(run()) is None
+    mock_store.assert_not_called()
+
+
+@patch("waft.tokens.store_token")
+@patch("waft.tokens.request_spotify_access_token")
+@patch("waft.tokens.retrieve_token")
+def test_renew_replaces_rejected_token(mock_retrieve, mock_request, mock_store):
+    """Unit test for TokenManager.renew().
+
+    when a persisted, unexpired token was revoked.
+    """
+    mock_retrieve.return_value = AccessToken("revoked", 5000.0)
+    fresh = AccessToken("fresh", 4600.0)
+    mock_request.return_value = fresh
+
+    async def run():
+        manager = TokenManager("id", "secret", clock=FakeClock(1000.0))
+        await manager.get_token()
+        tokens = [await manager.renew("revoked"), await manager.renew("revoked")]
+        manager.close()
+        return tokens
+
+    assert asyncio.run(run()) == ["fresh", "fresh"]
+    mock_request.assert_called_once_with("id", "secret")
+    mock_store.assert_called_once_with("id", fresh)
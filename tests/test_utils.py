@@ -2,7 +2,8 @@
 
 from textual.widgets.option_list import Option  # type: ignore
 
-from waft.datatypes import DisplayedTrack, YoutubeResult  # type: ignore
+from waft.datatypes import DisplayedAlbum  # type: ignore
+from waft.datatypes import DisplayedTrack, YoutubeResult
 from waft.utils import create_options_from_results  # type: ignore
 from waft.utils import create_options_from_suggestions, format_milliseconds
 
@@ -68,6 +69,41 @@ def test_create_options_from_results_multiple_tracks():
         assert isinstance(opt, Option)
 
 
+def test_create_options_from_results_album():
+    """Unit test for create_options_from_results().
+
+    when an album is inputted.
+    """
+    album = DisplayedAlbum("Bags' Groove", "Miles Davis", "1957", 7, "album1")
+
+    options = create_options_from_results([album])
+    table = options[0].prompt
+
+    assert len(options) == 1
+    assert table.columns[1]._cells == ["1957", ""]  # pylint: disable=W0212
+    assert table.columns[2]._cells == ["7 tracks", ""]  # pylint: disable=W0212
+
+
+def test_create_options_from_results_known_source():
+    """Unit test for create_options_from_results().
+
+    when one of the tracks has a known source.
+    """
+    tracks = [
+        DisplayedTrack("Song A", "Artist A", "Album A", 90_000, "123"),
+        DisplayedTrack("Song B", "Artist B", "Album B", 120_000, "456"),
+    ]
+
+    options = create_options_from_results(tracks, known_sources={"456"})
+
+    # pylint: disable=W0212
+    assert options[0].prompt.columns[2]._cells == ["1:30", ""]
+    assert options[1].prompt.columns[2]._cells == [
+        "2:00",
+        "[green]✓ known source[/green]",
+    ]
+
+
 def test_create_options_from_suggestions_single_video():
     """Unit test for create_options_from_suggestions().
 
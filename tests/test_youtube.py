@@ -2,9 +2,26 @@
 
 from unittest.mock import Mock, patch
 
+import pytest  # type: ignore
+from googleapiclient.errors import HttpError  # type: ignore
+
+from waft.cache import SuggestionCache  # type: ignore
 from waft.datatypes import DisplayedTrack, YoutubeResult  # type: ignore
-from waft.youtube import (parse_results_from_json,  # type: ignore
-                          search_youtube)
+from waft.quota import QuotaLedger  # type: ignore
+from waft.ratelimit import Priority  # type: ignore
+from waft.youtube import (HttpPool, close_youtube_services,  # type: ignore
+                          get_youtube_service, parse_results_from_json,
+                          search_youtube, suggest_sources)
+
+TRACK = DisplayedTrack("Doxy", "Miles Davis", "Relaxin'", 300000, "1234")
+
+
+@pytest.fixture(autouse=True)
+def fixture_services():
+    """Start and end every test without cached services."""
+    close_youtube_services()
+    yield
+    close_youtube_services()
 
 
 def test_parse_results_from_json_remove_non_videos():
@@ -133,7 +150,13 @@ def test_search_youtube_success(mock_build, mock_parse):
 
     results = search_youtube(track, api_key="fake_key")
 
-    mock_build.assert_called_once_with("youtube", "v3", developerKey="fake_key")
+    mock_build.assert_called_once_with(
+        "youtube",
+        "v3",
+        developerKey="fake_key",
+        static_discovery=True,
+        cache_discovery=False,
+    )
 
     mock_search.list.assert_called_once_with(
         part="snippet",
@@ -144,3 +167,89 @@ def test_search_youtube_success(mock_build, mock_parse):
     mock_request.execute.assert_called_once()
     mock_parse.assert_called_once_with({"items": []})
     assert results == ["parsed_result"]
+
+
+@patch("waft.youtube.googleapiclient.discovery.build")
+def test_get_youtube_service_is_cached(mock_build):
+    """Unit test for get_youtube_service().
+
+    when services are requested repeatedly for two keys.
+    """
+    mock_build.side_effect = lambda *args, **kwargs: Mock()
+
+    first = get_youtube_service("key1")
+
+    assert get_youtube_service("key1") is first
+    assert get_youtube_service("key2") is not first
+    assert mock_build.call_count == 2
+    close_youtube_services()
+    assert get_youtube_service("key1") is not first
+
+
+def test_http_pool_reuses_connections():
+    """Unit test for HttpPool.connection().
+
+    when connections are borrowed one after another and at once.
+    """
+    pool = HttpPool(size=1, timeout=5)
+
+    with pool.connection() as first:
+        with pool.connection() as second:
+            assert second is not first
+    with pool.connection() as third:
+        assert third is second
+
+    assert first.timeout == 5
+    pool.close()
+
+
+@patch("waft.youtube.search_youtube")
+def test_suggest_sources_caches(mock_search, tmp_path):
+    """Unit test for suggest_sources().
+
+    when the same track is selected twice.
+    """
+    suggestions = [YoutubeResult("Doxy", "Miles Davis", "https://youtu.be/doxy")]
+    mock_search.return_value = suggestions
+    cache = SuggestionCache(tmp_path / "cache.db")
+    ledger = QuotaLedger(tmp_path / "quota.db")
+
+    assert suggest_sources(TRACK, "fake_key", cache, ledger) == suggestions
+    assert suggest_sources(TRACK, "fake_key", cache, ledger) == suggestions
+
+    mock_search.assert_called_once_with(TRACK, "fake_key")
+    assert ledger.stats().spent == 100
+
+
+@patch("waft.youtube.search_youtube")
+def test_suggest_sources_within_quota(mock_search, tmp_path):
+    """Unit test for suggest_sources().
+
+    when the quota left is kept for interactive searches, then spent.
+    """
+    mock_search.side_effect = HttpError(
+        Mock(status=403), b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}'
+    )
+    cache = SuggestionCache(tmp_path / "cache.db")
+    ledger = QuotaLedger(tmp_path / "quota.db", daily_quota=100)
+
+    background = suggest_sources(TRACK, "key", cache, ledger, Priority.BACKGROUND)
+    interactive = suggest_sources(TRACK, "key", cache, ledger)
+
+    assert (background, interactive) == (None, None)
+    assert mock_search.call_count == 1
+    assert ledger.stats().exhausted
+
+
+@patch("waft.youtube.search_youtube")
+def test_suggest_sources_raises_other_errors(mock_search, tmp_path):
+    """Unit test for suggest_sources().
+
+    when the search fails for another reason than the quota.
+    """
+    mock_search.side_effect = HttpError(Mock(status=400), b"keyInvalid")
+    ledger = QuotaLedger(tmp_path / "quota.db")
+
+    with pytest.raises(HttpError):
+        suggest_sources(TRACK, "key", SuggestionCache(tmp_path / "cache.db"), ledger)
+    assert not ledger.stats().exhausted